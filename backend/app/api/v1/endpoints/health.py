@@ -1066,9 +1066,22 @@ class LanceDBHealthResponse(BaseModel):
     embedding_model: Optional[str] = Field(
         default=None, description="使用的Embedding模型名称"
     )
+    result_cache: Optional[Dict[str, Any]] = Field(
+        default=None, description="检索结果缓存指标 (hits/misses/invalidations/entries)"
+    )
     error: Optional[str] = Field(default=None, description="错误信息(仅error时存在)")
 
 
+def _lancedb_result_cache_stats() -> Optional[Dict[str, Any]]:
+    """Search result cache metrics, or None when the RAG package is unavailable."""
+    try:
+        from agentic_rag.clients.query_cache import get_search_result_cache
+
+        return get_search_result_cache().stats()
+    except Exception:
+        return None
+
+
 @router.get(
     "/health/lancedb",
     response_model=LanceDBHealthResponse,
@@ -1158,6 +1171,7 @@ async def check_lancedb_health(
             table_count=len(tables),
             total_vectors=total_vectors,
             embedding_model=embedding_model,
+            result_cache=_lancedb_result_cache_stats(),
         )
 
     except ImportError:
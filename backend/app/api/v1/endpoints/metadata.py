@@ -487,6 +487,9 @@ async def index_vault_notes(
             max_tokens=chunk_size,
             overlap_tokens=chunk_overlap,
             subject=DEFAULT_GROUP_ID,
+            embed_batch_size=settings.VAULT_INDEX_EMBED_BATCH_SIZE,
+            embed_concurrency=settings.VAULT_INDEX_EMBED_CONCURRENCY,
+            chunk_workers=settings.VAULT_INDEX_CHUNK_WORKERS,
         )
 
         duration_ms = (time.perf_counter() - start_time) * 1000
@@ -500,6 +503,7 @@ async def index_vault_notes(
             "chunk_count": chunk_count,
             "vault_path": vault_path,
             "duration_ms": round(duration_ms, 2),
+            "throughput": lancedb_client.get_stats().get("last_index"),
             "message": f"Indexed {chunk_count} chunks from vault .md files",
         }
 
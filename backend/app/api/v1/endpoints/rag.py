@@ -13,7 +13,7 @@ RAG (Retrieval-Augmented Generation) API Endpoints
 
 import logging
 from datetime import datetime, timezone
-from typing import Annotated, List, Literal, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ConfigDict, Field
@@ -208,6 +208,12 @@ class RAGStatusResponse(BaseModel):
     initialized: bool = Field(..., description="是否已初始化")
     langgraph_available: bool = Field(..., description="LangGraph 是否可用")
     import_error: Optional[str] = Field(None, description="导入错误信息")
+    rerank_scheduler: Optional[Dict[str, Any]] = Field(
+        None, description="Reranker 微批调度指标 (队列深度/批大小/等待时间)"
+    )
+    rerank_score_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Reranker 打分缓存指标 (命中/未命中/失效)"
+    )
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
@@ -417,6 +423,8 @@ async def get_rag_status(
         initialized=status.get("initialized", False),
         langgraph_available=status.get("langgraph_available", False),
         import_error=status.get("import_error"),
+        rerank_scheduler=status.get("rerank_scheduler"),
+        rerank_score_cache=status.get("rerank_score_cache"),
     )
 
 
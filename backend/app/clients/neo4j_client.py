@@ -45,6 +45,8 @@ from tenacity import (
     wait_exponential,
 )
 
+from app.clients.neo4j_fallback_store import FallbackStore
+
 logger = logging.getLogger(__name__)
 
 # Default storage path for JSON fallback mode
@@ -55,6 +57,9 @@ DEFAULT_STORAGE_PATH = (
 # Retryable exceptions for Neo4j operations
 RETRYABLE_EXCEPTIONS = (ServiceUnavailable, SessionExpired, TransientError)
 
+# Rows per UNWIND transaction for the bulk write methods
+DEFAULT_BULK_CHUNK_SIZE = 200
+
 
 class Neo4jClient:
     """
@@ -126,8 +131,8 @@ class Neo4jClient:
         self._last_health_check: Optional[datetime] = None
         self._health_status: bool = False
 
-        # JSON fallback data structure
-        self._data: Dict[str, Any] = {"users": [], "concepts": [], "relationships": []}
+        # JSON fallback data: indexed lists + append-only journal (see neo4j_fallback_store)
+        self._store = FallbackStore(self._storage_path)
 
         # Performance metrics
         self._metrics: Dict[str, Any] = {
@@ -144,6 +149,15 @@ class Neo4jClient:
             f"pool_size={max_connection_pool_size}"
         )
 
+    @property
+    def _data(self) -> Dict[str, Any]:
+        """JSON fallback data (users / concepts / relationships / ... lists)."""
+        return self._store.data
+
+    @_data.setter
+    def _data(self, data: Dict[str, Any]) -> None:
+        self._store.reset(data)
+
     @property
     def enabled(self) -> bool:
         """Check if client is enabled (not using fallback)."""
@@ -278,27 +292,15 @@ class Neo4jClient:
         [Source: docs/stories/30.2.story.md - AC 3]
         """
         try:
-            self._storage_path.parent.mkdir(parents=True, exist_ok=True)
-
-            if self._storage_path.exists():
-                with open(self._storage_path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
+            # Loads snapshot + journal, migrating older JSON files on first load
+            created = self._store.load()
+            if created:
+                logger.info(f"Created new JSON storage file: {self._storage_path}")
+            else:
                 logger.info(
                     f"Loaded {len(self._data.get('relationships', []))} relationships "
                     f"from {self._storage_path}"
                 )
-            else:
-                self._data = {
-                    "users": [],
-                    "concepts": [],
-                    "relationships": [],
-                    "metadata": {
-                        "created_at": datetime.now().isoformat(),
-                        "version": "2.0",  # Story 30.2 version
-                    },
-                }
-                await self._save_json_data()
-                logger.info(f"Created new JSON storage file: {self._storage_path}")
 
             self._initialized = True
             self._health_status = True
@@ -310,10 +312,9 @@ class Neo4jClient:
             return False
 
     async def _save_json_data(self) -> None:
-        """Save data to JSON storage file."""
+        """Persist pending JSON fallback changes (journal append, periodic compaction)."""
         try:
-            with open(self._storage_path, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, ensure_ascii=False, indent=2, default=str)
+            self._store.commit()
         except (OSError, IOError, TypeError) as e:
             logger.error(f"Failed to save JSON data: {e}")
 
@@ -482,6 +483,10 @@ class Neo4jClient:
         """
         logger.debug(f"Running JSON fallback query with params: {params}")
 
+        # Bulk UNWIND writes (record_episodes_bulk etc.) replay row by row
+        if "UNWIND $rows" in query:
+            return await self._handle_unwind_rows(query, params)
+
         # Parse query intent based on keywords
         if "MERGE" in query and "User" in query and "Concept" in query:
             return await self._handle_merge_learning(params)
@@ -494,7 +499,7 @@ class Neo4jClient:
             return []
 
     async def _handle_merge_learning(
-        self, params: Dict[str, Any]
+        self, params: Dict[str, Any], save: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Handle MERGE query for creating learning relationships.
@@ -506,6 +511,7 @@ class Neo4jClient:
 
         Args:
             params: Query parameters (userId, concept, score)
+            save: Persist the JSON file (bulk replays save once per chunk)
 
         Returns:
             List with created/updated relationship
@@ -518,40 +524,32 @@ class Neo4jClient:
         if not user_id or not concept:
             return []
 
+        store = self._store
+
         # Ensure user exists
-        user = next((u for u in self._data["users"] if u["id"] == user_id), None)
-        if not user:
-            user = {"id": user_id, "created_at": datetime.now().isoformat()}
-            self._data["users"].append(user)
+        if store.get("users", user_id) is None:
+            store.put("users", {"id": user_id, "created_at": datetime.now().isoformat()})
 
         # Ensure concept exists
-        concept_node = next(
-            (c for c in self._data["concepts"] if c["name"] == concept), None
-        )
+        concept_node = store.get("concepts", concept)
         if not concept_node:
-            concept_id = f"concept-{len(self._data['concepts']) + 1}"
+            concept_id = store.next_id("concepts", "concept")
             concept_node = {
                 "id": concept_id,
                 "name": concept,
                 "created_at": datetime.now().isoformat(),
                 "group_id": group_id,
             }
-            self._data["concepts"].append(concept_node)
+            store.put("concepts", concept_node)
         elif group_id:
             concept_node["group_id"] = group_id
+            store.put("concepts", concept_node)
 
         # Create or update relationship
         now = datetime.now()
         next_review = now + timedelta(days=1)
 
-        rel = next(
-            (
-                r
-                for r in self._data["relationships"]
-                if r["user_id"] == user_id and r["concept_name"] == concept
-            ),
-            None,
-        )
+        rel = store.relationship(user_id, concept)
 
         if rel:
             # Update existing relationship
@@ -561,10 +559,11 @@ class Neo4jClient:
             rel["review_count"] = rel.get("review_count", 0) + 1
             if group_id:
                 rel["group_id"] = group_id
+            store.put("relationships", rel)
         else:
             # Create new relationship
             rel = {
-                "id": f"learned-{len(self._data['relationships']) + 1}",
+                "id": store.next_id("relationships", "learned"),
                 "user_id": user_id,
                 "concept_id": concept_node["id"],
                 "concept_name": concept,
@@ -574,9 +573,10 @@ class Neo4jClient:
                 "review_count": 1,
                 "group_id": group_id,
             }
-            self._data["relationships"].append(rel)
+            store.put("relationships", rel)
 
-        await self._save_json_data()
+        if save:
+            await self._save_json_data()
 
         logger.info(
             f"Created learning relationship: {user_id} -> {concept} (score={score})"
@@ -610,38 +610,22 @@ class Neo4jClient:
         now = datetime.now()
         results = []
 
-        for rel in self._data.get("relationships", []):
-            if rel["user_id"] != user_id:
-                continue
-
-            # Check if due for review
-            next_review_str = rel.get("next_review")
-            if next_review_str:
-                try:
-                    next_review = datetime.fromisoformat(next_review_str)
-                    if next_review < now:
-                        concept = next(
-                            (
-                                c
-                                for c in self._data["concepts"]
-                                if c["name"] == rel["concept_name"]
-                            ),
-                            {
-                                "id": rel.get("concept_id", ""),
-                                "name": rel["concept_name"],
-                            },
-                        )
-                        results.append(
-                            {
-                                "concept": rel["concept_name"],
-                                "concept_id": concept.get("id", ""),
-                                "last_score": rel.get("last_score"),
-                                "review_count": rel.get("review_count", 0),
-                                "due_date": next_review.isoformat(),
-                            }
-                        )
-                except (ValueError, TypeError):
-                    continue
+        # next_review index: the user's due relationships, oldest first
+        for rel in self._store.due_relationships(user_id, now):
+            next_review = datetime.fromisoformat(str(rel["next_review"]))
+            concept = self._store.get("concepts", rel["concept_name"]) or {
+                "id": rel.get("concept_id", ""),
+                "name": rel["concept_name"],
+            }
+            results.append(
+                {
+                    "concept": rel["concept_name"],
+                    "concept_id": concept.get("id", ""),
+                    "last_score": rel.get("last_score"),
+                    "review_count": rel.get("review_count", 0),
+                    "due_date": next_review.isoformat(),
+                }
+            )
 
         # Sort by due date (oldest first)
         results.sort(key=lambda x: x.get("due_date", ""))
@@ -665,9 +649,12 @@ class Neo4jClient:
 
         results = []
 
-        for rel in self._data.get("relationships", []):
-            if user_id and rel["user_id"] != user_id:
-                continue
+        relationships = (
+            self._store.user_relationships(user_id)
+            if user_id
+            else self._data.get("relationships", [])
+        )
+        for rel in relationships:
             if concept_id and rel.get("concept_id") != concept_id:
                 continue
 
@@ -687,6 +674,51 @@ class Neo4jClient:
 
         return results
 
+    async def _handle_unwind_rows(
+        self, query: str, params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Replay a bulk UNWIND write against JSON storage, one row at a time.
+
+        Mirrors the single-row fallbacks: LEARNED rows go through
+        _handle_merge_learning, SCORED rows are appended to score_history.
+        Edge rows have no JSON representation (same as create_edge_relationship).
+        The file is saved once for the whole chunk.
+
+        Args:
+            query: UNWIND Cypher query (used to pick the row handler)
+            params: {"rows": [...]} with the same keys as the single-row queries
+
+        Returns:
+            [{"idx": ...}] for every row written
+        """
+        rows = params.get("rows") or []
+        written: List[Dict[str, Any]] = []
+
+        if "LEARNED" in query and "User" in query:
+            for row in rows:
+                if await self._handle_merge_learning(row, save=False):
+                    written.append({"idx": row.get("idx")})
+        elif "SCORED" in query:
+            for row in rows:
+                self._store.append(
+                    "score_history",
+                    {
+                        "concept_id": row.get("conceptId"),
+                        "canvas_name": row.get("canvasPath"),
+                        "score": row.get("score"),
+                        "timestamp": row.get("timestamp"),
+                    },
+                )
+                written.append({"idx": row.get("idx")})
+        else:
+            logger.warning(f"Unhandled bulk query pattern: {query[:100]}")
+            return []
+
+        if written:
+            await self._save_json_data()
+        return written
+
     async def create_learning_relationship(
         self,
         user_id: str,
@@ -742,9 +774,17 @@ class Neo4jClient:
         Returns:
             True if successful
         """
-        user_id = data.get("user_id", "unknown")
-        concept = data.get("concept", "unknown")
-        score = data.get("score")
+        params = self._episode_params(data)
+        return await self.create_learning_relationship(
+            user_id=params["userId"],
+            concept=params["concept"],
+            score=params["score"],
+            group_id=params["groupId"],
+        )
+
+    @staticmethod
+    def _episode_params(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Query parameters of a learning episode (group_id inferred from canvas_path)."""
         group_id = data.get("group_id")
 
         # Infer group_id from canvas_path if not provided
@@ -757,12 +797,12 @@ class Neo4jClient:
             subject = extract_subject_from_canvas_path(data["canvas_path"])
             group_id = build_group_id(subject)
 
-        return await self.create_learning_relationship(
-            user_id=user_id,
-            concept=concept,
-            score=score,
-            group_id=group_id,
-        )
+        return {
+            "userId": data.get("user_id", "unknown"),
+            "concept": data.get("concept", "unknown"),
+            "score": data.get("score"),
+            "groupId": group_id,
+        }
 
     async def get_review_suggestions(
         self, user_id: str, limit: int = 10, group_id: Optional[str] = None
@@ -940,11 +980,7 @@ class Neo4jClient:
         """
         results = []
 
-        for rel in self._data.get("relationships", []):
-            # Filter by user_id
-            if rel.get("user_id") != user_id:
-                continue
-
+        for rel in self._store.user_relationships(user_id):
             # Filter by date range
             rel_timestamp = rel.get("timestamp")
             if rel_timestamp:
@@ -1167,16 +1203,11 @@ class Neo4jClient:
                 if score is not None and timestamp:
                     results.append({"score": score, "timestamp": timestamp})
 
-        # Also check score_history array if exists (extended storage)
-        score_history = self._data.get("score_history", [])
-        for record in score_history:
-            if (
-                record.get("concept_id") == concept_id
-                or record.get("node_id") == concept_id
-            ):
-                results.append(
-                    {"score": record.get("score"), "timestamp": record.get("timestamp")}
-                )
+        # Also check score_history array if exists (extended storage), indexed by concept_id / node_id
+        for record in self._store.score_history(concept_id):
+            results.append(
+                {"score": record.get("score"), "timestamp": record.get("timestamp")}
+            )
 
         # Sort by timestamp (oldest first) and limit
         results.sort(key=lambda x: x.get("timestamp", ""))
@@ -1209,16 +1240,14 @@ class Neo4jClient:
 
         if self._use_json_fallback:
             # Store in score_history array
-            if "score_history" not in self._data:
-                self._data["score_history"] = []
-
-            self._data["score_history"].append(
+            self._store.append(
+                "score_history",
                 {
                     "concept_id": concept_id,
                     "canvas_name": canvas_name,
                     "score": score,
                     "timestamp": ts,
-                }
+                },
             )
 
             # Keep only last 100 records per concept to avoid unbounded growth
@@ -1249,6 +1278,184 @@ class Neo4jClient:
         )
         return len(results) > 0
 
+    # =========================================================================
+    # Bulk Write Methods (UNWIND)
+    # One transaction per chunk of rows instead of one session per row;
+    # failures are reported per input row as {"index", "error"}.
+    # =========================================================================
+
+    async def record_episodes_bulk(
+        self, episodes: List[Dict[str, Any]], chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Record many learning episodes (same payload as record_episode).
+
+        Args:
+            episodes: record_episode payload dicts
+            chunk_size: Rows per UNWIND transaction (default 200)
+
+        Returns:
+            Errors as [{"index": i, "error": str}], index into ``episodes``;
+            empty when every episode was written
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (u:User {id: row.userId})
+        MERGE (c:Concept {name: row.concept})
+        SET c.group_id = row.groupId
+        MERGE (u)-[r:LEARNED]->(c)
+        SET r.timestamp = datetime(),
+            r.score = row.score,
+            r.group_id = row.groupId,
+            r.next_review = datetime() + duration('P1D'),
+            r.review_count = coalesce(r.review_count, 0) + 1
+        RETURN row.idx AS idx
+        """
+        rows = [self._episode_params(data) for data in episodes]
+        return await self._run_unwind(query, rows, chunk_size)
+
+    async def record_score_history_bulk(
+        self, records: List[Dict[str, Any]], chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Record many scores to history (same fields as record_score_history).
+
+        Args:
+            records: Dicts with concept_id, canvas_name, score, optional timestamp
+            chunk_size: Rows per UNWIND transaction (default 200)
+
+        Returns:
+            Errors as [{"index": i, "error": str}], index into ``records``
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (n:Node {id: row.conceptId})
+        MERGE (c:Canvas {path: row.canvasPath})
+        MERGE (c)-[:CONTAINS_NODE]->(n)
+        CREATE (e:Episode {
+            id: randomUUID(),
+            type: 'scoring',
+            timestamp: datetime(row.timestamp)
+        })
+        CREATE (e)-[:SCORED {
+            score: row.score,
+            timestamp: datetime(row.timestamp)
+        }]->(n)
+        RETURN row.idx AS idx
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            {
+                "conceptId": record["concept_id"],
+                "canvasPath": record["canvas_name"],
+                "score": record["score"],
+                "timestamp": record.get("timestamp") or now,
+            }
+            for record in records
+        ]
+        return await self._run_unwind(query, rows, chunk_size)
+
+    async def create_edge_relationships_bulk(
+        self, edges: List[Dict[str, Any]], chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many CONNECTS_TO edges (same fields as create_edge_relationship).
+
+        Args:
+            edges: Dicts with canvas_path, edge_id, from_node_id, to_node_id,
+                   optional edge_label
+            chunk_size: Rows per UNWIND transaction (default 200)
+
+        Returns:
+            Errors as [{"index": i, "error": str}], index into ``edges``
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Canvas {path: row.canvasPath})
+        MERGE (from:Node {id: row.fromNodeId})
+        MERGE (to:Node {id: row.toNodeId})
+        MERGE (from)-[r:CONNECTS_TO {edge_id: row.edgeId}]->(to)
+        SET r.label = row.edgeLabel,
+            r.created_at = coalesce(r.created_at, datetime())
+        RETURN row.idx AS idx
+        """
+        rows = [
+            {
+                "canvasPath": edge["canvas_path"],
+                "edgeId": edge["edge_id"],
+                "fromNodeId": edge["from_node_id"],
+                "toNodeId": edge["to_node_id"],
+                "edgeLabel": edge.get("edge_label") or "",
+            }
+            for edge in edges
+        ]
+        return await self._run_unwind(query, rows, chunk_size)
+
+    async def _run_unwind(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run an ``UNWIND $rows AS row ... RETURN row.idx AS idx`` query in chunks.
+
+        Each chunk is one auto-commit transaction. A row whose idx is not
+        returned was not written. When a chunk fails with a Cypher error the
+        transaction is rolled back and its rows are retried one per
+        transaction, so only the offending rows are reported; any other error
+        (driver / connection / OS / timeout) fails the whole chunk.
+
+        Returns:
+            Errors as [{"index": i, "error": str}], sorted by index
+        """
+        size = max(1, chunk_size or DEFAULT_BULK_CHUNK_SIZE)
+        errors: List[Dict[str, Any]] = []
+
+        for start in range(0, len(rows), size):
+            chunk = [
+                dict(row, idx=start + offset)
+                for offset, row in enumerate(rows[start : start + size])
+            ]
+            try:
+                written = await self.run_query(query, rows=chunk)
+            except Neo4jError as e:
+                if len(chunk) == 1:
+                    errors.append({"index": chunk[0]["idx"], "error": str(e)})
+                    continue
+                logger.warning(
+                    f"Bulk write chunk of {len(chunk)} rows failed, isolating rows: {e}"
+                )
+                errors.extend(await self._run_unwind_rows(query, chunk))
+                continue
+            except Exception as e:
+                errors.extend({"index": row["idx"], "error": str(e)} for row in chunk)
+                continue
+
+            done = {record.get("idx") for record in written}
+            errors.extend(
+                {"index": row["idx"], "error": "row not written"}
+                for row in chunk
+                if row["idx"] not in done
+            )
+
+        return errors
+
+    async def _run_unwind_rows(
+        self, query: str, chunk: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Retry a failed bulk chunk one row per transaction."""
+        errors: List[Dict[str, Any]] = []
+        for row in chunk:
+            try:
+                written = await self.run_query(query, rows=[row])
+            except Exception as e:
+                errors.append({"index": row["idx"], "error": str(e)})
+                continue
+            if not written:
+                errors.append({"index": row["idx"], "error": "row not written"})
+        return errors
+
     # =========================================================================
     # Canvas Association CRUD Methods
     # Story 36.5: 跨Canvas讲座关联持久化
@@ -1367,19 +1574,8 @@ class Neo4jClient:
 
         [Source: docs/stories/36.5.story.md#Task-1.1]
         """
-        # Initialize canvas_associations list if not exists
-        if "canvas_associations" not in self._data:
-            self._data["canvas_associations"] = []
-
         # Check for existing association with same ID
-        existing = next(
-            (
-                a
-                for a in self._data["canvas_associations"]
-                if a.get("association_id") == association_id
-            ),
-            None,
-        )
+        existing = self._store.get("canvas_associations", association_id)
 
         now = datetime.now().isoformat()
 
@@ -1393,6 +1589,7 @@ class Neo4jClient:
             existing["updated_at"] = now
             if metadata:
                 existing["metadata"] = metadata
+            self._store.put("canvas_associations", existing)
         else:
             # Create new
             association = {
@@ -1409,7 +1606,7 @@ class Neo4jClient:
             }
             if metadata:
                 association["metadata"] = metadata
-            self._data["canvas_associations"].append(association)
+            self._store.put("canvas_associations", association)
 
         await self._save_json_data()
 
@@ -1600,14 +1797,7 @@ class Neo4jClient:
 
         [Source: docs/stories/36.5.story.md#Task-1.3]
         """
-        associations = self._data.get("canvas_associations", [])
-        original_count = len(associations)
-
-        self._data["canvas_associations"] = [
-            a for a in associations if a.get("association_id") != association_id
-        ]
-
-        if len(self._data["canvas_associations"]) < original_count:
+        if self._store.delete("canvas_associations", association_id):
             await self._save_json_data()
             logger.info(f"Deleted canvas association (JSON): {association_id}")
             return True
@@ -1713,30 +1903,29 @@ class Neo4jClient:
 
         [Source: docs/stories/36.5.story.md#Task-1.4]
         """
-        associations = self._data.get("canvas_associations", [])
+        assoc = self._store.get("canvas_associations", association_id)
+        if assoc is None:
+            logger.warning(f"Canvas association not found (JSON): {association_id}")
+            return False
 
-        for assoc in associations:
-            if assoc.get("association_id") == association_id:
-                # Update provided fields
-                if association_type is not None:
-                    assoc["association_type"] = association_type
-                if confidence is not None:
-                    assoc["confidence"] = confidence
-                if shared_concepts is not None:
-                    assoc["shared_concepts"] = shared_concepts
-                if bidirectional is not None:
-                    assoc["bidirectional"] = bidirectional
-                if metadata is not None:
-                    assoc["metadata"] = metadata
-
-                assoc["updated_at"] = datetime.now().isoformat()
-
-                await self._save_json_data()
-                logger.info(f"Updated canvas association (JSON): {association_id}")
-                return True
+        # Update provided fields
+        if association_type is not None:
+            assoc["association_type"] = association_type
+        if confidence is not None:
+            assoc["confidence"] = confidence
+        if shared_concepts is not None:
+            assoc["shared_concepts"] = shared_concepts
+        if bidirectional is not None:
+            assoc["bidirectional"] = bidirectional
+        if metadata is not None:
+            assoc["metadata"] = metadata
 
-        logger.warning(f"Canvas association not found (JSON): {association_id}")
-        return False
+        assoc["updated_at"] = datetime.now().isoformat()
+        self._store.put("canvas_associations", assoc)
+
+        await self._save_json_data()
+        logger.info(f"Updated canvas association (JSON): {association_id}")
+        return True
 
     async def load_all_canvas_associations(self) -> List[Dict[str, Any]]:
         """
@@ -1955,6 +2144,13 @@ class Neo4jClient:
         logger.debug(f"Neo4jClient cleanup: {self.stats}")
         if self._driver and not self._use_json_fallback:
             await self._close_driver()
+        if self._use_json_fallback and self._initialized:
+            # Fold the journal into the snapshot so the next start loads a single file
+            try:
+                self._store.commit()
+                self._store.compact()
+            except (OSError, IOError, TypeError) as e:
+                logger.error(f"Failed to compact JSON data: {e}")
         self._initialized = False
 
 
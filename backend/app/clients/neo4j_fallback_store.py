@@ -0,0 +1,400 @@
+"""
+Indexed, journaled storage for the Neo4jClient JSON fallback mode.
+
+The fallback used to keep plain lists in ``Neo4jClient._data``, find
+users / concepts / relationships with linear scans and rewrite the whole
+JSON file (``indent=2``) after every write — slowest exactly when Neo4j is
+down and the file has grown. FallbackStore keeps the same ``data`` shape
+(lists of dicts, so existing readers are unchanged) and adds:
+
+- hash indexes: users by id, concepts by name, relationships by id and by
+  (user_id, concept_name), canvas associations by id, score history by
+  concept_id
+- next_review ordering per user (review suggestions are a bisect, not a scan)
+- durable, incremental writes: changed documents are appended to a JSONL
+  journal per commit; once the journal passes ``compact_threshold`` entries
+  it is folded into the snapshot (file handling in app.utils.snapshot_journal)
+- migration on load: existing JSON files (version 2.0 and earlier) are read
+  as the snapshot and rewritten in the current format
+
+New users / concepts / relationships get ``next_id()`` ids ("learned-7"),
+numbered above every existing id, so a gap left by a delete never makes a new
+relationship reuse (and replace) another one. Files written before that with
+duplicate relationship ids are re-keyed on load.
+
+Documents are mutated in place by the callers and re-registered with
+``put()``; the journal records the full document, so replay is idempotent.
+Collection lists replaced or resized directly (``client._data[...] = ...``)
+are detected on the next lookup and re-indexed.
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import bisect
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.snapshot_journal import DEFAULT_COMPACT_THRESHOLD, SnapshotJournal
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = "3.0"
+
+# Keyed collections → key field; score_history is append-only
+COLLECTION_KEYS = {
+    "users": "id",
+    "concepts": "name",
+    "relationships": "id",
+    "canvas_associations": "association_id",
+}
+
+
+def _empty_data() -> Dict[str, Any]:
+    return {
+        "users": [],
+        "concepts": [],
+        "relationships": [],
+        "metadata": {
+            "created_at": datetime.now().isoformat(),
+            "version": STORE_VERSION,
+        },
+    }
+
+
+def _id_number(value: Any, prefix: str) -> int:
+    """n of a "<prefix>-<n>" id, 0 for any other id."""
+    if isinstance(value, str) and value.startswith(prefix + "-"):
+        suffix = value[len(prefix) + 1 :]
+        if suffix.isdigit():
+            return int(suffix)
+    return 0
+
+
+def _due_key(rel: Dict[str, Any]) -> Optional[datetime]:
+    """next_review as a naive datetime (None if missing, unparsable or tz-aware)."""
+    value = rel.get("next_review")
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except (ValueError, TypeError):
+        return None
+    return parsed if parsed.tzinfo is None else None
+
+
+class FallbackStore:
+    """In-memory fallback graph data with hash indexes and a write-ahead journal."""
+
+    def __init__(self, path: Path, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        self._files = SnapshotJournal(path, compact_threshold)
+        self.path = self._files.path
+        self.journal_path = self._files.journal_path
+        self.compact_threshold = compact_threshold
+        self.data: Dict[str, Any] = {"users": [], "concepts": [], "relationships": []}
+        self._pending: List[Dict[str, Any]] = []
+        # Sequence of the last journal entry; the snapshot records the one it includes
+        self._seq = 0
+        self._needs_compact = False
+        self._rebuild_indexes()
+
+    # ── persistence ──
+
+    def load(self, compact: bool = True) -> bool:
+        """
+        Load snapshot + journal (migrating older JSON files).
+
+        Args:
+            compact: Rewrite the snapshot when the file is new, migrated, has a
+                torn journal or a long journal. False only reads (offline tools).
+
+        Returns:
+            True if a new store file was created
+
+        Raises:
+            json.JSONDecodeError / OSError if the snapshot cannot be read
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        snapshot = self._files.read_snapshot()
+        created = snapshot is None
+        self.data = _empty_data() if created else snapshot
+
+        metadata = self.data.setdefault("metadata", {})
+        self._seq = int(metadata.get("journal_seq", 0) or 0)
+        positions: Dict[str, Dict[Any, int]] = {}
+        replayed, torn = self._files.replay(lambda op: self._replay(op, positions))
+        self._rebuild_indexes()
+        rekeyed = self._rekey_duplicate_ids("relationships", "learned")
+
+        migrated = not created and metadata.get("version") != STORE_VERSION
+        if migrated:
+            logger.info(
+                f"Migrating fallback store {self.path} "
+                f"from version {metadata.get('version', 'unversioned')} to {STORE_VERSION}"
+            )
+            metadata["migrated_from"] = metadata.get("version")
+            metadata["version"] = STORE_VERSION
+        if compact and (created or migrated or torn or rekeyed or self._files.should_compact):
+            self.compact()
+        return created
+
+    def _rekey_duplicate_ids(self, coll: str, prefix: str) -> int:
+        """Give fresh ids to documents sharing an id with an earlier one; returns how many."""
+        seen = set()
+        rekeyed = 0
+        for doc in self.data.get(coll, []) or []:
+            doc_id = doc.get("id")
+            if doc_id is None:
+                continue
+            if doc_id in seen:
+                doc["id"] = self.next_id(coll, prefix)
+                logger.warning(f"Re-keyed duplicate {coll} id {doc_id} as {doc['id']} in {self.path}")
+                rekeyed += 1
+            seen.add(doc["id"])
+        if rekeyed:
+            self._rebuild_indexes()
+        return rekeyed
+
+    def _replay(self, op: Dict[str, Any], positions: Dict[str, Dict[Any, int]]) -> bool:
+        """Apply a journal entry newer than the snapshot; False if it was skipped."""
+        # Entries already folded into the snapshot (crash before the journal was removed)
+        if op.get("s", 0) <= self._seq:
+            return False
+        self._apply(op, positions)
+        self._seq = op["s"]
+        return True
+
+    def _apply(self, op: Dict[str, Any], positions: Dict[str, Dict[Any, int]]) -> None:
+        """Apply a journal entry to ``data`` (indexes are rebuilt after replay)."""
+        coll = op.get("c")
+        items = self.data.setdefault(coll, [])
+        if op.get("op") == "append":
+            items.append(op["doc"])
+            return
+        key_field = COLLECTION_KEYS[coll]
+        if coll not in positions:
+            positions[coll] = {d.get(key_field): i for i, d in enumerate(items)}
+        by_key = positions[coll]
+        if op.get("op") == "put":
+            key = op["doc"][key_field]
+            if key in by_key:
+                items[by_key[key]] = op["doc"]
+            else:
+                by_key[key] = len(items)
+                items.append(op["doc"])
+        elif op.get("key") in by_key:
+            del items[by_key[op["key"]]]
+            del positions[coll]
+
+    def commit(self) -> int:
+        """Append pending changes to the journal (fsync); compact when it grows too long."""
+        if self._needs_compact:
+            written = len(self._pending)
+            self.compact()
+            return written
+        written = self._files.append(self._pending)
+        self._pending.clear()
+        if self._files.should_compact:
+            self.compact()
+        return written
+
+    def compact(self) -> None:
+        """Write the full snapshot atomically and truncate the journal."""
+        self.data.setdefault("metadata", {})["journal_seq"] = self._seq
+        self._files.write_snapshot(self.data)
+        self._pending.clear()
+        self._needs_compact = False
+
+    def reset(self, data: Dict[str, Any]) -> None:
+        """Replace the in-memory data; the next commit() rewrites the snapshot."""
+        self.data = data
+        self._pending.clear()
+        self._needs_compact = True
+        self._rebuild_indexes()
+
+    # ── indexes ──
+
+    def _ensure_indexes(self) -> None:
+        """Re-index if a collection list was replaced or resized outside put()/append()/delete()."""
+        for coll, (items, size) in self._indexed_lists.items():
+            current = self.data.get(coll)
+            if current is not items or len(current or ()) != size:
+                self._rebuild_indexes()
+                return
+
+    def _track(self, coll: str) -> None:
+        items = self.data.get(coll)
+        self._indexed_lists[coll] = (items, len(items or ()))
+
+    def _rebuild_indexes(self) -> None:
+        # collection → (list object, length) the indexes were built from
+        self._indexed_lists: Dict[str, Tuple[Any, int]] = {}
+        self._by_key: Dict[str, Dict[Any, Dict[str, Any]]] = {coll: {} for coll in COLLECTION_KEYS}
+        self._rel_by_pair: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self._rels_by_user: Dict[Any, List[Dict[str, Any]]] = {}
+        # Indexed relationship documents by object id (relationships may lack an "id")
+        self._rel_docs: Dict[int, Dict[str, Any]] = {}
+        # user_id → sorted [(next_review, id(rel))]
+        self._due: Dict[Any, List[Tuple[datetime, int]]] = {}
+        self._due_entry: Dict[int, Tuple[Any, Tuple[datetime, int]]] = {}
+        self._scores_by_concept: Dict[Any, List[Dict[str, Any]]] = {}
+        # (collection, id prefix) → highest "<prefix>-<n>" number handed out
+        self._id_counters: Dict[Tuple[str, str], int] = {}
+        for coll in COLLECTION_KEYS:
+            for doc in self.data.get(coll, []) or []:
+                self._index(coll, doc)
+        for record in self.data.get("score_history", []) or []:
+            self._index_score(record)
+        for coll in (*COLLECTION_KEYS, "score_history"):
+            self._track(coll)
+
+    def _index_score(self, record: Dict[str, Any]) -> None:
+        for key in {record.get("concept_id"), record.get("node_id")} - {None}:
+            self._scores_by_concept.setdefault(key, []).append(record)
+
+    def _index(self, coll: str, doc: Dict[str, Any]) -> None:
+        key = doc.get(COLLECTION_KEYS[coll])
+        if key is not None:
+            self._by_key[coll][key] = doc
+        if coll != "relationships":
+            return
+        if id(doc) not in self._rel_docs:
+            self._rel_docs[id(doc)] = doc
+            self._rels_by_user.setdefault(doc.get("user_id"), []).append(doc)
+        # First relationship per pair wins, as the old next(...) scans did
+        self._rel_by_pair.setdefault((doc.get("user_id"), doc.get("concept_name")), doc)
+        self._index_due(doc)
+
+    def _drop_due(self, rel: Dict[str, Any]) -> None:
+        entry = self._due_entry.pop(id(rel), None)
+        if entry is None:
+            return
+        user_id, key = entry
+        due = self._due.get(user_id, [])
+        position = bisect.bisect_left(due, key)
+        if position < len(due) and due[position] == key:
+            del due[position]
+
+    def _index_due(self, rel: Dict[str, Any]) -> None:
+        self._drop_due(rel)
+        due_at = _due_key(rel)
+        if due_at is None:
+            return
+        key = (due_at, id(rel))
+        bisect.insort(self._due.setdefault(rel.get("user_id"), []), key)
+        self._due_entry[id(rel)] = (rel.get("user_id"), key)
+
+    # ── lookups ──
+
+    def get(self, coll: str, key: Any) -> Optional[Dict[str, Any]]:
+        self._ensure_indexes()
+        return self._by_key[coll].get(key)
+
+    def relationship(self, user_id: Any, concept_name: Any) -> Optional[Dict[str, Any]]:
+        self._ensure_indexes()
+        return self._rel_by_pair.get((user_id, concept_name))
+
+    def user_relationships(self, user_id: Any) -> List[Dict[str, Any]]:
+        self._ensure_indexes()
+        return list(self._rels_by_user.get(user_id, ()))
+
+    def due_relationships(self, user_id: Any, now: datetime) -> List[Dict[str, Any]]:
+        """User's relationships with next_review < now, oldest due first."""
+        self._ensure_indexes()
+        due = self._due.get(user_id, [])
+        end = bisect.bisect_left(due, (now,))
+        return [self._rel_docs[rel_key] for _, rel_key in due[:end]]
+
+    def score_history(self, concept_id: Any) -> List[Dict[str, Any]]:
+        """score_history records whose concept_id or node_id is ``concept_id``."""
+        self._ensure_indexes()
+        return list(self._scores_by_concept.get(concept_id, ()))
+
+    # ── writes ──
+
+    def next_id(self, coll: str, prefix: str) -> str:
+        """New "<prefix>-<n>" id numbered above every "id" in ``coll``."""
+        self._ensure_indexes()
+        key = (coll, prefix)
+        if key not in self._id_counters:
+            self._id_counters[key] = max(
+                (_id_number(doc.get("id"), prefix) for doc in self.data.get(coll, []) or []),
+                default=0,
+            )
+        self._id_counters[key] += 1
+        return f"{prefix}-{self._id_counters[key]}"
+
+    def put(self, coll: str, doc: Dict[str, Any]) -> None:
+        """Insert or re-register (after in-place changes) a keyed document."""
+        self._ensure_indexes()
+        key = doc.get(COLLECTION_KEYS[coll])
+        items = self.data.setdefault(coll, [])
+        if key is None:
+            # Legacy document without a key: cannot be journaled, next commit compacts
+            if not any(d is doc for d in items):
+                items.append(doc)
+            self._index(coll, doc)
+            self._track(coll)
+            self._needs_compact = True
+            return
+        existing = self._by_key[coll].get(key)
+        if existing is None:
+            items.append(doc)
+        elif existing is not doc:
+            items[items.index(existing)] = doc
+            self._unindex_relationship(coll, existing)
+        self._index(coll, doc)
+        self._track(coll)
+        self._log({"op": "put", "c": coll, "doc": doc})
+
+    def append(self, coll: str, doc: Dict[str, Any]) -> None:
+        """Append to an unkeyed, append-only collection (score_history)."""
+        self._ensure_indexes()
+        self.data.setdefault(coll, []).append(doc)
+        if coll == "score_history":
+            self._index_score(doc)
+            self._track(coll)
+        self._log({"op": "append", "c": coll, "doc": doc})
+
+    def delete(self, coll: str, key: Any) -> bool:
+        self._ensure_indexes()
+        doc = self._by_key[coll].pop(key, None)
+        if doc is None:
+            return False
+        items = self.data.get(coll, [])
+        items[:] = [d for d in items if d is not doc]
+        self._unindex_relationship(coll, doc)
+        self._track(coll)
+        self._log({"op": "del", "c": coll, "key": key})
+        return True
+
+    def _log(self, op: Dict[str, Any]) -> None:
+        self._seq += 1
+        op["s"] = self._seq
+        self._pending.append(op)
+
+    def _unindex_relationship(self, coll: str, doc: Dict[str, Any]) -> None:
+        if coll != "relationships":
+            return
+        self._rel_docs.pop(id(doc), None)
+        user_rels = self._rels_by_user.get(doc.get("user_id"), [])
+        user_rels[:] = [r for r in user_rels if r is not doc]
+        self._drop_due(doc)
+        pair = (doc.get("user_id"), doc.get("concept_name"))
+        if self._rel_by_pair.get(pair) is doc:
+            del self._rel_by_pair[pair]
+            for rel in user_rels:
+                if rel.get("concept_name") == pair[1]:
+                    self._rel_by_pair[pair] = rel
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": STORE_VERSION,
+            "journal_entries": self._files.entries,
+            "pending": len(self._pending),
+            "relationships": len(self.data.get("relationships", []) or []),
+            "indexed_pairs": len(self._rel_by_pair),
+        }
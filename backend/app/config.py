@@ -419,6 +419,12 @@ class Settings(BaseSettings):
         description="Max concurrent Neo4j writes during batch processing. Story 30.11 AC-30.11.3",
     )
 
+    BATCH_NEO4J_CHUNK_SIZE: int = Field(
+        default=200,
+        ge=1,
+        description="Rows per UNWIND transaction for bulk Neo4j writes (record_episodes_bulk etc.)",
+    )
+
     # ═══════════════════════════════════════════════════════════════════════════
     # Graphiti JSON Dual-Write Settings (Story 36.9)
     # [Source: docs/stories/36.9.story.md - AC-36.9.5]
@@ -505,6 +511,21 @@ class Settings(BaseSettings):
         description="Overlap characters between chunks for .md note segmentation.",
     )
 
+    VAULT_INDEX_EMBED_BATCH_SIZE: int = Field(
+        default=64,
+        description="Chunks per cross-file embedding batch in the vault indexing pipeline.",
+    )
+
+    VAULT_INDEX_EMBED_CONCURRENCY: int = Field(
+        default=2,
+        description="Max embedding batches in flight during vault indexing.",
+    )
+
+    VAULT_INDEX_CHUNK_WORKERS: int = Field(
+        default=4,
+        description="Process pool size for Markdown chunking during vault indexing (<=1 = thread).",
+    )
+
     # ═══════════════════════════════════════════════════════════════════════════
     # FSRS Spaced Repetition Settings (Story 32.2)
     # ═══════════════════════════════════════════════════════════════════════════
@@ -519,6 +540,18 @@ class Settings(BaseSettings):
         description="FSRS target retention rate (0.0 to 1.0). Higher = more frequent reviews. Story 32.2.",
     )
 
+    FSRS_CARD_STATE_GROUP_COMMIT_MS: int = Field(
+        default=10,
+        description="Window (ms) in which card state saves share one journal append.",
+        ge=0,
+    )
+
+    FSRS_CARD_STATE_COMPACT_THRESHOLD: int = Field(
+        default=1000,
+        description="Card state journal entries before it is compacted into fsrs_card_states.json.",
+        ge=1,
+    )
+
     # ═══════════════════════════════════════════════════════════════════════════
     # Memory Retry Settings (Story 36.13 AC-2)
     # ═══════════════════════════════════════════════════════════════════════════
@@ -535,6 +568,31 @@ class Settings(BaseSettings):
         ge=0.0,
     )
 
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Memory Search Deadlines (search_memories tiers run concurrently)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    MEMORY_SEARCH_DEADLINE_MS: int = Field(
+        default=3500,
+        description="Overall deadline in ms for search_memories; tiers still running are cancelled.",
+        ge=1,
+    )
+
+    MEMORY_SEARCH_GRAPHITI_BUDGET_MS: int = Field(
+        default=3000,
+        description="Budget in ms for the Graphiti tier (tier 1) of search_memories.",
+        ge=1,
+    )
+
+    MEMORY_SEARCH_NEO4J_BUDGET_MS: int = Field(
+        default=2000,
+        description=(
+            "Budget in ms for the Neo4j fulltext tier (tier 2) of search_memories. "
+            "Matches the 2.0s wait_for the memory search paths already use."
+        ),
+        ge=1,
+    )
+
     # ═══════════════════════════════════════════════════════════════════════════
     # TTLCache Configuration (Story 36.13 AC-3,4,5)
     # ═══════════════════════════════════════════════════════════════════════════
@@ -13,6 +13,7 @@ Usage:
     uvicorn app.main:app --reload
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -101,6 +102,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"CORS origins: {settings.cors_origins_list}")
     logger.info(f"API prefix: {settings.API_V1_PREFIX}")
 
+    # Warm up the jieba dictionary in the background so the first hybrid
+    # search does not pay the 1-2s lazy dictionary load.
+    jieba_warmup_task = None
+    try:
+        from agentic_rag.clients.tokenization import get_jieba_tokenizer
+
+        jieba_warmup_task = asyncio.create_task(
+            get_jieba_tokenizer().warm_up_async()
+        )
+    except Exception as e:
+        logger.warning(f"jieba warm-up not started (non-fatal): {e}")
+
     # ✅ Verified from Story 17.2 AC-4: Start resource monitoring (≤5s interval)
     # [Source: docs/architecture/performance-monitoring-architecture.md:281-320]
     resource_monitor = get_default_monitor()
@@ -350,6 +363,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"LanceDB index service cleanup failed: {e}")
 
+    if jieba_warmup_task is not None and not jieba_warmup_task.done():
+        jieba_warmup_task.cancel()
+
+    # Close the shared pooled Ollama embedding session(s)
+    try:
+        from agentic_rag.clients.ollama_embed_client import close_ollama_embed_clients
+
+        await close_ollama_embed_clients()
+        logger.info("Ollama embedding connection pool closed")
+    except Exception as e:
+        logger.warning(f"Ollama embedding pool cleanup failed: {e}")
+
     # ✅ Story 7.2: Cleanup LLM logging infrastructure
     try:
         await llm_call_logger.stop()
@@ -15,7 +15,7 @@ Story 22.4 Implementation:
 """
 
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -265,6 +265,33 @@ class MemoryLayersStatus(BaseModel):
     semantic: LayerHealthStatus = Field(..., description="Semantic层状态")
 
 
+class SearchTierReport(BaseModel):
+    """Timing of one search_memories tier."""
+
+    results: int = Field(..., description="该层合并的结果数")
+    elapsed_ms: float = Field(..., description="该层耗时(ms)")
+    timed_out: bool = Field(..., description="是否超出预算/截止时间")
+    error: Optional[str] = Field(None, description="错误信息(仅失败时)")
+
+
+class MemorySearchReport(BaseModel):
+    """Per-tier report of the last search_memories call."""
+
+    tiers: Dict[str, SearchTierReport] = Field(..., description="各层报告")
+    elapsed_ms: float = Field(..., description="总耗时(ms)")
+    deadline_ms: int = Field(..., description="整体截止时间(ms)")
+    timed_out: bool = Field(..., description="是否有层超时")
+
+
+class MemorySearchStats(BaseModel):
+    """search_memories tier timeouts since startup."""
+
+    searches: int = Field(..., description="检索次数")
+    timed_out_searches: int = Field(..., description="有层超时的检索次数")
+    tier_timeouts: Dict[str, int] = Field(default_factory=dict, description="各层超时次数")
+    last_search: Optional[MemorySearchReport] = Field(None, description="最近一次检索的分层报告")
+
+
 class MemoryHealthResponse(BaseModel):
     """
     Response model for memory health check.
@@ -280,6 +307,7 @@ class MemoryHealthResponse(BaseModel):
 
     status: OverallStatus = Field(..., description="整体状态")
     layers: MemoryLayersStatus = Field(..., description="3层系统状态")
+    search: Optional[MemorySearchStats] = Field(None, description="记忆检索分层超时统计")
     timestamp: str = Field(..., description="检查时间戳")
 
     model_config = ConfigDict(
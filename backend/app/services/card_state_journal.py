@@ -0,0 +1,285 @@
+"""
+CardStateJournal - Append-only persistence for ReviewService FSRS card states.
+
+``ReviewService._save_card_states`` used to serialize the whole
+``_card_states`` dict (``indent=2``) and atomically rewrite
+``fsrs_card_states.json`` after every card update, so the cost of each
+review grew with the number of cards ever reviewed. The journal keeps that
+file as the snapshot and adds:
+
+- dirty tracking: ``CardStates`` (a dict) records which concept_ids changed
+- group commit: saves arriving within ``group_commit_ms`` share one JSONL
+  append (flush + fsync) holding only the changed cards
+- background compaction: once the journal passes ``compact_threshold``
+  entries it is folded into the snapshot by a separate task, off the review
+  path
+- fast startup replay with a load-time metric (``load_stats``)
+
+Snapshot / journal file handling (fsync'd appends, torn-tail replay, atomic
+snapshot replace) is shared with the Neo4j fallback store through
+``app.utils.snapshot_journal``.
+
+The snapshot stays a plain ``{concept_id: card_json}`` object, so existing
+files load unchanged. Every snapshot write is preceded by a journal append
+of the pending changes, so replaying a journal left behind by a crash
+between the snapshot replace and the journal unlink is idempotent.
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.utils.snapshot_journal import DEFAULT_COMPACT_THRESHOLD, SnapshotJournal
+
+logger = logging.getLogger(__name__)
+
+# Saves within this window share one journal append
+DEFAULT_GROUP_COMMIT_MS = 10
+
+
+class CardStates(dict):
+    """``{concept_id: card_json}`` dict that records changed keys for the journal."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._dirty: Set[str] = set()
+        # Set when the change cannot be expressed per key (e.g. clear())
+        self._rewrite = False
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._dirty.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._dirty.add(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            self._dirty.add(key)
+        return super().pop(key, *default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def popitem(self) -> Any:
+        item = super().popitem()
+        self._dirty.add(item[0])
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._dirty.clear()
+        self._rewrite = True
+
+    def mark_rewrite(self) -> None:
+        """Persist the whole dict on the next commit."""
+        self._rewrite = True
+
+    def take_changes(self) -> Tuple[Set[str], bool]:
+        """Return and reset (changed keys, full rewrite needed)."""
+        changes, rewrite = self._dirty, self._rewrite
+        self._dirty, self._rewrite = set(), False
+        return changes, rewrite
+
+    def restore_changes(self, changes: Set[str], rewrite: bool) -> None:
+        """Put back changes whose write failed so the next commit retries them."""
+        self._dirty |= changes
+        self._rewrite = self._rewrite or rewrite
+
+
+class CardStateJournal:
+    """Snapshot + JSONL journal for FSRS card states with group commit."""
+
+    def __init__(
+        self,
+        path: Path,
+        group_commit_ms: int = DEFAULT_GROUP_COMMIT_MS,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        lock: Optional[asyncio.Lock] = None,
+    ):
+        self._files = SnapshotJournal(path, compact_threshold)
+        self.path = self._files.path
+        self.journal_path = self._files.journal_path
+        self.group_commit_ms = group_commit_ms
+        self.compact_threshold = compact_threshold
+        self._lock = lock or asyncio.Lock()
+        # Snapshot missing or unreadable: the next commit writes it in full
+        self._needs_snapshot = True
+        self._batch: Optional[asyncio.Future] = None
+        self._compaction: Optional[asyncio.Task] = None
+        self.load_stats: Dict[str, Any] = {}
+        self.commits = 0
+        self.compactions = 0
+
+    # ── startup ──
+
+    def load(self) -> Dict[str, str]:
+        """
+        Read the snapshot and replay the journal.
+
+        Records ``load_stats`` (cards, journal_entries, torn, elapsed_ms).
+        Never raises: unreadable files are logged and treated as empty.
+        """
+        start = time.perf_counter()
+        states: Dict[str, str] = {}
+        self._needs_snapshot = True
+        try:
+            loaded = self._files.read_snapshot()
+            if isinstance(loaded, dict):
+                states = loaded
+                self._needs_snapshot = False
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.warning(f"Failed to load FSRS card states: {e}")
+
+        replayed, torn = self._replay(states)
+        self.load_stats = {
+            "cards": len(states),
+            "journal_entries": replayed,
+            "torn": torn,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        if states or replayed:
+            logger.info(
+                f"Loaded {len(states)} FSRS card states from {self.path} "
+                f"(journal_entries={replayed}, elapsed_ms={self.load_stats['elapsed_ms']})"
+            )
+
+        if torn or self._files.should_compact:
+            try:
+                self._write_snapshot(states)
+            except (OSError, TypeError) as e:
+                logger.warning(f"Failed to compact FSRS card states: {e}")
+        return states
+
+    def _replay(self, states: Dict[str, str]) -> Tuple[int, bool]:
+        try:
+            return self._files.replay(lambda entry: self._apply(states, entry))
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Failed to replay FSRS card state journal: {e}")
+            return self._files.entries, False
+
+    @staticmethod
+    def _apply(states: Dict[str, str], entry: Dict[str, Any]) -> None:
+        if "all" in entry:
+            states.clear()
+            states.update(entry["all"])
+        elif entry.get("d"):
+            states.pop(entry["k"], None)
+        else:
+            states[entry["k"]] = entry["v"]
+
+    # ── writes ──
+
+    async def commit(self, states: CardStates) -> None:
+        """
+        Persist the changed cards of ``states``.
+
+        Callers within the same ``group_commit_ms`` window share one append;
+        each caller returns once its changes are durable (or the write failed
+        and was logged).
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batch
+        if batch is None or batch.done() or batch.get_loop() is not loop:
+            batch = self._batch = loop.create_future()
+            loop.create_task(self._flush_after_window(states, batch))
+        await asyncio.shield(batch)
+
+    async def _flush_after_window(self, states: CardStates, batch: asyncio.Future) -> None:
+        try:
+            if self.group_commit_ms > 0:
+                await asyncio.sleep(self.group_commit_ms / 1000)
+            # Saves from here on start the next group
+            if self._batch is batch:
+                self._batch = None
+            await self.flush(states)
+        finally:
+            if not batch.done():
+                batch.set_result(None)
+
+    async def flush(self, states: CardStates) -> int:
+        """Append pending changes now; returns the number of journal entries written."""
+        async with self._lock:
+            written = await self._append_changes(states)
+            if self._needs_snapshot:
+                await self._snapshot(states)
+        if self._files.should_compact:
+            self._schedule_compaction(states)
+        return written
+
+    async def _append_changes(self, states: CardStates) -> int:
+        """Write pending changes as JSONL (lock held)."""
+        changes, rewrite = states.take_changes()
+        if not changes and not rewrite:
+            return 0
+        if rewrite:
+            entries = [{"all": dict(states)}]
+        else:
+            entries = [
+                {"k": key, "v": states[key]} if key in states else {"k": key, "d": 1}
+                for key in sorted(changes)
+            ]
+        try:
+            await asyncio.to_thread(self._append_lines, self._files.encode(entries))
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to save FSRS card states: {e}")
+            states.restore_changes(changes, rewrite)
+            return 0
+        self._files.entries += len(entries)
+        self.commits += 1
+        if rewrite:
+            # Reset entries are as large as the snapshot — fold them in right away
+            self._needs_snapshot = True
+        logger.debug(f"Journaled {len(entries)} FSRS card state change(s) to {self.journal_path}")
+        return len(entries)
+
+    def _append_lines(self, lines: str) -> None:
+        self._files.append_lines(lines)
+
+    # ── compaction ──
+
+    def _schedule_compaction(self, states: CardStates) -> None:
+        if self._compaction is not None and not self._compaction.done():
+            return
+        self._compaction = asyncio.get_running_loop().create_task(self.compact(states))
+
+    async def compact(self, states: CardStates) -> None:
+        """Fold the journal into the snapshot."""
+        async with self._lock:
+            await self._append_changes(states)
+            await self._snapshot(states)
+
+    async def _snapshot(self, states: CardStates) -> None:
+        """Write the snapshot and drop the journal (lock held, changes appended first)."""
+        try:
+            await asyncio.to_thread(self._write_snapshot, dict(states))
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to compact FSRS card states: {e}")
+
+    def _write_snapshot(self, states: Dict[str, str]) -> None:
+        self._files.write_snapshot(states)
+        self._needs_snapshot = False
+        self.compactions += 1
+        logger.debug(f"Compacted {len(states)} FSRS card states into {self.path}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "journal_entries": self._files.entries,
+            "commits": self.commits,
+            "compactions": self.compactions,
+            "compacting": self._compaction is not None and not self._compaction.done(),
+            "load": dict(self.load_stats),
+        }
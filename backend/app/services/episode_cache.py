@@ -0,0 +1,204 @@
+"""
+EpisodeCache - Indexed in-memory episode store for MemoryService.
+
+Replaces the plain ``_episodes`` list (Story 38.2 cache, capped at
+MAX_EPISODE_CACHE) with an insertion-ordered store that keeps:
+
+- episode_id index: O(1) dedup for record_learning_event / batch events
+- O(1) eviction of the oldest episode when the cap is exceeded
+- group_id and concept indexes for get_learning_history filters
+- an incremental bigram index over the lower-cased searchable text, so
+  search_memories tier 3 only checks episodes that contain every bigram
+  of the query instead of re-joining and lower-casing every episode
+
+The store still behaves like the old list (append / len / iteration /
+indexing / comparison with a list), so existing callers keep working.
+Episodes are indexed when appended and must not be mutated afterwards.
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+# Fields joined into the tier-3 searchable text (search_memories)
+SEARCH_FIELDS = ("content", "episode_type", "node_id", "concept")
+
+
+def searchable_text(episode: Dict[str, Any]) -> str:
+    """Lower-cased text tier 3 matches queries against."""
+    return " ".join(str(episode.get(field, "")) for field in SEARCH_FIELDS).lower()
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def _concept_key(episode: Dict[str, Any]) -> str:
+    return str(episode.get("concept") or "").lower()
+
+
+class EpisodeCache:
+    """Insertion-ordered, id-indexed episode store with secondary indexes."""
+
+    def __init__(self, maxlen: Optional[int] = None, episodes: Iterable[Dict[str, Any]] = ()):
+        self.maxlen = maxlen
+        self._seq = 0
+        self._items: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._text: Dict[int, str] = {}
+        self._by_id: Dict[str, int] = {}
+        self._by_group: Dict[Any, Set[int]] = {}
+        self._by_concept: Dict[str, Set[int]] = {}
+        self._by_bigram: Dict[str, Set[int]] = {}
+        self.extend(episodes)
+
+    # ── list-compatible interface ──
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._items.values()))
+
+    def __reversed__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(reversed(self._items.values())))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items.values())[index]
+        size = len(self._items)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("episode index out of range")
+        if index == 0:
+            return next(iter(self._items.values()))
+        if index == size - 1:
+            return next(reversed(self._items.values()))
+        return next(islice(self._items.values(), index, None))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EpisodeCache):
+            return list(self._items.values()) == list(other._items.values())
+        if isinstance(other, list):
+            return list(self._items.values()) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EpisodeCache(size={len(self)}, maxlen={self.maxlen})"
+
+    def append(self, episode: Dict[str, Any]) -> None:
+        """Add an episode, evicting the oldest ones beyond maxlen."""
+        seq = self._seq
+        self._seq += 1
+        self._items[seq] = episode
+
+        episode_id = episode.get("episode_id")
+        if episode_id:
+            self._by_id[episode_id] = seq
+        self._by_group.setdefault(episode.get("group_id", ""), set()).add(seq)
+        self._by_concept.setdefault(_concept_key(episode), set()).add(seq)
+        text = searchable_text(episode)
+        self._text[seq] = text
+        for gram in _bigrams(text):
+            self._by_bigram.setdefault(gram, set()).add(seq)
+
+        if self.maxlen is not None:
+            while len(self._items) > self.maxlen:
+                self._evict(next(iter(self._items)))
+
+    def extend(self, episodes: Iterable[Dict[str, Any]]) -> None:
+        for episode in episodes:
+            self.append(episode)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._text.clear()
+        self._by_id.clear()
+        self._by_group.clear()
+        self._by_concept.clear()
+        self._by_bigram.clear()
+
+    def _evict(self, seq: int) -> None:
+        episode = self._items.pop(seq)
+        episode_id = episode.get("episode_id")
+        if episode_id and self._by_id.get(episode_id) == seq:
+            del self._by_id[episode_id]
+        self._discard(self._by_group, episode.get("group_id", ""), seq)
+        self._discard(self._by_concept, _concept_key(episode), seq)
+        for gram in _bigrams(self._text.pop(seq)):
+            self._discard(self._by_bigram, gram, seq)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[int]], key: Any, seq: int) -> None:
+        seqs = index.get(key)
+        if seqs is not None:
+            seqs.discard(seq)
+            if not seqs:
+                del index[key]
+
+    # ── indexed lookups ──
+
+    def has(self, episode_id: str) -> bool:
+        return episode_id in self._by_id
+
+    def get(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        seq = self._by_id.get(episode_id)
+        return self._items[seq] if seq is not None else None
+
+    def select(
+        self,
+        group_id: Optional[str] = None,
+        concept_contains: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Episodes in insertion order, narrowed through the indexes.
+
+        Args:
+            group_id: Exact group_id match
+            concept_contains: Case-insensitive substring of the concept
+        """
+        seqs: Optional[Set[int]] = None
+        if group_id:
+            seqs = set(self._by_group.get(group_id, ()))
+        if concept_contains:
+            needle = concept_contains.lower()
+            matched: Set[int] = set()
+            for key, concept_seqs in self._by_concept.items():
+                if needle in key:
+                    matched |= concept_seqs
+            seqs = matched if seqs is None else seqs & matched
+        if seqs is None:
+            return list(self._items.values())
+        return [self._items[seq] for seq in sorted(seqs)]
+
+    def search(self, query: str, group_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Episodes whose searchable text contains ``query`` (case-insensitive),
+        newest first. Candidates come from the bigram index; each one is
+        confirmed against its cached text.
+        """
+        query_lower = query.lower()
+        grams = _bigrams(query_lower)
+        if grams:
+            postings = sorted((self._by_bigram.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = set(self._items)
+        if group_id:
+            candidates &= self._by_group.get(group_id, set())
+
+        for seq in sorted(candidates, reverse=True):
+            if seq in self._items and query_lower in self._text[seq]:
+                yield self._items[seq]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "episodes": len(self._items),
+            "ids": len(self._by_id),
+            "groups": len(self._by_group),
+            "concepts": len(self._by_concept),
+            "bigrams": len(self._by_bigram),
+        }
@@ -35,6 +35,7 @@ Story 36.9 Implementation:
 
 import asyncio
 import hashlib
+import inspect
 import json
 import logging
 import time
@@ -43,7 +44,7 @@ import uuid
 import structlog
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from cachetools import TTLCache
 
@@ -56,6 +57,7 @@ from app.core.subject_config import (
     extract_canvas_name,
     extract_subject_from_canvas_path,
 )
+from app.services.episode_cache import EpisodeCache
 from app.services.episode_worker import EpisodeTask, get_episode_worker
 from app.graphiti.entity_types import CANVAS_ENTITY_TYPES, CANVAS_EDGE_TYPES
 
@@ -164,7 +166,8 @@ class MemoryService:
         """
         self.neo4j = neo4j_client or get_neo4j_client()
         self._initialized = False
-        self._episodes: List[Dict[str, Any]] = []  # In-memory episode store
+        # In-memory episode store (ordered, indexed by episode_id / group_id / concept)
+        self._episodes = EpisodeCache(maxlen=self.MAX_EPISODE_CACHE)
         # Story 38.2 AC-2: Track whether episodes have been recovered from Neo4j
         self._episodes_recovered: bool = False
         # Story 38.2: Lock to prevent concurrent recovery attempts
@@ -178,9 +181,27 @@ class MemoryService:
 
             _settings = get_settings()
             _score_cache_maxsize = _settings.SCORE_HISTORY_CACHE_MAXSIZE
+            _search_deadline_ms = _settings.MEMORY_SEARCH_DEADLINE_MS
+            _search_budgets_ms = {
+                "graphiti": _settings.MEMORY_SEARCH_GRAPHITI_BUDGET_MS,
+                "neo4j_fulltext": _settings.MEMORY_SEARCH_NEO4J_BUDGET_MS,
+            }
         except (ImportError, RuntimeError, AttributeError) as e:
             logger.warning(f"Settings unavailable, using default cache config: {e}")
             _score_cache_maxsize = 1000
+            _search_deadline_ms = 3500
+            _search_budgets_ms = {"graphiti": 3000, "neo4j_fulltext": 2000}
+
+        # search_memories: overall deadline and per-tier budgets (ms)
+        self._search_deadline_ms: int = _search_deadline_ms
+        self._search_tier_budgets_ms: Dict[str, int] = _search_budgets_ms
+        # search_memories tier reports: timeout counters + the last search (get_stats / health)
+        self._search_stats: Dict[str, Any] = {
+            "searches": 0,
+            "timed_out_searches": 0,
+            "tier_timeouts": {},
+            "last_search": None,
+        }
 
         # Story 31.5: Cache for score history queries (30s TTL)
         # NFR-P0: Bounded TTLCache replaces bare dict to prevent unbounded memory growth
@@ -194,6 +215,17 @@ class MemoryService:
         self._pending_failed_writes: List[Dict[str, Any]] = []
         logger.debug("MemoryService initialized")
 
+    @property
+    def _episodes(self) -> EpisodeCache:
+        return self._episode_cache
+
+    @_episodes.setter
+    def _episodes(self, episodes: Iterable[Dict[str, Any]]) -> None:
+        # Plain lists (tests, legacy callers) are re-indexed into an EpisodeCache
+        if not isinstance(episodes, EpisodeCache):
+            episodes = EpisodeCache(maxlen=self.MAX_EPISODE_CACHE, episodes=episodes)
+        self._episode_cache = episodes
+
     async def initialize(self) -> bool:
         """Initialize the service and underlying clients."""
         if self._initialized:
@@ -290,12 +322,10 @@ class MemoryService:
                             "review_count": record.get("review_count") or 0,
                             "episode_type": "recovered",
                         }
+                        # EpisodeCache caps itself at MAX_EPISODE_CACHE
                         self._episodes.append(episode)
                         existing_keys.add((user_id, concept, timestamp))
                         added += 1
-                    # Cap episode cache to prevent unbounded growth
-                    if len(self._episodes) > self.MAX_EPISODE_CACHE:
-                        self._episodes = self._episodes[-self.MAX_EPISODE_CACHE :]
                 self._episodes_recovered = True
                 logger.info(
                     f"MemoryService: recovered {added} episodes from Neo4j ({len(records)} returned, {len(records) - added} deduped)"
@@ -428,26 +458,16 @@ class MemoryService:
             }
             # Story 30.10 AC-30.10.3: Dedup _episodes - skip if exists to preserve score history
             # Fix C4: changed from overwrite to skip-if-exists to not destroy FSRS score history
-            existing_idx = next(
-                (
-                    i
-                    for i, ep in enumerate(self._episodes)
-                    if ep.get("episode_id") == episode_id
-                ),
-                None,
-            )
-            if existing_idx is not None:
+            if self._episodes.has(episode_id):
                 log_decision(
                     function="MemoryService.record_learning_event",
                     input_summary={"concept": concept, "episode_id": episode_id},
                     output="skipped_duplicate",
-                    reason=f"episode already exists at idx={existing_idx}, preserving FSRS history",
+                    reason="episode already exists, preserving FSRS history",
                 )
             else:
+                # Fix C5: EpisodeCache evicts the oldest episode beyond MAX_EPISODE_CACHE
                 self._episodes.append(episode)
-                # Fix C5: Enforce MAX_EPISODE_CACHE to prevent unbounded memory growth
-                if len(self._episodes) > self.MAX_EPISODE_CACHE:
-                    self._episodes = self._episodes[-self.MAX_EPISODE_CACHE :]
                 log_decision(
                     function="MemoryService.record_learning_event",
                     input_summary={
@@ -558,16 +578,16 @@ class MemoryService:
         if not self._episodes_recovered:
             await self._recover_episodes_from_neo4j()
 
-        memory_episodes = [e for e in self._episodes if e.get("user_id") == user_id]
-
         # FR-KG-04 fix: Apply group_id filter to in-memory episodes for canvas-scoped
         # isolation (Story 30.8 AC-30.8.1). Without this, when Neo4j is unavailable
         # and we fall back to in-memory _episodes, queries with canvas_path would
         # leak data from other canvases that share the same user_id.
-        if group_id:
-            memory_episodes = [
-                e for e in memory_episodes if e.get("group_id", "") == group_id
-            ]
+        # group_id and concept (case-insensitive substring) come from the cache indexes.
+        memory_episodes = [
+            e
+            for e in self._episodes.select(group_id=group_id, concept_contains=concept)
+            if e.get("user_id") == user_id
+        ]
 
         # Apply date filters to in-memory episodes
         # S34 Bug fix #3: Normalize both sides to str for consistent comparison
@@ -591,15 +611,6 @@ class MemoryService:
                 e for e in memory_episodes if str(e.get("timestamp", "")) <= end_str
             ]
 
-        # Apply concept filter
-        if concept:
-            concept_lower = concept.lower()
-            memory_episodes = [
-                e
-                for e in memory_episodes
-                if concept_lower in e.get("concept", "").lower()
-            ]
-
         # Apply subject filter
         if subject:
             subject_lower = subject.lower()
@@ -937,8 +948,14 @@ class MemoryService:
             "initialized": self._initialized,
             "total_episodes": len(self._episodes),
             "neo4j_stats": self.neo4j.stats,
+            "search": self.get_search_stats(),
         }
 
+    def get_search_stats(self) -> Dict[str, Any]:
+        """search_memories tier timeouts and the per-tier report of the last search."""
+        stats = self._search_stats
+        return {**stats, "tier_timeouts": dict(stats["tier_timeouts"])}
+
     async def get_health_status(self) -> Dict[str, Any]:
         """
         获取3层记忆系统健康状态
@@ -1012,6 +1029,7 @@ class MemoryService:
         return {
             "status": overall_status,
             "layers": layers,
+            "search": self.get_search_stats(),
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -1028,6 +1046,7 @@ class MemoryService:
         - AC-30.11.3: BATCH_NEO4J_CONCURRENCY 配置并发数
         - AC-30.11.4: 兼容 Story 30.10 幂等键
         - AC-30.11.5: 记录 batch_avg_latency_ms
+        Neo4j 写入优先走 record_episodes_bulk (UNWIND 分块事务，逐行错误)
 
         Args:
             events: List of event dictionaries
@@ -1074,21 +1093,11 @@ class MemoryService:
 
                 # Story 30.10 AC-30.10.3: Dedup batch episodes
                 # Fix C4: skip-if-exists to preserve score history
-                existing_idx = next(
-                    (
-                        i
-                        for i, ep in enumerate(self._episodes)
-                        if ep.get("episode_id") == episode_id
-                    ),
-                    None,
-                )
-                if existing_idx is not None:
+                if self._episodes.has(episode_id):
                     logger.debug(f"Skipped duplicate batch episode: {episode_id}")
                 else:
+                    # Fix C5: EpisodeCache enforces MAX_EPISODE_CACHE
                     self._episodes.append(episode_record)
-                    # Fix C5: Enforce MAX_EPISODE_CACHE
-                    if len(self._episodes) > self.MAX_EPISODE_CACHE:
-                        self._episodes = self._episodes[-self.MAX_EPISODE_CACHE :]
 
                 neo4j_payload = {
                     "episode_id": episode_id,
@@ -1109,10 +1118,27 @@ class MemoryService:
                 failed += 1
                 errors.append({"index": idx, "error": str(e)})
 
-        # ── Phase 2: 并行 Neo4j 写入 (Story 30.11 AC-30.11.1) ──
+        # ── Phase 2: Neo4j 写入 ──
+        # 批量 UNWIND (每 BATCH_NEO4J_CHUNK_SIZE 行一个事务)，
+        # 客户端无 record_episodes_bulk 时回退为逐条并行写入 (Story 30.11 AC-30.11.1)
         neo4j_available = self.neo4j.stats.get("initialized", False)
+        bulk_write = getattr(self.neo4j, "record_episodes_bulk", None)
 
-        if neo4j_available and valid_records:
+        if neo4j_available and valid_records and inspect.iscoroutinefunction(bulk_write):
+            try:
+                bulk_errors = await bulk_write(
+                    [r["payload"] for r in valid_records],
+                    chunk_size=getattr(settings, "BATCH_NEO4J_CHUNK_SIZE", 200),
+                )
+            except Exception as e:
+                # Any failure (driver, OS, timeout) fails every row, like the
+                # per-record gather(return_exceptions=True) path
+                bulk_errors = [{"index": i, "error": str(e)} for i in range(len(valid_records))]
+            neo4j_errors = [
+                {"index": valid_records[err["index"]]["idx"], "error": err["error"]}
+                for err in bulk_errors
+            ]
+        elif neo4j_available and valid_records:
             concurrency = getattr(settings, "BATCH_NEO4J_CONCURRENCY", 10)
             semaphore = asyncio.Semaphore(concurrency)
 
@@ -1135,28 +1161,27 @@ class MemoryService:
                     neo4j_errors.append({"error": str(r)})
                 elif r is not None:
                     neo4j_errors.append(r)
+        else:
+            neo4j_errors = []
 
-            if neo4j_errors:
-                logger.warning(
-                    f"Batch Neo4j write: {len(neo4j_errors)} errors (non-blocking)"
+        if neo4j_errors:
+            logger.warning(
+                f"Batch Neo4j write: {len(neo4j_errors)} errors (non-blocking)"
+            )
+            # Fix C3: Surface Neo4j errors in response so caller knows about partial failures
+            errors.extend(neo4j_errors)
+            failed += len(neo4j_errors)
+            # Story 30.24 AC-30.24.4: Track failed writes for shutdown safety
+            episode_by_index = {r["idx"]: r["payload"]["episode_id"] for r in valid_records}
+            for i, err in enumerate(neo4j_errors):
+                eid = episode_by_index.get(err.get("index"), f"unknown_{i}")
+                self._pending_failed_writes.append(
+                    {
+                        "episode_id": eid,
+                        "timestamp": datetime.now().isoformat(),
+                        "reason": err.get("error", "unknown"),
+                    }
                 )
-                # Fix C3: Surface Neo4j errors in response so caller knows about partial failures
-                errors.extend(neo4j_errors)
-                failed += len(neo4j_errors)
-                # Story 30.24 AC-30.24.4: Track failed writes for shutdown safety
-                for i, err in enumerate(neo4j_errors):
-                    err_index = err.get("index")
-                    if err_index is not None and err_index < len(episode_ids):
-                        eid = episode_ids[err_index]
-                    else:
-                        eid = f"unknown_{i}"
-                    self._pending_failed_writes.append(
-                        {
-                            "episode_id": eid,
-                            "timestamp": datetime.now().isoformat(),
-                            "reason": err.get("error", "unknown"),
-                        }
-                    )
 
         # ── Phase 2: Enqueue batch events to GraphitiEpisodeWorker ──
         for record in valid_records:
@@ -1243,8 +1268,6 @@ class MemoryService:
         }
 
         self._episodes.append(episode)
-        if len(self._episodes) > self.MAX_EPISODE_CACHE:
-            self._episodes = self._episodes[-self.MAX_EPISODE_CACHE :]
 
         # Write to Neo4j if connected
         if self.neo4j.stats.get("initialized", False):
@@ -1790,22 +1813,72 @@ class MemoryService:
             search_filter: Optional SearchFilters for date/label filtering
 
         Signature backward-compatible — existing callers unaffected.
+        Tiers 1 and 2 run concurrently under a deadline; see
+        search_memories_with_report() for per-tier timing.
+        """
+        report = await self.search_memories_with_report(
+            query,
+            group_id=group_id,
+            max_results=max_results,
+            limit=limit,
+            search_config=search_config,
+            search_filter=search_filter,
+        )
+        return report["results"]
+
+    async def search_memories_with_report(
+        self,
+        query: str,
+        group_id: Optional[str] = None,
+        max_results: int = 50,
+        limit: Optional[int] = None,
+        search_config: str = "combined_rrf",
+        search_filter: Optional[Any] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        search_memories() plus per-tier timing.
+
+        Tier 1 (Graphiti) and tier 2 (Neo4j fulltext) run concurrently, each
+        bounded by its own budget (MEMORY_SEARCH_*_BUDGET_MS) and all of them by
+        the overall deadline (MEMORY_SEARCH_DEADLINE_MS). A tier that misses its
+        budget or the deadline contributes no results and is flagged
+        ``timed_out``; whatever the other tiers returned in time is still merged.
+        Tier 3 (in-memory cache) runs after them and is never skipped.
+
+        Args:
+            deadline_ms: Override for the overall deadline
+            (other args as search_memories)
+
+        Returns:
+            Dict with results, tiers ({name: {results, elapsed_ms, timed_out}}),
+            elapsed_ms, deadline_ms and timed_out (any tier timed out)
         """
         if not self._initialized:
             await self.initialize()
 
         effective_limit = limit if limit is not None else max_results
+        deadline_ms = deadline_ms if deadline_ms is not None else self._search_deadline_ms
+        search_start = time.monotonic()
         seen_ids: set = set()
         merged: List[Dict[str, Any]] = []
 
+        # Tiers 1 + 2: concurrent, merged in tier order once finished or past the deadline
+        tier_calls = {
+            "graphiti": self._search_graphiti(
+                query,
+                group_id,
+                effective_limit,
+                search_config=search_config,
+                search_filter=search_filter,
+            ),
+            "neo4j_fulltext": self._search_neo4j_fulltext(query, group_id, effective_limit),
+        }
+        tier_hits, tiers = await self._run_search_tiers(tier_calls, deadline_ms, search_start)
+        graphiti_hits = tier_hits["graphiti"]
+        neo4j_hits = tier_hits["neo4j_fulltext"]
+
         # Tier 1: Graphiti semantic search via search_()
-        graphiti_hits = await self._search_graphiti(
-            query,
-            group_id,
-            effective_limit,
-            search_config=search_config,
-            search_filter=search_filter,
-        )
         for ep in graphiti_hits:
             ep_id = ep.get("episode_id", "")
             if ep_id and ep_id not in seen_ids:
@@ -1815,7 +1888,6 @@ class MemoryService:
                 merged.append(ep)
 
         # Tier 2: Neo4j fulltext search
-        neo4j_hits = await self._search_neo4j_fulltext(query, group_id, effective_limit)
         for ep in neo4j_hits:
             ep_id = ep.get("episode_id", "")
             if ep_id and ep_id not in seen_ids:
@@ -1824,28 +1896,27 @@ class MemoryService:
                 merged.append(ep)
 
         # Tier 3: In-memory cache (always available fallback)
+        # EpisodeCache.search: bigram-index candidates, newest first, same substring match
+        tier3_start = time.monotonic()
         tier3_count = 0
-        query_lower = query.lower()
-        for episode in reversed(self._episodes):
+        for episode in self._episodes.search(query, group_id=group_id):
             if len(merged) >= effective_limit:
                 break
-            if group_id and episode.get("group_id", "") != group_id:
-                continue
             ep_id = episode.get("episode_id", "")
             if ep_id in seen_ids:
                 continue
-            searchable = " ".join(
-                str(episode.get(field, ""))
-                for field in ("content", "episode_type", "node_id", "concept")
-            ).lower()
-            if query_lower in searchable:
-                seen_ids.add(ep_id)
-                episode_with_source = {**episode, "source": "in_memory"}
-                episode_with_source["relevance_score"] = self._compute_unified_score(
-                    episode_with_source, tier=3
-                )
-                merged.append(episode_with_source)
-                tier3_count += 1
+            seen_ids.add(ep_id)
+            episode_with_source = {**episode, "source": "in_memory"}
+            episode_with_source["relevance_score"] = self._compute_unified_score(
+                episode_with_source, tier=3
+            )
+            merged.append(episode_with_source)
+            tier3_count += 1
+        tiers["in_memory"] = {
+            "results": tier3_count,
+            "elapsed_ms": round((time.monotonic() - tier3_start) * 1000, 2),
+            "timed_out": False,
+        }
 
         # FSRS R-value injection: boost low-retrievability concepts
         self._inject_fsrs_r_values(merged)
@@ -1855,13 +1926,100 @@ class MemoryService:
 
         # Epic 4 Feature 4.2: Log which tier(s) produced results
         logger.info(
-            f"[search_memories] Tier 1: {len(graphiti_hits)} results, "
-            f"Tier 2: {len(neo4j_hits)} results, "
+            f"[search_memories] Tier 1: {len(graphiti_hits)} results "
+            f"({tiers['graphiti']['elapsed_ms']}ms{', timed out' if tiers['graphiti']['timed_out'] else ''}), "
+            f"Tier 2: {len(neo4j_hits)} results "
+            f"({tiers['neo4j_fulltext']['elapsed_ms']}ms"
+            f"{', timed out' if tiers['neo4j_fulltext']['timed_out'] else ''}), "
             f"Tier 3: {tier3_count} results "
             f"(total merged: {len(merged[:effective_limit])}, sorted by relevance)"
         )
 
-        return merged[:effective_limit]
+        report = {
+            "results": merged[:effective_limit],
+            "tiers": tiers,
+            "elapsed_ms": round((time.monotonic() - search_start) * 1000, 2),
+            "deadline_ms": deadline_ms,
+            "timed_out": any(t["timed_out"] for t in tiers.values()),
+        }
+        self._record_search_report(report)
+        return report
+
+    def _record_search_report(self, report: Dict[str, Any]) -> None:
+        """Count timed-out searches per tier and keep the last report for get_search_stats()."""
+        stats = self._search_stats
+        stats["searches"] += 1
+        if report["timed_out"]:
+            stats["timed_out_searches"] += 1
+        for name, tier in report["tiers"].items():
+            if tier["timed_out"]:
+                stats["tier_timeouts"][name] = stats["tier_timeouts"].get(name, 0) + 1
+        stats["last_search"] = {
+            "tiers": report["tiers"],
+            "elapsed_ms": report["elapsed_ms"],
+            "deadline_ms": report["deadline_ms"],
+            "timed_out": report["timed_out"],
+        }
+
+    async def _run_search_tiers(
+        self,
+        tier_calls: Dict[str, Any],
+        deadline_ms: int,
+        search_start: float,
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+        """
+        Run search tier coroutines concurrently under budgets and a deadline.
+
+        Returns:
+            (hits by tier, report by tier); tiers that time out, fail or are
+            still running at the deadline (cancelled) contribute no hits.
+        """
+
+        async def _run_tier(name: str, call: Any) -> List[Dict[str, Any]]:
+            budget_ms = self._search_tier_budgets_ms.get(name, deadline_ms)
+            tier_start = time.monotonic()
+            try:
+                return await asyncio.wait_for(call, timeout=budget_ms / 1000)
+            except asyncio.TimeoutError:
+                tiers[name]["timed_out"] = True
+                logger.warning(f"[search_memories] {name} tier exceeded {budget_ms}ms budget")
+                return list()
+            finally:
+                # A tier cancelled at the deadline already has its elapsed time
+                if not tiers[name]["elapsed_ms"]:
+                    tiers[name]["elapsed_ms"] = round((time.monotonic() - tier_start) * 1000, 2)
+
+        tiers: Dict[str, Dict[str, Any]] = {
+            name: {"results": 0, "elapsed_ms": 0.0, "timed_out": False} for name in tier_calls
+        }
+        tasks = {
+            name: asyncio.create_task(_run_tier(name, call)) for name, call in tier_calls.items()
+        }
+        try:
+            remaining = deadline_ms / 1000 - (time.monotonic() - search_start)
+            await asyncio.wait(tasks.values(), timeout=max(remaining, 0))
+        finally:
+            # Past the deadline (or caller cancelled): drop tiers still running
+            for name, task in tasks.items():
+                if not task.done():
+                    tiers[name]["timed_out"] = True
+                    tiers[name]["elapsed_ms"] = round((time.monotonic() - search_start) * 1000, 2)
+                    task.cancel()
+
+        hits: Dict[str, List[Dict[str, Any]]] = {}
+        for name, task in tasks.items():
+            hits[name] = list()
+            if tiers[name]["timed_out"] and not task.done():
+                logger.warning(f"[search_memories] {name} tier cancelled at {deadline_ms}ms deadline")
+            elif task.cancelled():
+                tiers[name]["timed_out"] = True
+            elif task.exception() is not None:
+                tiers[name]["error"] = str(task.exception())
+                logger.warning(f"[search_memories] {name} tier failed (non-fatal): {task.exception()}")
+            else:
+                hits[name] = task.result() or list()
+            tiers[name]["results"] = len(hits[name])
+        return hits, tiers
 
     async def record_temporal_event(
         self,
@@ -1914,10 +2072,8 @@ class MemoryService:
         }
 
         # Store in memory
+        # Fix C5: EpisodeCache enforces MAX_EPISODE_CACHE
         self._episodes.append(episode_record)
-        # Fix C5: Enforce MAX_EPISODE_CACHE
-        if len(self._episodes) > self.MAX_EPISODE_CACHE:
-            self._episodes = self._episodes[-self.MAX_EPISODE_CACHE :]
 
         # Try to store in Neo4j if connected
         if self.neo4j.stats.get("initialized", False):
@@ -112,6 +112,26 @@ class RAGUnavailableError(RAGServiceError):
     pass
 
 
+def _rerank_scheduler_stats() -> Optional[Dict[str, Any]]:
+    """Reranker micro-batching metrics, or None when no reranker is loaded."""
+    try:
+        from agentic_rag.reranking import get_rerank_scheduler_stats
+
+        return get_rerank_scheduler_stats()
+    except Exception:
+        return None
+
+
+def _rerank_score_cache_stats() -> Optional[Dict[str, Any]]:
+    """Rerank score cache metrics, or None when the RAG package is unavailable."""
+    try:
+        from agentic_rag.reranking import get_rerank_score_cache_stats
+
+        return get_rerank_score_cache_stats()
+    except Exception:
+        return None
+
+
 # ============================================================
 # RAG Service Class
 # ============================================================
@@ -394,7 +414,9 @@ class RAGService:
         Get RAG service status information.
 
         Returns:
-            Dict with available, initialized, langgraph_available, import_error
+            Dict with available, initialized, langgraph_available, import_error,
+            rerank_scheduler (queue depth / batch size / wait time metrics),
+            rerank_score_cache (hit / miss / invalidation metrics)
 
         [Source: backend/app/api/v1/endpoints/rag.py#get_rag_status]
         """
@@ -403,6 +425,8 @@ class RAGService:
             "initialized": self._initialized,
             "langgraph_available": LANGGRAPH_AVAILABLE,
             "import_error": _IMPORT_ERROR,
+            "rerank_scheduler": _rerank_scheduler_stats(),
+            "rerank_score_cache": _rerank_score_cache_stats(),
         }
 
     async def query_with_fallback(
@@ -42,7 +42,8 @@ Story 32.2: Migrated from Ebbinghaus fixed intervals to FSRS-4.5 dynamic schedul
 #
 # CARD STATE PERSISTENCE:
 # Card states are persisted via:
-# 1. In-memory cache (_card_states dict) for fast access during session
+# 1. In-memory cache (_card_states dict) for fast access during session,
+#    journaled to data/fsrs_card_states.json (see card_state_journal.py)
 # 2. Graphiti knowledge graph for long-term storage (optional)
 # 3. API response card_data field for client-side caching
 #
@@ -73,6 +74,12 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from app.core.decision_tracker import log_decision
 from app.core.exceptions import CanvasNotFoundException, TaskNotFoundError
+from app.services.card_state_journal import (
+    DEFAULT_COMPACT_THRESHOLD,
+    DEFAULT_GROUP_COMMIT_MS,
+    CardStateJournal,
+    CardStates,
+)
 from app.services.weight_calculator import ConceptWeightData, WeightCalculator
 
 # Story 32.2 AC-32.2.1: Import FSRSManager for FSRS-4.5 algorithm
@@ -297,46 +304,69 @@ class ReviewService:
         self._initialized = True
         self._task_canvas_map: Dict[str, str] = {}  # Maps task_id to canvas_name
         # Story 32.2 + P0-2: Card state storage with file persistence
-        self._card_states: Dict[str, str] = self._load_card_states()
+        # (snapshot + append-only journal, only changed cards are written)
+        self._card_journal = self._create_card_journal()
+        self._card_state_store = CardStates(self._load_card_states(self._card_journal))
         # Story 32.10 AC-3: Track fire-and-forget persistence failures
         self._auto_persist_failures: int = 0
         logger.debug("ReviewService initialized")
 
+    @property
+    def _card_states(self) -> CardStates:
+        """Cached card states (concept_id -> card_data JSON); changed keys are journaled."""
+        return self._card_state_store
+
+    @_card_states.setter
+    def _card_states(self, states: Dict[str, str]) -> None:
+        # Replacing the whole dict persists it in full on the next save
+        self._card_state_store = CardStates(states)
+        self._card_state_store.mark_rewrite()
+
     @staticmethod
-    def _load_card_states() -> Dict[str, str]:
-        """P0-2: Load card states from persistent JSON file on startup."""
+    def _create_card_journal() -> CardStateJournal:
+        """Create the card state journal with group-commit / compaction settings."""
         try:
-            if _CARD_STATES_FILE.exists():
-                data = _CARD_STATES_FILE.read_text(encoding="utf-8")
-                loaded = json.loads(data)
-                if isinstance(loaded, dict):
-                    logger.info(
-                        f"Loaded {len(loaded)} FSRS card states from {_CARD_STATES_FILE}"
-                    )
-                    return loaded
-        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
-            logger.warning(f"Failed to load FSRS card states: {e}")
-        return {}
+            from app.config import get_settings
+
+            settings = get_settings()
+            group_commit_ms = settings.FSRS_CARD_STATE_GROUP_COMMIT_MS
+            compact_threshold = settings.FSRS_CARD_STATE_COMPACT_THRESHOLD
+        except (ImportError, RuntimeError, AttributeError) as e:
+            logger.warning(f"Settings unavailable, using default card state journal config: {e}")
+            group_commit_ms = DEFAULT_GROUP_COMMIT_MS
+            compact_threshold = DEFAULT_COMPACT_THRESHOLD
+        return CardStateJournal(
+            _CARD_STATES_FILE,
+            group_commit_ms=group_commit_ms,
+            compact_threshold=compact_threshold,
+            lock=_card_states_lock,
+        )
+
+    @staticmethod
+    def _load_card_states(journal: Optional[CardStateJournal] = None) -> Dict[str, str]:
+        """P0-2: Load card states (snapshot + journal replay) on startup.
+
+        Load time and replayed entries are recorded in journal.load_stats.
+        """
+        if journal is None:
+            journal = CardStateJournal(_CARD_STATES_FILE)
+        return journal.load()
 
     async def _save_card_states(self) -> None:
-        """P0-2: Persist card states to JSON file with concurrency protection.
+        """P0-2: Persist changed card states.
 
-        H2 fix: Uses asyncio.Lock to prevent concurrent writes and atomic
-        write (temp file + rename) to prevent file corruption.
+        Only cards changed since the last save are appended to the journal;
+        saves within the group-commit window share one fsync'd append, and
+        the journal is compacted into the JSON snapshot in the background.
+
+        H2 fix: Writes and compaction share _card_states_lock; the snapshot
+        is written atomically (temp file + rename).
         """
-        async with _card_states_lock:
-            try:
-                _CARD_STATES_FILE.parent.mkdir(parents=True, exist_ok=True)
-                data = json.dumps(self._card_states, ensure_ascii=False, indent=2)
-                # Atomic write: write to temp file then rename
-                tmp_file = _CARD_STATES_FILE.with_suffix(".json.tmp")
-                await asyncio.to_thread(tmp_file.write_text, data, "utf-8")
-                await asyncio.to_thread(tmp_file.replace, _CARD_STATES_FILE)
-                logger.debug(
-                    f"Saved {len(self._card_states)} FSRS card states to {_CARD_STATES_FILE}"
-                )
-            except (OSError, TypeError) as e:
-                logger.warning(f"Failed to save FSRS card states: {e}")
+        await self._card_journal.commit(self._card_states)
+
+    def get_card_state_stats(self) -> Dict[str, Any]:
+        """Card state persistence stats (journal size, commits, load-time metric)."""
+        return {"cards": len(self._card_states), **self._card_journal.stats()}
 
     def _extract_question_from_node(self, node: Dict[str, Any]) -> str:
         """
@@ -2,6 +2,10 @@
 
 Parses vault .md files with obsidiantools, builds bidirectional NetworkX graph,
 supports N-hop neighbor queries and hot updates via asyncio.Lock.
+
+The graph can also be built from the wiki-link adjacency index that
+LanceDBClient maintains while indexing the vault (build_from_index), which
+skips re-parsing every note.
 """
 
 from __future__ import annotations
@@ -33,6 +37,7 @@ class WikilinkGraphService:
         self._vault_path: Optional[str] = None
         self._vault = None  # obsidiantools.Vault
         self._graph = None  # NetworkX graph
+        self._paths: dict[str, str] = {}  # note key -> vault path (index-built graphs)
         self._lock = asyncio.Lock()
         self._node_count = 0
         self._edge_count = 0
@@ -66,6 +71,7 @@ class WikilinkGraphService:
             self._vault_path = vault_path
             self._vault = vault
             self._graph = vault.graph
+            self._paths = {}
             self._node_count = self._graph.number_of_nodes()
             self._edge_count = self._graph.number_of_edges()
 
@@ -84,6 +90,41 @@ class WikilinkGraphService:
             "build_time_ms": round(duration_ms, 1),
         }
 
+    async def build_from_index(self, index: Any, vault_path: Optional[str] = None) -> dict[str, Any]:
+        """Build the graph from a LanceDB WikiLinkIndex (no vault parsing)."""
+        import networkx as nx
+
+        start = time.monotonic()
+        graph = nx.DiGraph()
+        paths: dict[str, str] = {}
+        for file_path in index.files():
+            key = Path(file_path).stem
+            graph.add_node(key)
+            paths.setdefault(key, file_path)
+        for source, target in index.edges():
+            graph.add_edge(Path(source).stem, Path(target).stem)
+
+        async with self._lock:
+            self._vault_path = vault_path
+            self._vault = None
+            self._graph = graph
+            self._paths = paths
+            self._node_count = graph.number_of_nodes()
+            self._edge_count = graph.number_of_edges()
+
+        duration_ms = (time.monotonic() - start) * 1000
+        logger.info(
+            "wikilink.graph_built_from_index",
+            total_nodes=self._node_count,
+            total_edges=self._edge_count,
+            graph_build_time_ms=round(duration_ms, 1),
+        )
+        return {
+            "total_nodes": self._node_count,
+            "total_edges": self._edge_count,
+            "build_time_ms": round(duration_ms, 1),
+        }
+
     def get_neighbors(self, note_path: str, hop: int = 2) -> list[NeighborNote]:
         """BFS N-hop neighbor traversal (AC #2, #3, #5)."""
         if self._graph is None:
@@ -158,7 +199,7 @@ class WikilinkGraphService:
 
     def _resolve_path(self, note_key: str) -> str:
         if self._vault is None:
-            return f"{note_key}.md"
+            return self._paths.get(note_key, f"{note_key}.md")
         try:
             source = self._vault.get_source_path(note_key)
             return str(source) if source else f"{note_key}.md"
@@ -0,0 +1,155 @@
+"""
+SnapshotJournal - JSON snapshot + JSONL write-ahead journal files.
+
+Shared storage engine of the append-only stores (Neo4jClient JSON fallback
+``FallbackStore`` and ReviewService ``CardStateJournal``). Each store keeps
+its own entry format and in-memory data; this module owns the files:
+
+- ``append()``: write entries as JSON lines, flush + fsync
+- ``replay()``: read entries in order, stopping at a torn final line
+- ``write_snapshot()``: atomic snapshot write (unique mkstemp file + fsync +
+  os.replace), then drop the journal
+- ``should_compact``: the journal passed ``compact_threshold`` entries or has
+  grown larger than the snapshot. Rewriting a snapshot never costs more than
+  the journal bytes appended since the last one (amortized O(1) per write),
+  and small stores stay folded into their snapshot, so readers of the plain
+  JSON file see recent writes
+
+A crash between the snapshot replace and the journal unlink leaves entries
+that are already in the snapshot; stores make their replay idempotent.
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Journal entries before the snapshot is rewritten
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class SnapshotJournal:
+    """Snapshot file ``path`` with its JSONL journal ``<stem>.journal.jsonl``."""
+
+    def __init__(self, path: Path, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal.jsonl")
+        self.compact_threshold = compact_threshold
+        # Entries in the journal file (replayed on load or appended since)
+        self.entries = 0
+        self.journal_bytes = 0
+        self.snapshot_bytes = 0
+
+    @property
+    def should_compact(self) -> bool:
+        if not self.entries:
+            return False
+        return self.entries >= self.compact_threshold or self.journal_bytes > self.snapshot_bytes
+
+    def read_snapshot(self) -> Optional[Any]:
+        """
+        Parsed snapshot, or None if the file does not exist.
+
+        Raises:
+            json.JSONDecodeError / OSError / UnicodeDecodeError if it cannot be read
+        """
+        if not self.path.exists():
+            return None
+        self.snapshot_bytes = self.path.stat().st_size
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def replay(self, apply: Callable[[Dict[str, Any]], bool]) -> Tuple[int, bool]:
+        """
+        Feed journal entries to ``apply`` in order.
+
+        ``apply`` returns False for entries it skipped (e.g. already in the
+        snapshot); those are not counted.
+
+        Returns:
+            (replayed entries, torn final line found)
+
+        Raises:
+            OSError / UnicodeDecodeError if the journal cannot be read
+        """
+        self.entries = 0
+        self.journal_bytes = 0
+        if not self.journal_path.exists():
+            return 0, False
+        self.journal_bytes = self.journal_path.stat().st_size
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final append (crash mid-write) — everything before it is intact.
+                    # Callers compact right away: later appends would land after it and be skipped.
+                    logger.warning(f"Skipping truncated journal entry in {self.journal_path}")
+                    return self.entries, True
+                if apply(entry) is not False:
+                    self.entries += 1
+        return self.entries, False
+
+    @staticmethod
+    def encode(entries: Iterable[Dict[str, Any]]) -> str:
+        """JSON lines for ``entries`` (raises TypeError on unserializable values)."""
+        return "".join(_dumps(entry) + "\n" for entry in entries)
+
+    def append_lines(self, lines: str) -> None:
+        """Append encoded entries durably (flush + fsync)."""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_bytes += len(lines.encode("utf-8"))
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Append entries durably; returns how many were written."""
+        entries = list(entries)
+        if not entries:
+            return 0
+        self.append_lines(self.encode(entries))
+        self.entries += len(entries)
+        return len(entries)
+
+    def write_snapshot(self, data: Any) -> None:
+        """Atomically replace the snapshot with ``data`` and drop the journal."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = _dumps(data)
+        # Atomic write: write to a unique temp file then rename, so concurrent
+        # compactions of the same file never share or remove each other's temp file
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp")
+        try:
+            # mkstemp creates 0600 files; keep the snapshot's existing permissions
+            os.chmod(tmp_path, self.path.stat().st_mode & 0o777 if self.path.exists() else 0o644)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.entries = 0
+        self.journal_bytes = 0
+        self.snapshot_bytes = len(payload.encode("utf-8"))
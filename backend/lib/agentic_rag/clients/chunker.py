@@ -0,0 +1,274 @@
+"""
+Chunker - tiktoken 计数的智能分块引擎
+
+Story 2.3 的 `_chunk_text` 每次调用都会 `tiktoken.get_encoding()`，同一句子在
+累积、长句拆分和 overlap 计算中被反复编码。本模块:
+
+- 模块级缓存 cl100k_base 编码器 (进程内只加载一次)
+- 每次调用内按文本缓存 token 数，每个句子只编码一次
+- overlap 使用句子 token 数的后缀累积数组 + 二分查找，不再逐句重新计数
+- 超长句按子句拆分时只重新编码末尾不稳定的 pre-token 片段 (线性而非平方)
+
+大 vault 的并行分块由索引流水线的 chunk worker 进程池完成
+(VaultIndexPipeline → _split_md_file_worker)，本模块只负责单进程内的分块。
+
+分块结果与原实现逐字一致 (见 tests/benchmark/test_chunker_benchmark.py)。
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import re
+from bisect import bisect_right
+from typing import Callable, Dict, List
+
+# Pattern: code blocks (```...```), math blocks ($$...$$), tables (consecutive |...| lines)
+_ATOMIC_PATTERN = re.compile(
+    r"(```[\s\S]*?```)"  # fenced code blocks
+    r"|(\$\$[\s\S]*?\$\$)"  # block math formulas
+    r"|((?:^[ \t]*\|.+\|[ \t]*$\n?){2,})",  # tables: 2+ consecutive | lines
+    re.MULTILINE,
+)
+
+# Sentence boundaries: Chinese period, English period, newline,
+# question marks, exclamation marks
+_SENTENCE_PATTERN = re.compile(
+    r"(?<=[。！？\.\!\?])\s*"  # after sentence-ending punctuation
+    r"|\n+"  # or newline(s)
+)
+
+_SUB_CLAUSE_PATTERN = re.compile(r"(?<=[，,；;：:])\s*")
+
+# Trailing pre-token pieces re-tokenized when appending text (see _ConcatCounter)
+_UNSTABLE_TAIL_PIECES = 2
+
+_encoder = None
+_pretokenizer = None
+
+
+def get_encoder():
+    """Module-level cached tiktoken cl100k_base encoder."""
+    global _encoder
+    if _encoder is None:
+        import tiktoken
+
+        _encoder = tiktoken.get_encoding("cl100k_base")
+    return _encoder
+
+
+def _get_pretokenizer():
+    """Compiled tiktoken pre-tokenization regex (None if unavailable)."""
+    global _pretokenizer
+    if _pretokenizer is None:
+        try:
+            import regex
+
+            _pretokenizer = regex.compile(get_encoder()._pat_str)
+        except Exception:
+            _pretokenizer = False
+    return _pretokenizer or None
+
+
+def count_tokens(text: str) -> int:
+    """cl100k_base token count with a char-based fallback."""
+    try:
+        return len(get_encoder().encode(text))
+    except ValueError:
+        # tiktoken regex backtracking overflow on exotic content —
+        # fall back to char-based estimate (1 token ≈ 4 chars for English,
+        # ≈ 1.5 chars for Chinese; use conservative 2 chars/token)
+        return len(text) // 2
+
+
+def _split_sentences(t: str) -> List[str]:
+    """Split text into sentences by punctuation and newlines."""
+    return [s for s in _SENTENCE_PATTERN.split(t) if s and s.strip()]
+
+
+def _split_segments(text: str) -> List[tuple]:
+    """Split text into (is_atomic, content) segments."""
+    segments = []
+    last_end = 0
+    for m in _ATOMIC_PATTERN.finditer(text):
+        before = text[last_end : m.start()]
+        if before.strip():
+            segments.append((False, before))
+        segments.append((True, m.group(0)))
+        last_end = m.end()
+    remaining = text[last_end:]
+    if remaining.strip():
+        segments.append((False, remaining))
+    return segments
+
+
+def _make_counter() -> Callable[[str], int]:
+    """Per-call memoized token counter: each distinct string is encoded once."""
+    cache: Dict[str, int] = {}
+
+    def _count(t: str) -> int:
+        n = cache.get(t)
+        if n is None:
+            n = count_tokens(t)
+            cache[t] = n
+        return n
+
+    return _count
+
+
+class _ConcatCounter:
+    """
+    Exact token count of a growing concatenation without re-encoding it.
+
+    BPE runs independently on each pre-token piece, and the pre-tokenizer
+    has no look-behind, so appending text can only change the last pieces
+    of the current string. Only that unstable tail plus the appended part
+    is encoded, which makes repeated ``count(current + part)`` checks in
+    long-sentence splitting linear instead of quadratic.
+    """
+
+    def __init__(self, count: Callable[[str], int], pretokenizer):
+        self._count = count
+        self._pat = pretokenizer
+        self.reset("")
+
+    def reset(self, text: str) -> None:
+        self._fixed = 0
+        self._tail = text
+
+    def count_with(self, part: str) -> int:
+        return self._fixed + self._count(self._tail + part)
+
+    def append(self, part: str, total: int) -> None:
+        tail_text = self._tail + part
+        pieces = self._pat.findall(tail_text)
+        keep = "".join(pieces[-_UNSTABLE_TAIL_PIECES:])
+        self._fixed = total - self._count(keep)
+        self._tail = keep
+
+
+def chunk_text(
+    text: str, max_tokens: int = 512, overlap_tokens: int = 50
+) -> List[str]:
+    """
+    Story 2.3: 智能分块 — tiktoken token 计数 + 句子边界 + 原子保护
+
+    1. 检测并保护原子单元（代码块、数学公式、表格）不被切断
+    2. 非原子文本按句子边界切分，累积到 max_tokens 上限后 flush
+    3. 超过 max_tokens 的原子单元作为独立 chunk 保留
+    4. overlap 按 token 计数（约 overlap_tokens 个 token）
+
+    Args:
+        text: 输入文本（已经过 heading 一级切分）
+        max_tokens: 每个 chunk 的 token 上限（默认 512）
+        overlap_tokens: chunk 间 token 重叠量（默认 50）
+
+    Returns:
+        List[str]: 分块后的文本列表
+    """
+    # Empty text guard
+    if not text or not text.strip():
+        return [text]
+
+    _count = _make_counter()
+
+    # If text fits in one chunk, return as-is
+    if _count(text) <= max_tokens:
+        return [text]
+
+    segments = _split_segments(text)
+    if not segments:
+        return [text.strip()]
+
+    def _split_long_sentence(sentence: str) -> List[str]:
+        """Split a sentence that exceeds max_tokens at sub-clause boundaries."""
+        pretokenizer = _get_pretokenizer()
+        # Special-token text takes the char-estimate path in count_tokens()
+        concat = (
+            _ConcatCounter(_count, pretokenizer)
+            if pretokenizer is not None and "<|" not in sentence
+            else None
+        )
+        result = []
+        current = ""
+        for part in _SUB_CLAUSE_PATTERN.split(sentence):
+            candidate = current + part if current else part
+            if concat is not None:
+                n = concat.count_with(part) if current else _count(part)
+            else:
+                n = _count(candidate)
+            if n <= max_tokens:
+                current = candidate
+                if concat is not None:
+                    concat.append(part, n)
+            else:
+                if current.strip():
+                    result.append(current.strip())
+                current = part
+                if concat is not None:
+                    concat.reset(part)
+        if current.strip():
+            result.append(current.strip())
+        return result if result else [sentence]
+
+    chunks: List[str] = []
+    current_parts: List[str] = []
+    current_tokens = 0
+
+    def _flush_current() -> None:
+        nonlocal current_parts, current_tokens
+        if current_parts:
+            joined = "\n".join(current_parts).strip()
+            if joined:
+                chunks.append(joined)
+        current_parts = []
+        current_tokens = 0
+
+    def _overlap_parts() -> tuple:
+        """Longest sentence suffix of the last chunk within overlap_tokens."""
+        if not chunks or overlap_tokens <= 0:
+            return [], 0
+        sentences = _split_sentences(chunks[-1])
+        # suffix[i] = tokens of sentences[-i:], non-decreasing in i
+        suffix = [0]
+        for s in reversed(sentences):
+            suffix.append(suffix[-1] + _count(s))
+        take = bisect_right(suffix, overlap_tokens) - 1
+        if take <= 0:
+            return [], 0
+        return sentences[-take:], suffix[take]
+
+    for is_atomic, segment in segments:
+        if is_atomic:
+            seg_tokens = _count(segment)
+            if current_tokens + seg_tokens <= max_tokens:
+                current_parts.append(segment)
+                current_tokens += seg_tokens
+            else:
+                # Flush current chunk, then emit atomic as standalone
+                _flush_current()
+                chunks.append(segment.strip())
+            continue
+
+        for sentence in _split_sentences(segment):
+            s_tokens = _count(sentence)
+
+            # Handle sentences that exceed max_tokens on their own
+            if s_tokens > max_tokens:
+                _flush_current()
+                chunks.extend(_split_long_sentence(sentence))
+                continue
+
+            if current_tokens + s_tokens > max_tokens:
+                _flush_current()
+                # Add overlap from previous chunk
+                overlap, overlap_count = _overlap_parts()
+                current_parts = list(overlap)
+                current_tokens = overlap_count
+
+            current_parts.append(sentence)
+            current_tokens += s_tokens
+
+    _flush_current()
+
+    return chunks if chunks else [text.strip()]
+
@@ -0,0 +1,139 @@
+"""
+CourseTagIndex - 课程 → 标签集合的物化索引 (Story 2.8 Tag Jaccard 桥接)
+
+find_related_courses 原先每次 progressive_scope_search 第 2 阶段扩展都全表扫描
+course / tags_str 再逐行聚合。本模块把聚合结果常驻内存并增量维护:
+
+- 课程标签: (course, tag) → chunk 计数，按文件 (canvas_file) 记录各自贡献，
+  删除/重建文件时精确扣减 (计数归零时标签从课程中移除)
+- 邻居: 预计算课程两两 Jaccard (只保存 > 0 的对)；一批更新后只重算
+  标签集合变化的课程 (通过 tag → courses 倒排索引找候选)
+- 查询: related(course, threshold) 为字典查找，不再扫描表
+
+由 LanceDBClient 首次使用时扫描一次构建，之后由 add_documents /
+_delete_file_chunks(_delete_files_chunks) 增量更新；删表等其它写入使其失效后重建。
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+Pair = Tuple[str, str]
+
+
+def tag_jaccard(tags_a: Set[str], tags_b: Set[str]) -> float:
+    """Jaccard similarity of two tag sets (0.0 when either is empty)."""
+    if not tags_a or not tags_b:
+        return 0.0
+    return len(tags_a & tags_b) / len(tags_a | tags_b)
+
+
+class CourseTagIndex:
+    """Course tag sets with precomputed pairwise Jaccard neighbours."""
+
+    def __init__(self):
+        self._pair_counts: Counter = Counter()
+        self._file_pairs: Dict[str, Counter] = {}
+        self._course_tags: Dict[str, Set[str]] = {}
+        self._tag_courses: Dict[str, Set[str]] = {}
+        self._neighbours: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _pairs(course: Optional[str], tags: Iterable[str]) -> Counter:
+        if not course:
+            return Counter()
+        return Counter((course, tag) for tag in set(tags) if tag)
+
+    def add_rows(self, rows: Iterable[Tuple[str, Optional[str], Iterable[str]]]) -> None:
+        """Add chunks: (canvas_file, course, tags)."""
+        changed: Set[str] = set()
+        for file_path, course, tags in rows:
+            pairs = self._pairs(course, tags)
+            if not pairs:
+                continue
+            self._file_pairs.setdefault(file_path or "", Counter()).update(pairs)
+            for pair, count in pairs.items():
+                if self._pair_counts[pair] == 0:
+                    self._link(pair, changed)
+                self._pair_counts[pair] += count
+        self._refresh(changed)
+
+    def remove_files(self, file_paths: Iterable[str]) -> None:
+        """Drop every chunk contributed by these files."""
+        changed: Set[str] = set()
+        for file_path in file_paths:
+            pairs = self._file_pairs.pop(file_path, None)
+            if not pairs:
+                continue
+            for pair, count in pairs.items():
+                remaining = self._pair_counts[pair] - count
+                if remaining > 0:
+                    self._pair_counts[pair] = remaining
+                else:
+                    del self._pair_counts[pair]
+                    self._unlink(pair, changed)
+        self._refresh(changed)
+
+    def _link(self, pair: Pair, changed: Set[str]) -> None:
+        course, tag = pair
+        self._course_tags.setdefault(course, set()).add(tag)
+        self._tag_courses.setdefault(tag, set()).add(course)
+        changed.add(course)
+
+    def _unlink(self, pair: Pair, changed: Set[str]) -> None:
+        course, tag = pair
+        tags = self._course_tags.get(course)
+        if tags is not None:
+            tags.discard(tag)
+            if not tags:
+                del self._course_tags[course]
+        courses = self._tag_courses.get(tag)
+        if courses is not None:
+            courses.discard(course)
+            if not courses:
+                del self._tag_courses[tag]
+        changed.add(course)
+
+    def _refresh(self, changed: Set[str]) -> None:
+        """Recompute Jaccard between each changed course and the courses it may touch."""
+        for course in changed:
+            tags = self._course_tags.get(course, set())
+            candidates: Set[str] = set(self._neighbours.get(course, {}))
+            for tag in tags:
+                candidates |= self._tag_courses.get(tag, set())
+            candidates.discard(course)
+
+            row = self._neighbours.setdefault(course, {})
+            for other in candidates:
+                score = tag_jaccard(tags, self._course_tags.get(other, set()))
+                if score > 0:
+                    row[other] = score
+                    self._neighbours.setdefault(other, {})[course] = score
+                else:
+                    row.pop(other, None)
+                    other_row = self._neighbours.get(other)
+                    if other_row is not None:
+                        other_row.pop(course, None)
+                        if not other_row:
+                            del self._neighbours[other]
+            if not row:
+                del self._neighbours[course]
+
+    def related(self, course: str, threshold: float) -> List[str]:
+        """Courses with tag Jaccard > threshold, most similar first."""
+        row = self._neighbours.get(course, {})
+        ranked = sorted(row.items(), key=lambda item: (-item[1], item[0]))
+        return [other for other, score in ranked if score > threshold]
+
+    def course_tags(self, course: str) -> Set[str]:
+        return set(self._course_tags.get(course, set()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "courses": len(self._course_tags),
+            "tags": len(self._tag_courses),
+            "files": len(self._file_pairs),
+            "neighbour_pairs": sum(len(row) for row in self._neighbours.values()) // 2,
+        }
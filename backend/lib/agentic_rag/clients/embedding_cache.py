@@ -0,0 +1,379 @@
+"""
+EmbeddingCache - 内容寻址的持久化 embedding 缓存
+
+每次重建索引、每次查询都会调用 Ollama / MultimodalVectorizer，即使完全相同的
+chunk 文本之前已经 embedding 过 (编辑笔记后未改动的小节、重复的模板段落、
+重复的查询)。本模块按 (model, 规范化文本哈希) 缓存向量:
+
+- 内存前端: LRU (cachetools.LRUCache)，命中时零 I/O
+- 磁盘后端: SQLite (WAL) 表，向量以 float32 BLOB 存储，按主键查找
+- 容量上限: 磁盘条目超过 max_disk_entries 时按 last_access 淘汰最久未用条目
+  (内存与磁盘命中只记录在内存中，攒批后随下一次写入/淘汰/close 一并写回
+  last_access，查找本身不产生写事务; 常驻内存的热点向量在磁盘上同样是"新"的)
+- 条目计数: 打开时 COUNT 一次，之后随插入/淘汰增减，写入与 stats() 不再全表计数
+- 异步接口: aget_many / aput_many 在 asyncio.to_thread 中访问 SQLite，
+  内存命中不离开事件循环
+- 指标: memory_hits / disk_hits / misses / evictions / hit_rate
+
+编辑一篇笔记后，只有发生变化的 heading 小节需要重新 embedding。
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from cachetools import LRUCache
+
+try:
+    from loguru import logger
+
+    LOGURU_ENABLED = True
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    LOGURU_ENABLED = False
+
+
+# 磁盘条目超出上限该比例后才触发淘汰，避免每次写入都 DELETE
+_EVICTION_SLACK = 0.1
+
+# SQLite 单条语句参数上限 (SQLITE_MAX_VARIABLE_NUMBER 默认 999)
+_SQL_PARAM_CHUNK = 500
+
+# 待写回的 last_access 达到该数量，或距上次写回超过该秒数时才落盘
+_ACCESS_FLUSH_ENTRIES = 256
+_ACCESS_FLUSH_INTERVAL_S = 30.0
+
+
+def normalize_text(text: str) -> str:
+    """规范化文本: Unicode NFC + 统一换行 + 去除首尾空白"""
+    return unicodedata.normalize("NFC", text.replace("\r\n", "\n")).strip()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    arr = array("f")
+    arr.frombytes(blob)
+    return arr.tolist()
+
+
+class EmbeddingCache:
+    """
+    (model, text) → vector 的两级缓存
+
+    Args:
+        path: SQLite 文件路径 (None = 仅内存缓存)
+        model: embedding 模型名，参与缓存键计算
+        max_memory_entries: 内存 LRU 容量
+        max_disk_entries: 磁盘条目上限
+
+    Usage:
+        >>> cache = EmbeddingCache("data/lancedb/embedding_cache.sqlite3", "BAAI/bge-m3")
+        >>> vectors = cache.get_many(texts)      # 未命中为 None
+        >>> cache.put_many(missed_texts, missed_vectors)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        model: str,
+        max_memory_entries: int = 10000,
+        max_disk_entries: int = 500000,
+    ):
+        self.path = path
+        self.model = model
+        self.max_disk_entries = max_disk_entries
+        self._memory: LRUCache = LRUCache(maxsize=max(1, max_memory_entries))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # 磁盘命中的 key → 访问时间，延迟写回 last_access
+        self._pending_access: Dict[str, float] = {}
+        self._last_access_flush = time.monotonic()
+        # 磁盘条目数 (打开时 COUNT 一次，随插入/淘汰维护)
+        self._disk_count = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path:
+            self._open()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _open(self) -> None:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, "
+                "vector BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access "
+                "ON embeddings(last_access)"
+            )
+            conn.commit()
+            self._disk_count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._conn = conn
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(
+                    f"[EmbeddingCache] Disk cache unavailable ({self.path}), memory only: {e}"
+                )
+            self._conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._flush_access()
+                    self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+
+    def key_for(self, text: str) -> str:
+        """缓存键: sha256(model \\0 normalized_text)"""
+        payload = f"{self.model}\x00{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, text: str) -> Optional[List[float]]:
+        return self.get_many([text])[0]
+
+    async def aget(self, text: str) -> Optional[List[float]]:
+        return (await self.aget_many([text]))[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """批量查找，返回与 texts 对齐的列表 (未命中为 None)"""
+        results, disk_lookup = self._memory_lookup(texts)
+        if disk_lookup:
+            self._disk_lookup(disk_lookup, results)
+        return results
+
+    async def aget_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """get_many 的异步版本: 内存未命中的部分在线程中查 SQLite"""
+        results, disk_lookup = self._memory_lookup(texts)
+        if disk_lookup:
+            await asyncio.to_thread(self._disk_lookup, disk_lookup, results)
+        return results
+
+    def _memory_lookup(self, texts: Sequence[str]):
+        """内存 LRU 查找，返回 (results, 未命中 key → 下标列表)"""
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        disk_lookup: Dict[str, List[int]] = {}
+        now = time.time()
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = self.key_for(text)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    results[i] = vector
+                    self.memory_hits += 1
+                    if self._conn is not None:
+                        # 热点向量常驻内存，磁盘 last_access 也要刷新，否则最先被淘汰
+                        self._pending_access[key] = now
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+        return results, disk_lookup
+
+    def _disk_lookup(
+        self, disk_lookup: Dict[str, List[int]], results: List[Optional[List[float]]]
+    ) -> None:
+        with self._lock:
+            if self._conn is not None:
+                found = self._disk_get(list(disk_lookup.keys()))
+                for key, vector in found.items():
+                    self._memory[key] = vector
+                    for i in disk_lookup.pop(key):
+                        results[i] = vector
+                        self.disk_hits += 1
+            self.misses += sum(len(idx) for idx in disk_lookup.values())
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(keys), _SQL_PARAM_CHUNK):
+                part = keys[start : start + _SQL_PARAM_CHUNK]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    part,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = _unpack(blob)
+            if found:
+                now = time.time()
+                for key in found:
+                    self._pending_access[key] = now
+                if (
+                    len(self._pending_access) >= _ACCESS_FLUSH_ENTRIES
+                    or time.monotonic() - self._last_access_flush >= _ACCESS_FLUSH_INTERVAL_S
+                ):
+                    self._flush_access()
+                    self._conn.commit()
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"[EmbeddingCache] Disk lookup failed: {e}")
+        return found
+
+    def _flush_access(self) -> None:
+        """写回延迟的 last_access (调用方持有锁并负责 commit)"""
+        self._last_access_flush = time.monotonic()
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+            [(ts, key) for key, ts in pending.items()],
+        )
+
+    # ------------------------------------------------------------------
+    # Insert / eviction
+    # ------------------------------------------------------------------
+
+    def put(self, text: str, vector: Sequence[float]) -> None:
+        self.put_many([text], [vector])
+
+    def put_many(
+        self, texts: Sequence[str], vectors: Sequence[Optional[Sequence[float]]]
+    ) -> None:
+        rows = self._memory_put(texts, vectors)
+        if rows:
+            self._disk_put(rows)
+
+    async def aput_many(
+        self, texts: Sequence[str], vectors: Sequence[Optional[Sequence[float]]]
+    ) -> None:
+        """put_many 的异步版本: SQLite 写入在线程中执行"""
+        rows = self._memory_put(texts, vectors)
+        if rows and self._conn is not None:
+            await asyncio.to_thread(self._disk_put, rows)
+
+    def _memory_put(
+        self, texts: Sequence[str], vectors: Sequence[Optional[Sequence[float]]]
+    ) -> List[tuple]:
+        """写入内存 LRU，返回待写入磁盘的行"""
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if not vector:
+                    continue
+                key = self.key_for(text)
+                vec = list(vector)
+                self._memory[key] = vec
+                rows.append((key, self.model, len(vec), _pack(vec), now))
+        return rows
+
+    def _disk_put(self, rows: List[tuple]) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                new_keys = {row[0] for row in rows} - self._existing_keys([row[0] for row in rows])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(key, model, dim, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                # 同一事务顺带写回延迟的 last_access
+                self._flush_access()
+                self._conn.commit()
+                self._disk_count += len(new_keys)
+                self._evict_if_needed()
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.debug(f"[EmbeddingCache] Disk write failed: {e}")
+
+    def _existing_keys(self, keys: List[str]) -> set:
+        """已在磁盘上的 key (主键查找，调用方持有锁)"""
+        existing = set()
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _SQL_PARAM_CHUNK):
+            part = unique[start : start + _SQL_PARAM_CHUNK]
+            placeholders = ",".join("?" * len(part))
+            rows = self._conn.execute(
+                f"SELECT key FROM embeddings WHERE key IN ({placeholders})", part
+            ).fetchall()
+            existing.update(key for (key,) in rows)
+        return existing
+
+    def _evict_if_needed(self) -> None:
+        if self._disk_count <= self.max_disk_entries * (1 + _EVICTION_SLACK):
+            return
+        excess = self._disk_count - self.max_disk_entries
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        deleted = max(cursor.rowcount, 0)
+        self._disk_count -= deleted
+        self.evictions += deleted
+        if LOGURU_ENABLED:
+            logger.debug(f"[EmbeddingCache] Evicted {deleted} least-recently-used entries")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._pending_access.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+                self._disk_count = 0
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def disk_entries(self) -> int:
+        """磁盘条目数 (维护的计数，不访问 SQLite)"""
+        if self._conn is None:
+            return 0
+        return self._disk_count
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model": self.model,
+            "path": self.path,
+            "memory_entries": len(self._memory),
+            "memory_capacity": int(self._memory.maxsize),
+            "disk_entries": self.disk_entries(),
+            "disk_capacity": self.max_disk_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pending_access_updates": len(self._pending_access),
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4)
+            if lookups
+            else 0.0,
+        }
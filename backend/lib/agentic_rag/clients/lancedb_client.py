@@ -41,9 +41,13 @@ Updated: 2026-03-16 (Story 2.3 - bge-m3 Migration)
 import asyncio
 import json
 import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 try:
     from loguru import logger
@@ -71,14 +75,22 @@ except ImportError:
     NUMPY_AVAILABLE = False
 
 # Story 2.4: jieba 中文分词支持
-try:
-    import jieba
+# 词典由 JiebaTokenizer 在应用启动时后台预热 (首次分词时也会懒加载)
+from .tokenization import JIEBA_AVAILABLE, get_jieba_tokenizer, index_tokenization
 
-    JIEBA_AVAILABLE = True
-    # 预加载 jieba 字典，避免首次分词时 1-2 秒延迟
-    jieba.initialize()
-except ImportError:
-    JIEBA_AVAILABLE = False
+# 请求级共享查询向量 (prepare_query_embeddings → 各检索节点)
+from .query_embeddings import current_query_embedding_scope, query_embedding_scope
+
+# Story 2.8: 课程标签物化索引 (Tag Jaccard 桥接)
+from .course_tag_index import CourseTagIndex, tag_jaccard
+
+# Story 2.8: 笔记级 wiki-link 邻接索引 (邻居扩展)
+from .wikilink_index import WikiLinkIndex
+
+# (db_path, table) -> lock serializing background index maintenance (vector
+# create_index / optimize and FTS merges) across LanceDBClient instances
+_table_maintenance_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_table_maintenance_locks_guard = threading.Lock()
 
 
 def _jieba_tokenize(text: str) -> str:
@@ -96,12 +108,14 @@ def _jieba_tokenize(text: str) -> str:
     Returns:
         空格分隔的分词文本
     """
-    if not JIEBA_AVAILABLE:
-        return text
-    if not text or not text.strip():
-        return text
-    tokens = jieba.cut(text, cut_all=False)
-    return " ".join(tokens)
+    return get_jieba_tokenizer().tokenize(text)
+
+
+def _split_tags(tags_str: Optional[str]) -> List[str]:
+    """Story 2.8: frontmatter tags_str ("a,b") → values of the tags list column."""
+    if not tags_str:
+        return []
+    return [t.strip() for t in str(tags_str).split(",") if t.strip()]
 
 
 def _chunk_text(
@@ -110,10 +124,8 @@ def _chunk_text(
     """
     Story 2.3: 智能分块 — tiktoken token 计数 + 句子边界 + 原子保护
 
-    1. 检测并保护原子单元（代码块、数学公式、表格）不被切断
-    2. 非原子文本按句子边界切分，累积到 max_tokens 上限后 flush
-    3. 超过 max_tokens 的原子单元作为独立 chunk 保留
-    4. overlap 按 token 计数（约 overlap_tokens 个 token）
+    Delegates to the chunker engine (cached encoder, each sentence encoded
+    once, cumulative-offset overlap). See agentic_rag.clients.chunker.
 
     Args:
         text: 输入文本（已经过 heading 一级切分）
@@ -123,159 +135,29 @@ def _chunk_text(
     Returns:
         List[str]: 分块后的文本列表
     """
-    import re
+    from .chunker import chunk_text
 
-    import tiktoken
+    return chunk_text(text, max_tokens, overlap_tokens)
 
-    enc = tiktoken.get_encoding("cl100k_base")
 
-    def _count_tokens(t: str) -> int:
-        try:
-            return len(enc.encode(t))
-        except ValueError:
-            # tiktoken regex backtracking overflow on exotic content —
-            # fall back to char-based estimate (1 token ≈ 4 chars for English,
-            # ≈ 1.5 chars for Chinese; use conservative 2 chars/token)
-            return len(t) // 2
-
-    # Empty text guard
-    if not text or not text.strip():
-        return [text] if text else [text]
-
-    # If text fits in one chunk, return as-is
-    if _count_tokens(text) <= max_tokens:
-        return [text]
-
-    # --- Step 1: Split text into segments (atomic vs splittable) ---
-    # Pattern: code blocks (```...```), math blocks ($$...$$), tables (consecutive |...| lines)
-    atomic_pattern = re.compile(
-        r"(```[\s\S]*?```)"  # fenced code blocks
-        r"|(\$\$[\s\S]*?\$\$)"  # block math formulas
-        r"|((?:^[ \t]*\|.+\|[ \t]*$\n?){2,})",  # tables: 2+ consecutive | lines
-        re.MULTILINE,
-    )
+def _split_md_file_worker(
+    rel_path: str, content: str, max_tokens: int, overlap_tokens: int
+) -> List[Dict[str, Any]]:
+    """
+    Module-level chunking entry point for the indexing pipeline.
 
-    segments = []  # list of (is_atomic: bool, content: str)
-    last_end = 0
-    for m in atomic_pattern.finditer(text):
-        # Text before the atomic unit
-        before = text[last_end : m.start()]
-        if before.strip():
-            segments.append((False, before))
-        # The atomic unit itself
-        segments.append((True, m.group(0)))
-        last_end = m.end()
-    # Remaining text after last atomic unit
-    remaining = text[last_end:]
-    if remaining.strip():
-        segments.append((False, remaining))
-
-    if not segments:
-        return [text.strip()]
-
-    # --- Step 2: Split non-atomic text into sentences ---
-    # Sentence boundaries: Chinese period, English period, newline,
-    # question marks, exclamation marks
-    sentence_pattern = re.compile(
-        r"(?<=[。！？\.\!\?])\s*"  # after sentence-ending punctuation
-        r"|\n+"  # or newline(s)
+    Kept at module level so it can be pickled into a ProcessPoolExecutor.
+    FTS pre-tokenization also happens here, so it runs in the chunk worker
+    processes rather than in the writer. Chunks go through tokenize_batch(),
+    which bypasses the query tokenization LRU.
+    """
+    chunks = LanceDBClient._split_md_by_heading(
+        content, rel_path, max_tokens, overlap_tokens
     )
-
-    def _split_sentences(t: str) -> List[str]:
-        """Split text into sentences by punctuation and newlines."""
-        parts = sentence_pattern.split(t)
-        sentences = [s for s in parts if s and s.strip()]
-        return sentences
-
-    def _split_long_sentence(sentence: str) -> List[str]:
-        """Split a sentence that exceeds max_tokens at sub-clause boundaries."""
-        sub_pattern = re.compile(r"(?<=[，,；;：:])\s*")
-        parts = sub_pattern.split(sentence)
-        result = []
-        current = ""
-        for part in parts:
-            candidate = current + part if current else part
-            if _count_tokens(candidate) <= max_tokens:
-                current = candidate
-            else:
-                if current.strip():
-                    result.append(current.strip())
-                current = part
-        if current.strip():
-            result.append(current.strip())
-        return result if result else [sentence]
-
-    # --- Step 3: Build chunks from segments ---
-    chunks: List[str] = []
-    current_parts: List[str] = []
-    current_tokens = 0
-
-    def _flush_current():
-        nonlocal current_parts, current_tokens
-        if current_parts:
-            chunk_text_joined = "\n".join(current_parts).strip()
-            if chunk_text_joined:
-                chunks.append(chunk_text_joined)
-        current_parts = []
-        current_tokens = 0
-
-    def _get_overlap_parts() -> List[str]:
-        """Get the last few sentences from the most recent chunk for overlap."""
-        if not chunks or overlap_tokens <= 0:
-            return chunks[0:0]  # empty list without literal
-        last_chunk = chunks[-1]
-        sentences = _split_sentences(last_chunk)
-        overlap_parts = chunks[0:0]  # empty list without literal
-        overlap_count = 0
-        for s in reversed(sentences):
-            s_tokens = _count_tokens(s)
-            if overlap_count + s_tokens > overlap_tokens:
-                break
-            overlap_parts.insert(0, s)
-            overlap_count += s_tokens
-        return overlap_parts
-
-    for is_atomic, segment in segments:
-        if is_atomic:
-            seg_tokens = _count_tokens(segment)
-            # If atomic fits in current chunk, add it
-            if current_tokens + seg_tokens <= max_tokens:
-                current_parts.append(segment)
-                current_tokens += seg_tokens
-            else:
-                # Flush current chunk, then emit atomic as standalone
-                _flush_current()
-                chunks.append(segment.strip())
-        else:
-            # Split into sentences and accumulate
-            sentences = _split_sentences(segment)
-            for sentence in sentences:
-                s_tokens = _count_tokens(sentence)
-
-                # Handle sentences that exceed max_tokens on their own
-                if s_tokens > max_tokens:
-                    _flush_current()
-                    for sub in _split_long_sentence(sentence):
-                        chunks.append(sub)
-                    continue
-
-                if current_tokens + s_tokens > max_tokens:
-                    _flush_current()
-                    # Add overlap from previous chunk
-                    overlap_parts = _get_overlap_parts()
-                    if overlap_parts:
-                        current_parts = list(overlap_parts)
-                        current_tokens = sum(_count_tokens(p) for p in overlap_parts)
-                    else:
-                        current_tokens = 0
-
-                current_parts.append(sentence)
-                current_tokens += s_tokens
-
-    # Flush remaining
-    _flush_current()
-
-    return chunks if chunks else [text.strip()]
+    tokenized = get_jieba_tokenizer().tokenize_batch([c["content"] for c in chunks])
+    for chunk, content_tokenized in zip(chunks, tokenized):
+        chunk["content_tokenized"] = content_tokenized
+    return chunks
 
 
 class LanceDBClient:
@@ -326,6 +208,25 @@ class LanceDBClient:
         "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2": 384,  # [deprecated]
     }
 
+    # ANN 向量索引: PQ/IVF 训练至少需要的行数; 距离必须与 table.search() 默认 (L2) 一致
+    ANN_MIN_TRAINING_ROWS = 256
+    ANN_METRIC = "l2"
+
+    # 过滤列的标量索引 (只为表中存在的列创建): 低基数列用 BITMAP,
+    # canvas_file 用 BTREE, tags 列表列用 LABEL_LIST (array_has_any 走索引)
+    SCALAR_INDEXES = {
+        "subject": "BITMAP",
+        "course": "BITMAP",
+        "category": "BITMAP",
+        "canvas_file": "BTREE",
+        "tags": "LABEL_LIST",
+    }
+
+    # progressive_scope_search 模式: cascade 逐级串行 / concurrent 各级并发 /
+    # wide 一次宽范围检索后按行元数据划分 scope_level (候选数 = num_results × 倍数)
+    SCOPE_SEARCH_MODES = ("cascade", "concurrent", "wide")
+    SCOPE_WIDE_OVERSAMPLE = 4
+
     def __init__(
         self,
         db_path: str = "data/lancedb",  # ✅ Story 38.1 Fix: 从 backend/ 目录运行时路径正确
@@ -335,6 +236,24 @@ class LanceDBClient:
         batch_size: int = 100,
         enable_fallback: bool = True,
         vault_id: Optional[str] = None,
+        enable_embedding_cache: bool = True,
+        embedding_cache_path: Optional[str] = None,
+        embedding_cache_max_memory: int = 10000,
+        embedding_cache_max_disk: int = 500000,
+        ollama_max_connections: int = 8,
+        embed_coalesce_window_ms: float = 5.0,
+        search_workers: int = 4,
+        fts_incremental: bool = True,
+        fts_debounce_seconds: float = 2.0,
+        fts_stale_rows: int = 2000,
+        enable_result_cache: bool = True,
+        ann_auto_index: bool = True,
+        ann_index_type: str = "IVF_SQ",
+        ann_min_rows: int = 50000,
+        ann_optimize_rows: int = 10000,
+        ann_retrain_growth: float = 2.0,
+        ann_nprobes: Optional[int] = 20,
+        ann_refine_factor: Optional[int] = None,
     ):
         """
         初始化 LanceDBClient
@@ -350,6 +269,24 @@ class LanceDBClient:
             batch_size: 批量处理大小 (默认: 100, Story 23.2 AC 2)
             enable_fallback: 启用降级(超时/错误时返回空结果)
             vault_id: Vault namespace (None = dynamic from config)
+            enable_embedding_cache: 启用 (model, text) 内容寻址 embedding 缓存
+            embedding_cache_path: 缓存 SQLite 路径 (默认: {db_path}/embedding_cache.sqlite3)
+            embedding_cache_max_memory: 内存 LRU 条目上限
+            embedding_cache_max_disk: 磁盘条目上限 (超出按最久未用淘汰)
+            ollama_max_connections: Ollama 共享连接池上限
+            embed_coalesce_window_ms: 并发单条 embed() 合并为批量请求的等待窗口 (0 = 不合并)
+            search_workers: 搜索线程池大小 (Dense/FTS 分支在事件循环外并发执行)
+            fts_incremental: FTS 增量维护 (索引只建一次, 之后去抖合并新增行)
+            fts_debounce_seconds: 增量 FTS 合并的去抖窗口
+            fts_stale_rows: 未索引行数达到该阈值时立即执行 optimize
+            enable_result_cache: 启用检索结果缓存 (按表索引版本精确失效)
+            ann_auto_index: 表行数达到 ann_min_rows 后自动创建 ANN 向量索引
+            ann_index_type: 向量索引类型 ("IVF_SQ" / "IVF_PQ" / "IVF_HNSW_SQ")
+            ann_min_rows: 自动建索引的行数阈值 (以下保持精确 flat 扫描)
+            ann_optimize_rows: 未索引行数达到该值时 optimize() 合并进索引
+            ann_retrain_growth: 行数增长到训练时的该倍数后重新训练索引 (0 = 不重训)
+            ann_nprobes: 默认 nprobes (search() 可按调用覆盖)
+            ann_refine_factor: 默认 refine_factor (None = 不精排)
         """
         self.db_path = os.path.expanduser(db_path)
         self.embedding_dim = embedding_dim
@@ -368,6 +305,80 @@ class LanceDBClient:
         self._vectorizer = None
         self._vectorizer_initialized = False
 
+        # Throughput stats of the last index_vault_notes pipeline run
+        self._last_index_stats: Optional[Dict[str, Any]] = None
+
+        # Content-addressed embedding cache (created lazily on first embed)
+        self.enable_embedding_cache = enable_embedding_cache
+        self.embedding_cache_path = embedding_cache_path
+        self.embedding_cache_max_memory = embedding_cache_max_memory
+        self.embedding_cache_max_disk = embedding_cache_max_disk
+        self._embedding_cache = None
+
+        # Shared pooled Ollama HTTP client (one per base URL, see ollama_embed_client)
+        self.ollama_max_connections = ollama_max_connections
+        self.embed_coalesce_window_ms = embed_coalesce_window_ms
+
+        # Bounded executor for blocking LanceDB search calls (created lazily)
+        self.search_workers = max(1, search_workers)
+        self._search_executor: Optional[ThreadPoolExecutor] = None
+        # Rolling per-branch search latencies (ms) for get_stats()
+        self._search_latency: Dict[str, deque] = {
+            branch: deque(maxlen=256) for branch in ("embed", "dense", "fts", "total")
+        }
+
+        # Incremental FTS maintenance: table -> pending debounced optimize task
+        self.fts_incremental = fts_incremental
+        self.fts_debounce_seconds = fts_debounce_seconds
+        self.fts_stale_rows = fts_stale_rows
+        self._fts_pending: Dict[str, asyncio.Task] = {}
+        # table -> in-flight merge started past the staleness threshold
+        self._fts_merging: Dict[str, asyncio.Task] = {}
+
+        self._fts_stats: Dict[str, Any] = {
+            "full_rebuilds": 0,
+            "deferred_updates": 0,
+            "incremental_merges": 0,
+            "stale_merges": 0,
+            "last_merge_ms": None,
+        }
+
+        # Search result cache shared across instances (see query_cache)
+        self.enable_result_cache = enable_result_cache
+
+        # ANN vector index lifecycle: table -> background build/optimize task
+        self.ann_auto_index = ann_auto_index
+        self.ann_index_type = ann_index_type.upper()
+        self.ann_min_rows = max(self.ANN_MIN_TRAINING_ROWS, ann_min_rows)
+        self.ann_optimize_rows = max(1, ann_optimize_rows)
+        self.ann_retrain_growth = ann_retrain_growth
+        self.ann_nprobes = ann_nprobes
+        self.ann_refine_factor = ann_refine_factor
+        self._ann_pending: Dict[str, asyncio.Task] = {}
+        self._ann_trained_rows: Dict[str, int] = {}
+        self._ann_stats: Dict[str, Any] = {
+            "builds": 0,
+            "retrains": 0,
+            "optimizations": 0,
+            "failures": 0,
+            "last_build_ms": None,
+            "last_optimize_ms": None,
+        }
+
+        # BM25 term statistics for context compression: table -> (version, stats)
+        self._term_stats: Dict[str, Tuple[int, Any]] = {}
+        self._term_stats_pending: Dict[str, asyncio.Task] = {}
+
+        # Story 2.8: course -> tag set index with Jaccard neighbours, per table
+        # (built on first use, then maintained by add_documents / file deletes)
+        # table -> (index version it is current for, CourseTagIndex)
+        self._course_indexes: Dict[str, Tuple[int, CourseTagIndex]] = {}
+
+        # Story 2.8: note-level wiki-link graph, per table (persisted in
+        # WIKILINK_TABLE, maintained by index_vault_notes / index_single_file)
+        # table -> (index version it is current for, WikiLinkIndex)
+        self._wikilink_indexes: Dict[str, Tuple[int, WikiLinkIndex]] = {}
+
     # =========================================================================
     # Story 1.9: Vault-ID table namespacing
     # =========================================================================
@@ -431,6 +442,9 @@ class LanceDBClient:
             try:
                 self._db.drop_table(tname, ignore_missing=True)
                 self._tables_cache.pop(tname, None)
+                self._course_indexes.pop(tname, None)
+                self._forget_wikilink_index(tname)
+                self._bump_index_version(tname)
             except Exception:
                 pass
         return len(tables)
@@ -496,10 +510,70 @@ class LanceDBClient:
             for tname in vector_tables:
                 self._check_and_fix_dimension_mismatch(tname, self.embedding_dim)
 
+            # Story 2.8: tags list column + filter indexes for pre-existing tables
+            for tname in vector_tables:
+                if tname in self._tables_cache:
+                    self._migrate_filter_columns(tname)
+
         except Exception as e:
             if LOGURU_ENABLED:
                 logger.debug(f"Failed to cache tables: {e}")
 
+    # tags_str → tags for rows written before the tags column existed
+    _TAGS_FROM_TAGS_STR_SQL = (
+        "array_remove(string_to_array("
+        "regexp_replace(trim(tags_str), '\\s*,\\s*', ',', 'g'), ','), '')"
+    )
+
+    def _migrate_filter_columns(self, table_name: str) -> None:
+        """
+        Add the tags list column to tables that only have tags_str, then make
+        sure the scalar filter indexes exist.
+        """
+        try:
+            tbl = self._db.open_table(table_name)
+            columns = set(tbl.schema.names)
+            if "tags_str" in columns and "tags" not in columns:
+                tbl.add_columns({"tags": self._TAGS_FROM_TAGS_STR_SQL})
+                self._tables_cache[table_name] = tbl
+                self._bump_index_version(table_name)
+                if LOGURU_ENABLED:
+                    logger.info(f"[INDEX] Migrated '{table_name}': added tags column")
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(f"[INDEX] tags column migration failed: {e}")
+        self._ensure_scalar_indexes(table_name)
+
+    def _ensure_scalar_indexes(self, table_name: str) -> None:
+        """Create missing BITMAP/BTREE/LABEL_LIST indexes on filter columns.
+
+        Rows added later are merged into them by the same optimize() pass that
+        maintains the FTS index; unmerged rows are scanned.
+        """
+        if self._db is None:
+            return
+        try:
+            from lancedb.index import Bitmap, BTree, LabelList
+
+            configs = {"BITMAP": Bitmap, "BTREE": BTree, "LABEL_LIST": LabelList}
+            tbl = self._db.open_table(table_name)
+            columns = set(tbl.schema.names)
+            indexed = {c for index in tbl.list_indices() for c in index.columns}
+            created = []
+            for column, index_type in self.SCALAR_INDEXES.items():
+                if column in columns and column not in indexed:
+                    tbl.create_index(column, config=configs[index_type]())
+                    created.append(column)
+            if created:
+                self._tables_cache[table_name] = tbl
+                if LOGURU_ENABLED:
+                    logger.info(
+                        f"[INDEX] Created scalar indexes on '{table_name}': {created}"
+                    )
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(f"[INDEX] Scalar index creation failed: {e}")
+
     # =========================================================================
     # Story 2.7: File Fingerprint Infrastructure
     # =========================================================================
@@ -675,6 +749,90 @@ class LanceDBClient:
                     f"[fingerprint] Failed to remove fingerprint for {file_path}: {e}"
                 )
 
+    def _result_cache(self):
+        from .query_cache import get_search_result_cache
+
+        return get_search_result_cache()
+
+    def _table_version(self, table_name: str) -> int:
+        """Index version of a table, bumped by every client that writes to it."""
+        return self._result_cache().version(os.path.abspath(self.db_path), table_name)
+
+    def _bump_index_version(self, table_name: str) -> None:
+        """Invalidate cached search results for a table after it changed."""
+        cache = self._result_cache()
+        db_path = os.path.abspath(self.db_path)
+        previous = cache.version(db_path, table_name)
+        version = cache.bump(db_path, table_name)
+        # This client applied its own change to its derived indexes; writes
+        # from other clients still force a rebuild
+        for indexes in (self._course_indexes, self._wikilink_indexes):
+            entry = indexes.get(table_name)
+            if entry is not None and entry[0] == previous:
+                indexes[table_name] = (version, entry[1])
+
+    async def get_term_statistics(self, table_name: str = "vault_notes"):
+        """
+        BM25 document frequencies over a table's jieba-tokenized chunks.
+
+        Statistics are built in a worker thread from the content_tokenized
+        column and rebuilt in the background whenever the table's index
+        version moves on. Callers never wait for a scan: until the first
+        build finishes this returns None, and during a rebuild it returns
+        the previous statistics.
+
+        Returns:
+            agentic_rag.compression.TermStatistics or None
+        """
+        table_name = self.resolve_table_name(table_name)
+        if not self._initialized:
+            await self.initialize()
+        if self._db is None:
+            return None
+
+        version = self._table_version(table_name)
+        cached = self._term_stats.get(table_name)
+        if cached is None or cached[0] != version:
+            task = self._term_stats_pending.get(table_name)
+            if task is None or task.done():
+                self._term_stats_pending[table_name] = asyncio.get_running_loop().create_task(
+                    self._build_term_statistics(table_name, version)
+                )
+        return cached[1] if cached else None
+
+    async def _build_term_statistics(self, table_name: str, version: int) -> None:
+        t0 = time.perf_counter()
+        try:
+            stats = await asyncio.to_thread(self._scan_term_statistics, table_name)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"[term_stats] Failed to scan '{table_name}': {e}")
+            stats = None
+        # A failed or empty scan is cached too: retried on the next version
+        self._term_stats[table_name] = (version, stats)
+        if LOGURU_ENABLED and stats is not None:
+            logger.debug(
+                f"[term_stats] '{table_name}': {stats.num_docs} docs, "
+                f"{len(stats.doc_freq)} terms in {(time.perf_counter() - t0) * 1000:.0f}ms"
+            )
+
+    def _scan_term_statistics(self, table_name: str):
+        from agentic_rag.compression import TermStatistics
+
+        if table_name not in self._db.table_names():
+            return None
+        tbl = self._db.open_table(table_name)
+        if "content_tokenized" not in tbl.schema.names:
+            return None
+        column = (
+            tbl.search()
+            .select(["content_tokenized"])
+            .limit(None)
+            .to_arrow()
+            .column("content_tokenized")
+        )
+        return TermStatistics.from_tokenized(column.to_pylist())
+
     def _delete_file_chunks(self, table_name: str, file_path: str) -> int:
         """
         Story 2.7 AC-2: Delete all chunks for a file from a LanceDB table.
@@ -703,6 +861,9 @@ class LanceDBClient:
 
             escaped = file_path.replace("'", "''")
             tbl.delete(f"canvas_file = '{escaped}'")
+            self._course_index_remove_files(table_name, [file_path])
+            self._wikilink_index_remove_files(table_name, [file_path])
+            self._bump_index_version(table_name)
             if LOGURU_ENABLED:
                 logger.debug(
                     f"[index] Deleted old chunks for '{file_path}' from '{table_name}'"
@@ -715,6 +876,80 @@ class LanceDBClient:
                 )
             return 0
 
+    def _delete_files_chunks(self, table_name: str, file_paths: List[str]) -> int:
+        """
+        Bulk variant of _delete_file_chunks: one delete for many files.
+
+        Returns:
+            1 on success, 0 on failure.
+        """
+        if self._db is None or not file_paths:
+            return 0
+
+        try:
+            if table_name in self._tables_cache:
+                tbl = self._tables_cache[table_name]
+            else:
+                try:
+                    tbl = self._db.open_table(table_name)
+                    self._tables_cache[table_name] = tbl
+                except Exception:
+                    return 0
+
+            in_list = ", ".join(f"'{self._escape_sql(fp)}'" for fp in file_paths)
+            tbl.delete(f"canvas_file IN ({in_list})")
+            self._course_index_remove_files(table_name, file_paths)
+            self._wikilink_index_remove_files(table_name, file_paths)
+            self._bump_index_version(table_name)
+            return 1
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(
+                    f"[index] Failed to bulk delete chunks for {len(file_paths)} files: {e}"
+                )
+            return 0
+
+    def _update_fingerprints(self, records: List[tuple]):
+        """
+        Bulk variant of _update_fingerprint.
+
+        Args:
+            records: [(file_path, content_hash, chunk_count), ...]
+        """
+        if self._db is None or not records:
+            return
+
+        now = datetime.now().isoformat()
+        rows = [
+            {
+                "file_path": file_path,
+                "content_hash": content_hash,
+                "last_indexed": now,
+                "chunk_count": chunk_count,
+            }
+            for file_path, content_hash, chunk_count in records
+        ]
+
+        try:
+            if self.FINGERPRINT_TABLE in self._tables_cache:
+                tbl = self._tables_cache[self.FINGERPRINT_TABLE]
+                in_list = ", ".join(
+                    f"'{self._escape_sql(r['file_path'])}'" for r in rows
+                )
+                try:
+                    tbl.delete(f"file_path IN ({in_list})")
+                except Exception:
+                    pass
+                tbl.add(rows)
+            else:
+                tbl = self._db.create_table(self.FINGERPRINT_TABLE, data=rows)
+                self._tables_cache[self.FINGERPRINT_TABLE] = tbl
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.error(
+                    f"[fingerprint] Failed to update {len(rows)} fingerprints: {e}"
+                )
+
     async def rebuild_index(
         self,
         vault_path: str,
@@ -757,6 +992,9 @@ class LanceDBClient:
         try:
             self._db.drop_table(table_name, ignore_missing=True)
             self._tables_cache.pop(table_name, None)
+            self._course_indexes.pop(table_name, None)
+            self._forget_wikilink_index(table_name)
+            self._bump_index_version(table_name)
         except Exception:
             pass
 
@@ -916,6 +1154,9 @@ class LanceDBClient:
                     escaped_node = node_id.replace("'", "''")
                     try:
                         tbl.delete(f"node_id = '{escaped_node}'")
+                        self._course_indexes.pop(table_name, None)
+                        self._wikilink_indexes.pop(table_name, None)
+                        self._bump_index_version(table_name)
                     except Exception:
                         pass
             except Exception:
@@ -926,6 +1167,8 @@ class LanceDBClient:
         # Story 2.4: Rebuild FTS index for hybrid search support
         if count > 0:
             self._rebuild_fts_index(table_name)
+            self._ensure_scalar_indexes(table_name)
+            self._maintain_vector_index(table_name)
 
         if LOGURU_ENABLED:
             logger.info(
@@ -984,34 +1227,26 @@ class LanceDBClient:
             self._vectorizer_initialized = True
             return False
 
+    def _get_ollama_client(self):
+        """Shared pooled Ollama client for the configured OLLAMA_BASE_URL."""
+        from .ollama_embed_client import get_ollama_embed_client
+
+        return get_ollama_embed_client(
+            model="bge-m3",
+            max_connections=self.ollama_max_connections,
+            coalesce_window_ms=self.embed_coalesce_window_ms,
+        )
+
     async def _ollama_embed(self, text: str) -> Optional[List[float]]:
         """
         Embed text via Ollama API (GPU-accelerated).
 
         Uses the bge-m3 model loaded in the Ollama container with GPU passthrough.
+        Concurrent calls within the coalescing window share one /api/embed batch
+        request over the pooled session.
         Returns None if Ollama is unavailable, allowing fallback to CPU vectorizer.
         """
-        import aiohttp
-
-        ollama_url = os.environ.get("OLLAMA_BASE_URL", "http://ollama:11434")
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{ollama_url}/api/embed",
-                    json={"model": "bge-m3", "input": text},
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        embeddings = data.get("embeddings")
-                        if embeddings and len(embeddings) > 0:
-                            return embeddings[0]
-                    if LOGURU_ENABLED:
-                        logger.debug(f"Ollama embed returned status {resp.status}")
-        except Exception as e:
-            if LOGURU_ENABLED:
-                logger.debug(f"Ollama embed unavailable: {e}")
-        return None
+        return await self._get_ollama_client().embed(text, timeout_s=30)
 
     async def _ollama_embed_batch(
         self, texts: List[str]
@@ -1022,29 +1257,68 @@ class LanceDBClient:
         Ollama /api/embed supports batch input natively.
         Returns None if Ollama is unavailable.
         """
-        import aiohttp
+        return await self._get_ollama_client().embed_batch(texts, timeout_s=120)
 
-        ollama_url = os.environ.get("OLLAMA_BASE_URL", "http://ollama:11434")
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{ollama_url}/api/embed",
-                    json={"model": "bge-m3", "input": texts},
-                    timeout=aiohttp.ClientTimeout(total=120),
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        embeddings = data.get("embeddings")
-                        if embeddings and len(embeddings) == len(texts):
-                            return embeddings
-                    if LOGURU_ENABLED:
-                        logger.debug(
-                            f"Ollama batch embed returned status {resp.status}"
-                        )
-        except Exception as e:
-            if LOGURU_ENABLED:
-                logger.debug(f"Ollama batch embed unavailable: {e}")
-        return None
+    def _get_embedding_cache(self):
+        """Lazily open the embedding cache (None when disabled)."""
+        if not self.enable_embedding_cache:
+            return None
+        if self._embedding_cache is None:
+            from .embedding_cache import EmbeddingCache
+
+            path = self.embedding_cache_path or os.path.join(
+                self.db_path, "embedding_cache.sqlite3"
+            )
+            self._embedding_cache = EmbeddingCache(
+                path=path,
+                model=self.embedding_model,
+                max_memory_entries=self.embedding_cache_max_memory,
+                max_disk_entries=self.embedding_cache_max_disk,
+            )
+        return self._embedding_cache
+
+    async def _embed_cached(
+        self, texts: List[str], compute
+    ) -> Optional[List[List[float]]]:
+        """
+        Batch embed through the embedding cache.
+
+        Only cache misses (deduplicated) are passed to ``compute``; results are
+        written back to the cache.
+
+        Args:
+            texts: Texts to embed.
+            compute: async callable(texts) -> vectors or None.
+
+        Returns:
+            One vector per text, or None if ``compute`` failed.
+        """
+        cache = self._get_embedding_cache()
+        if cache is None:
+            return await compute(texts)
+
+        vectors = await cache.aget_many(texts)
+        missing: Dict[str, List[int]] = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(texts[i], []).append(i)
+        if not missing:
+            return vectors
+
+        miss_texts = list(missing.keys())
+        computed = await compute(miss_texts)
+        if computed is None or len(computed) != len(miss_texts):
+            return None
+        for text, vector in zip(miss_texts, computed):
+            for i in missing[text]:
+                vectors[i] = vector
+        await cache.aput_many(miss_texts, computed)
+        return vectors
+
+    async def _vectorizer_batch(self, texts: List[str]) -> List[List[float]]:
+        """CPU vectorizer batch embedding returning plain vectors."""
+        vectorized = await self._vectorizer.batch_vectorize(texts)
+        return [v.vector for v in vectorized]
 
     async def embed(self, text: str) -> List[float]:
         """
@@ -1052,6 +1326,7 @@ class LanceDBClient:
 
         Story 2.3: 使用 bge-m3 生成 1024 维 Dense 向量
         优先使用 Ollama GPU embedding，失败时 fallback 到 sentence-transformers CPU。
+        命中 embedding 缓存时不调用任何模型。
 
         Args:
             text: 要向量化的文本
@@ -1062,6 +1337,56 @@ class LanceDBClient:
         Raises:
             RuntimeError: 如果所有 embedding 方式都失败
         """
+        cache = self._get_embedding_cache()
+        if cache is not None:
+            cached = await cache.aget(text)
+            if cached is not None:
+                return cached
+
+        vector = await self._compute_embedding(text)
+        if cache is not None:
+            await cache.aput_many([text], [vector])
+        return vector
+
+    async def embed_queries(self, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        批量向量化查询 (每个不同的 query 只 embedding 一次)
+
+        供 prepare_query_embeddings 节点在检索 fan-out 前调用:
+        去重后走一次批量 embedding (cache → Ollama GPU → CPU vectorizer)，
+        批量不可用时逐条 fallback 到 embed()。
+
+        Args:
+            texts: 查询文本 (可重复)
+
+        Returns:
+            Dict[str, List[float]]: query → 向量，embedding 失败的 query 不在结果中
+        """
+        unique = list(dict.fromkeys(t for t in texts if t))
+        if not unique:
+            return {}
+
+        vectors = None
+        if self._embedder is None:
+            try:
+                vectors = await self._embed_cached(
+                    unique, self._compute_embeddings_batch
+                )
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.warning(f"[embed_queries] Batch embedding failed: {e}")
+        if vectors is not None:
+            return dict(zip(unique, vectors))
+
+        embedded: Dict[str, List[float]] = {}
+        for text in unique:
+            vector = await self._embed_query_text(text)
+            if vector is not None:
+                embedded[text] = vector
+        return embedded
+
+    async def _compute_embedding(self, text: str) -> List[float]:
+        """Uncached single-text embedding (Ollama GPU → CPU vectorizer)."""
         # Try Ollama GPU first
         result = await self._ollama_embed(text)
         if result is not None:
@@ -1145,20 +1470,23 @@ class LanceDBClient:
 
         # ✅ Story 23.2 AC 2: 批量向量化 (batch_size=100)
         # ✅ Verified from MultimodalVectorizer.batch_vectorize() (line 455-515)
+        # 未改动的节点直接命中 embedding 缓存
         try:
-            vectorized = await self._vectorizer.batch_vectorize(texts)
+            vectors = await self._embed_cached(texts, self._vectorizer_batch)
         except Exception as e:
             if LOGURU_ENABLED:
                 logger.error(f"Batch vectorization failed: {e}")
             return 0
+        if vectors is None:
+            return 0
 
         # 准备LanceDB文档
         documents = []
-        for node, vec_result in zip(text_nodes, vectorized):
+        for node, vector in zip(text_nodes, vectors):
             doc = {
                 "doc_id": f"canvas_{node['id']}",
                 "content": node.get("text", ""),
-                "vector": vec_result.vector,
+                "vector": vector,
                 "canvas_file": canvas_path,
                 "node_id": node.get("id", ""),
                 "node_type": node.get("type", "text"),
@@ -1184,6 +1512,8 @@ class LanceDBClient:
         # Story 2.4: Rebuild FTS index on content_tokenized for hybrid search support
         if count > 0:
             self._rebuild_fts_index(table_name)
+            self._ensure_scalar_indexes(table_name)
+            self._maintain_vector_index(table_name)
 
         if LOGURU_ENABLED:
             logger.info(f"Indexed {count} nodes from {canvas_path} to {table_name}")
@@ -1200,6 +1530,11 @@ class LanceDBClient:
         subject: Optional[str] = None,
         force_rebuild: bool = False,
         progress_callback=None,
+        embed_batch_size: Optional[int] = None,
+        embed_concurrency: int = 2,
+        chunk_workers: Optional[int] = None,
+        write_batch_size: int = 512,
+        queue_size: int = 64,
     ) -> int:
         """
         Story 2.7: Fingerprint-driven incremental vault indexing.
@@ -1219,6 +1554,15 @@ class LanceDBClient:
             subject: Subject tag for isolation.
             force_rebuild: If True, skip fingerprint comparison and index all files.
             progress_callback: Optional callable(current, total) for progress.
+                A callable(current, total, stats) additionally receives
+                throughput stats (files_per_sec, chunks_per_sec, ...).
+            embed_batch_size: Chunks per cross-file embedding batch
+                (default: self.batch_size).
+            embed_concurrency: Max embedding batches in flight.
+            chunk_workers: Chunking processes (None = min(4, cpu_count),
+                <=1 = chunk in a thread).
+            write_batch_size: Chunks buffered per bulk LanceDB insert.
+            queue_size: Capacity of the bounded queues between stages.
 
         Returns:
             int: Total number of chunks indexed.
@@ -1233,7 +1577,7 @@ class LanceDBClient:
         await self._init_vectorizer()
         # Note: _vectorizer may be None here, but Ollama GPU batch path at
         # _ollama_embed_batch() does not require it. Only bail out if BOTH
-        # Ollama and vectorizer are unavailable (checked per-file below).
+        # Ollama and vectorizer are unavailable (checked per embedding batch).
 
         if skip_dirs is None:
             skip_dirs = [".obsidian", ".git", ".trash", "node_modules"]
@@ -1290,102 +1634,138 @@ class LanceDBClient:
             self._remove_fingerprint(del_rel)
             if LOGURU_ENABLED:
                 logger.debug(f"[INDEX] Cleaned deleted file: {del_rel}")
+        if deleted_files_rel:
+            self._delete_wikilink_rows(table_name, deleted_files_rel)
 
         if not files_to_index:
             # Nothing to index — but still rebuild FTS if deletions happened
             if deleted_files_rel:
                 self._rebuild_fts_index(table_name)
+                self._bump_index_version(table_name)
 
             duration_ms = (time.perf_counter() - index_start) * 1000
             if LOGURU_ENABLED:
                 logger.info(f"[INDEX] No files to index, duration={duration_ms:.0f}ms")
             return 0
 
-        # Process files: chunk + vectorize + delete-before-insert
-        import hashlib
+        # Pipelined indexing: read → chunk (process pool) → cross-file embedding
+        # batches → bulk insert. See vault_index_pipeline for stage details.
+        from .vault_index_pipeline import VaultIndexPipeline
 
-        total_chunks_indexed = 0
-        for file_idx, md_file in enumerate(files_to_index):
-            if progress_callback:
-                progress_callback(file_idx + 1, len(files_to_index))
+        async def _write(jobs) -> int:
+            return await self._write_indexed_files(table_name, jobs, subject)
 
-            try:
-                with open(md_file, "r", encoding="utf-8") as fh:
-                    content = fh.read()
-            except Exception as e:
-                if LOGURU_ENABLED:
-                    logger.debug(f"Skipping {md_file}: {e}")
-                continue
+        pipeline = VaultIndexPipeline(
+            chunk_fn=_split_md_file_worker,
+            embed_fn=self._embed_texts_for_index,
+            write_fn=_write,
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            embed_batch_size=embed_batch_size or self.batch_size,
+            embed_concurrency=embed_concurrency,
+            chunk_workers=(
+                chunk_workers
+                if chunk_workers is not None
+                else min(4, os.cpu_count() or 1)
+            ),
+            write_batch_size=write_batch_size,
+            queue_size=queue_size,
+            progress_callback=progress_callback,
+        )
+        files = [
+            (fp, os.path.relpath(fp, vault_path).replace("\\", "/"))
+            for fp in files_to_index
+        ]
+        self._last_index_stats = await pipeline.run(files)
+        total_chunks_indexed = self._last_index_stats["chunks_written"]
 
-            if not content.strip():
-                continue
+        # Story 2.7 AC-5: Rebuild FTS index after incremental update
+        self._rebuild_fts_index(table_name)
+        self._ensure_scalar_indexes(table_name)
+        self._maintain_vector_index(table_name)
+        self._bump_index_version(table_name)
 
-            rel_path = os.path.relpath(md_file, vault_path).replace("\\", "/")
-            chunks = self._split_md_by_heading(
-                content, rel_path, max_tokens, overlap_tokens
+        duration_ms = (time.perf_counter() - index_start) * 1000
+        if LOGURU_ENABLED:
+            logger.info(
+                f"[INDEX] Complete: {total_chunks_indexed} chunks from "
+                f"{len(files_to_index)} files in {duration_ms:.0f}ms"
             )
 
-            if not chunks:
-                continue
+        return total_chunks_indexed
 
-            # Batch vectorize chunks for this file (Ollama GPU → CPU fallback)
-            texts = [c["content"] for c in chunks]
-            ollama_vectors = await self._ollama_embed_batch(texts)
-            if ollama_vectors is not None:
-                # Wrap in namedtuple-like objects for compatibility
-                from types import SimpleNamespace
+    async def _embed_texts_for_index(
+        self, texts: List[str]
+    ) -> Optional[List[List[float]]]:
+        """
+        Batch embed chunk texts for indexing (cache → Ollama GPU → CPU vectorizer).
 
-                vectorized = [SimpleNamespace(vector=v) for v in ollama_vectors]
-            else:
-                if self._vectorizer is None:
-                    if LOGURU_ENABLED:
-                        logger.error(
-                            f"Both Ollama and CPU vectorizer unavailable, skipping {rel_path}"
-                        )
-                    continue
-                try:
-                    vectorized = await self._vectorizer.batch_vectorize(texts)
-                except Exception as e:
-                    if LOGURU_ENABLED:
-                        logger.error(f"Vectorization failed for {rel_path}: {e}")
-                    continue
+        Unchanged sections of an edited note hit the embedding cache, so only
+        changed headings cost embedding time.
 
-            # Build documents
-            documents = []
-            for chunk, vec_result in zip(chunks, vectorized):
-                chunk_id = hashlib.md5(
-                    f"{chunk['file_path']}:{chunk.get('heading', '')}:{chunk['content'][:100]}".encode()
-                ).hexdigest()
-
-                metadata = {
-                    "file_path": chunk["file_path"],
-                    "heading": chunk.get("heading", ""),
-                    "heading_path": chunk.get("heading_path", []),
-                    "line_start": chunk.get("line_start"),
-                    "line_end": chunk.get("line_end"),
-                    "source": "vault_note",
-                    "subject": subject,
-                    "source_type": (
-                        "video_transcript"
-                        if LanceDBClient._is_video_transcript(chunk["file_path"])
-                        else "note"
-                    ),
-                    # Story 2.8: Frontmatter metadata
-                    "course": chunk.get("course", ""),
-                    "tags_str": chunk.get("tags_str", ""),
-                    "category": chunk.get("category", ""),
-                }
+        Returns:
+            One vector per text, or None if no embedding backend is available.
+        """
+        return await self._embed_cached(texts, self._compute_embeddings_batch)
 
-                if LanceDBClient._is_video_transcript(chunk["file_path"]):
-                    ts_info = LanceDBClient._extract_timestamps_from_section(
-                        chunk.get("heading", ""), chunk["content"]
-                    )
-                    metadata.update(ts_info)
+    async def _compute_embeddings_batch(
+        self, texts: List[str]
+    ) -> Optional[List[List[float]]]:
+        """Uncached batch embedding (Ollama GPU → CPU vectorizer fallback)."""
+        ollama_vectors = await self._ollama_embed_batch(texts)
+        if ollama_vectors is not None:
+            return ollama_vectors
+
+        if self._vectorizer is None:
+            return None
+        return await self._vectorizer_batch(texts)
+
+    @staticmethod
+    def _build_vault_note_documents(
+        chunks: List[Dict[str, Any]],
+        vectors: List[List[float]],
+        subject: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Build LanceDB vault_notes documents from chunks and their vectors."""
+        import hashlib
+
+        documents = []
+        for chunk, vector in zip(chunks, vectors):
+            chunk_id = hashlib.md5(
+                f"{chunk['file_path']}:{chunk.get('heading', '')}:{chunk['content'][:100]}".encode()
+            ).hexdigest()
+
+            metadata = {
+                "file_path": chunk["file_path"],
+                "heading": chunk.get("heading", ""),
+                "heading_path": chunk.get("heading_path", []),
+                "line_start": chunk.get("line_start"),
+                "line_end": chunk.get("line_end"),
+                "source": "vault_note",
+                "subject": subject,
+                "source_type": (
+                    "video_transcript"
+                    if LanceDBClient._is_video_transcript(chunk["file_path"])
+                    else "note"
+                ),
+                # Story 2.8: Frontmatter metadata
+                "course": chunk.get("course", ""),
+                "tags_str": chunk.get("tags_str", ""),
+                "category": chunk.get("category", ""),
+            }
+
+            if LanceDBClient._is_video_transcript(chunk["file_path"]):
+                ts_info = LanceDBClient._extract_timestamps_from_section(
+                    chunk.get("heading", ""), chunk["content"]
+                )
+                metadata.update(ts_info)
 
-                doc = {
+            documents.append(
+                {
                     "doc_id": f"vault_{chunk_id}",
                     "content": chunk["content"],
-                    "vector": vec_result.vector,
+                    "content_tokenized": chunk.get("content_tokenized"),
+                    "vector": vector,
                     "canvas_file": chunk["file_path"],
                     "node_id": "",
                     "node_type": "vault_note",
@@ -1400,49 +1780,363 @@ class LanceDBClient:
                     "timestamp": datetime.now().isoformat(),
                     "metadata_json": json.dumps(metadata, ensure_ascii=False),
                 }
-                documents.append(doc)
+            )
+        return documents
 
-            # Story 2.7 AC-2: delete-before-insert
-            self._delete_file_chunks(table_name, rel_path)
+    async def _write_indexed_files(
+        self, table_name: str, jobs: List[Any], subject: Optional[str]
+    ) -> int:
+        """
+        Bulk write stage of the indexing pipeline.
 
-            # Insert new chunks
-            chunk_count = await self.add_documents(table_name, documents)
-            total_chunks_indexed += chunk_count
+        One delete for all files in the batch (delete-before-insert), one
+        add_documents call for all their chunks, then one fingerprint update.
 
-            # Update fingerprint — use in-memory content to avoid TOCTOU race
-            # (file may have changed on disk between read and hash)
-            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
-            self._update_fingerprint(rel_path, content_hash, chunk_count)
+        Args:
+            table_name: Resolved LanceDB table name.
+            jobs: IndexFileJob list whose chunks are fully embedded.
+            subject: Subject tag for isolation.
 
-            if LOGURU_ENABLED:
-                logger.debug(f"[INDEX] Indexed {chunk_count} chunks from {rel_path}")
+        Returns:
+            Number of chunks written (0 on failure; fingerprints are not
+            updated so the files are retried on the next run).
+        """
+        import hashlib
 
-        # Story 2.7 AC-5: Rebuild FTS index after incremental update
-        self._rebuild_fts_index(table_name)
+        documents: List[Dict[str, Any]] = []
+        wikilinks: List[Tuple[str, List[str], List[str]]] = []
+        for job in jobs:
+            job_documents = self._build_vault_note_documents(job.chunks, job.vectors, subject)
+            documents.extend(job_documents)
+            wikilinks.append(
+                (
+                    job.rel_path,
+                    self._extract_wiki_links(job.content),
+                    [doc["doc_id"] for doc in job_documents],
+                )
+            )
+        if not documents:
+            return 0
+
+        # Story 2.7 AC-2: delete-before-insert
+        self._delete_files_chunks(table_name, [job.rel_path for job in jobs])
+
+        count = await self.add_documents(table_name, documents)
+        if count == 0:
+            return 0
+        self._wikilink_index_set_files(table_name, wikilinks)
+
+        # Update fingerprint — use in-memory content to avoid TOCTOU race
+        # (file may have changed on disk between read and hash)
+        self._update_fingerprints(
+            [
+                (
+                    job.rel_path,
+                    hashlib.sha256(job.content.encode("utf-8")).hexdigest(),
+                    len(job.chunks),
+                )
+                for job in jobs
+            ]
+        )
 
-        duration_ms = (time.perf_counter() - index_start) * 1000
         if LOGURU_ENABLED:
-            logger.info(
-                f"[INDEX] Complete: {total_chunks_indexed} chunks from "
-                f"{len(files_to_index)} files in {duration_ms:.0f}ms"
+            logger.debug(
+                f"[INDEX] Bulk wrote {count} chunks from {len(jobs)} files"
             )
+        return count
 
-        return total_chunks_indexed
+    def _rebuild_fts_index(self, table_name: str, force: bool = False):
+        """
+        Story 2.7 AC-5: Refresh the FTS index on content_tokenized after an update.
+
+        The index is built from scratch only when it does not exist yet (or
+        when ``force`` / ``fts_incremental=False``). Otherwise the update is
+        deferred: new rows are merged into the existing index by a debounced
+        ``optimize()`` pass, or immediately once ``fts_stale_rows`` rows are
+        unindexed. Rows not yet merged are still found by FTS queries (LanceDB
+        scans unindexed fragments alongside the index), so search stays
+        correct in the meantime.
+        """
+        try:
+            tbl = self._db.open_table(table_name)
+            index = self._get_fts_index(tbl)
+            if force or not self.fts_incremental or index is None:
+                self._cancel_fts_refresh(table_name)
+                tbl.create_fts_index("content_tokenized", replace=True)
+                # Cached handles are pinned to the pre-index version
+                self._tables_cache[table_name] = tbl
+                self._fts_stats["full_rebuilds"] += 1
+                if LOGURU_ENABLED:
+                    logger.info(
+                        f"[INDEX] Rebuilt FTS index on '{table_name}.content_tokenized' (jieba_available={JIEBA_AVAILABLE})"
+                    )
+                return
+
+            unindexed = self._fts_unindexed_rows(tbl, index)
+            if unindexed >= self.fts_stale_rows:
+                self._cancel_fts_refresh(table_name)
+                self._fts_stats["stale_merges"] += 1
+                self._start_fts_merge(table_name)
+                return
+            self._schedule_fts_refresh(table_name)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(f"[INDEX] FTS index rebuild failed: {e}")
 
-    def _rebuild_fts_index(self, table_name: str):
+    @staticmethod
+    def _get_fts_index(tbl):
+        """Return the FTS IndexConfig on content_tokenized, or None."""
+        try:
+            for index in tbl.list_indices():
+                if index.index_type == "FTS" and "content_tokenized" in index.columns:
+                    return index
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def _fts_unindexed_rows(tbl, index) -> int:
+        unindexed = getattr(index, "num_unindexed_rows", None)
+        if unindexed is None:
+            try:
+                unindexed = tbl.index_stats(index.name).num_unindexed_rows
+            except Exception:
+                unindexed = 0
+        return unindexed or 0
+
+    def _table_maintenance_lock(self, table_name: str) -> threading.Lock:
+        """Per-table lock so index builds and optimize() never overlap on one table."""
+        key = (os.path.abspath(self.db_path), table_name)
+        with _table_maintenance_locks_guard:
+            lock = _table_maintenance_locks.get(key)
+            if lock is None:
+                lock = _table_maintenance_locks[key] = threading.Lock()
+            return lock
+
+    def _merge_fts_index(self, table_name: str) -> None:
+        """Merge unindexed rows into the existing FTS index (and compact files)."""
+        t0 = time.perf_counter()
+        try:
+            tbl = self._db.open_table(table_name)
+            with self._table_maintenance_lock(table_name):
+                tbl.optimize()
+            self._tables_cache[table_name] = tbl
+            self._fts_stats["incremental_merges"] += 1
+            self._fts_stats["last_merge_ms"] = round(
+                (time.perf_counter() - t0) * 1000, 2
+            )
+            if LOGURU_ENABLED:
+                logger.debug(
+                    f"[INDEX] Merged new rows into FTS index of '{table_name}' "
+                    f"in {self._fts_stats['last_merge_ms']}ms"
+                )
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(f"[INDEX] FTS incremental merge failed: {e}")
+
+    def _schedule_fts_refresh(self, table_name: str) -> None:
+        """Debounce FTS merges: a newer update restarts the window."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._merge_fts_index(table_name)
+            return
+        self._cancel_fts_refresh(table_name)
+        self._fts_stats["deferred_updates"] += 1
+        self._fts_pending[table_name] = loop.create_task(
+            self._debounced_fts_merge(table_name)
+        )
+
+    def _start_fts_merge(self, table_name: str) -> None:
+        """Merge now without debouncing; off the event loop when one is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._merge_fts_index(table_name)
+            return
+        task = self._fts_merging.get(table_name)
+        if task is not None and not task.done():
+            # The in-flight optimize() also picks up rows written before it started;
+            # anything later is merged by the next update or flush
+            self._schedule_fts_refresh(table_name)
+            return
+        self._fts_merging[table_name] = loop.create_task(self._stale_fts_merge(table_name))
+
+    async def _stale_fts_merge(self, table_name: str) -> None:
+        try:
+            await asyncio.to_thread(self._merge_fts_index, table_name)
+        finally:
+            self._fts_merging.pop(table_name, None)
+
+    def _cancel_fts_refresh(self, table_name: str) -> None:
+        task = self._fts_pending.pop(table_name, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def _debounced_fts_merge(self, table_name: str) -> None:
+        try:
+            await asyncio.sleep(self.fts_debounce_seconds)
+        except asyncio.CancelledError:
+            # Superseded by a newer update
+            return
+        self._fts_pending.pop(table_name, None)
+        await self._run_search_blocking(self._merge_fts_index, table_name)
+
+    async def flush_fts_updates(self) -> int:
+        """Run all pending debounced FTS merges now and wait for in-flight ones. Returns tables merged."""
+        merging = [t for t in self._fts_merging.values() if not t.done()]
+        if merging:
+            await asyncio.gather(*merging, return_exceptions=True)
+        tables = list(self._fts_pending.keys())
+        for table_name in tables:
+            self._cancel_fts_refresh(table_name)
+            await self._run_search_blocking(self._merge_fts_index, table_name)
+        return len(tables)
+
+    # =========================================================================
+    # ANN vector index lifecycle
+    # =========================================================================
+
+    def _maintain_vector_index(self, table_name: str) -> None:
         """
-        Story 2.7 AC-5: Rebuild FTS index on content_tokenized after incremental update.
+        Create or refresh the ANN vector index after a table update.
+
+        - no index and >= ann_min_rows rows: build one (ann_index_type)
+        - rows grew ann_retrain_growth x since training: retrain (replace)
+        - >= ann_optimize_rows unindexed rows: optimize() merges them in
+
+        Smaller tables keep exact flat search. Jobs run in a worker thread
+        when an event loop is running; rows not merged yet are still found
+        (LanceDB flat-scans unindexed fragments alongside the index).
         """
+        if not self.ann_auto_index or self._db is None:
+            return
+        try:
+            tbl = self._db.open_table(table_name)
+            action = self._vector_index_action(table_name, tbl)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(f"[INDEX] Vector index check failed: {e}")
+            return
+        if action is None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._run_vector_index_job(table_name, action)
+            return
+        task = self._ann_pending.get(table_name)
+        if task is not None and not task.done():
+            # A job is in flight; the next update re-checks
+            return
+        self._ann_pending[table_name] = loop.create_task(
+            self._vector_index_job(table_name, action)
+        )
+
+    def _vector_index_action(self, table_name: str, tbl) -> Optional[str]:
+        rows = tbl.count_rows()
+        index = self._get_vector_index(tbl)
+        if index is None:
+            return "create" if rows >= self.ann_min_rows else None
+
+        trained = self._ann_trained_rows.setdefault(
+            table_name, getattr(index, "num_indexed_rows", None) or rows
+        )
+        if self.ann_retrain_growth and rows >= trained * self.ann_retrain_growth:
+            return "retrain"
+        if self._fts_unindexed_rows(tbl, index) >= self.ann_optimize_rows:
+            return "optimize"
+        return None
+
+    @staticmethod
+    def _get_vector_index(tbl):
+        """Return the IndexConfig of the ANN index on the vector column, or None."""
+        try:
+            for index in tbl.list_indices():
+                index_type = str(index.index_type).upper()
+                if "vector" in index.columns and (
+                    index_type.startswith("IVF") or "HNSW" in index_type
+                ):
+                    return index
+        except Exception:
+            pass
+        return None
+
+    def _vector_index_config(self):
+        from lancedb.index import IvfHnswSq, IvfPq, IvfSq
+
+        # IVF_SQ is the default: near-exact recall at nprobes=20 and cheap to
+        # (re)train; default IVF_PQ sub-vectors lose too much recall without
+        # refine_factor (see tests/benchmark/test_ann_index_benchmark.py).
+        # Partition / sub-vector counts follow LanceDB's size-based defaults.
+        config_cls = {
+            "IVF_PQ": IvfPq,
+            "IVF_HNSW_SQ": IvfHnswSq,
+        }.get(self.ann_index_type, IvfSq)
+        return config_cls(distance_type=self.ANN_METRIC)
+
+    def _run_vector_index_job(self, table_name: str, action: str) -> None:
+        """Build, retrain or optimize the vector index (blocking)."""
+        t0 = time.perf_counter()
         try:
             tbl = self._db.open_table(table_name)
-            tbl.create_fts_index("content_tokenized", replace=True)
+            if action == "optimize":
+                with self._table_maintenance_lock(table_name):
+                    tbl.optimize()
+                self._ann_stats["optimizations"] += 1
+                self._ann_stats["last_optimize_ms"] = round(
+                    (time.perf_counter() - t0) * 1000, 2
+                )
+            else:
+                with self._table_maintenance_lock(table_name):
+                    rows = tbl.count_rows()
+                    # With config=, the first positional argument is the column
+                    tbl.create_index(
+                        "vector", config=self._vector_index_config(), replace=True
+                    )
+                self._ann_trained_rows[table_name] = rows
+                self._ann_stats["builds" if action == "create" else "retrains"] += 1
+                self._ann_stats["last_build_ms"] = round(
+                    (time.perf_counter() - t0) * 1000, 2
+                )
+            # Cached handles are pinned to the pre-index version
+            self._tables_cache[table_name] = tbl
             if LOGURU_ENABLED:
                 logger.info(
-                    f"[INDEX] Rebuilt FTS index on '{table_name}.content_tokenized' (jieba_available={JIEBA_AVAILABLE})"
+                    f"[INDEX] Vector index {action} on '{table_name}' "
+                    f"({self.ann_index_type}) in "
+                    f"{(time.perf_counter() - t0) * 1000:.0f}ms"
                 )
         except Exception as e:
+            self._ann_stats["failures"] += 1
             if LOGURU_ENABLED:
-                logger.warning(f"[INDEX] FTS index rebuild failed: {e}")
+                logger.warning(f"[INDEX] Vector index {action} failed: {e}")
+
+    async def _vector_index_job(self, table_name: str, action: str) -> None:
+        try:
+            # Default executor: index training must not occupy search workers
+            await asyncio.to_thread(self._run_vector_index_job, table_name, action)
+        finally:
+            self._ann_pending.pop(table_name, None)
+
+    @staticmethod
+    def _apply_ann_params(
+        vq, nprobes: Optional[int], refine_factor: Optional[int]
+    ):
+        """Apply ANN knobs to a vector query (ignored on flat-scanned tables)."""
+        if nprobes:
+            vq = vq.nprobes(nprobes)
+        if refine_factor:
+            vq = vq.refine_factor(refine_factor)
+        return vq
+
+    async def flush_vector_index_jobs(self) -> int:
+        """Wait for in-flight vector index jobs. Returns jobs awaited."""
+        tasks = [t for t in self._ann_pending.values() if not t.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return len(tasks)
 
     async def index_single_file(
         self,
@@ -1523,21 +2217,22 @@ class LanceDBClient:
                 logger.error("Vectorizer not available, cannot index single file")
             return 0
 
-        # Batch vectorize
+        # Batch vectorize (unchanged sections hit the embedding cache)
         texts = [c["content"] for c in chunks]
-        vectorized = await self._vectorizer.batch_vectorize(texts)
+        vectorized = await self._embed_cached(texts, self._vectorizer_batch)
 
-        if len(vectorized) != len(chunks):
+        if vectorized is None or len(vectorized) != len(chunks):
             if LOGURU_ENABLED:
                 logger.error(
-                    f"Vectorization mismatch: {len(chunks)} chunks vs {len(vectorized)} vectors"
+                    f"Vectorization mismatch: {len(chunks)} chunks vs "
+                    f"{len(vectorized) if vectorized is not None else 0} vectors"
                 )
             return 0
 
         # Build documents
         documents = []
-        for chunk, vec_result in zip(chunks, vectorized):
-            if not vec_result.vector:
+        for chunk, vector in zip(chunks, vectorized):
+            if not vector:
                 continue
 
             chunk_id = hashlib.md5(
@@ -1572,7 +2267,7 @@ class LanceDBClient:
             doc = {
                 "doc_id": f"vault_{chunk_id}",
                 "content": chunk["content"],
-                "vector": vec_result.vector,
+                "vector": vector,
                 "canvas_file": chunk.get("file_path", rel_path),
                 "node_id": "",
                 "node_type": "vault_note",
@@ -1593,12 +2288,19 @@ class LanceDBClient:
         self._delete_file_chunks(table_name, rel_path)
 
         count = await self.add_documents(table_name, documents)
+        if count:
+            self._wikilink_index_set_files(
+                table_name,
+                [(rel_path, self._extract_wiki_links(content), [doc["doc_id"] for doc in documents])],
+            )
 
         # Update fingerprint
         self._update_fingerprint(rel_path, content_hash, count)
 
         # Rebuild FTS index
         self._rebuild_fts_index(table_name)
+        self._ensure_scalar_indexes(table_name)
+        self._maintain_vector_index(table_name)
 
         if LOGURU_ENABLED:
             logger.info(
@@ -1679,6 +2381,10 @@ class LanceDBClient:
 
         For each search result, extract wiki-links and fetch chunks from linked files.
         Neighbor chunks get decayed scores and source_type="neighbor_expansion".
+
+        Link targets are resolved to exact files through the table's
+        WikiLinkIndex, and the linked files' top chunks are fetched with one
+        doc_id IN (...) query.
         """
         if not results:
             return results
@@ -1704,40 +2410,52 @@ class LanceDBClient:
         if self._db is None:
             return results
 
+        table_name = self.resolve_table_name(table_name)
         try:
+            index = await self._get_wikilink_index_async(table_name)
+            if index is None:
+                return results
+
+            # Collect doc_ids already in results to avoid duplicates
+            # (converted results carry the "lancedb_" prefix, table rows do not)
+            existing_doc_ids: set = set()
+            for r in results:
+                doc_id = r.get("doc_id", "")
+                existing_doc_ids.add(doc_id)
+                existing_doc_ids.add(doc_id[len("lancedb_"):] if doc_id.startswith("lancedb_") else doc_id)
+
+            wanted = [
+                doc_id
+                for _, doc_id in index.neighbour_chunk_ids(linked_files)
+                if doc_id not in existing_doc_ids
+            ]
+            if not wanted:
+                return results
+
             if table_name in self._tables_cache:
                 tbl = self._tables_cache[table_name]
             else:
                 tbl = self._db.open_table(table_name)
                 self._tables_cache[table_name] = tbl
 
-            # Collect doc_ids already in results to avoid duplicates
-            existing_doc_ids: set = set()
-            for r in results:
-                existing_doc_ids.add(r.get("doc_id", ""))
-
-            for link_name in linked_files:
-                try:
-                    escaped_link = self._escape_like(link_name)
-                    where_clause = f"canvas_file LIKE '%{escaped_link}%'"
-                    rows = tbl.search().where(where_clause).limit(3).to_list()
-                    for row in rows:
-                        neighbor_doc = dict(row)
-                        doc_id = neighbor_doc.get("doc_id", "")
-                        if doc_id in existing_doc_ids:
-                            continue
-                        existing_doc_ids.add(doc_id)
-                        orig_score = neighbor_doc.get("_distance", 0.5)
-                        decayed_distance = (
-                            orig_score / score_decay if score_decay > 0 else orig_score
-                        )
-                        neighbor_doc["_distance"] = decayed_distance
-                        neighbor_doc["_source_type"] = "neighbor_expansion"
-                        neighbor_results.append(neighbor_doc)
-                except Exception:
+            in_list = ", ".join(f"'{self._escape_sql(doc_id)}'" for doc_id in wanted)
+            rows = tbl.search().where(f"doc_id IN ({in_list})").limit(len(wanted)).to_list()
+            by_id = {row.get("doc_id", ""): row for row in rows}
+            for doc_id in wanted:
+                row = by_id.get(doc_id)
+                if row is None:
                     continue
-        except Exception:
-            pass
+                neighbor_doc = dict(row)
+                orig_score = neighbor_doc.get("_distance", 0.5)
+                decayed_distance = (
+                    orig_score / score_decay if score_decay > 0 else orig_score
+                )
+                neighbor_doc["_distance"] = decayed_distance
+                neighbor_doc["_source_type"] = "neighbor_expansion"
+                neighbor_results.append(neighbor_doc)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"[neighbors] Expansion failed for '{table_name}': {e}")
 
         if neighbor_results:
             formatted = self._convert_to_search_results(neighbor_results)
@@ -1747,14 +2465,182 @@ class LanceDBClient:
 
         return results
 
+    # -------------------------------------------------------------------------
+    # Wiki-link adjacency index (persisted in WIKILINK_TABLE, one row per file)
+    # -------------------------------------------------------------------------
+
+    WIKILINK_TABLE = "wikilink_graph"
+
+    def get_wikilink_index(self, table_name: str = "vault_notes") -> Optional[WikiLinkIndex]:
+        """
+        Note-level wiki-link graph of a notes table (shared with
+        wikilink_graph_service). Loaded from WIKILINK_TABLE, or built with one
+        scan of the notes table the first time; None if the table is missing.
+        """
+        if self._db is None:
+            return None
+        try:
+            return self._get_wikilink_index(self.resolve_table_name(table_name))
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.warning(f"[wikilinks] Failed to load index for '{table_name}': {e}")
+            return None
+
+    def _get_wikilink_index(self, table_name: str) -> Optional[WikiLinkIndex]:
+        version = self._table_version(table_name)
+        entry = self._wikilink_indexes.get(table_name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        index = self._build_wikilink_index(table_name)
+        if index is not None:
+            self._wikilink_indexes[table_name] = (version, index)
+        return index
+
+    async def _get_wikilink_index_async(self, table_name: str) -> Optional[WikiLinkIndex]:
+        """_get_wikilink_index with the load / scan in a worker thread (search path)."""
+        version = self._table_version(table_name)
+        entry = self._wikilink_indexes.get(table_name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        index = await asyncio.to_thread(self._build_wikilink_index, table_name)
+        if index is not None:
+            # Versioned as of before the build: changes made meanwhile trigger another one
+            self._wikilink_indexes[table_name] = (version, index)
+        return index
+
+    def _build_wikilink_index(self, table_name: str) -> Optional[WikiLinkIndex]:
+        """Load the persisted graph, or scan the notes table and persist it."""
+        index = self._load_wikilink_index(table_name)
+        if index is None:
+            index = self._scan_wikilink_index(table_name)
+            if index is None:
+                return None
+            self._persist_wikilink_rows(table_name, index.files(), index)
+        if LOGURU_ENABLED:
+            logger.debug(f"[wikilinks] Index ready for '{table_name}': {index.stats()}")
+        return index
+
+    def _load_wikilink_index(self, table_name: str) -> Optional[WikiLinkIndex]:
+        """Rebuild the in-memory index from persisted rows (None if none stored)."""
+        if self.WIKILINK_TABLE not in self._db.table_names():
+            return None
+        tbl = self._db.open_table(self.WIKILINK_TABLE)
+        rows = (
+            tbl.search()
+            .where(f"table_name = '{self._escape_sql(table_name)}'")
+            .select(["file_path", "links_json", "chunk_ids_json"])
+            .limit(None)
+            .to_arrow()
+            .to_pylist()
+        )
+        if not rows:
+            return None
+        index = WikiLinkIndex()
+        for row in rows:
+            index.set_file(
+                row["file_path"], json.loads(row["links_json"]), json.loads(row["chunk_ids_json"])
+            )
+        return index
+
+    def _scan_wikilink_index(self, table_name: str) -> Optional[WikiLinkIndex]:
+        """Build the index from the notes table (tables indexed before the graph existed)."""
+        if table_name not in self._db.table_names():
+            return None
+        tbl = self._db.open_table(table_name)
+        if not {"canvas_file", "doc_id", "content"} <= set(tbl.schema.names):
+            return None
+        rows = (
+            tbl.search()
+            .select(["canvas_file", "doc_id", "content"])
+            .limit(None)
+            .to_arrow()
+            .to_pylist()
+        )
+        links: Dict[str, List[str]] = {}
+        chunk_ids: Dict[str, List[str]] = {}
+        for row in rows:
+            file_path = row.get("canvas_file")
+            if not file_path:
+                continue
+            links.setdefault(file_path, []).extend(self._extract_wiki_links(row.get("content") or ""))
+            chunk_ids.setdefault(file_path, []).append(row.get("doc_id") or "")
+        index = WikiLinkIndex()
+        for file_path, ids in chunk_ids.items():
+            index.set_file(file_path, links[file_path], ids)
+        return index
+
+    def _persist_wikilink_rows(
+        self, table_name: str, file_paths: List[str], index: WikiLinkIndex
+    ) -> None:
+        """Delete-before-insert the rows of these files."""
+        rows = [
+            {
+                "table_name": table_name,
+                "file_path": file_path,
+                "links_json": json.dumps(index.links(file_path), ensure_ascii=False),
+                "chunk_ids_json": json.dumps(index.chunk_ids(file_path)),
+            }
+            for file_path in file_paths
+            if file_path in index
+        ]
+        if self.WIKILINK_TABLE in self._db.table_names():
+            self._delete_wikilink_rows(table_name, file_paths)
+            if rows:
+                self._db.open_table(self.WIKILINK_TABLE).add(rows)
+        elif rows:
+            self._db.create_table(self.WIKILINK_TABLE, data=rows)
+
+    def _delete_wikilink_rows(self, table_name: str, file_paths: Optional[List[str]] = None) -> None:
+        """Delete persisted rows of a table (all of them when file_paths is None)."""
+        if self._db is None or self.WIKILINK_TABLE not in self._db.table_names():
+            return
+        clause = f"table_name = '{self._escape_sql(table_name)}'"
+        if file_paths is not None:
+            if not file_paths:
+                return
+            in_list = ", ".join(f"'{self._escape_sql(fp)}'" for fp in file_paths)
+            clause += f" AND file_path IN ({in_list})"
+        try:
+            self._db.open_table(self.WIKILINK_TABLE).delete(clause)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"[wikilinks] Failed to delete rows for '{table_name}': {e}")
+
+    def _wikilink_index_set_files(
+        self, table_name: str, entries: List[Tuple[str, List[str], List[str]]]
+    ) -> None:
+        """Record (file_path, links, chunk_ids) of freshly written files."""
+        if self._db is None or not entries:
+            return
+        try:
+            index = self._get_wikilink_index(table_name)
+            if index is None:
+                return
+            for file_path, links, chunk_ids in entries:
+                index.set_file(file_path, links, chunk_ids)
+            self._persist_wikilink_rows(table_name, [entry[0] for entry in entries], index)
+        except Exception as e:
+            # Dropped so the next use rebuilds it from the notes table
+            self._wikilink_indexes.pop(table_name, None)
+            self._delete_wikilink_rows(table_name)
+            if LOGURU_ENABLED:
+                logger.warning(f"[wikilinks] Failed to update index for '{table_name}': {e}")
+
+    def _wikilink_index_remove_files(self, table_name: str, file_paths: List[str]) -> None:
+        entry = self._wikilink_indexes.get(table_name)
+        if entry is not None:
+            entry[1].remove_files(file_paths)
+
+    def _forget_wikilink_index(self, table_name: str) -> None:
+        self._wikilink_indexes.pop(table_name, None)
+        self._delete_wikilink_rows(table_name)
+
     @staticmethod
     def _compute_tag_jaccard(tags_a: set, tags_b: set) -> float:
         """Story 2.8 AC-5: Compute Jaccard similarity between two tag sets."""
-        if not tags_a or not tags_b:
-            return 0.0
-        intersection = len(tags_a & tags_b)
-        union = len(tags_a | tags_b)
-        return intersection / union if union > 0 else 0.0
+        return tag_jaccard(tags_a, tags_b)
 
     async def find_related_courses(
         self,
@@ -1764,51 +2650,73 @@ class LanceDBClient:
     ) -> List[str]:
         """
         Story 2.8 AC-5: Find courses with Tag Jaccard similarity above threshold.
-        Scans the table for distinct courses and computes Jaccard similarity
-        with the current course's tag set.
+
+        Looks up the precomputed Jaccard neighbours in the table's
+        CourseTagIndex (most similar first); the table is scanned (in a
+        worker thread) the first time the index is needed and again after
+        another client changed the table.
         """
+        table_name = self.resolve_table_name(table_name)
         if self._db is None:
             return list()
 
         try:
-            if table_name not in self._tables_cache:
-                self._tables_cache[table_name] = self._db.open_table(table_name)
-            tbl = self._tables_cache[table_name]
-            # Story 2-8 H5: Only select course and tags_str columns to avoid
-            # loading full content/vector columns into memory.
-            df = tbl.to_pandas(columns=["course", "tags_str"])
-
-            if "course" not in df.columns or "tags_str" not in df.columns:
+            index = await self._get_course_index(table_name)
+            if index is None:
                 return list()
+            return index.related(current_course, threshold)
+        except Exception:
+            return list()
 
-            course_tags: Dict[str, set] = {}
-            for _, row in df.iterrows():
-                course = row.get("course", "")
-                tags_str = row.get("tags_str", "")
-                if not course:
-                    continue
-                if course not in course_tags:
-                    course_tags[course] = set()
-                if tags_str:
-                    course_tags[course].update(
-                        t.strip() for t in tags_str.split(",") if t.strip()
-                    )
+    async def _get_course_index(self, table_name: str) -> Optional[CourseTagIndex]:
+        """Return the table's CourseTagIndex, rebuilding it when the table version moved on."""
+        version = self._table_version(table_name)
+        entry = self._course_indexes.get(table_name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        index = await asyncio.to_thread(self._scan_course_index, table_name)
+        if index is not None:
+            # Versioned as of before the scan: changes made meanwhile trigger another one
+            self._course_indexes[table_name] = (version, index)
+        return index
+
+    def _scan_course_index(self, table_name: str) -> Optional[CourseTagIndex]:
+        """Build a CourseTagIndex with one scan of the course / tag columns."""
+        if table_name not in self._db.table_names():
+            return None
+        tbl = self._db.open_table(table_name)
+        columns = set(tbl.schema.names)
+        if "course" not in columns or not columns & {"tags", "tags_str"}:
+            return None
 
-            current_tags = course_tags.get(current_course, set())
-            if not current_tags:
-                return list()
+        # Only course / tag / file columns, never content or vectors
+        tag_column = "tags" if "tags" in columns else "tags_str"
+        selected = ["course", tag_column] + (["canvas_file"] if "canvas_file" in columns else [])
+        rows = tbl.search().select(selected).limit(None).to_arrow().to_pylist()
 
-            related: List[str] = []
-            for other_course, other_tags in course_tags.items():
-                if other_course == current_course:
-                    continue
-                jaccard = self._compute_tag_jaccard(current_tags, other_tags)
-                if jaccard > threshold:
-                    related.append(other_course)
+        index = CourseTagIndex()
+        index.add_rows(self._course_index_row(row) for row in rows)
+        if LOGURU_ENABLED:
+            logger.debug(f"[course_index] Built for '{table_name}': {index.stats()}")
+        return index
 
-            return related
-        except Exception:
-            return list()
+    @staticmethod
+    def _course_index_row(row: Dict[str, Any]) -> tuple:
+        tags = row.get("tags")
+        if tags is None:
+            tags = _split_tags(row.get("tags_str"))
+        return row.get("canvas_file") or "", row.get("course"), tags
+
+    def _course_index_add_rows(self, table_name: str, data: List[Dict[str, Any]]) -> None:
+        entry = self._course_indexes.get(table_name)
+        if entry is not None:
+            entry[1].add_rows(self._course_index_row(row) for row in data)
+
+    def _course_index_remove_files(self, table_name: str, file_paths: List[str]) -> None:
+        entry = self._course_indexes.get(table_name)
+        if entry is not None:
+            entry[1].remove_files(file_paths)
 
     async def progressive_scope_search(
         self,
@@ -1824,6 +2732,7 @@ class LanceDBClient:
         tag_jaccard_threshold: float = 0.3,
         category: Optional[str] = None,
         rrf_k: int = 60,
+        scope_mode: str = "cascade",
     ) -> List[Dict[str, Any]]:
         """
         Story 2.8 AC-3: Progressive 4-stage cascading scope search.
@@ -1838,6 +2747,17 @@ class LanceDBClient:
         Each result is tagged with scope_level (1-4) in metadata.
         Expansion stops when results >= min_results_threshold.
 
+        The query is embedded once for all stages (the request's
+        query_embedding_scope is reused, or one is opened here). scope_mode
+        selects how the stages run:
+          cascade:    one stage after another, stopping early (up to 4+N searches
+                      in sequence)
+          concurrent: every stage at once; the same results as cascade with the
+                      latency of the slowest single search
+          wide:       one search over the stage 4 scope with
+                      num_results × SCOPE_WIDE_OVERSAMPLE candidates; scope_level
+                      is assigned from each row's course / category
+
         Args:
             query: Search query text.
             course_id: Current course ID for initial scope.
@@ -1851,10 +2771,78 @@ class LanceDBClient:
             tag_jaccard_threshold: Jaccard similarity threshold for related courses.
             category: Optional category for stage 3 filtering.
             rrf_k: RRF fusion k parameter (Story 2.11 configurable, default 60).
+            scope_mode: "cascade" (default), "concurrent" or "wide".
 
         Returns:
             List of search results with scope_level in metadata.
         """
+        if scope_mode not in self.SCOPE_SEARCH_MODES:
+            raise ValueError(
+                f"Unknown scope_mode '{scope_mode}', expected one of {self.SCOPE_SEARCH_MODES}"
+            )
+
+        search_kwargs: Dict[str, Any] = {
+            "query": query,
+            "table_name": table_name,
+            "num_results": num_results,
+            "query_type": query_type,
+            "subject": subject,
+            "canvas_file": canvas_file,
+            "rrf_k": rrf_k,
+        }
+        bridge = tag_jaccard_bridge_enabled and bool(course_id)
+
+        # Every stage searches with the same query: embed it once
+        shared_scope = (
+            query_embedding_scope() if current_query_embedding_scope() is None else nullcontext()
+        )
+        with shared_scope:
+            if scope_mode == "cascade":
+                return await self._scope_search_cascade(
+                    search_kwargs, course_id, min_results_threshold, bridge,
+                    tag_jaccard_threshold, category,
+                )
+
+            if isinstance(query, str):
+                # Embed before fanning out so concurrent stages do not race on it
+                await self._get_query_vector(query)
+            related_courses: List[str] = []
+            if bridge:
+                related_courses = await self.find_related_courses(
+                    current_course=course_id,
+                    table_name=table_name,
+                    threshold=tag_jaccard_threshold,
+                )
+
+            if scope_mode == "concurrent":
+                batches = await self._scope_search_concurrent(
+                    search_kwargs, course_id, related_courses, category
+                )
+            else:
+                batches = await self._scope_search_wide(
+                    search_kwargs, course_id, related_courses, category
+                )
+
+        results = self._collect_scope_batches(batches, num_results, min_results_threshold)
+        if LOGURU_ENABLED:
+            logger.debug(
+                f"[progressive] {scope_mode}: {len(results)} results for course={course_id} "
+                f"(related_courses={related_courses})"
+            )
+        return results
+
+    async def _scope_search_cascade(
+        self,
+        search_kwargs: Dict[str, Any],
+        course_id: str,
+        min_results_threshold: int,
+        bridge: bool,
+        tag_jaccard_threshold: float,
+        category: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Stages one after another; stops as soon as the threshold is met."""
+        num_results = search_kwargs["num_results"]
+        table_name = search_kwargs["table_name"]
         all_results: List[Dict[str, Any]] = []  # noqa: C408
         seen_doc_ids: set = set()
 
@@ -1872,16 +2860,7 @@ class LanceDBClient:
             return added
 
         # Stage 1: Same course
-        stage1 = await self.search(
-            query=query,
-            table_name=table_name,
-            num_results=num_results,
-            query_type=query_type,
-            course_id=course_id,
-            subject=subject,
-            canvas_file=canvas_file,
-            rrf_k=rrf_k,
-        )
+        stage1 = await self.search(course_id=course_id, **search_kwargs)
         _tag_and_collect(stage1, scope=1)
 
         if len(all_results) >= min_results_threshold:
@@ -1892,7 +2871,7 @@ class LanceDBClient:
             return all_results[:num_results]
 
         # Stage 2: Related courses via Tag Jaccard
-        if tag_jaccard_bridge_enabled and course_id:
+        if bridge:
             related_courses = await self.find_related_courses(
                 current_course=course_id,
                 table_name=table_name,
@@ -1901,16 +2880,7 @@ class LanceDBClient:
             for related_course in related_courses:
                 if len(all_results) >= min_results_threshold:
                     break
-                stage2 = await self.search(
-                    query=query,
-                    table_name=table_name,
-                    num_results=num_results,
-                    query_type=query_type,
-                    course_id=related_course,
-                    subject=subject,
-                    canvas_file=canvas_file,
-                    rrf_k=rrf_k,
-                )
+                stage2 = await self.search(course_id=related_course, **search_kwargs)
                 _tag_and_collect(stage2, scope=2)
 
             if LOGURU_ENABLED:
@@ -1923,15 +2893,7 @@ class LanceDBClient:
 
         # Stage 3: Same category
         if category:
-            stage3 = await self._search_by_category(
-                query=query,
-                category=category,
-                table_name=table_name,
-                num_results=num_results,
-                query_type=query_type,
-                subject=subject,
-                rrf_k=rrf_k,
-            )
+            stage3 = await self._search_by_category(category=category, **self._category_kwargs(search_kwargs))
             _tag_and_collect(stage3, scope=3)
 
             if LOGURU_ENABLED:
@@ -1943,15 +2905,7 @@ class LanceDBClient:
                 return all_results[:num_results]
 
         # Stage 4: Full library (no course/category filter)
-        stage4 = await self.search(
-            query=query,
-            table_name=table_name,
-            num_results=num_results,
-            query_type=query_type,
-            subject=subject,
-            canvas_file=canvas_file,
-            rrf_k=rrf_k,
-        )
+        stage4 = await self.search(**search_kwargs)
         _tag_and_collect(stage4, scope=4)
 
         if LOGURU_ENABLED:
@@ -1961,6 +2915,94 @@ class LanceDBClient:
 
         return all_results[:num_results]
 
+    @staticmethod
+    def _category_kwargs(search_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """search() kwargs accepted by _search_by_category (no canvas_file filter)."""
+        return {k: v for k, v in search_kwargs.items() if k != "canvas_file"}
+
+    async def _scope_search_concurrent(
+        self,
+        search_kwargs: Dict[str, Any],
+        course_id: str,
+        related_courses: List[str],
+        category: Optional[str],
+    ) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """Run every stage at once; batches come back in cascade order."""
+        stages: List[Tuple[int, Any]] = [(1, self.search(course_id=course_id, **search_kwargs))]
+        stages.extend(
+            (2, self.search(course_id=related, **search_kwargs)) for related in related_courses
+        )
+        if category:
+            stages.append(
+                (3, self._search_by_category(category=category, **self._category_kwargs(search_kwargs)))
+            )
+        stages.append((4, self.search(**search_kwargs)))
+
+        outcomes = await asyncio.gather(*(call for _, call in stages), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return [(scope, results) for (scope, _), results in zip(stages, outcomes)]
+
+    async def _scope_search_wide(
+        self,
+        search_kwargs: Dict[str, Any],
+        course_id: str,
+        related_courses: List[str],
+        category: Optional[str],
+    ) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """One search over the widest scope; rows are split into stages by their metadata."""
+        num_results = search_kwargs["num_results"]
+        wide_kwargs = dict(search_kwargs, num_results=num_results * self.SCOPE_WIDE_OVERSAMPLE)
+        results = await self.search(**wide_kwargs)
+
+        # Batch order mirrors the cascade: course, each related course, category, rest
+        related_rank = {related: i for i, related in enumerate(related_courses)}
+        same_course: List[Dict[str, Any]] = []
+        related_rows: List[List[Dict[str, Any]]] = [[] for _ in related_courses]
+        same_category: List[Dict[str, Any]] = []
+        rest: List[Dict[str, Any]] = []
+        for r in results:
+            metadata = r.get("metadata") or {}
+            course = metadata.get("course")
+            if course_id and course == course_id:
+                same_course.append(r)
+            elif course in related_rank:
+                related_rows[related_rank[course]].append(r)
+            elif category and metadata.get("category") == category:
+                same_category.append(r)
+            else:
+                rest.append(r)
+
+        batches = [(1, same_course)] + [(2, rows) for rows in related_rows]
+        batches += [(3, same_category), (4, rest)]
+        # Each cascade stage returns at most num_results
+        return [(scope, rows[:num_results]) for scope, rows in batches]
+
+    @staticmethod
+    def _collect_scope_batches(
+        batches: List[Tuple[int, List[Dict[str, Any]]]],
+        num_results: int,
+        min_results_threshold: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge stage batches the way the cascade does: unique doc_ids tagged with
+        scope_level, no further batch once min_results_threshold is reached.
+        """
+        collected: List[Dict[str, Any]] = []
+        seen_doc_ids: set = set()
+        for scope, results in batches:
+            if len(collected) >= min_results_threshold:
+                break
+            for r in results:
+                doc_id = r.get("doc_id", "")
+                if doc_id in seen_doc_ids:
+                    continue
+                seen_doc_ids.add(doc_id)
+                r.setdefault("metadata", {})["scope_level"] = scope
+                collected.append(r)
+        return collected[:num_results]
+
     async def _search_by_category(
         self,
         query: str,
@@ -1995,7 +3037,7 @@ class LanceDBClient:
             if table_name in self._tables_cache:
                 table = self._tables_cache[table_name]
             else:
-                table = self._db.open_table(table_name)
+                table = await self._run_search_blocking(self._db.open_table, table_name)
                 self._tables_cache[table_name] = table
         except Exception:
             return self._convert_to_search_results([])
@@ -2005,28 +3047,40 @@ class LanceDBClient:
         if subject:
             clauses.append(f"subject = '{self._escape_sql(subject)}'")
 
+        # LanceDB queries block; they run in the search executor like search()
+        def _dense(query_vector: List[float], limit: int) -> List[Dict]:
+            vq = table.search(query_vector).limit(limit)
+            vq = self._apply_ann_params(vq, self.ann_nprobes, self.ann_refine_factor)
+            vq = self._apply_where_clauses(vq, clauses)
+            return vq.to_list()
+
+        def _fts() -> List[Dict]:
+            fq = table.search(_jieba_tokenize(query), query_type="fts").limit(num_results * 2)
+            fq = self._apply_where_clauses(fq, clauses)
+            return fq.to_list()
+
         all_raw: List[Dict[str, Any]] = []  # noqa: C408
 
         if query_type == "hybrid" and isinstance(query, str):
-            query_vector = await self._get_query_vector(query)
+            # FTS runs in the executor while the query is embedded
+            fts_task = asyncio.ensure_future(self._run_search_blocking(_fts))
             vector_results: List[Dict] = []  # noqa: C408
             fts_results: List[Dict] = []  # noqa: C408
 
-            if query_vector is not None:
-                try:
-                    vq = table.search(query_vector).limit(num_results * 2)
-                    vq = self._apply_where_clauses(vq, clauses)
-                    vector_results = vq.to_list()
-                except Exception:
-                    pass
+            try:
+                query_vector = await self._get_query_vector(query)
+                if query_vector is not None:
+                    vector_results = await self._run_search_blocking(
+                        _dense, query_vector, num_results * 2
+                    )
+            except asyncio.CancelledError:
+                fts_task.cancel()
+                raise
+            except Exception:
+                pass
 
             try:
-                tokenized_query = _jieba_tokenize(query)
-                fq = table.search(tokenized_query, query_type="fts").limit(
-                    num_results * 2
-                )
-                fq = self._apply_where_clauses(fq, clauses)
-                fts_results = fq.to_list()
+                fts_results = await fts_task
             except Exception:
                 pass
 
@@ -2040,9 +3094,7 @@ class LanceDBClient:
         query_vector = await self._get_query_vector(query)
         if query_vector is not None:
             try:
-                sq = table.search(query_vector).limit(num_results)
-                sq = self._apply_where_clauses(sq, clauses)
-                all_raw = sq.to_list()
+                all_raw = await self._run_search_blocking(_dense, query_vector, num_results)
             except Exception:
                 pass
 
@@ -2261,7 +3313,7 @@ class LanceDBClient:
         self,
         query: str,
         table_name: str = "canvas_nodes",
-        canvas_file: Optional[str] = None,
+        canvas_file: Optional[Union[str, List[str]]] = None,
         subject: Optional[str] = None,
         num_results: int = 10,
         metric: str = "cosine",
@@ -2269,6 +3321,8 @@ class LanceDBClient:
         course_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
         rrf_k: int = 60,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         向量搜索
@@ -2289,27 +3343,59 @@ class LanceDBClient:
         Args:
             query: 搜索查询 (文本或向量)
             table_name: 表名
-            canvas_file: Canvas文件路径(用于过滤)
+            canvas_file: Canvas文件路径(用于过滤); 传列表时以 canvas_file IN (...)
+                预过滤, 一次扫描覆盖多个Canvas
             subject: 学科标识(用于学科隔离过滤)
             num_results: 返回结果数量
             metric: 距离度量 ("cosine" 或 "L2")
             query_type: 搜索类型 ("vector" 或 "hybrid"). hybrid使用向量+FTS+RRF融合
             course_id: 课程ID (maps to 'course' column, 用于按课程过滤搜索范围)
-            tags: 标签列表 (maps to 'tags_str' column, 用于按标签过滤, OR 匹配)
+            tags: 标签列表 (maps to 'tags' list column, 用于按标签过滤, OR 精确匹配)
             rrf_k: RRF fusion k parameter (Story 2.11 configurable, default 60)
+            nprobes: ANN 索引探测分区数 (None = ann_nprobes; 无索引时忽略)
+            refine_factor: ANN 精排倍数 (None = ann_refine_factor)
 
         Returns:
             List[SearchResult]: 标准化的搜索结果
         """
         table_name = self.resolve_table_name(table_name)
+        if nprobes is None:
+            nprobes = self.ann_nprobes
+        if refine_factor is None:
+            refine_factor = self.ann_refine_factor
         start_time = time.perf_counter()
 
         if not self._initialized:
             await self.initialize()
 
+        # Result cache: only text queries; key includes every result-shaping param
+        cache = None
+        if self.enable_result_cache and isinstance(query, str):
+            cache = self._result_cache()
+            cache_db = os.path.abspath(self.db_path)
+            cache_version = cache.version(cache_db, table_name)
+            fingerprint = self._search_fingerprint(
+                cache,
+                query=query,
+                canvas_file=canvas_file,
+                subject=subject,
+                num_results=num_results,
+                metric=metric,
+                query_type=query_type,
+                course_id=course_id,
+                tags=tags,
+                rrf_k=rrf_k,
+                nprobes=nprobes,
+                refine_factor=refine_factor,
+            )
+            cached = cache.get(cache_db, table_name, fingerprint)
+            if cached is not None:
+                return self._with_cache_latency(cached, start_time)
+
         try:
             # ✅ AC 2.3: 设置超时
             timeout_seconds = self.timeout_ms / 1000.0
+            search_info: Dict[str, Any] = {}
 
             # 执行搜索
             results = await asyncio.wait_for(
@@ -2324,10 +3410,17 @@ class LanceDBClient:
                     course_id=course_id,
                     tags=tags,
                     rrf_k=rrf_k,
+                    search_info=search_info,
+                    nprobes=nprobes,
+                    refine_factor=refine_factor,
                 ),
                 timeout=timeout_seconds,
             )
 
+            # Degraded results (missing query vector / failed branch) are not cached
+            if cache is not None and results and not search_info.get("degraded"):
+                cache.put(cache_db, table_name, fingerprint, results, cache_version)
+
             latency_ms = (time.perf_counter() - start_time) * 1000
 
             if LOGURU_ENABLED:
@@ -2364,6 +3457,311 @@ class LanceDBClient:
             else:
                 raise
 
+    def _search_fingerprint(
+        self,
+        cache,
+        query: str,
+        canvas_file: Optional[Union[str, List[str]]],
+        subject: Optional[str],
+        num_results: int,
+        metric: str,
+        query_type: str,
+        course_id: Optional[str],
+        tags: Optional[List[str]],
+        rrf_k: int,
+        nprobes: Optional[int],
+        refine_factor: Optional[int],
+    ) -> str:
+        """Result cache key: every result-shaping search parameter."""
+        return cache.fingerprint(
+            query=query,
+            canvas_file=(
+                sorted(canvas_file) if isinstance(canvas_file, list) else canvas_file
+            ),
+            subject=subject,
+            num_results=num_results,
+            metric=metric,
+            query_type=query_type,
+            course_id=course_id,
+            tags=sorted(tags) if tags else None,
+            rrf_k=rrf_k,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+            model=self.embedding_model,
+        )
+
+    async def search_batch(
+        self,
+        queries: List[str],
+        table_name: str = "canvas_nodes",
+        canvas_file: Optional[Union[str, List[str]]] = None,
+        subject: Optional[str] = None,
+        num_results: int = 10,
+        metric: str = "cosine",
+        query_type: str = "hybrid",
+        course_id: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        rrf_k: int = 60,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        批量检索: 多个查询 (如 multi_query 改写变体) 共享一次检索
+
+        与逐个调用 search() 结果一致，但:
+        - 所有查询一次批量 embedding (已在 query_embedding_scope 中的直接复用)
+        - Dense 分支为一次多向量查询 (LanceDB query_index 区分各查询)
+        - FTS 分支各查询在检索线程池中并发
+        - 每个查询各自 RRF 融合，并写入结果缓存 (之后同参数的 search() 直接命中)
+
+        Args:
+            queries: 查询文本列表 (可重复)
+            其余参数同 search()，对所有查询生效
+
+        Returns:
+            List[List[SearchResult]]: 与 queries 一一对应的结果列表
+        """
+        table_name = self.resolve_table_name(table_name)
+        if nprobes is None:
+            nprobes = self.ann_nprobes
+        if refine_factor is None:
+            refine_factor = self.ann_refine_factor
+
+        if not self._initialized:
+            await self.initialize()
+
+        unique = list(dict.fromkeys(q for q in queries if isinstance(q, str) and q))
+        results_by_query: Dict[str, List[Dict[str, Any]]] = {}
+
+        cache = None
+        fingerprints: Dict[str, str] = {}
+        lookup_start = time.perf_counter()
+        if self.enable_result_cache:
+            cache = self._result_cache()
+            cache_db = os.path.abspath(self.db_path)
+            cache_version = cache.version(cache_db, table_name)
+            for query in unique:
+                fingerprints[query] = self._search_fingerprint(
+                    cache,
+                    query=query,
+                    canvas_file=canvas_file,
+                    subject=subject,
+                    num_results=num_results,
+                    metric=metric,
+                    query_type=query_type,
+                    course_id=course_id,
+                    tags=tags,
+                    rrf_k=rrf_k,
+                    nprobes=nprobes,
+                    refine_factor=refine_factor,
+                )
+                cached = cache.get(cache_db, table_name, fingerprints[query])
+                if cached is not None:
+                    results_by_query[query] = self._with_cache_latency(cached, lookup_start)
+
+        pending = [q for q in unique if q not in results_by_query]
+        if pending:
+            start_time = time.perf_counter()
+            degraded: set = set()
+            try:
+                fused = await asyncio.wait_for(
+                    self._search_batch_internal(
+                        queries=pending,
+                        table_name=table_name,
+                        canvas_file=canvas_file,
+                        subject=subject,
+                        num_results=num_results,
+                        query_type=query_type,
+                        course_id=course_id,
+                        tags=tags,
+                        rrf_k=rrf_k,
+                        degraded=degraded,
+                        nprobes=nprobes,
+                        refine_factor=refine_factor,
+                    ),
+                    timeout=self.timeout_ms / 1000.0,
+                )
+            except asyncio.TimeoutError:
+                if LOGURU_ENABLED:
+                    logger.warning(f"LanceDBClient.search_batch timeout ({self.timeout_ms}ms)")
+                if not self.enable_fallback:
+                    raise
+                fused = {}
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.error(f"LanceDBClient.search_batch error: {e}")
+                if not self.enable_fallback:
+                    raise
+                fused = {}
+
+            for query in pending:
+                results = fused.get(query, [])
+                results_by_query[query] = results
+                if cache is not None and results and query not in degraded:
+                    cache.put(cache_db, table_name, fingerprints[query], results, cache_version)
+
+            if LOGURU_ENABLED:
+                logger.debug(
+                    f"LanceDBClient.search_batch: queries={len(pending)} "
+                    f"(cached={len(unique) - len(pending)}), table={table_name}, "
+                    f"latency={(time.perf_counter() - start_time) * 1000:.2f}ms"
+                )
+
+        return [results_by_query.get(q, []) if isinstance(q, str) else [] for q in queries]
+
+    async def _search_batch_internal(
+        self,
+        queries: List[str],
+        table_name: str,
+        canvas_file: Optional[Union[str, List[str]]],
+        subject: Optional[str],
+        num_results: int,
+        query_type: str,
+        course_id: Optional[str],
+        tags: Optional[List[str]],
+        rrf_k: int,
+        degraded: set,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        search_batch 的检索实现: 多向量 Dense + 并发 FTS + 逐查询 RRF.
+
+        Queries whose results came from a failed / missing branch are added
+        to ``degraded`` (not cached, like search()).
+        """
+        if self._db is None:
+            return {}
+
+        start_time = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        try:
+            if table_name in self._tables_cache:
+                table = self._tables_cache[table_name]
+            else:
+                table = await self._run_search_blocking(self._db.open_table, table_name)
+                self._tables_cache[table_name] = table
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"Table {table_name} not found: {e}")
+            return {}
+
+        where_clauses = self._build_where_filters(
+            canvas_file=canvas_file,
+            subject=subject,
+            course_id=course_id,
+            tags=tags,
+        )
+        hybrid = query_type == "hybrid"
+
+        def _dense_many(vectors: List[List[float]], limit: int) -> List[List[Dict]]:
+            t0 = time.perf_counter()
+            try:
+                # Several vectors → one query; rows carry query_index
+                vq = table.search(vectors if len(vectors) > 1 else vectors[0]).limit(limit)
+                vq = self._apply_ann_params(vq, nprobes, refine_factor)
+                vq = self._apply_where_clauses(vq, where_clauses)
+                grouped: List[List[Dict]] = [[] for _ in vectors]
+                for row in vq.to_list():
+                    grouped[row.pop("query_index", 0)].append(row)
+                return grouped
+            finally:
+                timings["dense"] = (time.perf_counter() - t0) * 1000
+
+        def _fts(query: str) -> List[Dict]:
+            fq = table.search(_jieba_tokenize(query), query_type="fts").limit(num_results * 2)
+            fq = self._apply_where_clauses(fq, where_clauses)
+            return fq.to_list()
+
+        # FTS of every query runs in the executor while the queries are embedded
+        fts_tasks: Dict[str, asyncio.Future] = {}
+        if hybrid:
+            fts_start = time.perf_counter()
+            fts_tasks = {
+                q: asyncio.ensure_future(self._run_search_blocking(_fts, q)) for q in queries
+            }
+
+        try:
+            t0 = time.perf_counter()
+            vectors = await self._get_query_vectors(queries)
+            timings["embed"] = (time.perf_counter() - t0) * 1000
+
+            embedded = [q for q in queries if q in vectors]
+            dense_by_query: Dict[str, List[Dict]] = {}
+            if embedded:
+                try:
+                    grouped = await self._run_search_blocking(
+                        _dense_many,
+                        [vectors[q] for q in embedded],
+                        num_results * 2 if hybrid else num_results,
+                    )
+                    dense_by_query = dict(zip(embedded, grouped))
+                except Exception as e:
+                    degraded.update(queries)
+                    if LOGURU_ENABLED:
+                        logger.debug(f"[search_batch] Dense branch failed: {e}")
+            degraded.update(q for q in queries if q not in vectors)
+
+            fts_by_query: Dict[str, List[Dict]] = {}
+            for query, task in fts_tasks.items():
+                try:
+                    fts_by_query[query] = await task
+                except Exception as e:
+                    degraded.add(query)
+                    if LOGURU_ENABLED:
+                        logger.debug(f"[search_batch] FTS branch unavailable for '{query[:40]}': {e}")
+            if fts_tasks:
+                timings["fts"] = (time.perf_counter() - fts_start) * 1000
+        except asyncio.CancelledError:
+            for task in fts_tasks.values():
+                task.cancel()
+            raise
+
+        timings["total"] = (time.perf_counter() - start_time) * 1000
+        self._record_search_latency(timings)
+        latency = {k: round(v, 2) for k, v in timings.items()}
+
+        fused: Dict[str, List[Dict[str, Any]]] = {}
+        for query in queries:
+            vector_results = dense_by_query.get(query, [])
+            if hybrid:
+                fts_results = fts_by_query.get(query, [])
+                raw = (
+                    self._rrf_fuse(vector_results, fts_results, num_results, k=rrf_k)
+                    if vector_results or fts_results
+                    else []
+                )
+            else:
+                raw = vector_results
+            results = self._convert_to_search_results(raw, canvas_file=canvas_file)
+            for result in results:
+                result["metadata"]["search_latency_ms"] = latency
+            fused[query] = results
+        return fused
+
+    async def _get_query_vectors(self, queries: List[str]) -> Dict[str, List[float]]:
+        """Vectors for several queries: request scope first, the rest in one batch."""
+        scope = current_query_embedding_scope()
+        vectors: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        for query in queries:
+            vector = scope.get(query) if scope is not None else None
+            if vector is None:
+                missing.append(query)
+            else:
+                vectors[query] = vector
+
+        if missing:
+            embedded = await self.embed_queries(missing)
+            for query in missing:
+                vector = embedded.get(query)
+                if scope is not None:
+                    scope.record(query, vector)
+                if vector is not None:
+                    vectors[query] = vector
+        return vectors
+
     @staticmethod
     def _escape_sql(value: str) -> str:
         """Escape single quotes for SQL WHERE clauses to prevent injection."""
@@ -2384,7 +3782,7 @@ class LanceDBClient:
 
     def _build_where_filters(
         self,
-        canvas_file: Optional[str] = None,
+        canvas_file: Optional[Union[str, List[str]]] = None,
         subject: Optional[str] = None,
         course_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
@@ -2392,40 +3790,85 @@ class LanceDBClient:
         """
         Story 2.4 AC-5: Build SQL WHERE filter clauses for LanceDB queries.
 
-        Supports canvas_file, subject, course_id (maps to 'course' column),
-        and tags (maps to 'tags_str' column, OR matching via LIKE).
+        Supports canvas_file (a single file, or a list matched with IN),
+        subject, course_id (maps to 'course' column), and tags (maps to the
+        'tags' list column, OR matching of exact tags).
         Returns list of SQL clause strings to apply via .where().
 
         Column mapping:
         - course_id param → 'course' column (set by index_vault_notes from frontmatter)
-        - tags param → 'tags_str' column (comma-separated tags from frontmatter)
+        - tags param → 'tags' column (list split from frontmatter tags_str)
+
+        All columns carry scalar indexes (SCALAR_INDEXES), so the clauses are
+        answered by index lookups during prefiltering.
         """
         clauses: List[str] = []
-        if canvas_file:
+        if isinstance(canvas_file, (list, tuple)) and canvas_file:
+            files = ", ".join(f"'{self._escape_sql(f)}'" for f in canvas_file)
+            clauses.append(f"canvas_file IN ({files})")
+        elif isinstance(canvas_file, str) and canvas_file:
             clauses.append(f"canvas_file = '{self._escape_sql(canvas_file)}'")
         if subject:
             clauses.append(f"subject = '{self._escape_sql(subject)}'")
         if course_id:
             clauses.append(f"course = '{self._escape_sql(course_id)}'")
         if tags:
-            # Story 2-8 H4: Use _escape_like for LIKE patterns to escape % and _
-            tag_conditions = " OR ".join(
-                f"tags_str LIKE '%{self._escape_like(tag)}%'" for tag in tags
-            )
-            clauses.append(f"({tag_conditions})")
+            # Exact tag match (LIKE '%tag%' also matched substrings, e.g. "ml" in "html")
+            tag_values = ", ".join(f"'{self._escape_sql(tag)}'" for tag in tags)
+            clauses.append(f"array_has_any(tags, make_array({tag_values}))")
         return clauses
 
     def _apply_where_clauses(self, search_query, clauses: List[str]):
-        """Apply a list of WHERE clauses to a LanceDB search query."""
+        """Apply a list of WHERE clauses (ANDed) to a LanceDB search query as prefilters."""
         for clause in clauses:
-            search_query = search_query.where(clause)
+            search_query = search_query.where(clause, prefilter=True)
         return search_query
 
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(
+                max_workers=self.search_workers,
+                thread_name_prefix="lancedb-search",
+            )
+        return self._search_executor
+
+    async def _run_search_blocking(self, fn, *args):
+        """Run a blocking LanceDB call in the bounded search executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_search_executor(), fn, *args)
+
+    @staticmethod
+    def _with_cache_latency(results: List[Dict[str, Any]], start_time: float) -> List[Dict[str, Any]]:
+        """Replace the latency stored with cached results by this lookup's own."""
+        elapsed = round((time.perf_counter() - start_time) * 1000, 2)
+        latency = {"cache": elapsed, "total": elapsed}
+        for result in results:
+            result.setdefault("metadata", {})["search_latency_ms"] = latency
+        return results
+
+    def _record_search_latency(self, timings: Dict[str, float]) -> None:
+        for branch, ms in timings.items():
+            if branch in self._search_latency:
+                self._search_latency[branch].append(ms)
+
+    def _search_latency_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        for branch, samples in self._search_latency.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats[branch] = {
+                "count": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered), 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            }
+        return stats
+
     async def _search_internal(
         self,
         query: str,
         table_name: str,
-        canvas_file: Optional[str],
+        canvas_file: Optional[Union[str, List[str]]],
         subject: Optional[str],
         num_results: int,
         metric: str,
@@ -2433,17 +3876,34 @@ class LanceDBClient:
         course_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
         rrf_k: int = 60,
+        search_info: Optional[Dict[str, Any]] = None,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """内部搜索实现 (Story 2.4: hybrid default + jieba FTS + course/tags filter)"""
+        """
+        内部搜索实现 (Story 2.4: hybrid default + jieba FTS + course/tags filter)
+
+        Blocking LanceDB calls run in a bounded thread pool so the event loop
+        stays free. In hybrid mode the FTS branch starts immediately and
+        overlaps with query embedding + the dense branch. Per-branch latency
+        is attached to each result as metadata["search_latency_ms"].
+        ``search_info["degraded"]`` is set when a branch was unavailable.
+        ``nprobes`` / ``refine_factor`` tune the ANN index when the table has one.
+        """
         if self._db is None:
             return []
 
+        start_time = time.perf_counter()
+        timings: Dict[str, float] = {}
+        if search_info is None:
+            search_info = {}
+
         # 获取表
         try:
             if table_name in self._tables_cache:
                 table = self._tables_cache[table_name]
             else:
-                table = self._db.open_table(table_name)
+                table = await self._run_search_blocking(self._db.open_table, table_name)
                 self._tables_cache[table_name] = table
         except Exception as e:
             if LOGURU_ENABLED:
@@ -2461,43 +3921,83 @@ class LanceDBClient:
         # Accumulator for raw results across branches
         all_raw: List[Dict[str, Any]] = list()
 
+        def _dense(query_vector: List[float], limit: int) -> List[Dict]:
+            t0 = time.perf_counter()
+            try:
+                vq = table.search(query_vector).limit(limit)
+                vq = self._apply_ann_params(vq, nprobes, refine_factor)
+                vq = self._apply_where_clauses(vq, where_clauses)
+                return vq.to_list()
+            finally:
+                timings["dense"] = (time.perf_counter() - t0) * 1000
+
+        def _finish(raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            timings["total"] = (time.perf_counter() - start_time) * 1000
+            self._record_search_latency(timings)
+            results = self._convert_to_search_results(raw, canvas_file=canvas_file)
+            latency = {k: round(v, 2) for k, v in timings.items()}
+            for result in results:
+                result["metadata"]["search_latency_ms"] = latency
+            return results
+
         # Hybrid search: manual vector + FTS with RRF fusion
         # We can't use table.search(query, query_type="hybrid") because the table
         # has no registered embedding function (vectors are pre-computed externally).
         # Instead, we manually run both searches and fuse with RRF.
         if query_type == "hybrid" and isinstance(query, str):
-            query_vector = await self._get_query_vector(query)
 
+            # Story 2.4 AC-2: FTS with jieba-tokenized query on content_tokenized
+            # Serves as sparse search substitute (LanceDB has no native sparse vector
+            # column type; Tantivy FTS + jieba provides equivalent Chinese retrieval).
+            def _fts() -> List[Dict]:
+                t0 = time.perf_counter()
+                try:
+                    tokenized_query = _jieba_tokenize(query)
+                    if LOGURU_ENABLED:
+                        logger.debug(
+                            f"[search] FTS jieba tokenized: '{query[:40]}' -> '{tokenized_query[:60]}'"
+                        )
+                    fq = table.search(tokenized_query, query_type="fts").limit(
+                        num_results * 2
+                    )
+                    fq = self._apply_where_clauses(fq, where_clauses)
+                    return fq.to_list()
+                finally:
+                    timings["fts"] = (time.perf_counter() - t0) * 1000
+
+            async def _embed_then_dense() -> List[Dict]:
+                t0 = time.perf_counter()
+                query_vector = await self._get_query_vector(query)
+                timings["embed"] = (time.perf_counter() - t0) * 1000
+                if query_vector is None:
+                    search_info["degraded"] = True
+                    return []
+                return await self._run_search_blocking(
+                    _dense, query_vector, num_results * 2
+                )
+
+            # FTS runs in the executor while the query is embedded
+            fts_task = asyncio.ensure_future(self._run_search_blocking(_fts))
             vector_results: List[Dict] = list()
             fts_results: List[Dict] = list()
 
             # Dense vector search branch
-            if query_vector is not None:
-                try:
-                    vq = table.search(query_vector).limit(num_results * 2)
-                    vq = self._apply_where_clauses(vq, where_clauses)
-                    vector_results = vq.to_list()
-                except Exception as e:
-                    if LOGURU_ENABLED:
-                        logger.debug(f"Hybrid vector branch failed: {e}")
-
-            # Story 2.4 AC-2: FTS with jieba-tokenized query on content_tokenized
-            # Serves as sparse search substitute (LanceDB has no native sparse vector
-            # column type; Tantivy FTS + jieba provides equivalent Chinese retrieval).
             try:
-                tokenized_query = _jieba_tokenize(query)
+                vector_results = await _embed_then_dense()
+            except asyncio.CancelledError:
+                fts_task.cancel()
+                raise
+            except Exception as e:
+                search_info["degraded"] = True
                 if LOGURU_ENABLED:
-                    logger.debug(
-                        f"[search] FTS jieba tokenized: '{query[:40]}' -> '{tokenized_query[:60]}'"
-                    )
-                fq = table.search(tokenized_query, query_type="fts").limit(
-                    num_results * 2
-                )
-                fq = self._apply_where_clauses(fq, where_clauses)
-                fts_results = fq.to_list()
+                    logger.debug(f"Hybrid vector branch failed: {e}")
+
+            try:
+                fts_results = await fts_task
             except Exception as e:
                 # FTS unavailable (no index yet, no content_tokenized column, etc.)
                 # Hybrid degrades to Dense-only — still returns results via vector branch
+                search_info["degraded"] = True
                 if LOGURU_ENABLED:
                     logger.warning(
                         f"[search] FTS branch unavailable, degrading to Dense-only: {e}"
@@ -2510,7 +4010,7 @@ class LanceDBClient:
                 all_raw = self._rrf_fuse(
                     vector_results, fts_results, num_results, k=rrf_k
                 )
-                return self._convert_to_search_results(all_raw, canvas_file=canvas_file)
+                return _finish(all_raw)
 
             # Both hybrid branches returned nothing — degrade to pure vector
             if LOGURU_ENABLED:
@@ -2519,20 +4019,24 @@ class LanceDBClient:
                 )
 
         # Pure vector search (fallback or explicit query_type="vector")
+        t0 = time.perf_counter()
         query_vector = await self._get_query_vector(query)
+        timings.setdefault("embed", (time.perf_counter() - t0) * 1000)
         if query_vector is not None:
             try:
-                search_query = table.search(query_vector).limit(num_results)
-                search_query = self._apply_where_clauses(search_query, where_clauses)
-                all_raw = search_query.to_list()
+                all_raw = await self._run_search_blocking(
+                    _dense, query_vector, num_results
+                )
             except Exception as e:
+                search_info["degraded"] = True
                 if LOGURU_ENABLED:
                     logger.error(f"LanceDB vector search failed: {e}")
         else:
+            search_info["degraded"] = True
             if LOGURU_ENABLED:
                 logger.warning("[search] No query vector available")
 
-        return self._convert_to_search_results(all_raw, canvas_file=canvas_file)
+        return _finish(all_raw)
 
     async def _get_query_vector(self, query: str) -> Optional[List[float]]:
         """
@@ -2556,6 +4060,19 @@ class LanceDBClient:
         if NUMPY_AVAILABLE and isinstance(query, np.ndarray):
             return query.tolist()
 
+        # 请求级共享向量: fan-out 前已批量 embedding 的 query 直接复用
+        scope = current_query_embedding_scope()
+        if scope is None:
+            return await self._embed_query_text(query)
+
+        vector = scope.get(query)
+        if vector is None:
+            vector = await self._embed_query_text(query)
+            scope.record(query, vector)
+        return vector
+
+    async def _embed_query_text(self, query: str) -> Optional[List[float]]:
+        """Embed a query string (embedder → embed()), None on failure."""
         # 尝试使用embedder生成向量 (legacy support)
         if self._embedder is not None:
             try:
@@ -2607,7 +4124,9 @@ class LanceDBClient:
         return results
 
     def _convert_to_search_results(
-        self, raw_results: List[Dict[str, Any]], canvas_file: Optional[str] = None
+        self,
+        raw_results: List[Dict[str, Any]],
+        canvas_file: Optional[Union[str, List[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         转换LanceDB结果为标准SearchResult格式
@@ -2627,6 +4146,8 @@ class LanceDBClient:
         }
         """
         search_results = []
+        # Multi-canvas filters carry no single fallback file
+        default_canvas = canvas_file if isinstance(canvas_file, str) else None
 
         for i, item in enumerate(raw_results):
             # 提取内容
@@ -2652,7 +4173,7 @@ class LanceDBClient:
             metadata = {
                 "source": "lancedb",
                 "timestamp": datetime.now().isoformat(),
-                "canvas_file": item.get("canvas_file") or canvas_file,
+                "canvas_file": item.get("canvas_file") or default_canvas,
                 "original_distance": distance,
             }
 
@@ -2747,6 +4268,9 @@ class LanceDBClient:
 
             self._db.drop_table(table_name, ignore_missing=True)
             self._tables_cache.pop(table_name, None)
+            self._course_indexes.pop(table_name, None)
+            self._forget_wikilink_index(table_name)
+            self._bump_index_version(table_name)
             return True
 
         except Exception as e:
@@ -2784,11 +4308,16 @@ class LanceDBClient:
                 )
 
                 content = doc.get("content", "")
+                # Story 2.4: jieba 预分词后的内容，供 FTS 索引使用
+                # (索引流水线已在分块 worker 中预分词; 索引内容不经过查询分词 LRU)
+                content_tokenized = doc.get("content_tokenized")
+                if not content_tokenized:
+                    with index_tokenization():
+                        content_tokenized = _jieba_tokenize(content)
                 lance_doc = {
                     "doc_id": doc.get("doc_id"),
                     "content": content,
-                    # Story 2.4: jieba 预分词后的内容，供 FTS 索引使用
-                    "content_tokenized": _jieba_tokenize(content),
+                    "content_tokenized": content_tokenized,
                     "vector": doc.get("vector") or doc.get("embedding"),
                     "canvas_file": canvas_file,
                     "timestamp": doc.get("timestamp") or datetime.now().isoformat(),
@@ -2815,6 +4344,10 @@ class LanceDBClient:
                     if key in doc:
                         lance_doc[key] = doc[key]
 
+                # Story 2.8: tags list column (LABEL_LIST index) from tags_str
+                if "tags_str" in lance_doc and "tags" not in lance_doc:
+                    lance_doc["tags"] = _split_tags(lance_doc["tags_str"])
+
                 # metadata_json: use top-level if present (index_vault_notes),
                 # else serialize metadata dict
                 if doc.get("metadata_json"):
@@ -2838,12 +4371,18 @@ class LanceDBClient:
 
             # 检查表是否存在
             if table_name in self._tables_cache:
-                table = self._tables_cache[table_name]
+                table, data = self._fit_tags_to_table(
+                    table_name, self._tables_cache[table_name], data
+                )
                 table.add(data)
             else:
                 # 创建新表
-                table = self._db.create_table(table_name, data=data)
+                table = self._db.create_table(
+                    table_name, data=self._with_typed_tags(data)
+                )
                 self._tables_cache[table_name] = table
+            self._course_index_add_rows(table_name, data)
+            self._bump_index_version(table_name)
 
             if LOGURU_ENABLED:
                 logger.info(f"Added {len(data)} documents to {table_name}")
@@ -2855,6 +4394,44 @@ class LanceDBClient:
                 logger.error(f"Failed to add documents: {e}")
             return 0
 
+    def _fit_tags_to_table(self, table_name: str, table, data: List[Dict[str, Any]]):
+        """
+        Match the tags values to an existing table.
+
+        Tables written before the tags column existed are migrated first
+        (tags_str → tags); if the column still is missing, tags are left out
+        so the insert does not fail on an unknown column.
+        """
+        if not any("tags" in row for row in data):
+            return table, data
+        if "tags" not in table.schema.names:
+            self._migrate_filter_columns(table_name)
+            table = self._tables_cache.get(table_name, table)
+            if "tags" not in table.schema.names:
+                if LOGURU_ENABLED:
+                    logger.warning(f"[INDEX] '{table_name}' has no tags column; inserting without tags")
+                return table, [{k: v for k, v in row.items() if k != "tags"} for row in data]
+        return table, self._normalize_tags(data)
+
+    @staticmethod
+    def _normalize_tags(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Give every row a tags list ([] when missing or None)."""
+        return [{**row, "tags": list(row.get("tags") or [])} for row in data]
+
+    @classmethod
+    def _with_typed_tags(cls, data: List[Dict[str, Any]]):
+        """Pin tags to list<string> (all-empty lists would infer list<null>)."""
+        if not any("tags" in row for row in data):
+            return data
+        import pyarrow as pa
+
+        arrow = pa.Table.from_pylist(cls._normalize_tags(data))
+        idx = arrow.schema.get_field_index("tags")
+        tags_type = pa.list_(pa.string())
+        return arrow.set_column(
+            idx, pa.field("tags", tags_type), arrow.column("tags").cast(tags_type)
+        )
+
     async def search_multiple_tables(
         self,
         query: str,
@@ -2891,9 +4468,11 @@ class LanceDBClient:
 
         all_results = []
 
-        for table_name in table_names:
-            try:
-                results = await self.search(
+        # Tables are searched concurrently; each search offloads its blocking
+        # branches to the shared bounded executor.
+        per_table = await asyncio.gather(
+            *(
+                self.search(
                     query=query,
                     table_name=table_name,
                     canvas_file=canvas_file,
@@ -2904,10 +4483,16 @@ class LanceDBClient:
                     tags=tags,
                     rrf_k=rrf_k,
                 )
-                all_results.extend(results)
-            except Exception as e:
+                for table_name in table_names
+            ),
+            return_exceptions=True,
+        )
+        for table_name, results in zip(table_names, per_table):
+            if isinstance(results, BaseException):
                 if LOGURU_ENABLED:
-                    logger.debug(f"Search in {table_name} failed: {e}")
+                    logger.debug(f"Search in {table_name} failed: {results}")
+                continue
+            all_results.extend(results)
 
         # 按分数排序
         all_results.sort(key=lambda x: x.get("score", 0.0), reverse=True)
@@ -3021,4 +4606,50 @@ class LanceDBClient:
             "batch_size": self.batch_size,
             "enable_fallback": self.enable_fallback,
             "lancedb_installed": LANCEDB_AVAILABLE,
+            "last_index": self._last_index_stats,
+            "embedding_cache": (
+                self._embedding_cache.stats()
+                if self._embedding_cache is not None
+                else None
+            ),
+            "ollama": self._get_ollama_client().stats(),
+            "search_latency": self._search_latency_stats(),
+            "tokenizer": get_jieba_tokenizer().stats(),
+            "result_cache": self._result_cache().stats()
+            if self.enable_result_cache
+            else None,
+            "fts": {
+                **self._fts_stats,
+                "incremental": self.fts_incremental,
+                "pending_tables": sorted(
+                    set(self._fts_pending) | {t for t, task in self._fts_merging.items() if not task.done()}
+                ),
+            },
+            "vector_index": {
+                **self._ann_stats,
+                "auto_index": self.ann_auto_index,
+                "index_type": self.ann_index_type,
+                "min_rows": self.ann_min_rows,
+                "nprobes": self.ann_nprobes,
+                "refine_factor": self.ann_refine_factor,
+                "pending_tables": sorted(
+                    t for t, task in self._ann_pending.items() if not task.done()
+                ),
+            },
         }
+
+    async def close(self) -> None:
+        """
+        合并待处理的 FTS 更新并等待向量索引任务, 释放本实例的 embedding 缓存与搜索线程池
+
+        Ollama 共享连接池由其他实例共用, 只在应用 shutdown 时通过
+        close_ollama_embed_clients() 关闭。
+        """
+        await self.flush_fts_updates()
+        await self.flush_vector_index_jobs()
+        if self._search_executor is not None:
+            self._search_executor.shutdown(wait=False)
+            self._search_executor = None
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
+            self._embedding_cache = None
@@ -0,0 +1,299 @@
+"""
+OllamaEmbedClient - 共享连接池的 Ollama /api/embed 客户端
+
+原先 `_ollama_embed` / `_ollama_embed_batch` 每次调用都新建 aiohttp.ClientSession，
+每个查询都要重新建立 TCP 连接，无法复用 keep-alive。本模块提供:
+
+- 长生命周期的 aiohttp.ClientSession (TCPConnector 限制并发连接数)
+- 请求合并 (coalescing): 在 coalesce_window_ms 窗口内到达的并发单条 embed()
+  合并为一次 /api/embed 批量请求 (达到 max_batch 时立即发送)
+- 同一 base_url 的所有 LanceDBClient 实例共享一个客户端，由应用 shutdown 时
+  close_ollama_embed_clients() 统一释放 (单个 LanceDBClient.close() 不关闭)
+- 切换事件循环时关闭旧 session，旧循环上未完成的合并请求以异常结束
+- 指标: requests / coalesced_requests / texts / errors / max_batch_seen
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from loguru import logger
+
+    LOGURU_ENABLED = True
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    LOGURU_ENABLED = False
+
+
+DEFAULT_OLLAMA_URL = "http://ollama:11434"
+
+
+class OllamaEmbedClient:
+    """
+    Pooled, coalescing client for the Ollama embedding endpoint.
+
+    Args:
+        base_url: Ollama 服务地址
+        model: Ollama embedding 模型名
+        max_connections: 连接池上限 (TCPConnector limit)
+        coalesce_window_ms: 单条请求合并等待窗口 (0 = 不合并)
+        max_batch: 单次合并请求的最大文本数
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_OLLAMA_URL,
+        model: str = "bge-m3",
+        max_connections: int = 8,
+        coalesce_window_ms: float = 5.0,
+        max_batch: int = 32,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_connections = max(1, max_connections)
+        self.coalesce_window_ms = max(0.0, coalesce_window_ms)
+        self.max_batch = max(1, max_batch)
+
+        self._session = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # 进行中的合并请求 (持有引用，防止任务在完成前被回收)
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.coalesced_requests = 0
+        self.texts = 0
+        self.errors = 0
+        self.max_batch_seen = 0
+
+    # ------------------------------------------------------------------
+    # Session management
+    # ------------------------------------------------------------------
+
+    def _bind_loop(self) -> None:
+        """Sessions and futures are loop-bound; start fresh on a new loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        old_loop, old_session, old_pending = self._loop, self._session, self._pending
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._loop = loop
+        self._session = None
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+
+        if old_pending:
+            error = RuntimeError("OllamaEmbedClient moved to another event loop")
+            for _, future, _ in old_pending:
+                self._fail_orphan(old_loop, future, error)
+        if old_session is not None and not old_session.closed:
+            if old_loop is not None and old_loop.is_running():
+                # 旧循环仍在其他线程运行: 在它上面关闭
+                asyncio.run_coroutine_threadsafe(_close_session(old_session), old_loop)
+            else:
+                self._track(loop.create_task(_close_session(old_session)))
+
+    @staticmethod
+    def _fail_orphan(
+        loop: Optional[asyncio.AbstractEventLoop], future: asyncio.Future, error: Exception
+    ) -> None:
+        if future.done():
+            return
+        try:
+            if loop is not None and loop.is_running():
+                loop.call_soon_threadsafe(_set_exception, future, error)
+            else:
+                future.set_exception(error)
+        except RuntimeError:
+            # 旧循环已关闭，没有协程还能等待这个 future
+            pass
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _get_session(self):
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """关闭连接池，未完成的合并请求返回 None"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_result(None)
+        if self._session is not None and not self._session.closed:
+            await _close_session(self._session)
+        self._session = None
+        if self._tasks and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def embed_batch(
+        self, texts: List[str], timeout_s: float = 120
+    ) -> Optional[List[List[float]]]:
+        """
+        Batch embed texts via one /api/embed request.
+
+        Returns:
+            One vector per text, or None if Ollama is unavailable.
+        """
+        if not texts:
+            return []
+        self._bind_loop()
+        return await self._post(texts, timeout_s)
+
+    async def embed(self, text: str, timeout_s: float = 30) -> Optional[List[float]]:
+        """
+        Embed a single text, coalescing with concurrent callers.
+
+        Returns:
+            Embedding vector, or None if Ollama is unavailable.
+        """
+        self._bind_loop()
+        if self.coalesce_window_ms <= 0:
+            vectors = await self._post([text], timeout_s)
+            return vectors[0] if vectors else None
+
+        future = self._loop.create_future()
+        self._pending.append((text, future, timeout_s))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(
+                self.coalesce_window_ms / 1000.0, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._track(self._loop.create_task(self._send_coalesced(batch)))
+
+    async def _send_coalesced(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        # Identical concurrent texts share one slot in the request
+        unique: Dict[str, int] = {}
+        for text, _, _ in batch:
+            unique.setdefault(text, len(unique))
+        self.coalesced_requests += len(batch)
+        # The merged request must not time out before any caller would have
+        timeout_s = max(t for _, _, t in batch)
+
+        try:
+            vectors = await self._post(list(unique.keys()), timeout_s)
+        except Exception:
+            vectors = None
+        for text, future, _ in batch:
+            if not future.done():
+                future.set_result(vectors[unique[text]] if vectors else None)
+
+    async def _post(
+        self, texts: List[str], timeout_s: float
+    ) -> Optional[List[List[float]]]:
+        import aiohttp
+
+        self.requests += 1
+        self.texts += len(texts)
+        self.max_batch_seen = max(self.max_batch_seen, len(texts))
+        try:
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": self.model, "input": texts},
+                timeout=aiohttp.ClientTimeout(total=timeout_s),
+            ) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    embeddings = data.get("embeddings")
+                    if embeddings and len(embeddings) == len(texts):
+                        return embeddings
+                if LOGURU_ENABLED:
+                    logger.debug(f"Ollama embed returned status {resp.status}")
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"Ollama embed unavailable: {e}")
+        self.errors += 1
+        return None
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "model": self.model,
+            "max_connections": self.max_connections,
+            "coalesce_window_ms": self.coalesce_window_ms,
+            "requests": self.requests,
+            "coalesced_requests": self.coalesced_requests,
+            "texts": self.texts,
+            "errors": self.errors,
+            "max_batch_seen": self.max_batch_seen,
+            "session_open": self._session is not None and not self._session.closed,
+        }
+
+
+async def _close_session(session) -> None:
+    try:
+        await session.close()
+    except Exception:
+        pass
+
+
+def _set_exception(future: asyncio.Future, error: Exception) -> None:
+    if not future.done():
+        future.set_exception(error)
+
+
+# =============================================================================
+# Shared instances (one pool per Ollama base URL)
+# =============================================================================
+
+_clients: Dict[str, OllamaEmbedClient] = {}
+
+
+def get_ollama_embed_client(
+    base_url: Optional[str] = None, **kwargs: Any
+) -> OllamaEmbedClient:
+    """获取 base_url 对应的共享 OllamaEmbedClient (首次调用时按 kwargs 创建)"""
+    url = (base_url or os.environ.get("OLLAMA_BASE_URL", DEFAULT_OLLAMA_URL)).rstrip("/")
+    client = _clients.get(url)
+    if client is None:
+        client = OllamaEmbedClient(base_url=url, **kwargs)
+        _clients[url] = client
+    return client
+
+
+async def close_ollama_embed_clients() -> None:
+    """关闭所有共享连接池 (应用 shutdown 时调用)"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
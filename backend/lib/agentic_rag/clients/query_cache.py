@@ -0,0 +1,127 @@
+"""
+SearchResultCache - 按索引版本失效的检索结果缓存
+
+相同的 hybrid 检索 (query + 表 + subject/course/tags 过滤 + num_results + rrf_k)
+每次都会重新 embedding 并执行 Dense + FTS。本模块缓存最终结果:
+
+- 缓存键: (db_path, table, 表索引版本, 查询指纹)
+- 表版本: add_documents / 删除 chunk / index_vault_notes / drop 表时递增，
+  旧版本条目立即清除 (精确失效)
+- 上限: TTLCache (maxsize + ttl_seconds)，TTL 兜底其它进程对同一库的写入
+- 进程级共享: 同进程内的所有 LanceDBClient 实例共享版本号，
+  一个实例写入会使其它实例的缓存失效
+- 指标: hits / misses / invalidations / hit_rate / entries
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+
+class SearchResultCache:
+    """
+    Search result cache keyed on query fingerprint + per-table index version.
+
+    Args:
+        maxsize: 最大条目数 (LRU 淘汰)
+        ttl_seconds: 条目存活时间
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0):
+        self._cache: TTLCache = TTLCache(maxsize=max(1, maxsize), ttl=ttl_seconds)
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def fingerprint(**params: Any) -> str:
+        """Stable hash of the search parameters."""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def version(self, db_path: str, table: str) -> int:
+        with self._lock:
+            return self._versions.get((db_path, table), 0)
+
+    def bump(self, db_path: str, table: str) -> int:
+        """Mark a table as changed and drop its cached results."""
+        with self._lock:
+            version = self._versions.get((db_path, table), 0) + 1
+            self._versions[(db_path, table)] = version
+            stale = [k for k in self._cache.keys() if k[0] == db_path and k[1] == table]
+            for key in stale:
+                self._cache.pop(key, None)
+            self.invalidations += len(stale)
+            return version
+
+    def get(
+        self, db_path: str, table: str, fingerprint: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            key = (db_path, table, self._versions.get((db_path, table), 0), fingerprint)
+            results = self._cache.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Callers mutate result dicts (fusion scores, metadata) — hand out copies
+        return copy.deepcopy(results)
+
+    def put(
+        self,
+        db_path: str,
+        table: str,
+        fingerprint: str,
+        results: List[Dict[str, Any]],
+        version: int,
+    ) -> None:
+        """Store results computed against ``version`` (dropped if the table moved on)."""
+        with self._lock:
+            if self._versions.get((db_path, table), 0) != version:
+                return
+            self._cache[(db_path, table, version, fingerprint)] = copy.deepcopy(results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+                "ttl_seconds": self._cache.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "table_versions": {
+                    f"{db}:{table}": v for (db, table), v in self._versions.items()
+                },
+            }
+
+
+# =============================================================================
+# Singleton (shared by all LanceDBClient instances in the process)
+# =============================================================================
+
+_cache: Optional[SearchResultCache] = None
+
+
+def get_search_result_cache(**kwargs: Any) -> SearchResultCache:
+    """获取进程级共享 SearchResultCache (首次调用时按 kwargs 创建)"""
+    global _cache
+    if _cache is None:
+        _cache = SearchResultCache(**kwargs)
+    return _cache
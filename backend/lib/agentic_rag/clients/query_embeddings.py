@@ -0,0 +1,81 @@
+"""
+QueryEmbeddingScope - 单次请求内共享的查询向量
+
+canvas_agentic_rag 的 5 路并行检索中，retrieve_lancedb / vault_notes /
+multimodal / cross_canvas 都会对同一个 query 各自调用一次 embedding。
+本模块提供请求级的查询向量上下文:
+
+- prepare_query_embeddings 节点在 fan-out 前把所有不同的 query
+  (原始 query + multi_query 变体 + rewrite 结果) 一次批量 embedding，
+  写入 state["query_embeddings"]
+- 检索节点用 query_embedding_scope(state["query_embeddings"]) 包住检索调用，
+  LanceDBClient._get_query_vector 优先从当前 scope 取向量
+- scope 未命中时仍会正常 embedding，并记录到 scope.calls，
+  节点把它合并进 state["embedding_calls"] 便于观察重复 embedding
+
+基于 contextvars，asyncio.gather 派生的子任务自动继承当前 scope。
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Mapping, Optional
+
+
+class QueryEmbeddingScope:
+    """
+    Request-scoped query → vector memo.
+
+    Args:
+        vectors: 预先计算好的查询向量 (通常来自 state["query_embeddings"])
+    """
+
+    def __init__(self, vectors: Optional[Mapping[str, List[float]]] = None):
+        self.vectors: Dict[str, List[float]] = dict(vectors or {})
+        self.calls: Dict[str, int] = {}
+        self.hits = 0
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the shared vector for ``text`` (None if not embedded yet)."""
+        vector = self.vectors.get(text)
+        if vector is not None:
+            self.hits += 1
+        return vector
+
+    def record(self, text: str, vector: Optional[List[float]]) -> None:
+        """Record an embedding call made inside this scope."""
+        self.calls[text] = self.calls.get(text, 0) + 1
+        if vector is not None:
+            self.vectors[text] = vector
+
+
+_current_scope: ContextVar[Optional[QueryEmbeddingScope]] = ContextVar(
+    "query_embedding_scope", default=None
+)
+
+
+def current_query_embedding_scope() -> Optional[QueryEmbeddingScope]:
+    """当前请求的查询向量 scope (不在 scope 内时为 None)"""
+    return _current_scope.get()
+
+
+@contextmanager
+def query_embedding_scope(
+    vectors: Optional[Mapping[str, List[float]]] = None,
+) -> Iterator[QueryEmbeddingScope]:
+    """
+    在 with 块内共享查询向量。
+
+    Example:
+        >>> with query_embedding_scope(state.get("query_embeddings")) as scope:
+        ...     results = await client.search(query)
+        >>> scope.calls  # with 块内实际发生的 embedding 次数
+    """
+    scope = QueryEmbeddingScope(vectors)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
@@ -0,0 +1,223 @@
+"""
+JiebaTokenizer - jieba 分词服务 (FTS 预分词 + 查询分词)
+
+原先 lancedb_client 在 import 时同步 `jieba.initialize()`，索引时逐 chunk 分词、
+查询时每次都重新分词。本模块提供:
+
+- 预热: 应用启动时后台加载 jieba 词典 (可指定持久化缓存目录与用户词典)，
+  首次搜索不再等待 1-2 秒的字典加载
+- 索引分词: tokenize_batch() / index_tokenization() 范围内的分词不经过查询
+  LRU (索引流水线在分块 worker 进程中调用，并行度由 VaultIndexPipeline 的
+  进程池提供)
+- 查询缓存: tokenize() 的短文本 (查询) 分词结果进入 LRU，索引 chunk 不会挤出
+  查询条目，命中率只反映查询
+- 指标: startup_ms / texts / tokens / tokens_per_sec / query cache 命中率
+
+环境变量:
+- JIEBA_CACHE_DIR: jieba 序列化词典缓存目录 (默认系统临时目录)
+- JIEBA_USER_DICT: 用户词典路径 (课程术语等)
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from cachetools import LRUCache
+
+try:
+    from loguru import logger
+
+    LOGURU_ENABLED = True
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    LOGURU_ENABLED = False
+
+try:
+    import jieba
+
+    JIEBA_AVAILABLE = True
+except ImportError:
+    JIEBA_AVAILABLE = False
+
+
+# Texts up to this length are treated as queries and cached
+QUERY_CACHE_MAX_CHARS = 256
+
+# Set while index-time content is tokenized: chunks are rarely tokenized twice,
+# so caching them would only evict query entries and skew the query hit rate
+_index_time: ContextVar[bool] = ContextVar("jieba_index_time", default=False)
+
+
+@contextmanager
+def index_tokenization() -> Iterator[None]:
+    """Tokenize index-time content inside this block without using the query LRU."""
+    token = _index_time.set(True)
+    try:
+        yield
+    finally:
+        _index_time.reset(token)
+
+
+class JiebaTokenizer:
+    """
+    jieba 精确模式分词服务
+
+    Args:
+        cache_dir: jieba 词典缓存目录 (None = JIEBA_CACHE_DIR 或 jieba 默认)
+        user_dict: 用户词典路径 (None = JIEBA_USER_DICT)
+        query_cache_size: 查询分词 LRU 容量
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        user_dict: Optional[str] = None,
+        query_cache_size: int = 4096,
+    ):
+        self.cache_dir = cache_dir or os.environ.get("JIEBA_CACHE_DIR")
+        self.user_dict = user_dict or os.environ.get("JIEBA_USER_DICT")
+        self._query_cache: LRUCache = LRUCache(maxsize=max(1, query_cache_size))
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+
+        self.warmed_up = False
+        self.startup_ms: Optional[float] = None
+        self.texts = 0
+        self.tokens = 0
+        self.tokenize_seconds = 0.0
+        self.query_hits = 0
+        self.query_misses = 0
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def warm_up(self) -> bool:
+        """Load the jieba dictionary (and user dictionary) once."""
+        if not JIEBA_AVAILABLE:
+            return False
+        if self.warmed_up:
+            return True
+        with self._warm_lock:
+            if self.warmed_up:
+                return True
+            start = time.perf_counter()
+            try:
+                if self.cache_dir:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    jieba.dt.tmp_dir = self.cache_dir
+                jieba.initialize()
+                if self.user_dict and os.path.isfile(self.user_dict):
+                    jieba.load_userdict(self.user_dict)
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.warning(f"[Tokenizer] jieba warm-up failed: {e}")
+            self.startup_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.warmed_up = True
+            if LOGURU_ENABLED:
+                logger.info(f"[Tokenizer] jieba dictionary loaded in {self.startup_ms}ms")
+        return True
+
+    async def warm_up_async(self) -> bool:
+        """Warm up in a worker thread (for FastAPI lifespan background task)."""
+        return await asyncio.to_thread(self.warm_up)
+
+    # ------------------------------------------------------------------
+    # Tokenization
+    # ------------------------------------------------------------------
+
+    def tokenize(self, text: str) -> str:
+        """
+        jieba 精确模式 (cut_all=False) 分词，输出空格分隔的词语字符串。
+
+        短文本 (查询) 命中 LRU 时不重新分词；index_tokenization() 范围内
+        (索引内容) 不读写查询 LRU。
+        """
+        if not JIEBA_AVAILABLE:
+            return text
+        if not text or not text.strip():
+            return text
+
+        cacheable = len(text) <= QUERY_CACHE_MAX_CHARS and not _index_time.get()
+        if cacheable:
+            with self._lock:
+                cached = self._query_cache.get(text)
+                if cached is not None:
+                    self.query_hits += 1
+                    return cached
+                self.query_misses += 1
+
+        if not self.warmed_up:
+            self.warm_up()
+        start = time.perf_counter()
+        tokens = list(jieba.cut(text, cut_all=False))
+        elapsed = time.perf_counter() - start
+        result = " ".join(tokens)
+
+        with self._lock:
+            self.texts += 1
+            self.tokens += len(tokens)
+            self.tokenize_seconds += elapsed
+            if cacheable:
+                self._query_cache[text] = result
+        return result
+
+    def tokenize_batch(self, texts: Sequence[str]) -> List[str]:
+        """
+        Tokenize index-time content (chunks) without touching the query LRU.
+
+        Args:
+            texts: Texts to tokenize.
+
+        Returns:
+            Tokenized strings aligned with ``texts``.
+        """
+        with index_tokenization():
+            return [self.tokenize(t) for t in texts]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.query_hits + self.query_misses
+        return {
+            "jieba_available": JIEBA_AVAILABLE,
+            "warmed_up": self.warmed_up,
+            "startup_ms": self.startup_ms,
+            "texts": self.texts,
+            "tokens": self.tokens,
+            "tokens_per_sec": round(self.tokens / self.tokenize_seconds, 1)
+            if self.tokenize_seconds
+            else 0.0,
+            "query_cache_entries": len(self._query_cache),
+            "query_cache_hits": self.query_hits,
+            "query_cache_misses": self.query_misses,
+            "query_cache_hit_rate": round(self.query_hits / lookups, 4)
+            if lookups
+            else 0.0,
+        }
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_tokenizer: Optional[JiebaTokenizer] = None
+
+
+def get_jieba_tokenizer(**kwargs: Any) -> JiebaTokenizer:
+    """获取进程级共享 JiebaTokenizer (首次调用时按 kwargs 创建)"""
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = JiebaTokenizer(**kwargs)
+    return _tokenizer
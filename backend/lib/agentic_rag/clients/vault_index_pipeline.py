@@ -0,0 +1,463 @@
+"""
+VaultIndexPipeline - 分阶段并发的 Vault 笔记索引流水线
+
+index_vault_notes 原先逐文件串行执行 读取 → 分块 → embedding → 写入，
+5k 笔记的全量重建主要耗在串行的 embedding 往返与逐文件 add_documents 上。
+
+本模块把四个阶段拆成由有界队列连接的流水线，让 CPU 分块、embedding I/O
+与 LanceDB 写入相互重叠:
+
+    read (线程) ──▶ chunk (进程池/线程) ──▶ embed (跨文件批次, 并发) ──▶ write (批量)
+
+- read: 文件读取在线程中执行，不阻塞事件循环
+- chunk: _split_md_by_heading 在进程池中执行 (文件数较少时退化为线程)
+- embed: 跨文件累积 chunk，凑满 embed_batch_size 后发起一次批量 embedding，
+  最多 embed_concurrency 个批次同时在途
+- write: 单写者，文件的全部 chunk 向量就绪后进入写缓冲，凑满 write_batch_size
+  后一次性 delete-before-insert + 批量插入 + 指纹更新
+
+所有队列均有界 (queue_size)，上游阶段在下游积压时自动背压。
+
+吞吐量 (files/s, chunks/s) 通过 progress_callback 上报:
+- callback(current, total)            — 旧签名，保持兼容
+- callback(current, total, stats)     — 可选第三参数接收吞吐统计 dict
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from loguru import logger
+
+    LOGURU_ENABLED = True
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    LOGURU_ENABLED = False
+
+
+# 文件数低于该值时不启动进程池 (进程启动 + jieba 字典加载开销大于收益)
+PROCESS_POOL_MIN_FILES = 32
+
+# 队列结束哨兵
+_SENTINEL = object()
+
+
+@dataclass
+class IndexFileJob:
+    """流水线中单个文件的处理状态"""
+
+    abs_path: str
+    rel_path: str
+    content: str = ""
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    vectors: List[Optional[List[float]]] = field(default_factory=list)
+    pending: int = 0
+    failed: bool = False
+
+
+@dataclass
+class IndexPipelineStats:
+    """流水线吞吐统计"""
+
+    total_files: int = 0
+    files_done: int = 0
+    files_indexed: int = 0
+    files_skipped: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    embed_batches: int = 0
+    write_batches: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def elapsed_s(self) -> float:
+        return max(time.perf_counter() - self.started_at, 1e-9)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed_s()
+        return {
+            "total_files": self.total_files,
+            "files_done": self.files_done,
+            "files_indexed": self.files_indexed,
+            "files_skipped": self.files_skipped,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_written": self.chunks_written,
+            "embed_batches": self.embed_batches,
+            "write_batches": self.write_batches,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "files_per_sec": round(self.files_done / elapsed, 2),
+            "chunks_per_sec": round(self.chunks_written / elapsed, 2),
+        }
+
+
+def _in_flight_busy(tasks: List[asyncio.Task]) -> bool:
+    """是否仍有未完成的 embedding 批次"""
+    return any(not t.done() for t in tasks)
+
+
+def _callback_accepts_stats(callback: Callable) -> bool:
+    """判断 progress_callback 是否接受第三个 stats 参数"""
+    try:
+        params = list(inspect.signature(callback).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in params):
+        return True
+    positional = [
+        p
+        for p in params
+        if p.kind
+        in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    return len(positional) >= 3
+
+
+class VaultIndexPipeline:
+    """
+    Vault 笔记并发索引流水线
+
+    不直接依赖 LanceDBClient，各阶段的具体实现通过可调用对象注入:
+
+    Args:
+        chunk_fn: 同步函数 (rel_path, content, max_tokens, overlap_tokens) -> chunks，
+            需为模块级函数以便在进程池中 pickle
+        embed_fn: 异步函数 (texts) -> vectors 或 None (None 表示本批次失败)
+        write_fn: 异步函数 (jobs) -> 写入的 chunk 数，负责 delete-before-insert 与指纹更新
+        max_tokens / overlap_tokens: 透传给 chunk_fn
+        embed_batch_size: 跨文件 embedding 批次大小
+        embed_concurrency: 同时在途的 embedding 批次数
+        chunk_workers: 分块进程数 (<=1 时使用线程)
+        write_batch_size: 单次批量写入的 chunk 数阈值
+        queue_size: 各阶段间队列容量
+        progress_callback: callback(current, total[, stats])
+    """
+
+    def __init__(
+        self,
+        chunk_fn: Callable[[str, str, int, int], List[Dict[str, Any]]],
+        embed_fn: Callable[[List[str]], Awaitable[Optional[List[List[float]]]]],
+        write_fn: Callable[[List[IndexFileJob]], Awaitable[int]],
+        max_tokens: int = 512,
+        overlap_tokens: int = 50,
+        embed_batch_size: int = 64,
+        embed_concurrency: int = 2,
+        chunk_workers: int = 0,
+        write_batch_size: int = 512,
+        queue_size: int = 64,
+        progress_callback: Optional[Callable] = None,
+    ):
+        self.chunk_fn = chunk_fn
+        self.embed_fn = embed_fn
+        self.write_fn = write_fn
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.embed_concurrency = max(1, embed_concurrency)
+        self.chunk_workers = max(0, chunk_workers)
+        self.write_batch_size = max(1, write_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.progress_callback = progress_callback
+        self._callback_with_stats = bool(
+            progress_callback and _callback_accepts_stats(progress_callback)
+        )
+        self.stats = IndexPipelineStats()
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+
+    def _file_done(self, indexed: bool) -> None:
+        self.stats.files_done += 1
+        if indexed:
+            self.stats.files_indexed += 1
+        else:
+            self.stats.files_skipped += 1
+        if self.progress_callback is None:
+            return
+        try:
+            if self._callback_with_stats:
+                self.progress_callback(
+                    self.stats.files_done, self.stats.total_files, self.stats.to_dict()
+                )
+            else:
+                self.progress_callback(self.stats.files_done, self.stats.total_files)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"[INDEX-PIPELINE] progress_callback failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _read_file(path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                return fh.read()
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"Skipping {path}: {e}")
+            return None
+
+    async def _read_stage(
+        self, files: List[tuple], read_queue: asyncio.Queue, chunk_tasks: int
+    ) -> None:
+        try:
+            for abs_path, rel_path in files:
+                content = await asyncio.to_thread(self._read_file, abs_path)
+                if content is None or not content.strip():
+                    self._file_done(indexed=False)
+                    continue
+                await read_queue.put(
+                    IndexFileJob(abs_path=abs_path, rel_path=rel_path, content=content)
+                )
+        finally:
+            for _ in range(chunk_tasks):
+                await read_queue.put(_SENTINEL)
+
+    async def _chunk_stage(
+        self,
+        read_queue: asyncio.Queue,
+        chunk_queue: asyncio.Queue,
+        executor: Optional[Executor],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await read_queue.get()
+            if job is _SENTINEL:
+                break
+            args = (job.rel_path, job.content, self.max_tokens, self.overlap_tokens)
+            try:
+                if executor is not None:
+                    try:
+                        job.chunks = await loop.run_in_executor(
+                            executor, self.chunk_fn, *args
+                        )
+                    except Exception as e:
+                        # BrokenProcessPool / pickling errors — degrade to thread
+                        if LOGURU_ENABLED:
+                            logger.debug(
+                                f"[INDEX-PIPELINE] Process chunking failed for "
+                                f"{job.rel_path}, retrying in thread: {e}"
+                            )
+                        job.chunks = await asyncio.to_thread(self.chunk_fn, *args)
+                else:
+                    job.chunks = await asyncio.to_thread(self.chunk_fn, *args)
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.error(f"Chunking failed for {job.rel_path}: {e}")
+                job.chunks = []
+
+            if not job.chunks:
+                self._file_done(indexed=False)
+                continue
+            job.vectors = [None] * len(job.chunks)
+            job.pending = len(job.chunks)
+            await chunk_queue.put(job)
+        await chunk_queue.put(_SENTINEL)
+
+    async def _embed_batch(
+        self,
+        batch: List[tuple],
+        write_queue: asyncio.Queue,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        try:
+            texts = [job.chunks[idx]["content"] for job, idx in batch]
+            try:
+                vectors = await self.embed_fn(texts)
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.error(f"[INDEX-PIPELINE] Embedding batch failed: {e}")
+                vectors = None
+            if vectors is not None and len(vectors) != len(texts):
+                if LOGURU_ENABLED:
+                    logger.error(
+                        f"Vectorization mismatch: {len(texts)} chunks vs {len(vectors)} vectors"
+                    )
+                vectors = None
+
+            self.stats.embed_batches += 1
+            finished: List[IndexFileJob] = []
+            for pos, (job, idx) in enumerate(batch):
+                if vectors is None:
+                    job.failed = True
+                else:
+                    job.vectors[idx] = vectors[pos]
+                    self.stats.chunks_embedded += 1
+                job.pending -= 1
+                if job.pending == 0:
+                    finished.append(job)
+
+            for job in finished:
+                if job.failed:
+                    if LOGURU_ENABLED:
+                        logger.error(
+                            f"Both Ollama and CPU vectorizer unavailable, skipping {job.rel_path}"
+                        )
+                    self._file_done(indexed=False)
+                else:
+                    await write_queue.put(job)
+        finally:
+            semaphore.release()
+
+    async def _embed_stage(
+        self, chunk_queue: asyncio.Queue, write_queue: asyncio.Queue
+    ) -> None:
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+        in_flight: List[asyncio.Task] = []
+        pending: List[tuple] = []
+
+        async def _dispatch(batch: List[tuple]) -> None:
+            await semaphore.acquire()
+            in_flight[:] = [t for t in in_flight if not t.done()]
+            in_flight.append(
+                asyncio.create_task(self._embed_batch(batch, write_queue, semaphore))
+            )
+
+        try:
+            while True:
+                job = await chunk_queue.get()
+                if job is _SENTINEL:
+                    break
+                pending.extend((job, idx) for idx in range(len(job.chunks)))
+                while len(pending) >= self.embed_batch_size:
+                    batch = pending[: self.embed_batch_size]
+                    pending = pending[self.embed_batch_size :]
+                    await _dispatch(batch)
+                # Flush a partial batch when upstream has nothing queued, so the
+                # tail of a slow read/chunk stage is not held back waiting for peers.
+                if pending and chunk_queue.empty() and not _in_flight_busy(in_flight):
+                    batch, pending = pending, []
+                    await _dispatch(batch)
+            if pending:
+                await _dispatch(pending)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            await write_queue.put(_SENTINEL)
+
+    async def _flush_writes(self, buffer: List[IndexFileJob]) -> None:
+        chunk_count = sum(len(job.chunks) for job in buffer)
+        try:
+            written = await self.write_fn(buffer)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.error(f"[INDEX-PIPELINE] Bulk write failed: {e}")
+            written = 0
+        self.stats.write_batches += 1
+        self.stats.chunks_written += written
+        ok = written > 0 or chunk_count == 0
+        for _ in buffer:
+            self._file_done(indexed=ok)
+
+    async def _write_stage(self, write_queue: asyncio.Queue) -> None:
+        buffer: List[IndexFileJob] = []
+        buffered_chunks = 0
+        while True:
+            job = await write_queue.get()
+            if job is _SENTINEL:
+                break
+            buffer.append(job)
+            buffered_chunks += len(job.chunks)
+            if buffered_chunks >= self.write_batch_size or write_queue.empty():
+                await self._flush_writes(buffer)
+                buffer = []
+                buffered_chunks = 0
+        if buffer:
+            await self._flush_writes(buffer)
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    async def run(self, files: List[tuple]) -> Dict[str, Any]:
+        """
+        执行流水线
+
+        Args:
+            files: [(abs_path, rel_path), ...]
+
+        Returns:
+            吞吐统计 dict (见 IndexPipelineStats.to_dict)
+        """
+        self.stats = IndexPipelineStats(total_files=len(files))
+        if not files:
+            return self.stats.to_dict()
+
+        executor: Optional[Executor] = None
+        if self.chunk_workers > 1 and len(files) >= PROCESS_POOL_MIN_FILES:
+            try:
+                # spawn: forking a process that holds LanceDB's async runtime
+                # is unsafe, and spawn matches the Windows default anyway.
+                executor = ProcessPoolExecutor(
+                    max_workers=min(self.chunk_workers, os.cpu_count() or 1),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except Exception as e:
+                if LOGURU_ENABLED:
+                    logger.debug(f"[INDEX-PIPELINE] Process pool unavailable: {e}")
+                executor = None
+
+        chunk_tasks = max(1, self.chunk_workers)
+        read_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        try:
+            chunkers = [
+                self._chunk_stage(read_queue, chunk_queue, executor)
+                for _ in range(chunk_tasks)
+            ]
+            # _chunk_stage emits one sentinel per worker; embed stage must wait
+            # for all of them, so fan them into a single sentinel here.
+            merged_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+            async def _merge() -> None:
+                remaining = chunk_tasks
+                while remaining:
+                    item = await chunk_queue.get()
+                    if item is _SENTINEL:
+                        remaining -= 1
+                        continue
+                    await merged_queue.put(item)
+                await merged_queue.put(_SENTINEL)
+
+            stages = [
+                asyncio.create_task(c)
+                for c in (
+                    self._read_stage(files, read_queue, chunk_tasks),
+                    *chunkers,
+                    _merge(),
+                    self._embed_stage(merged_queue, write_queue),
+                    self._write_stage(write_queue),
+                )
+            ]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                for task in stages:
+                    task.cancel()
+                raise
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        stats = self.stats.to_dict()
+        if LOGURU_ENABLED:
+            logger.info(
+                f"[INDEX-PIPELINE] {stats['files_indexed']}/{stats['total_files']} files, "
+                f"{stats['chunks_written']} chunks, "
+                f"{stats['files_per_sec']} files/s, {stats['chunks_per_sec']} chunks/s"
+            )
+        return stats
@@ -0,0 +1,161 @@
+"""
+WikiLinkIndex - 笔记级 wiki-link 邻接索引 (Story 2.8 AC-4 邻居扩展)
+
+expand_neighbors 原先对每个 [[link]] 依次执行一次
+canvas_file LIKE '%name%' 全表扫描，既慢又会误匹配 (名称互为子串的文件)。
+本模块在 index_vault_notes 写入时维护笔记级链接图:
+
+- 文件: canvas_file (vault 相对路径) → 出链目标 + 前 N 个 chunk doc_id (文档顺序)
+- 解析: 按 Obsidian 规则把链接目标解析为精确文件路径
+  ([[name]] / [[name.md]] / [[dir/name]] / [[name#标题]] / [[name^块]]，不区分大小写；
+  同名文件取路径最短者)
+- 查询: neighbour_chunk_ids(links) 返回链接文件的 chunk id，
+  邻居扩展变为一次 doc_id IN (...) 批量查询
+
+由 LanceDBClient 持久化到 wikilink_graph 表 (每文件一行)，
+wikilink_graph_service 也可直接由本索引构建图 (build_from_index)，无需重新解析 vault。
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import posixpath
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# 每个链接文件参与邻居扩展的 chunk 数 (与原 LIKE 查询的 limit(3) 一致)
+TOP_CHUNKS = 3
+
+
+def link_key(target: str) -> str:
+    """Normalized link target: no anchor / alias / .md suffix, '/' separators, lower case."""
+    target = target.split("|", 1)[0]
+    for anchor in ("#", "^"):
+        target = target.split(anchor, 1)[0]
+    target = target.strip().replace("\\", "/").strip("/")
+    if target.lower().endswith(".md"):
+        target = target[:-3]
+    return target.lower()
+
+
+def _path_key(file_path: str) -> str:
+    return link_key(file_path)
+
+
+def _name_key(file_path: str) -> str:
+    return posixpath.basename(_path_key(file_path))
+
+
+class WikiLinkIndex:
+    """Note-level wiki-link graph with link target → exact file resolution."""
+
+    def __init__(self, top_chunks: int = TOP_CHUNKS):
+        self.top_chunks = top_chunks
+        self._links: Dict[str, List[str]] = {}
+        self._chunks: Dict[str, List[str]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._linked_from: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._links
+
+    def set_file(self, file_path: str, links: Iterable[str], chunk_ids: Iterable[str]) -> None:
+        """Replace a file's outgoing links and chunk ids."""
+        self._drop(file_path)
+        keys: List[str] = []
+        for link in links:
+            key = link_key(link)
+            if key and key not in keys:
+                keys.append(key)
+        self._links[file_path] = keys
+        self._chunks[file_path] = list(chunk_ids)[: self.top_chunks]
+        self._by_name.setdefault(_name_key(file_path), set()).add(file_path)
+        for key in keys:
+            self._linked_from.setdefault(posixpath.basename(key), set()).add(file_path)
+
+    def remove_files(self, file_paths: Iterable[str]) -> None:
+        for file_path in file_paths:
+            self._drop(file_path)
+
+    def _drop(self, file_path: str) -> None:
+        keys = self._links.pop(file_path, None)
+        if keys is None:
+            return
+        self._chunks.pop(file_path, None)
+        name = _name_key(file_path)
+        paths = self._by_name.get(name)
+        if paths is not None:
+            paths.discard(file_path)
+            if not paths:
+                del self._by_name[name]
+        for key in keys:
+            sources = self._linked_from.get(posixpath.basename(key))
+            if sources is not None:
+                sources.discard(file_path)
+                if not sources:
+                    del self._linked_from[posixpath.basename(key)]
+
+    def resolve(self, target: str) -> Optional[str]:
+        """Exact file path a link target points to (None if no such note)."""
+        key = link_key(target)
+        candidates = self._by_name.get(posixpath.basename(key))
+        if not candidates:
+            return None
+        if "/" in key:
+            candidates = {
+                path for path in candidates
+                if _path_key(path) == key or _path_key(path).endswith("/" + key)
+            }
+            if not candidates:
+                return None
+        return min(candidates, key=lambda path: (path.count("/"), len(path), path))
+
+    def outgoing(self, file_path: str) -> List[str]:
+        """Files this note links to, in link order."""
+        resolved: List[str] = []
+        for key in self._links.get(file_path, ()):
+            target = self.resolve(key)
+            if target is not None and target != file_path and target not in resolved:
+                resolved.append(target)
+        return resolved
+
+    def backlinks(self, file_path: str) -> List[str]:
+        """Files linking to this note."""
+        sources = self._linked_from.get(_name_key(file_path), set())
+        return sorted(
+            source for source in sources
+            if source != file_path and file_path in self.outgoing(source)
+        )
+
+    def chunk_ids(self, file_path: str) -> List[str]:
+        return list(self._chunks.get(file_path, ()))
+
+    def neighbour_chunk_ids(self, links: Iterable[str]) -> List[Tuple[str, str]]:
+        """(file_path, doc_id) of the top chunks of every file the links resolve to."""
+        pairs: List[Tuple[str, str]] = []
+        seen_files: Set[str] = set()
+        for link in links:
+            target = self.resolve(link)
+            if target is None or target in seen_files:
+                continue
+            seen_files.add(target)
+            pairs.extend((target, doc_id) for doc_id in self._chunks.get(target, ()))
+        return pairs
+
+    def edges(self) -> List[Tuple[str, str]]:
+        """All resolved (source, target) file pairs."""
+        return [(source, target) for source in self._links for target in self.outgoing(source)]
+
+    def files(self) -> List[str]:
+        return list(self._links)
+
+    def links(self, file_path: str) -> List[str]:
+        return list(self._links.get(file_path, ()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._links),
+            "links": sum(len(keys) for keys in self._links.values()),
+        }
@@ -2,19 +2,36 @@
 Story 2.10: Context Compression Module
 
 Implements sentence-level extractive compression:
-- Query-relevance scoring per sentence
+- Query-relevance scoring per sentence (BM25)
 - Atomic block protection (code, formulas, tables)
 - Token budget enforcement (default 3000 tokens)
 - Staleness check via content_hash comparison
 
+CompressionEngine keeps the per-request work small:
+- the query is tokenized once per request
+- sentence splitting, token counts and jieba term frequencies are cached
+  per document content hash (LRU), so chunks seen by earlier requests or
+  CRAG loop iterations are not re-tokenized
+- IDF comes from vault-level document frequencies (TermStatistics built
+  from the vault_notes content_tokenized column by LanceDBClient);
+  without them the candidate sentences themselves serve as the corpus
+- budget selection is a single pass over the relevance order
+
 Reference: Sentence-level extraction preserves factual accuracy
 (no LLM summarization = no hallucination risk).
 """
 
+import hashlib
 import logging
+import math
 import re
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from cachetools import LRUCache
+
+from agentic_rag.clients.tokenization import JIEBA_AVAILABLE, get_jieba_tokenizer
 
 logger = logging.getLogger(__name__)
 
@@ -32,22 +49,41 @@ _SENTENCE_PATTERN = re.compile(
     r"|\n+"
 )
 
+# Terms must contain at least one word character (drops punctuation tokens)
+_WORD_PATTERN = re.compile(r"\w+")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_encoder: Any = None
+
+
+def _get_encoder() -> Any:
+    """tiktoken cl100k_base encoder, loaded once (None if tiktoken is missing)."""
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoder = False
+    return _encoder or None
+
 
 def _count_tokens_approx(text: str) -> int:
     """
     Approximate token count: 1 token ~ 4 chars (EN) / 1.5 chars (CN).
     Uses tiktoken if available for accuracy.
     """
-    try:
-        import tiktoken
-
-        enc = tiktoken.get_encoding("cl100k_base")
+    enc = _get_encoder()
+    if enc is not None:
         return len(enc.encode(text))
-    except ImportError:
-        # Heuristic fallback
-        cn_chars = sum(1 for c in text if "\u4e00" <= c <= "\u9fff")
-        en_chars = len(text) - cn_chars
-        return int(cn_chars / 1.5 + en_chars / 4)
+    # Heuristic fallback
+    cn_chars = sum(1 for c in text if "\u4e00" <= c <= "\u9fff")
+    en_chars = len(text) - cn_chars
+    return int(cn_chars / 1.5 + en_chars / 4)
 
 
 def _split_into_units(text: str) -> List[dict]:
@@ -59,22 +95,19 @@ def _split_into_units(text: str) -> List[dict]:
     units: List[dict] = []
     last_end = 0
 
+    def _add_sentences(segment: str) -> None:
+        for s in _SENTENCE_PATTERN.split(segment):
+            s = s.strip()
+            if s:
+                units.append(
+                    {"text": s, "is_atomic": False, "tokens": _count_tokens_approx(s)}
+                )
+
     for m in _ATOMIC_PATTERN.finditer(text):
         # Non-atomic text before this block
         before = text[last_end : m.start()]
         if before.strip():
-            # Split into sentences
-            sentences = _SENTENCE_PATTERN.split(before)
-            for s in sentences:
-                s = s.strip()
-                if s:
-                    units.append(
-                        {
-                            "text": s,
-                            "is_atomic": False,
-                            "tokens": _count_tokens_approx(s),
-                        }
-                    )
+            _add_sentences(before)
         # Atomic block
         block_text = m.group(0).strip()
         if block_text:
@@ -90,88 +123,236 @@ def _split_into_units(text: str) -> List[dict]:
     # Remaining text
     remaining = text[last_end:]
     if remaining.strip():
-        sentences = _SENTENCE_PATTERN.split(remaining)
-        for s in sentences:
-            s = s.strip()
-            if s:
-                units.append(
-                    {
-                        "text": s,
-                        "is_atomic": False,
-                        "tokens": _count_tokens_approx(s),
-                    }
-                )
+        _add_sentences(remaining)
 
     return units
 
 
-def _tokenize_text(text: str) -> set:
-    """
-    Tokenize text using jieba for Chinese and regex for non-Chinese.
+def _terms_from_tokenized(tokenized: str) -> List[str]:
+    """Lowercased terms of a space-separated jieba tokenization."""
+    return [t.lower() for t in tokenized.split() if _WORD_PATTERN.search(t)]
 
-    jieba.cut handles Chinese word segmentation properly (e.g. "贝叶斯定理"
-    -> ["贝叶斯", "定理"]), whereas \\w+ treats each Chinese character as a
-    separate "word" and misses multi-character term matches.
 
-    Falls back to regex \\w+ if jieba is not available.
+def _tokenize_terms(text: str) -> List[str]:
     """
-    try:
-        import jieba
+    Tokenize text into lowercased terms (jieba for Chinese, regex fallback).
 
-        # jieba.cut handles mixed Chinese/English text
-        return {
-            w.strip().lower()
-            for w in jieba.cut(text)
-            if w.strip() and len(w.strip()) > 0
-        }
-    except ImportError:
-        return set(re.findall(r"\w+", text.lower()))
+    jieba segments multi-character terms (e.g. "贝叶斯定理" -> ["贝叶斯", "定理"])
+    the same way the FTS index does, so terms line up with vault statistics.
+    """
+    if JIEBA_AVAILABLE:
+        return _terms_from_tokenized(get_jieba_tokenizer().tokenize(text))
+    return _WORD_PATTERN.findall(text.lower())
 
 
-def _score_relevance(unit_text: str, query: str) -> float:
+class TermStatistics:
     """
-    Score sentence relevance to query using keyword overlap (TF-IDF-like).
-    Higher score = more relevant.
+    Document frequencies for BM25 IDF.
 
-    Uses jieba for Chinese tokenization to correctly segment multi-character
-    terms (e.g. "贝叶斯定理" -> ["贝叶斯", "定理"]) instead of treating each
-    character as a separate token.
+    Args:
+        num_docs: 语料文档数 (vault chunk 数)
+        doc_freq: term → 包含该 term 的文档数
     """
-    query_lower = query.lower()
-    unit_lower = unit_text.lower()
 
-    # Extract query terms using jieba-aware tokenization
-    query_terms = _tokenize_text(query_lower)
-    if not query_terms:
-        return 0.0
+    def __init__(self, num_docs: int, doc_freq: Dict[str, int]):
+        self.num_docs = num_docs
+        self.doc_freq = doc_freq
 
-    # Count matching terms
-    unit_terms = _tokenize_text(unit_lower)
-    overlap = query_terms & unit_terms
+    @classmethod
+    def from_term_sets(cls, docs: Iterable[Iterable[str]]) -> "TermStatistics":
+        doc_freq: Dict[str, int] = {}
+        num_docs = 0
+        for terms in docs:
+            num_docs += 1
+            for term in set(terms):
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+        return cls(num_docs, doc_freq)
 
-    # Score: proportion of query terms found + bonus for longer matches
-    base_score = len(overlap) / len(query_terms) if query_terms else 0.0
+    @classmethod
+    def from_tokenized(cls, texts: Iterable[Optional[str]]) -> "TermStatistics":
+        """Build from content_tokenized values (space-separated jieba output)."""
+        return cls.from_term_sets(_terms_from_tokenized(t) for t in texts if t)
 
-    # Substring match bonus (for Chinese phrases)
-    substring_bonus = 0.0
-    for qt in query_terms:
-        if len(qt) >= 2 and qt in unit_lower:
-            substring_bonus += 0.1
+    def idf(self, term: str) -> float:
+        df = self.doc_freq.get(term, 0)
+        return math.log(1.0 + (self.num_docs - df + 0.5) / (df + 0.5))
 
-    return min(base_score + substring_bonus, 1.0)
+
+class _Unit(NamedTuple):
+    text: str
+    is_atomic: bool
+    tokens: int
+    term_freq: Dict[str, int]
+    length: int
+
+
+class CompressionEngine:
+    """
+    Extractive context compressor with a cross-request tokenization cache.
+
+    Args:
+        cache_size: 缓存的文档 (按内容哈希) 数量上限
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self._units: LRUCache = LRUCache(maxsize=max(1, cache_size))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def units_for(self, content: str) -> Tuple[_Unit, ...]:
+        """Scoring units of a document, tokenized once per distinct content."""
+        key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            units = self._units.get(key)
+            if units is not None:
+                self.hits += 1
+                return units
+            self.misses += 1
+
+        built = []
+        for unit in _split_into_units(content):
+            terms = _tokenize_terms(unit["text"])
+            term_freq: Dict[str, int] = {}
+            for term in terms:
+                term_freq[term] = term_freq.get(term, 0) + 1
+            built.append(
+                _Unit(unit["text"], unit["is_atomic"], unit["tokens"], term_freq, len(terms))
+            )
+        units = tuple(built)
+        with self._lock:
+            self._units[key] = units
+        return units
+
+    def compress(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        max_tokens: int = 3000,
+        term_stats: Optional[TermStatistics] = None,
+    ) -> str:
+        """See compress_context()."""
+        start = time.perf_counter()
+
+        units: List[_Unit] = []
+        stale: List[bool] = []
+        for doc in documents:
+            content = doc.get("content", "")
+            if not content:
+                continue
+            is_stale = bool(
+                doc.get("metadata", {}).get("stale", False) or doc.get("stale", False)
+            )
+            for unit in self.units_for(content):
+                units.append(unit)
+                stale.append(is_stale)
+
+        if not units:
+            return ""
+
+        relevance = self._score(set(_tokenize_terms(query)), units, term_stats)
+        protected_blocks = 0
+        for i, unit in enumerate(units):
+            # Staleness penalty
+            if stale[i]:
+                relevance[i] *= 0.5
+            # Atomic blocks get a small bonus to preserve them
+            if unit.is_atomic:
+                relevance[i] = max(relevance[i], 0.3)
+
+        # Single pass over units by relevance (stable: ties keep document order)
+        order = sorted(range(len(units)), key=relevance.__getitem__, reverse=True)
+        selected = [False] * len(units)
+        remaining = max_tokens
+        smallest = min(u.tokens for u in units)
+        for i in order:
+            if units[i].tokens > remaining:
+                continue
+            selected[i] = True
+            remaining -= units[i].tokens
+            if units[i].is_atomic:
+                protected_blocks += 1
+            if remaining < smallest:
+                break
+
+        # Reassemble in original document order
+        compressed = "\n".join(u.text for u, keep in zip(units, selected) if keep)
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        input_tokens = sum(u.tokens for u in units)
+        output_tokens = max_tokens - remaining
+        ratio = output_tokens / input_tokens if input_tokens > 0 else 1.0
+        logger.info(
+            f"[COMPRESS] {input_tokens} tokens -> {output_tokens} tokens "
+            f"({ratio:.0%} compression), {protected_blocks} blocks protected, "
+            f"{duration_ms:.0f}ms"
+        )
+
+        return compressed
+
+    @staticmethod
+    def _score(
+        query_terms: set,
+        units: List[_Unit],
+        term_stats: Optional[TermStatistics],
+    ) -> List[float]:
+        """BM25 of each unit against the query, normalized to [0, 1]."""
+        if not query_terms:
+            return [0.0] * len(units)
+        if term_stats is None or term_stats.num_docs == 0:
+            # No vault statistics: the candidate sentences are the corpus
+            term_stats = TermStatistics.from_term_sets(u.term_freq for u in units)
+        idf = {term: term_stats.idf(term) for term in query_terms}
+        avg_len = (sum(u.length for u in units) / len(units)) or 1.0
+
+        scores = []
+        for unit in units:
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * unit.length / avg_len)
+            score = 0.0
+            for term, weight in idf.items():
+                tf = unit.term_freq.get(term)
+                if tf:
+                    score += weight * tf * (BM25_K1 + 1.0) / (tf + norm)
+            scores.append(score)
+
+        top = max(scores)
+        return [s / top for s in scores] if top > 0 else scores
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._units),
+                "maxsize": int(self._units.maxsize),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_engine: Optional[CompressionEngine] = None
+
+
+def get_compression_engine(**kwargs: Any) -> CompressionEngine:
+    """获取进程级共享 CompressionEngine (首次调用时按 kwargs 创建)"""
+    global _engine
+    if _engine is None:
+        _engine = CompressionEngine(**kwargs)
+    return _engine
 
 
 def compress_context(
     query: str,
     documents: List[Dict[str, Any]],
     max_tokens: int = 3000,
+    term_stats: Optional[TermStatistics] = None,
 ) -> str:
     """
     Story 2.10 AC-1: Compress retrieved context to max_tokens.
 
     Algorithm:
     1. Split all documents into sentence-level units (protecting atomic blocks)
-    2. Score each unit for query relevance
+    2. Score each unit for query relevance (BM25)
     3. Select highest-scoring units until token budget is reached
     4. Reassemble in original document order
 
@@ -179,77 +360,12 @@ def compress_context(
         query: User query for relevance scoring.
         documents: List of SearchResult dicts with "content" key.
         max_tokens: Target token budget.
+        term_stats: Vault-level document frequencies for IDF (optional).
 
     Returns:
         Compressed context string.
     """
-    start = time.perf_counter()
-
-    # Collect all units with source tracking
-    all_units: List[dict] = []
-    for doc_idx, doc in enumerate(documents):
-        content = doc.get("content", "")
-        if not content:
-            continue
-        units = _split_into_units(content)
-        for unit_idx, unit in enumerate(units):
-            unit["doc_idx"] = doc_idx
-            unit["unit_idx"] = unit_idx
-            # Staleness penalty
-            is_stale = doc.get("metadata", {}).get("stale", False) or doc.get(
-                "stale", False
-            )
-            relevance = _score_relevance(unit["text"], query)
-            if is_stale:
-                relevance *= 0.5
-            # Atomic blocks get a small bonus to preserve them
-            if unit["is_atomic"]:
-                relevance = max(relevance, 0.3)
-            unit["relevance"] = relevance
-            all_units.append(unit)
-
-    if not all_units:
-        return ""
-
-    # Calculate input tokens
-    input_tokens = sum(u["tokens"] for u in all_units)
-
-    # Sort by relevance (descending) — keep atomic blocks prioritized
-    sorted_units = sorted(all_units, key=lambda u: u["relevance"], reverse=True)
-
-    # Select units until budget
-    selected_indices: set = set()
-    current_tokens = 0
-    protected_blocks = 0
-
-    for unit in sorted_units:
-        unit_key = (unit["doc_idx"], unit["unit_idx"])
-        if current_tokens + unit["tokens"] > max_tokens:
-            continue
-        selected_indices.add(unit_key)
-        current_tokens += unit["tokens"]
-        if unit["is_atomic"]:
-            protected_blocks += 1
-
-    # Reassemble in original order
-    selected_units = [
-        u for u in all_units if (u["doc_idx"], u["unit_idx"]) in selected_indices
-    ]
-    # Already in original order from all_units iteration
-
-    compressed = "\n".join(u["text"] for u in selected_units)
-
-    duration_ms = (time.perf_counter() - start) * 1000
-    output_tokens = _count_tokens_approx(compressed)
-
-    ratio = output_tokens / input_tokens if input_tokens > 0 else 1.0
-    logger.info(
-        f"[COMPRESS] {input_tokens} tokens -> {output_tokens} tokens "
-        f"({ratio:.0%} compression), {protected_blocks} blocks protected, "
-        f"{duration_ms:.0f}ms"
-    )
-
-    return compressed
+    return get_compression_engine().compress(query, documents, max_tokens, term_stats)
 
 
 def staleness_check(
@@ -115,7 +115,9 @@ class CanvasRAGConfig(TypedDict, total=False):
     # === 精排配置 ===
     reranking_strategy: Literal["local", "cohere", "hybrid_auto"]  # Reranking策略
     reranker_model_name: str  # 精排模型名称 (默认 gte-reranker-modernbert-base)
-    reranker_torch_dtype: str  # 推理精度 (默认 float16)
+    reranker_torch_dtype: str  # 推理精度 (默认 float16, CPU 上 torch 后端改用 float32)
+    reranker_backend: Literal["auto", "torch", "onnx", "int8"]  # 推理后端 (默认 auto = torch; onnx/int8 需显式开启)
+    reranker_num_threads: int  # CPU 推理线程数 (0 = 运行时默认; torch 仅在推理期间生效)
     adaptive_k_buffer: int  # gap 后缓冲区 (默认 5)
     adaptive_k_min: int  # 最小返回数量 (默认 3)
     adaptive_k_max: int  # 最大返回数量 (默认 15)
@@ -147,6 +149,7 @@ class CanvasRAGConfig(TypedDict, total=False):
 
     # === 过滤与扩展配置 (Story 2.8) ===
     progressive_scope_enabled: bool  # 渐进范围搜索 (默认 True)
+    progressive_scope_mode: Literal["cascade", "concurrent", "wide"]  # 阶段执行方式 (默认 cascade; concurrent/wide 需显式开启)
     min_results_threshold: int  # 渐进搜索最小结果阈值 (默认 5)
     neighbor_expansion_enabled: bool  # Wiki-links 邻居扩展 (默认 True)
     neighbor_max_count: int  # 最大邻居扩展文件数 (默认 5)
@@ -204,6 +207,8 @@ DEFAULT_CONFIG = CanvasRAGConfig(
     reranking_strategy="hybrid_auto",
     reranker_model_name="Alibaba-NLP/gte-reranker-modernbert-base",
     reranker_torch_dtype="float16",
+    reranker_backend="auto",
+    reranker_num_threads=0,
     adaptive_k_buffer=5,
     adaptive_k_min=3,
     adaptive_k_max=15,
@@ -227,6 +232,7 @@ DEFAULT_CONFIG = CanvasRAGConfig(
     multi_query_model="gemini/gemini-2.0-flash",
     # === 过滤与扩展 (Story 2.8) ===
     progressive_scope_enabled=True,
+    progressive_scope_mode="cascade",
     min_results_threshold=5,
     neighbor_expansion_enabled=True,
     neighbor_max_count=5,
@@ -277,6 +283,7 @@ def validate_config(config: CanvasRAGConfig) -> CanvasRAGConfig:
         "retrieval_batch_size": {"type": int, "min": 1},
         "time_decay_factor": {"type": (int, float), "min": 0.0, "max": 1.0},
         "cohere_monthly_limit": {"type": int, "min": 0},
+        "reranker_num_threads": {"type": int, "min": 0, "max": 256},
         # Phase 4: CRAG deep research fallback budget
         "deep_research_timeout_s": {"type": (int, float), "min": 1.0, "max": 60.0},
         "deep_research_max_queries": {"type": int, "min": 1, "max": 20},
@@ -313,7 +320,9 @@ def validate_config(config: CanvasRAGConfig) -> CanvasRAGConfig:
     _ENUM_RULES: Dict[str, set] = {
         "fusion_strategy": {"rrf", "weighted", "cascade", "layered_rrf"},
         "reranking_strategy": {"local", "cohere", "hybrid_auto"},
+        "reranker_backend": {"auto", "torch", "onnx", "int8"},
         "search_type": {"vector", "hybrid"},
+        "progressive_scope_mode": {"cascade", "concurrent", "wide"},
         # A9: L1 router strategy — hybrid is default, llm/rule are opt-in overrides
         "l1_router_strategy": {"llm", "rule", "hybrid"},
     }
@@ -45,6 +45,7 @@ logger = logging.getLogger(__name__)
 
 # ✅ Story 12.1-12.4: 使用真实客户端
 from agentic_rag.clients import GraphitiClient, LanceDBClient, TemporalClient  # noqa: E402
+from agentic_rag.clients.query_embeddings import query_embedding_scope  # noqa: E402
 from agentic_rag.config import DEFAULT_FUSION_GROUPS, CanvasRAGConfig  # noqa: E402
 from agentic_rag.reranking import (
     COHERE_AVAILABLE,
@@ -276,6 +277,7 @@ async def retrieve_lancedb(
     rrf_k = _safe_get_config(runtime, "rrf_k", 60)
     tag_jaccard_threshold = _safe_get_config(runtime, "tag_jaccard_threshold", 0.3)
     min_results_threshold = _safe_get_config(runtime, "min_results_threshold", 5)
+    scope_mode = _safe_get_config(runtime, "progressive_scope_mode", "cascade")
     neighbor_max_count = _safe_get_config(runtime, "neighbor_max_count", 5)
     neighbor_score_decay = _safe_get_config(runtime, "neighbor_score_decay", 0.7)
     canvas_file = state.get("canvas_file")
@@ -319,68 +321,71 @@ async def retrieve_lancedb(
     # Story 2-8 H1+H2: When course_id is present, use progressive_scope_search
     # (4-stage cascading) + expand_neighbors (1-hop wiki-link expansion) to
     # activate previously dead-code functions.
-    try:
-        client = await _get_lancedb_client()
-
-        # Story 1.9: Search across all expanded subjects and merge results
-        lancedb_results: List = []
-        per_subject_limit = max(1, batch_size // len(subjects_to_search))
-        for search_subject in subjects_to_search:
-            if course_id:
-                # Story 2-8: Use progressive_scope_search for course-scoped queries
-                subject_results = await client.progressive_scope_search(
-                    query=query,
-                    course_id=course_id,
-                    table_name="vault_notes",
-                    num_results=per_subject_limit,
-                    min_results_threshold=min_results_threshold,
-                    query_type=search_type,
-                    subject=search_subject,
-                    canvas_file=canvas_file,
-                    tag_jaccard_bridge_enabled=True,
-                    tag_jaccard_threshold=tag_jaccard_threshold,
-                    rrf_k=rrf_k,
-                )
-            else:
-                subject_results = await client.search_multiple_tables(
-                    query=query,
-                    canvas_file=canvas_file,
-                    subject=search_subject,
-                    num_results_per_table=per_subject_limit // 2 + 1,
-                    query_type=search_type,
-                    course_id=course_id,
-                    tags=tags,
-                    rrf_k=rrf_k,
-                )
-            lancedb_results.extend(subject_results)
-
-        # Story 2-8 H2: 1-hop wiki-link neighbor expansion on search results
-        lancedb_results = await client.expand_neighbors(
-            results=lancedb_results,
-            table_name="vault_notes",
-            max_neighbors=neighbor_max_count,
-            score_decay=neighbor_score_decay,
-        )
+    # Shared query embeddings: reuse vectors prepared before fan-out
+    with query_embedding_scope(state.get("query_embeddings")) as embedding_scope:
+        try:
+            client = await _get_lancedb_client()
+
+            # Story 1.9: Search across all expanded subjects and merge results
+            lancedb_results: List = []
+            per_subject_limit = max(1, batch_size // len(subjects_to_search))
+            for search_subject in subjects_to_search:
+                if course_id:
+                    # Story 2-8: Use progressive_scope_search for course-scoped queries
+                    subject_results = await client.progressive_scope_search(
+                        query=query,
+                        course_id=course_id,
+                        table_name="vault_notes",
+                        num_results=per_subject_limit,
+                        min_results_threshold=min_results_threshold,
+                        query_type=search_type,
+                        subject=search_subject,
+                        canvas_file=canvas_file,
+                        tag_jaccard_bridge_enabled=True,
+                        tag_jaccard_threshold=tag_jaccard_threshold,
+                        rrf_k=rrf_k,
+                        scope_mode=scope_mode,
+                    )
+                else:
+                    subject_results = await client.search_multiple_tables(
+                        query=query,
+                        canvas_file=canvas_file,
+                        subject=search_subject,
+                        num_results_per_table=per_subject_limit // 2 + 1,
+                        query_type=search_type,
+                        course_id=course_id,
+                        tags=tags,
+                        rrf_k=rrf_k,
+                    )
+                lancedb_results.extend(subject_results)
+
+            # Story 2-8 H2: 1-hop wiki-link neighbor expansion on search results
+            lancedb_results = await client.expand_neighbors(
+                results=lancedb_results,
+                table_name="vault_notes",
+                max_neighbors=neighbor_max_count,
+                score_decay=neighbor_score_decay,
+            )
 
-        # Deduplicate by doc_id, keeping highest score
-        seen_ids: dict = {}
-        for r in lancedb_results:
-            doc_id = r.get("doc_id", "")
-            if doc_id not in seen_ids or r.get("score", 0) > seen_ids[doc_id].get(
-                "score", 0
-            ):
-                seen_ids[doc_id] = r
-        lancedb_results = sorted(
-            seen_ids.values(), key=lambda x: x.get("score", 0), reverse=True
-        )
+            # Deduplicate by doc_id, keeping highest score
+            seen_ids: dict = {}
+            for r in lancedb_results:
+                doc_id = r.get("doc_id", "")
+                if doc_id not in seen_ids or r.get("score", 0) > seen_ids[doc_id].get(
+                    "score", 0
+                ):
+                    seen_ids[doc_id] = r
+            lancedb_results = sorted(
+                seen_ids.values(), key=lambda x: x.get("score", 0), reverse=True
+            )
 
-        # 限制总结果数
-        lancedb_results = lancedb_results[:batch_size]
+            # 限制总结果数
+            lancedb_results = lancedb_results[:batch_size]
 
-    except Exception as e:
-        # Fallback: 返回空结果
-        logger.warning(f"[retrieve_lancedb] Fallback triggered: {e}")
-        lancedb_results = []
+        except Exception as e:
+            # Fallback: 返回空结果
+            logger.warning(f"[retrieve_lancedb] Fallback triggered: {e}")
+            lancedb_results = []
 
     latency_ms = (time.perf_counter() - start_time) * 1000
 
@@ -389,7 +394,10 @@ async def retrieve_lancedb(
         f"[retrieve_lancedb] END - results={len(lancedb_results)}, latency={latency_ms:.2f}ms"
     )
 
-    return {"lancedb_results": lancedb_results, "lancedb_latency_ms": latency_ms}
+    result = {"lancedb_results": lancedb_results, "lancedb_latency_ms": latency_ms}
+    if embedding_scope.calls:
+        result["embedding_calls"] = embedding_scope.calls
+    return result
 
 
 # ========================================
@@ -1191,15 +1199,21 @@ async def _rerank_local(
     Local Cross-Encoder Reranking.
 
     Story 2.5: Uses get_reranker() singleton (gte-reranker-modernbert-base, fp16).
+    Inference backend (torch / onnx / int8) and CPU thread count come from
+    reranker_backend / reranker_num_threads ("auto" = torch; onnx / int8 are opt-in).
     Falls back to original ordering if sentence-transformers is unavailable.
+
+    Candidates are scored against original_query once the CRAG loop has
+    rewritten the question, so chunks re-retrieved on later iterations hit
+    the reranker's score cache and only new candidates reach the model.
     """
     if not results:
         return results
 
-    # Extract query from state messages
+    # Extract query: original question if rewritten, else last message
     messages = state.get("messages", [])
-    query = ""
-    if messages:
+    query = state.get("original_query") or ""
+    if not query and messages:
         last_msg = messages[-1]
         query = (
             last_msg.get("content", "")
@@ -1228,11 +1242,20 @@ async def _rerank_local(
     if runtime:
         model_name = _safe_get_config(runtime, "reranker_model_name", default_model)
         torch_dtype = _safe_get_config(runtime, "reranker_torch_dtype", "float16")
+        backend = _safe_get_config(runtime, "reranker_backend", "auto")
+        num_threads = _safe_get_config(runtime, "reranker_num_threads", 0)
     else:
         model_name = default_model
         torch_dtype = "float16"
-
-    reranker = get_reranker(model_name=model_name, torch_dtype=torch_dtype)
+        backend = "auto"
+        num_threads = 0
+
+    reranker = get_reranker(
+        model_name=model_name,
+        torch_dtype=torch_dtype,
+        backend=backend,
+        num_threads=num_threads,
+    )
     if reranker is None:
         logger.warning(
             "[_rerank_local] Reranker not available, returning original ordering"
@@ -1745,16 +1768,23 @@ async def compress_context_node(
         except Exception as e:
             logger.debug(f"[compress_context] Staleness check skipped: {e}")
 
-    # Step 2: Context compression
+    # Step 2: Context compression (BM25 with vault-level IDF when available)
     compressed_context = ""
     if reranked:
         try:
             from agentic_rag.compression import compress_context
 
+            try:
+                client = await _get_lancedb_client()
+                term_stats = await client.get_term_statistics("vault_notes")
+            except Exception:
+                term_stats = None
+
             compressed_context = compress_context(
                 query=query,
                 documents=reranked,
                 max_tokens=max_tokens,
+                term_stats=term_stats,
             )
         except Exception as e:
             logger.warning(f"[compress_context] Compression failed: {e}")
@@ -1901,3 +1931,88 @@ async def multi_query_rewrite_node(
     return {
         "multi_queries": queries,
     }
+
+
+# ========================================
+# Shared query embeddings (before retrieval fan-out)
+# ========================================
+
+
+async def prepare_query_embeddings_node(
+    state: CanvasRAGState, runtime: Runtime[CanvasRAGConfig]
+) -> Dict[str, Any]:
+    """
+    Embed every distinct retrieval query once, before fan-out.
+
+    Pipeline position: multi_query_rewrite / rewrite_query /
+    deep_research_fallback -> prepare_query_embeddings -> fan_out_retrieval.
+
+    retrieve_lancedb, retrieve_vault_notes, retrieve_multimodal and
+    retrieve_cross_canvas all embed the same query; with multi_queries the
+    work is multiplied per variant. This node embeds the current query plus
+    all multi_query variants in a single batch and stores them in
+    state["query_embeddings"]; the retrieval nodes read them through
+    query_embedding_scope. Queries already embedded earlier in the request
+    (e.g. before a rewrite loop) are not embedded again.
+
+    With several multi_query variants, vault_notes is also searched for all
+    of them in one LanceDBClient.search_batch call, so the per-variant
+    retrieve_vault_notes searches are result-cache hits.
+
+    Failures are non-fatal: retrieval nodes embed / search on demand as before.
+
+    Returns:
+        State updates: query_embeddings, embedding_calls.
+    """
+    start_time = time.perf_counter()
+
+    messages = state.get("messages", [])
+    query = ""
+    if messages:
+        last_msg = messages[-1]
+        query = (
+            last_msg.get("content", "")
+            if isinstance(last_msg, dict)
+            else getattr(last_msg, "content", "")
+        )
+
+    embeddings: Dict[str, List[float]] = dict(state.get("query_embeddings") or {})
+    candidates = [query, *(state.get("multi_queries") or [])]
+    pending = [q for q in dict.fromkeys(candidates) if q and q not in embeddings]
+    if not pending:
+        return {"query_embeddings": embeddings}
+
+    try:
+        client = await _get_lancedb_client()
+        embedded = await client.embed_queries(pending)
+    except Exception as e:
+        logger.warning(f"[prepare_query_embeddings] Embedding failed: {e}")
+        return {"query_embeddings": embeddings}
+
+    embeddings.update(embedded)
+
+    # multi_query variants: one batched vault_notes retrieval for all of them
+    # (multi-vector dense query + per-query RRF). Same db and parameters as
+    # retrieve_vault_notes, whose per-variant searches then hit the result cache
+    multi_queries = state.get("multi_queries") or []
+    if len(multi_queries) > 1:
+        try:
+            with query_embedding_scope(embeddings):
+                await client.search_batch(
+                    multi_queries,
+                    table_name="vault_notes",
+                    num_results=_safe_get_config(runtime, "retrieval_batch_size", 10),
+                )
+        except Exception as e:
+            logger.debug(f"[prepare_query_embeddings] Batched vault retrieval skipped: {e}")
+
+    latency_ms = (time.perf_counter() - start_time) * 1000
+    logger.debug(
+        f"[prepare_query_embeddings] {len(embedded)}/{len(pending)} queries embedded, "
+        f"latency={latency_ms:.0f}ms"
+    )
+
+    return {
+        "query_embeddings": embeddings,
+        "embedding_calls": {q: 1 for q in embedded},
+    }
@@ -0,0 +1,142 @@
+"""
+RerankScoreCache - Cross-Encoder 打分缓存
+
+CRAG 循环 (check_quality → rewrite_query / deep_research_fallback → 再检索)
+多数时候召回的还是同一批 chunk，_rerank_local 每轮都会全部重新打分。
+本模块缓存 cross-encoder 输出，循环中只有新候选才进入模型:
+
+- 缓存键: (reranker 模型, 归一化 query, chunk 内容哈希)
+  归一化 = NFKC + 折叠空白 + 小写
+- 失效: 内容变化 → 哈希变化 → 旧分数不再命中；同时记录 doc_id → 内容哈希，
+  发现同一 doc_id 内容变化时立即清除其旧条目
+- 上限: TTLCache (maxsize + ttl_seconds)
+- 指标: hits / misses / invalidations / hit_rate / entries
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cachetools import LRUCache, TTLCache
+
+ScoreKey = Tuple[str, str, str]
+
+
+def normalize_query(query: str) -> str:
+    """NFKC, collapse whitespace, lowercase."""
+    return " ".join(unicodedata.normalize("NFKC", query).split()).lower()
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class RerankScoreCache:
+    """
+    Bounded cache of cross-encoder scores keyed on (model, query, content hash).
+
+    Args:
+        maxsize: 最大条目数 (LRU 淘汰)
+        ttl_seconds: 条目存活时间
+    """
+
+    def __init__(self, maxsize: int = 8192, ttl_seconds: float = 1800.0):
+        self._cache: TTLCache = TTLCache(maxsize=max(1, maxsize), ttl=ttl_seconds)
+        # doc_id → content hash last scored; bounded like the score entries
+        self._doc_hashes: LRUCache = LRUCache(maxsize=max(1, maxsize))
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(
+        self,
+        model: str,
+        query: str,
+        contents: Sequence[str],
+        doc_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> Tuple[List[Optional[float]], List[ScoreKey]]:
+        """
+        Cached score per document (None on miss) and the keys to store misses under.
+
+        When doc_ids are given, a doc_id whose content hash changed since it
+        was last seen has its old entries dropped first.
+        """
+        normalized = normalize_query(query)
+        keys = [(model, normalized, content_hash(c)) for c in contents]
+        scores: List[Optional[float]] = []
+        with self._lock:
+            if doc_ids is not None:
+                for doc_id, key in zip(doc_ids, keys):
+                    if doc_id:
+                        self._track(doc_id, key[2])
+            for key in keys:
+                score = self._cache.get(key)
+                if score is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                scores.append(score)
+        return scores, keys
+
+    def put_many(self, keys: Sequence[ScoreKey], scores: Sequence[float]) -> None:
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._cache[key] = float(score)
+
+    def invalidate_doc(self, doc_id: str) -> int:
+        """Drop every cached score for a chunk (e.g. after it was deleted)."""
+        with self._lock:
+            old_hash = self._doc_hashes.pop(doc_id, None)
+            return self._drop_hash(old_hash) if old_hash else 0
+
+    def _track(self, doc_id: str, new_hash: str) -> None:
+        old_hash = self._doc_hashes.get(doc_id)
+        self._doc_hashes[doc_id] = new_hash
+        if old_hash is not None and old_hash != new_hash:
+            self._drop_hash(old_hash)
+
+    def _drop_hash(self, digest: str) -> int:
+        stale = [k for k in self._cache.keys() if k[2] == digest]
+        for key in stale:
+            self._cache.pop(key, None)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._doc_hashes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+                "ttl_seconds": self._cache.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# =============================================================================
+# Singleton (survives reranker reinitialization; model is part of the key)
+# =============================================================================
+
+_cache: Optional[RerankScoreCache] = None
+
+
+def get_rerank_score_cache(**kwargs: Any) -> RerankScoreCache:
+    """获取进程级共享 RerankScoreCache (首次调用时按 kwargs 创建)"""
+    global _cache
+    if _cache is None:
+        _cache = RerankScoreCache(**kwargs)
+    return _cache
@@ -0,0 +1,225 @@
+"""
+RerankScheduler - 跨请求的 Cross-Encoder 微批调度
+
+每次 rerank_results 都单独 asyncio.to_thread(model.predict)，并发会话下
+大量小批次 predict 在同一组 CPU 核上互相争抢。本模块把并发请求的
+(query, doc) 对在一个短时间窗口内合并成一个大批次:
+
+- 收集窗口: 第一个请求到达后最多等待 max_wait_ms，或攒满 max_batch_pairs 立即出批
+  (单个请求不拆分，超过上限的请求独立成批)
+- 并发上限: 同时执行的 predict 批次数不超过 max_concurrent_batches，
+  批次执行期间新到的请求继续排队合并
+- 结果按请求切分后分别返回给调用方；predict 异常传递给该批所有调用方
+- 指标: queue_depth / queued_pairs / running_batches / 批大小 / 等待时间 / predict 延迟
+
+Author: Canvas Learning System Team
+Created: 2026-10-17
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+Pair = Tuple[str, str]
+
+
+class _RerankRequest:
+    __slots__ = ("pairs", "future", "enqueued_at")
+
+    def __init__(self, pairs: List[Pair], future: asyncio.Future):
+        self.pairs = pairs
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+def _percentile(samples: Sequence[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class RerankScheduler:
+    """
+    Micro-batching scheduler for cross-encoder scoring.
+
+    Args:
+        predict: 同步打分函数 (pairs -> scores)，在线程中执行
+        max_batch_pairs: 单批最多 (query, doc) 对数
+        max_wait_ms: 收集窗口 (0 = 不等待，只合并已排队的请求)
+        max_concurrent_batches: 同时执行的批次数上限
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[List[Pair]], Sequence[float]],
+        max_batch_pairs: int = 128,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 1,
+    ):
+        self._predict = predict
+        self.max_batch_pairs = max(1, max_batch_pairs)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Deque[_RerankRequest] = deque()
+        self._pending_pairs = 0
+        self._running = 0
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        # 执行中的批次任务 (持有引用，防止任务在完成前被回收)
+        self._tasks: Set[asyncio.Task] = set()
+
+        self._batches = 0
+        self._requests = 0
+        self._pairs = 0
+        self._max_batch_seen = 0
+        self._errors = 0
+        self._batch_pairs: Deque[int] = deque(maxlen=1024)
+        self._batch_requests: Deque[int] = deque(maxlen=1024)
+        self._wait_ms: Deque[float] = deque(maxlen=1024)
+        self._predict_ms: Deque[float] = deque(maxlen=1024)
+
+    async def score(self, query: str, documents: List[str]) -> List[float]:
+        """
+        Score documents against a query, batched with concurrent callers.
+
+        Returns:
+            One score per document, in input order.
+        """
+        if not documents:
+            return []
+
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+
+        request = _RerankRequest([(query, doc) for doc in documents], loop.create_future())
+        self._pending.append(request)
+        self._pending_pairs += len(request.pairs)
+        if self._pending_pairs >= self.max_batch_pairs:
+            self._wakeup.set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._dispatch())
+
+        return await request.future
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Queue state belongs to one event loop; rebuild it on a new loop."""
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._pending = deque()
+        self._pending_pairs = 0
+        self._running = 0
+        self._worker = None
+        self._tasks = set()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+
+    async def _dispatch(self) -> None:
+        while self._pending:
+            if self._pending_pairs < self.max_batch_pairs and self.max_wait_ms > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.max_wait_ms / 1000.0
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            # Waiting for a free slot lets more requests join the next batch
+            await self._slots.acquire()
+            batch = self._take_batch()
+            if not batch:
+                self._slots.release()
+                continue
+            self._running += 1
+            task = self._loop.create_task(self._execute(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _take_batch(self) -> List[_RerankRequest]:
+        batch: List[_RerankRequest] = []
+        size = 0
+        while self._pending:
+            request = self._pending[0]
+            if request.future.done():  # caller cancelled while queued
+                self._pending.popleft()
+                self._pending_pairs -= len(request.pairs)
+                continue
+            if batch and size + len(request.pairs) > self.max_batch_pairs:
+                break
+            self._pending.popleft()
+            self._pending_pairs -= len(request.pairs)
+            batch.append(request)
+            size += len(request.pairs)
+        return batch
+
+    async def _execute(self, batch: List[_RerankRequest]) -> None:
+        started = time.perf_counter()
+        pairs = [pair for request in batch for pair in request.pairs]
+        try:
+            scores = await asyncio.to_thread(self._predict, pairs)
+        except Exception as e:
+            self._errors += 1
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self._running -= 1
+            self._slots.release()
+            self._record(batch, len(pairs), started)
+
+        offset = 0
+        for request in batch:
+            n = len(request.pairs)
+            if not request.future.done():
+                request.future.set_result([float(s) for s in scores[offset : offset + n]])
+            offset += n
+
+    def _record(self, batch: List[_RerankRequest], num_pairs: int, started: float) -> None:
+        self._batches += 1
+        self._requests += len(batch)
+        self._pairs += num_pairs
+        self._max_batch_seen = max(self._max_batch_seen, num_pairs)
+        self._batch_pairs.append(num_pairs)
+        self._batch_requests.append(len(batch))
+        self._predict_ms.append((time.perf_counter() - started) * 1000)
+        for request in batch:
+            self._wait_ms.append((started - request.enqueued_at) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, batch size and wait time metrics."""
+        stats: Dict[str, Any] = {
+            "queue_depth": len(self._pending),
+            "queued_pairs": self._pending_pairs,
+            "running_batches": self._running,
+            "batches": self._batches,
+            "requests": self._requests,
+            "pairs": self._pairs,
+            "errors": self._errors,
+            "max_batch_pairs_seen": self._max_batch_seen,
+            "max_batch_pairs": self.max_batch_pairs,
+            "max_wait_ms": self.max_wait_ms,
+            "max_concurrent_batches": self.max_concurrent_batches,
+        }
+        if self._batch_pairs:
+            stats["avg_batch_pairs"] = round(
+                sum(self._batch_pairs) / len(self._batch_pairs), 2
+            )
+            stats["avg_batch_requests"] = round(
+                sum(self._batch_requests) / len(self._batch_requests), 2
+            )
+        if self._wait_ms:
+            stats["wait_ms"] = {
+                "avg": round(sum(self._wait_ms) / len(self._wait_ms), 2),
+                "p95": round(_percentile(self._wait_ms, 0.95), 2),
+            }
+        if self._predict_ms:
+            stats["predict_ms"] = {
+                "avg": round(sum(self._predict_ms) / len(self._predict_ms), 2),
+                "p95": round(_percentile(self._predict_ms, 0.95), 2),
+            }
+        return stats
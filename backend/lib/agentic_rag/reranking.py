@@ -6,6 +6,7 @@ Story 2.2: Phase 0 搜索通道修复 - Reranker激活
 Story 2.5: 精排融合升级 - gte-reranker-modernbert-base fp16
 
 - Local Cross-Encoder (gte-reranker-modernbert-base, 149M, fp16)
+- 可插拔推理后端: torch / onnx (ONNX Runtime) / int8 (动态量化), 默认 auto = torch
 - Cohere Rerank API
 - Hybrid自动选择逻辑
 - 懒加载单例模式 (get_reranker)
@@ -19,10 +20,14 @@ Updated: 2026-03-16 (Story 2.5 - gte-reranker + fp16 + singleton)
 import asyncio
 import logging
 import os
+import threading
 import time
+from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from agentic_rag.rerank_cache import RerankScoreCache, get_rerank_score_cache
+from agentic_rag.rerank_scheduler import RerankScheduler
 from agentic_rag.state import SearchResult
 
 logger = logging.getLogger(__name__)
@@ -40,6 +45,13 @@ except ImportError:
     CROSS_ENCODER_AVAILABLE = False
     logger.warning("sentence-transformers not installed. Local reranking unavailable.")
 
+try:
+    import onnxruntime
+
+    ONNX_RUNTIME_AVAILABLE = True
+except ImportError:
+    ONNX_RUNTIME_AVAILABLE = False
+
 try:
     import cohere
 
@@ -64,6 +76,79 @@ class RerankStrategy(str, Enum):
 # Local Cross-Encoder Reranker
 # ========================================
 
+# Inference backends for LocalReranker
+RERANKER_BACKENDS = ("auto", "torch", "onnx", "int8")
+
+
+def resolve_reranker_backend(
+    backend: str, device: str, torch_dtype: str
+) -> Tuple[str, str]:
+    """
+    Resolve the inference backend and precision for a device.
+
+    - auto: torch, as before the backends were added. onnx and int8 change
+      scores slightly and are only used when requested explicitly, after
+      checking them with tests/benchmark/test_reranker_benchmark.py
+    - torch on CPU: float16 is replaced by float32 (most CPUs emulate fp16
+      matmuls, which makes it slower than fp32)
+    - int8 quantizes Linear layers dynamically and only runs on CPU; on GPU
+      it falls back to torch
+
+    Args:
+        backend: "auto", "torch", "onnx" or "int8"
+        device: "cpu", "cuda", "cuda:0", ...
+        torch_dtype: Requested precision for the torch backend
+
+    Returns:
+        (backend, precision) actually used
+
+    Raises:
+        ValueError: Unknown backend
+    """
+    backend = (backend or "auto").lower()
+    if backend not in RERANKER_BACKENDS:
+        raise ValueError(
+            f"Unknown reranker backend: {backend} (expected one of {RERANKER_BACKENDS})"
+        )
+
+    on_cpu = not device.startswith("cuda")
+    if backend == "auto":
+        backend = "torch"
+
+    if backend == "onnx":
+        return "onnx", "float32"
+    if backend == "int8":
+        if on_cpu:
+            return "int8", "int8"
+        logger.warning(
+            f"[LocalReranker] int8 dynamic quantization is CPU-only, using torch on {device}"
+        )
+        backend = "torch"
+
+    if on_cpu and torch_dtype == "float16":
+        return "torch", "float32"
+    return "torch", torch_dtype
+
+
+# torch.set_num_threads is process-wide: calls that change it are serialized
+# and the previous value is restored afterwards
+_torch_threads_lock = threading.Lock()
+
+
+@contextmanager
+def _torch_num_threads(num_threads: Optional[int]):
+    """Run a block with torch intra-op threads set to num_threads (None = unchanged)."""
+    if not num_threads:
+        yield
+        return
+    with _torch_threads_lock:
+        previous = torch.get_num_threads()
+        torch.set_num_threads(num_threads)
+        try:
+            yield
+        finally:
+            torch.set_num_threads(previous)
+
 
 class LocalReranker:
     """
@@ -72,14 +157,38 @@ class LocalReranker:
     Story 2.5: gte-reranker-modernbert-base (Alibaba-NLP, 149M params)
     架构文档确认选型, Hit@1=83%, CPU延迟<200ms (top-20 input)
     支持 fp16 精度推理, 减少显存占用和推理延迟
+
+    推理后端 (backend, 见 resolve_reranker_backend):
+    - torch: CrossEncoder 原生推理 (GPU 用 torch_dtype, CPU 上 fp16 改为 fp32)
+    - onnx: ONNX Runtime (sentence-transformers backend="onnx", 需 optimum[onnxruntime])
+    - int8: torch 动态 int8 量化 (Linear 层, 仅 CPU)
+    - auto (默认): torch; onnx / int8 需显式指定 (先用 benchmark 核对精度)
+    num_threads 设置 CPU 推理线程数: onnx 为会话级; torch 只在 predict 期间
+    临时设置, 结束后恢复进程原值。
+
+    predict 经 RerankScheduler 执行: 并发请求在 batch_window_ms 窗口内合并为
+    至多 max_batch_pairs 对的批次，同时执行的批次数不超过 max_concurrent_batches。
+
+    打分结果写入 RerankScoreCache (默认进程级共享)，键为 (模型, 归一化 query,
+    内容哈希)，CRAG 循环再次召回的 chunk 不再进入模型。
     """
 
+    # torch intra-op threads applied around predict (None = process setting untouched)
+    _torch_threads: Optional[int] = None
+
     def __init__(
         self,
         model_name: str = "Alibaba-NLP/gte-reranker-modernbert-base",
         device: Optional[str] = None,
         batch_size: int = 32,
         torch_dtype: str = "float16",
+        backend: str = "auto",
+        num_threads: Optional[int] = None,
+        batch_window_ms: float = 5.0,
+        max_batch_pairs: int = 128,
+        max_concurrent_batches: int = 1,
+        score_cache: Optional[RerankScoreCache] = None,
+        enable_score_cache: bool = True,
     ):
         if not CROSS_ENCODER_AVAILABLE:
             raise ImportError(
@@ -92,6 +201,14 @@ class LocalReranker:
         self.model_name = model_name
         self.device = device
         self.batch_size = batch_size
+        self.num_threads = num_threads or None
+        # Requested settings, compared by get_reranker() to detect config changes
+        self.requested_dtype = torch_dtype
+        self.requested_backend = backend
+
+        self.backend, precision_label = resolve_reranker_backend(
+            backend, device, torch_dtype
+        )
 
         # Story 2.5 AC-2: fp16 precision for reduced memory and faster inference
         dtype_map = {
@@ -99,40 +216,102 @@ class LocalReranker:
             "bfloat16": torch.bfloat16,
             "float32": torch.float32,
         }
-        self._torch_dtype = dtype_map.get(torch_dtype, torch.float16)
-        precision_label = torch_dtype
+        self._torch_dtype = dtype_map.get(precision_label, torch.float32)
+
+        if self.backend == "onnx":
+            try:
+                self.model = self._load_onnx()
+            except Exception as e:
+                logger.warning(
+                    f"[LocalReranker] ONNX backend unavailable ({e}), using int8 on CPU"
+                )
+                self.backend, precision_label = resolve_reranker_backend(
+                    "int8", device, torch_dtype
+                )
+                self._torch_dtype = dtype_map.get(precision_label, torch.float32)
+
+        if self.backend != "onnx":
+            # Load CrossEncoder with fp16 model args
+            model_kwargs: Dict[str, Any] = {}
+            if self._torch_dtype != torch.float32:
+                model_kwargs["torch_dtype"] = self._torch_dtype
+
+            self.model = CrossEncoder(
+                model_name,
+                device=device,
+                model_kwargs=model_kwargs if model_kwargs else None,
+            )
 
-        # Load CrossEncoder with fp16 model args
-        model_kwargs: Dict[str, Any] = {}
-        if self._torch_dtype != torch.float32:
-            model_kwargs["torch_dtype"] = self._torch_dtype
+        if self.backend == "int8":
+            self.model.model = torch.ao.quantization.quantize_dynamic(
+                self.model.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
 
-        self.model = CrossEncoder(
-            model_name,
-            device=device,
-            model_kwargs=model_kwargs if model_kwargs else None,
+        self.precision = precision_label
+        # ONNX Runtime sessions get num_threads in their session options instead
+        self._torch_threads = self.num_threads if self.backend != "onnx" else None
+        self.scheduler = RerankScheduler(
+            self._predict_pairs,
+            max_batch_pairs=max_batch_pairs,
+            max_wait_ms=batch_window_ms,
+            max_concurrent_batches=max_concurrent_batches,
+        )
+        self.score_cache = (
+            (score_cache or get_rerank_score_cache()) if enable_score_cache else None
         )
+        # Scores differ slightly across precisions — keep them apart in the cache
+        self.cache_model_key = f"{model_name}:{self.backend}/{self.precision}"
 
         # Story 2.5 AC-5: Startup logging — model name, device, precision, param count
-        param_count = sum(p.numel() for p in self.model.model.parameters())
+        try:
+            param_count = sum(p.numel() for p in self.model.model.parameters())
+            params_label = f"{param_count / 1e6:.1f}M"
+        except Exception:
+            params_label = "n/a"  # ONNX sessions expose no torch parameters
         logger.info(
             f"LocalReranker initialized: model={model_name}, "
-            f"device={device}, precision={precision_label}, "
-            f"params={param_count / 1e6:.1f}M, batch_size={batch_size}"
+            f"device={device}, backend={self.backend}, precision={precision_label}, "
+            f"params={params_label}, batch_size={batch_size}, "
+            f"num_threads={self.num_threads or 'default'}"
+        )
+
+    def _load_onnx(self) -> "CrossEncoder":
+        """Load the cross-encoder on ONNX Runtime (exported on first load)."""
+        model_kwargs: Dict[str, Any] = {}
+        if ONNX_RUNTIME_AVAILABLE and self.num_threads:
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = self.num_threads
+            model_kwargs["session_options"] = session_options
+        return CrossEncoder(
+            self.model_name,
+            device=self.device,
+            backend="onnx",
+            model_kwargs=model_kwargs or None,
         )
 
+    def _predict_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score (query, doc) pairs synchronously; runs on a scheduler thread."""
+        with _torch_num_threads(self._torch_threads):
+            return self.model.predict(
+                pairs, batch_size=self.batch_size, show_progress_bar=False
+            )
+
     async def rerank(
         self,
         query: str,
         documents: List[str],
         top_k: int = 10,
         return_documents: bool = True,
+        doc_ids: Optional[List[Optional[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Rerank documents using Cross-Encoder.
 
-        Story 2.5 AC-2: Uses asyncio.to_thread (Python 3.9+) instead of
-        loop.run_in_executor for simpler, safer async wrapping.
+        Scoring goes through self.scheduler, which batches pairs from
+        concurrent callers into one predict call on a worker thread.
+        Scores already in self.score_cache are reused; only the remaining
+        documents are sent to the model. doc_ids (parallel to documents)
+        let the cache drop scores of chunks whose content changed.
 
         Returns list of dicts: [{index, score, document}, ...]
         sorted by score descending.
@@ -140,21 +319,13 @@ class LocalReranker:
         if not documents:
             return _empty_list()
 
-        pairs = [(query, doc) for doc in documents]
-
-        # Story 2.5 AC-2: asyncio.to_thread replaces loop.run_in_executor
         start_t = time.perf_counter()
-        scores = await asyncio.to_thread(
-            self.model.predict,
-            pairs,
-            batch_size=self.batch_size,
-            show_progress_bar=False,
-        )
+        scores = await self._score(query, documents, doc_ids)
         latency_ms = (time.perf_counter() - start_t) * 1000
 
-        # Story 2.5 AC-5: Log reranking latency
+        # Story 2.5 AC-5: Log reranking latency (includes batching wait)
         logger.debug(
-            f"[LocalReranker] predict latency={latency_ms:.1f}ms for {len(documents)} docs"
+            f"[LocalReranker] rerank latency={latency_ms:.1f}ms for {len(documents)} docs"
         )
 
         scored_docs = [
@@ -169,6 +340,26 @@ class LocalReranker:
 
         return scored_docs[:top_k]
 
+    async def _score(
+        self,
+        query: str,
+        documents: List[str],
+        doc_ids: Optional[List[Optional[str]]],
+    ) -> List[float]:
+        if self.score_cache is None:
+            return await self.scheduler.score(query, documents)
+
+        scores, keys = self.score_cache.lookup(
+            self.cache_model_key, query, documents, doc_ids
+        )
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            fresh = await self.scheduler.score(query, [documents[i] for i in missing])
+            self.score_cache.put_many([keys[i] for i in missing], fresh)
+            for i, score in zip(missing, fresh):
+                scores[i] = score
+        return scores
+
     async def rerank_search_results(
         self,
         query: str,
@@ -186,6 +377,7 @@ class LocalReranker:
             documents=documents,
             top_k=min(top_k, len(documents)),
             return_documents=False,
+            doc_ids=[r.get("doc_id") for r in search_results],
         )
 
         result_list: List[SearchResult] = []
@@ -337,18 +529,22 @@ _reranker_init_flag: bool = False
 def get_reranker(
     model_name: str = "Alibaba-NLP/gte-reranker-modernbert-base",
     torch_dtype: str = "float16",
+    backend: str = "auto",
+    num_threads: Optional[int] = None,
 ) -> Optional[LocalReranker]:
     """
     Story 2.5 AC-2: Lazy-loaded singleton factory for LocalReranker.
 
     First call initializes the model; subsequent calls return the cached instance.
-    If requested model_name or torch_dtype differs from the cached instance,
-    logs a warning (requires restart to pick up new config).
+    If requested model_name, torch_dtype, backend or num_threads differs from
+    the cached instance, logs a warning and reinitializes.
     Returns None if sentence-transformers is not installed (graceful degradation).
 
     Args:
         model_name: HuggingFace model identifier
         torch_dtype: Inference precision ("float16", "bfloat16", "float32")
+        backend: Inference backend ("auto", "torch", "onnx", "int8")
+        num_threads: CPU inference threads (None/0 = runtime default)
 
     Returns:
         LocalReranker instance or None if unavailable
@@ -357,35 +553,33 @@ def get_reranker(
 
     if _reranker_instance is not None:
         # Story 2.5 H2 fix: Detect config mismatch on cached singleton
-        if _reranker_instance.model_name != model_name:
+        requested = {
+            "model_name": model_name,
+            "torch_dtype": torch_dtype,
+            "backend": backend,
+            "num_threads": num_threads or None,
+        }
+        cached = {
+            "model_name": _reranker_instance.model_name,
+            "torch_dtype": _reranker_instance.requested_dtype,
+            "backend": _reranker_instance.requested_backend,
+            "num_threads": _reranker_instance.num_threads,
+        }
+        changed = [key for key in requested if requested[key] != cached[key]]
+        if changed:
+            key = changed[0]
             logger.warning(
-                f"[get_reranker] Requested model_name={model_name} differs from "
-                f"cached={_reranker_instance.model_name}. Reinitializing reranker."
+                f"[get_reranker] Requested {key}={requested[key]} differs from "
+                f"cached={cached[key]}. Reinitializing reranker."
             )
             _reranker_instance = None
             _reranker_init_flag = False
-            return get_reranker(model_name=model_name, torch_dtype=torch_dtype)
-        dtype_map = {"float16": "float16", "bfloat16": "bfloat16", "float32": "float32"}
-        cached_dtype = next(
-            (
-                k
-                for k, v in {
-                    "float16": torch.float16,
-                    "bfloat16": torch.bfloat16,
-                    "float32": torch.float32,
-                }.items()
-                if _reranker_instance._torch_dtype == v
-            ),
-            "unknown",
-        )
-        if cached_dtype != dtype_map.get(torch_dtype, torch_dtype):
-            logger.warning(
-                f"[get_reranker] Requested torch_dtype={torch_dtype} differs from "
-                f"cached={cached_dtype}. Reinitializing reranker."
+            return get_reranker(
+                model_name=model_name,
+                torch_dtype=torch_dtype,
+                backend=backend,
+                num_threads=num_threads,
             )
-            _reranker_instance = None
-            _reranker_init_flag = False
-            return get_reranker(model_name=model_name, torch_dtype=torch_dtype)
         return _reranker_instance
 
     if _reranker_init_flag:
@@ -404,6 +598,8 @@ def get_reranker(
             model_name=model_name,
             torch_dtype=torch_dtype,
             batch_size=32,
+            backend=backend,
+            num_threads=num_threads,
         )
         return _reranker_instance
     except Exception as e:
@@ -411,6 +607,18 @@ def get_reranker(
         return None
 
 
+def get_rerank_scheduler_stats() -> Optional[Dict[str, Any]]:
+    """Micro-batching metrics of the reranker singleton (None before first load)."""
+    if _reranker_instance is None:
+        return None
+    return _reranker_instance.scheduler.stats()
+
+
+def get_rerank_score_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/invalidation metrics of the shared rerank score cache."""
+    return get_rerank_score_cache().stats()
+
+
 # ========================================
 # Module-level exports
 # ========================================
@@ -420,6 +628,11 @@ __all__ = [
     "LocalReranker",
     "CohereReranker",
     "get_reranker",
+    "get_rerank_scheduler_stats",
+    "get_rerank_score_cache_stats",
+    "resolve_reranker_backend",
+    "RERANKER_BACKENDS",
     "CROSS_ENCODER_AVAILABLE",
+    "ONNX_RUNTIME_AVAILABLE",
     "COHERE_AVAILABLE",
 ]
@@ -23,7 +23,7 @@ Created: 2025-12-12
 import asyncio
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Union
 
 try:
     from loguru import logger
@@ -78,6 +78,8 @@ class CrossCanvasRetrieverConfig:
         canvas_table: LanceDB Canvas节点表名
         max_related_canvases: 最大关联Canvas数量
         enable_cache: 是否启用缓存
+        scan_overfetch: 单次扫描的候选倍数 (配额 × Canvas数 × 倍数)，
+            为按Canvas配额截取留出余量
     """
 
     top_k: int = 10
@@ -86,6 +88,7 @@ class CrossCanvasRetrieverConfig:
     canvas_table: str = "canvas_nodes"
     max_related_canvases: int = 5
     enable_cache: bool = True
+    scan_overfetch: int = 3
 
 
 # ============================================================
@@ -100,11 +103,11 @@ class LanceDBClientProtocol(Protocol):
         self,
         query: str,
         table_name: str,
-        canvas_file: Optional[str] = None,
+        canvas_file: Optional[Union[str, List[str]]] = None,
         num_results: int = 10,
         metric: str = "cosine",
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors."""
+        """Search for similar vectors (canvas_file list → IN filter)."""
         ...
 
 
@@ -205,13 +208,18 @@ class CrossCanvasService:
         """
         在关联Canvas中搜索相关节点
 
+        单次扫描: 以 canvas_file IN (...) 预过滤执行一次 vector+FTS 检索
+        (query 只 embedding 一次)，融合后再按Canvas配额截取
+        (每个Canvas最多 num_results // len(related_canvases) + 1 条)。
+        逐个Canvas检索的耗时随关联Canvas数线性增长，会超出500ms预算。
+
         Args:
             query: 搜索查询
             related_canvases: 关联Canvas列表
             num_results: 返回结果数量
 
         Returns:
-            List[Dict]: 搜索结果
+            List[Dict]: 搜索结果 (按分数降序)
         """
         if not related_canvases:
             # Fail-soft: when find_related_canvases is still a placeholder
@@ -221,26 +229,40 @@ class CrossCanvasService:
             # aggregator use other retrievers.
             return []
 
-        # 聚合多个Canvas的搜索结果
-        all_results: List[Dict[str, Any]] = []
+        canvases = list(dict.fromkeys(related_canvases))
+        quota = num_results // len(canvases) + 1
 
-        for canvas in related_canvases:
-            try:
-                canvas_results = await self.lancedb.search(
-                    query=query,
-                    table_name=self.config.canvas_table,
-                    canvas_file=canvas,
-                    num_results=num_results // len(related_canvases) + 1,
-                )
-                all_results.extend(canvas_results)
-            except Exception as e:
-                if LOGURU_ENABLED:
-                    logger.debug(f"Search failed for {canvas}: {e}")
+        # 一次扫描所有关联Canvas，多取候选以便配额截取后仍能填满
+        try:
+            candidates = await self.lancedb.search(
+                query=query,
+                table_name=self.config.canvas_table,
+                canvas_file=canvases if len(canvases) > 1 else canvases[0],
+                num_results=quota * len(canvases) * max(1, self.config.scan_overfetch),
+            )
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.debug(f"Search failed for {len(canvases)} canvases: {e}")
+            return []
 
-        # 按分数排序并截取
-        all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
-        results = all_results[:num_results]
+        return self._apply_canvas_quotas(candidates, quota, num_results)
 
+    @staticmethod
+    def _apply_canvas_quotas(
+        candidates: List[Dict[str, Any]], quota: int, num_results: int
+    ) -> List[Dict[str, Any]]:
+        """按分数降序选取结果，每个Canvas最多 quota 条，共 num_results 条"""
+        ordered = sorted(candidates, key=lambda x: x.get("score", 0), reverse=True)
+        per_canvas: Dict[str, int] = {}
+        results: List[Dict[str, Any]] = []
+        for r in ordered:
+            canvas = (r.get("metadata") or {}).get("canvas_file") or r.get("canvas_file")
+            if per_canvas.get(canvas, 0) >= quota:
+                continue
+            per_canvas[canvas] = per_canvas.get(canvas, 0) + 1
+            results.append(r)
+            if len(results) >= num_results:
+                break
         return results
 
     async def search(
@@ -436,22 +458,29 @@ async def cross_canvas_retrieval_node(
     if runtime and runtime.context:
         batch_size = runtime.context.get("retrieval_batch_size", 10)
 
-    try:
-        service = await _get_cross_canvas_service()
-        cross_canvas_results = await service.search(
-            query=query, canvas_file=canvas_file, num_results=batch_size
-        )
-    except Exception as e:
-        if LOGURU_ENABLED:
-            logger.error(f"cross_canvas_retrieval_node error: {e}")
-        cross_canvas_results = []
+    from agentic_rag.clients.query_embeddings import query_embedding_scope
+
+    # Reuse the query vector prepared before fan-out
+    with query_embedding_scope(state.get("query_embeddings")) as embedding_scope:
+        try:
+            service = await _get_cross_canvas_service()
+            cross_canvas_results = await service.search(
+                query=query, canvas_file=canvas_file, num_results=batch_size
+            )
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.error(f"cross_canvas_retrieval_node error: {e}")
+            cross_canvas_results = []
 
     latency_ms = (time.perf_counter() - start_time) * 1000
 
-    return {
+    result = {
         "cross_canvas_results": cross_canvas_results,
         "cross_canvas_latency_ms": latency_ms,
     }
+    if embedding_scope.calls:
+        result["embedding_calls"] = embedding_scope.calls
+    return result
 
 
 # Export
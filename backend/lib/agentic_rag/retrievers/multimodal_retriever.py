@@ -771,6 +771,8 @@ async def multimodal_retrieval_node(
     import logging
     import time
 
+    from agentic_rag.clients.query_embeddings import query_embedding_scope
+
     logger = logging.getLogger(__name__)
     start_time = time.time()
 
@@ -805,6 +807,7 @@ async def multimodal_retrieval_node(
             "multimodal_latency_ms": (time.time() - start_time) * 1000,
         }
 
+    embedding_calls: Dict[str, int] = {}
     try:
         # Story 2-9 H1: Use LanceDBClient.search() which is the standard
         # search interface. The previous code called search_multimodal() and
@@ -812,13 +815,16 @@ async def multimodal_retrieval_node(
         # LanceDBClient.search() handles text-to-vector conversion internally
         # via _get_query_vector() and supports hybrid search.
         if hasattr(client, "search"):
-            raw_results = await client.search(
-                query=query,
-                table_name="multimodal_content",
-                canvas_file=canvas_file,
-                num_results=5,
-                query_type="hybrid",
-            )
+            # Reuse the query vector prepared before fan-out
+            with query_embedding_scope(state.get("query_embeddings")) as embedding_scope:
+                raw_results = await client.search(
+                    query=query,
+                    table_name="multimodal_content",
+                    canvas_file=canvas_file,
+                    num_results=5,
+                    query_type="hybrid",
+                )
+            embedding_calls = embedding_scope.calls
         elif hasattr(client, "search_multimodal"):
             raw_results = await client.search_multimodal(
                 query=query,
@@ -887,10 +893,13 @@ async def multimodal_retrieval_node(
             f"[multimodal_retrieval_node] END - results={len(formatted_results)}, latency={latency_ms:.2f}ms"
         )
 
-        return {
+        result = {
             "multimodal_results": formatted_results,
             "multimodal_latency_ms": latency_ms,
         }
+        if embedding_calls:
+            result["embedding_calls"] = embedding_calls
+        return result
 
     except MultimodalRetrievalTimeout:
         # Timeout degradation - return empty results
@@ -298,20 +298,27 @@ async def vault_notes_retrieval_node(
     if runtime and runtime.context:
         batch_size = runtime.context.get("retrieval_batch_size", 10)
 
-    try:
-        service = await _get_vault_notes_service()
-        vault_notes_results = await service.search(query=query, num_results=batch_size)
-    except Exception as e:
-        if LOGURU_ENABLED:
-            logger.error(f"vault_notes_retrieval_node error: {e}")
-        vault_notes_results = []
+    from agentic_rag.clients.query_embeddings import query_embedding_scope
+
+    # Reuse the query vector prepared before fan-out
+    with query_embedding_scope(state.get("query_embeddings")) as embedding_scope:
+        try:
+            service = await _get_vault_notes_service()
+            vault_notes_results = await service.search(query=query, num_results=batch_size)
+        except Exception as e:
+            if LOGURU_ENABLED:
+                logger.error(f"vault_notes_retrieval_node error: {e}")
+            vault_notes_results = []
 
     latency_ms = (time.perf_counter() - start_time) * 1000
 
-    return {
+    result = {
         "vault_notes_results": vault_notes_results,
         "vault_notes_latency_ms": latency_ms,
     }
+    if embedding_scope.calls:
+        result["embedding_calls"] = embedding_scope.calls
+    return result
 
 
 # Export
@@ -42,6 +42,21 @@ def add_dicts(
     return {**left, **right}
 
 
+def add_counts(
+    left: Optional[Dict[str, int]], right: Optional[Dict[str, int]]
+) -> Dict[str, int]:
+    """
+    Reducer summing per-key counters from parallel updates
+
+    Used for embedding_calls: every retrieval node reports the embedding
+    calls it made, and concurrent writes in the same step are added up.
+    """
+    merged = dict(left or {})
+    for key, count in (right or {}).items():
+        merged[key] = merged.get(key, 0) + count
+    return merged
+
+
 class SearchResult(TypedDict):
     """检索结果单元
 
@@ -158,6 +173,12 @@ class CanvasRAGState(MessagesState):
     stale_count: Annotated[int, "过期片段数量"]
     multi_queries: Annotated[Optional[List[str]], "Multi-Query 改写后的查询列表"]
 
+    # 请求级共享查询向量: fan-out 前每个不同的 query 只 embedding 一次
+    query_embeddings: Annotated[
+        Optional[Dict[str, List[float]]], "query → 向量 (prepare_query_embeddings 写入)"
+    ]
+    embedding_calls: Annotated[Dict[str, int], add_counts]
+
     # Story 7.1: Faithfulness 忠实度检查字段
     faithfulness_score: Annotated[Optional[float], "Faithfulness忠实度评分 (0.0-1.0)"]
     faithfulness_details: Annotated[
@@ -241,6 +262,9 @@ def create_initial_state(**overrides: Any) -> Dict[str, Any]:
         "learning_memories": None,
         "stale_count": 0,
         "multi_queries": None,
+        # Shared query embeddings
+        "query_embeddings": None,
+        "embedding_calls": {},
         # Story 7.1 Faithfulness
         "faithfulness_score": None,
         "faithfulness_details": None,
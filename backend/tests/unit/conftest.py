@@ -64,3 +64,52 @@ def fallback_service(mock_canvas_service, mock_task_manager):
             task_manager=mock_task_manager,
             fsrs_manager=None,
         )
+
+
+# ============================================================================
+# LanceDBClient with deterministic fake embeddings (agentic_rag client tests)
+# ============================================================================
+
+EMBED_DIM = 8
+
+
+def fake_vector(text: str, dim: int = EMBED_DIM) -> list:
+    """Deterministic embedding for ``text`` (no Ollama needed)."""
+    seed = sum(ord(c) for c in text)
+    return [float((seed + i) % 7) / 7.0 for i in range(dim)]
+
+
+@pytest.fixture
+def make_lancedb_client(tmp_path, monkeypatch):
+    """Factory for LanceDBClient on tmp_path with Ollama embeddings replaced by fake_vector.
+
+    Single-text embed calls are recorded on ``client.embedded``, batch calls
+    on ``client.batches``. The multimodal vectorizer is disabled so every
+    embedding goes through the fakes. Keyword arguments go to LanceDBClient.
+    """
+    from agentic_rag.clients.lancedb_client import LanceDBClient
+
+    def _make(db_path=None, **kwargs):
+        kwargs.setdefault("vault_id", "default")
+        client = LanceDBClient(db_path=str(db_path or tmp_path / "db"), **kwargs)
+        client.embedded = []
+        client.batches = []
+
+        async def _no_vectorizer():
+            client._vectorizer_initialized = True
+            return False
+
+        async def _fake_single(text):
+            client.embedded.append(text)
+            return fake_vector(text)
+
+        async def _fake_batch(texts):
+            client.batches.append(list(texts))
+            return [fake_vector(t) for t in texts]
+
+        monkeypatch.setattr(client, "_init_vectorizer", _no_vectorizer)
+        monkeypatch.setattr(client, "_ollama_embed", _fake_single)
+        monkeypatch.setattr(client, "_ollama_embed_batch", _fake_batch)
+        return client
+
+    return _make
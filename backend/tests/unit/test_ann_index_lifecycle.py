@@ -0,0 +1,202 @@
+"""
+Tests for ANN vector index lifecycle management in LanceDBClient.
+
+Tables switch from flat scan to an ANN index once they cross a row
+threshold; later inserts are merged by optimize() or trigger a retrain
+once the table has grown enough, and nprobes/refine_factor reach the
+vector query.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+
+DIM = 16
+
+
+def _docs(prefix: str, n: int, seed: int = 0) -> list:
+    rng = random.Random(f"{prefix}{seed}")
+    return [
+        {
+            "doc_id": f"{prefix}{i}",
+            "content": f"{prefix} 笔记内容 {i}",
+            "vector": [rng.random() for _ in range(DIM)],
+            "canvas_file": f"{prefix}_{i}.md",
+        }
+        for i in range(n)
+    ]
+
+
+async def _make_client(tmp_path, monkeypatch, **kwargs) -> LanceDBClient:
+    c = LanceDBClient(
+        db_path=str(tmp_path / "db"),
+        vault_id="default",
+        enable_embedding_cache=False,
+        enable_result_cache=False,
+        **kwargs,
+    )
+
+    async def _fake_single(text):
+        rng = random.Random(text)
+        return [rng.random() for _ in range(DIM)]
+
+    monkeypatch.setattr(c, "_ollama_embed", _fake_single)
+    await c.initialize()
+    return c
+
+
+def _vector_index(client: LanceDBClient, table: str = "vault_notes"):
+    return client._get_vector_index(client._db.open_table(table))
+
+
+class TestAnnIndexLifecycle:
+    async def test_small_table_stays_flat(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path, monkeypatch, ann_min_rows=300)
+        await client.add_documents("vault_notes", _docs("a", 100))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+
+        assert _vector_index(client) is None
+        assert client.get_stats()["vector_index"]["builds"] == 0
+        await client.close()
+
+    async def test_index_created_past_threshold(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path, monkeypatch, ann_min_rows=300)
+        await client.add_documents("vault_notes", _docs("a", 320))
+        client._maintain_vector_index("vault_notes")
+        assert client.get_stats()["vector_index"]["pending_tables"] == ["vault_notes"]
+        assert await client.flush_vector_index_jobs() == 1
+
+        index = _vector_index(client)
+        assert index is not None
+        assert index.index_type == "IvfSq"
+        stats = client.get_stats()["vector_index"]
+        assert stats["builds"] == 1
+        assert stats["pending_tables"] == []
+
+        # Search goes through the index with the configured knobs
+        results = await client.search("a 笔记内容", table_name="vault_notes", num_results=5)
+        assert len(results) == 5
+        await client.close()
+
+    @pytest.mark.parametrize(
+        "index_type,expected", [("ivf_pq", "IVFPQ"), ("IVF_HNSW_SQ", "HNSW")]
+    )
+    async def test_configurable_index_type(
+        self, tmp_path, monkeypatch, index_type, expected
+    ):
+        client = await _make_client(
+            tmp_path, monkeypatch, ann_min_rows=300, ann_index_type=index_type
+        )
+        await client.add_documents("vault_notes", _docs("a", 320))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+
+        assert expected in _vector_index(client).index_type.upper()
+        await client.close()
+
+    async def test_inserts_optimized_into_index(self, tmp_path, monkeypatch):
+        client = await _make_client(
+            tmp_path, monkeypatch, ann_min_rows=300, ann_optimize_rows=50
+        )
+        await client.add_documents("vault_notes", _docs("a", 320))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+
+        await client.add_documents("vault_notes", _docs("b", 20))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+        assert _vector_index(client).num_unindexed_rows == 20
+        assert client.get_stats()["vector_index"]["optimizations"] == 0
+
+        await client.add_documents("vault_notes", _docs("c", 40))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+
+        assert _vector_index(client).num_unindexed_rows == 0
+        stats = client.get_stats()["vector_index"]
+        assert stats["optimizations"] == 1
+        assert stats["retrains"] == 0
+        await client.close()
+
+    async def test_index_build_and_fts_merge_are_serialized(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path, monkeypatch, ann_min_rows=300)
+        other = LanceDBClient(db_path=str(tmp_path / "db"), vault_id="default")
+        await client.add_documents("vault_notes", _docs("a", 320))
+        client._rebuild_fts_index("vault_notes")
+
+        lock = client._table_maintenance_lock("vault_notes")
+        assert other._table_maintenance_lock("vault_notes") is lock
+
+        with lock:
+            client._maintain_vector_index("vault_notes")
+            merge = asyncio.create_task(asyncio.to_thread(client._merge_fts_index, "vault_notes"))
+            await asyncio.sleep(0.2)
+            stats = client.get_stats()
+            assert stats["vector_index"]["builds"] == 0
+            assert stats["fts"]["incremental_merges"] == 0
+
+        await client.flush_vector_index_jobs()
+        await merge
+        stats = client.get_stats()
+        assert stats["vector_index"]["builds"] == 1
+        assert stats["fts"]["incremental_merges"] == 1
+        await client.close()
+
+    async def test_retrain_after_growth(self, tmp_path, monkeypatch):
+        client = await _make_client(
+            tmp_path, monkeypatch, ann_min_rows=300, ann_retrain_growth=1.5
+        )
+        await client.add_documents("vault_notes", _docs("a", 300))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+
+        await client.add_documents("vault_notes", _docs("b", 160))
+        client._maintain_vector_index("vault_notes")
+        await client.flush_vector_index_jobs()
+
+        stats = client.get_stats()["vector_index"]
+        assert stats["retrains"] == 1
+        assert _vector_index(client).num_indexed_rows == 460
+        await client.close()
+
+    async def test_auto_index_disabled(self, tmp_path, monkeypatch):
+        client = await _make_client(
+            tmp_path, monkeypatch, ann_min_rows=300, ann_auto_index=False
+        )
+        await client.add_documents("vault_notes", _docs("a", 320))
+        client._maintain_vector_index("vault_notes")
+
+        assert _vector_index(client) is None
+        await client.close()
+
+    def test_threshold_never_below_training_minimum(self):
+        client = LanceDBClient(vault_id="default", ann_min_rows=10)
+        assert client.ann_min_rows == LanceDBClient.ANN_MIN_TRAINING_ROWS
+
+
+class TestAnnQueryParams:
+    async def test_nprobes_and_refine_factor_applied(self, tmp_path, monkeypatch):
+        client = await _make_client(
+            tmp_path, monkeypatch, ann_nprobes=7, ann_refine_factor=3
+        )
+        await client.add_documents("vault_notes", _docs("a", 10))
+
+        calls = []
+        original = LanceDBClient._apply_ann_params
+
+        def _spy(vq, nprobes, refine_factor):
+            calls.append((nprobes, refine_factor))
+            return original(vq, nprobes, refine_factor)
+
+        monkeypatch.setattr(client, "_apply_ann_params", _spy)
+        await client.search("a", table_name="vault_notes", query_type="vector")
+        await client.search(
+            "a", table_name="vault_notes", query_type="vector", nprobes=40
+        )
+
+        assert calls == [(7, 3), (40, 3)]
+        await client.close()
@@ -0,0 +1,174 @@
+"""
+Tests for CardStateJournal, the append-only persistence behind
+ReviewService._card_states.
+
+Saves append only the changed cards to a JSONL journal, saves within the
+group-commit window share one append, the journal is compacted into
+fsrs_card_states.json in the background, and startup replays it with a
+load-time metric.
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.card_state_journal import CardStateJournal, CardStates
+
+
+# Snapshot content larger than the journals the tests write, so commits stay appends
+_BALLAST = {f"old-{i}": '{"s":1}' for i in range(100)}
+
+
+def _journal_lines(journal):
+    return [json.loads(line) for line in journal.journal_path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return CardStateJournal(tmp_path / "fsrs_card_states.json", group_commit_ms=5)
+
+
+@pytest.fixture
+def loaded(journal):
+    """Journal with an existing snapshot of 100 cards."""
+    journal._write_snapshot({f"c{i}": '{"s":1}' for i in range(100)})
+    states = CardStates(journal.load())
+    return journal, states
+
+
+class TestCardStates:
+    def test_tracks_changed_keys(self):
+        states = CardStates({"a": "1", "b": "2"})
+        states["c"] = "3"
+        del states["a"]
+        states.pop("missing", None)
+
+        assert states.take_changes() == ({"a", "c"}, False)
+        assert states.take_changes() == (set(), False)
+
+        states.clear()
+        assert states.take_changes() == (set(), True)
+
+
+class TestJournal:
+    async def test_save_appends_only_changed_cards(self, loaded):
+        journal, states = loaded
+        snapshot = journal.path.read_text(encoding="utf-8")
+
+        states["c3"] = '{"s":2}'
+        del states["c4"]
+        await journal.commit(states)
+
+        assert journal.path.read_text(encoding="utf-8") == snapshot
+        assert _journal_lines(journal) == [{"k": "c3", "v": '{"s":2}'}, {"k": "c4", "d": 1}]
+
+        reloaded = CardStateJournal(journal.path).load()
+        assert reloaded["c3"] == '{"s":2}'
+        assert "c4" not in reloaded
+        assert len(reloaded) == 99
+
+    async def test_group_commit(self, loaded):
+        journal, states = loaded
+
+        async def review(i):
+            states[f"new-{i}"] = '{"s":3}'
+            await journal.commit(states)
+
+        await asyncio.gather(*(review(i) for i in range(10)))
+
+        assert journal.commits == 1
+        assert len(_journal_lines(journal)) == 10
+
+    async def test_background_compaction(self, tmp_path):
+        journal = CardStateJournal(tmp_path / "fsrs_card_states.json", group_commit_ms=0, compact_threshold=3)
+        states = CardStates(_BALLAST)
+        states.mark_rewrite()
+        await journal.commit(states)  # first save writes the snapshot
+
+        for i in range(3):
+            states[f"c{i}"] = '{"s":1}'
+            await journal.commit(states)
+        await journal._compaction
+
+        assert not journal.journal_path.exists()
+        assert json.loads(journal.path.read_text(encoding="utf-8")) == dict(states)
+        assert journal.stats()["compactions"] == 2
+
+    async def test_first_save_writes_snapshot(self, journal):
+        states = CardStates({"a": "1"})
+        states.mark_rewrite()
+
+        await journal.commit(states)
+
+        assert json.loads(journal.path.read_text(encoding="utf-8")) == {"a": "1"}
+        assert not journal.journal_path.exists()
+
+    async def test_failed_append_is_retried(self, loaded):
+        journal, states = loaded
+        states["c1"] = '{"s":9}'
+
+        with patch.object(journal, "_append_lines", side_effect=OSError("disk full")):
+            await journal.commit(states)
+        await journal.commit(states)
+
+        assert _journal_lines(journal) == [{"k": "c1", "v": '{"s":9}'}]
+
+
+class TestLoad:
+    def test_load_metric_and_replay(self, journal):
+        journal._write_snapshot({"a": "1", **_BALLAST})
+        journal._append_lines('{"k":"b","v":"2"}\n{"k":"a","d":1}\n')
+
+        states = CardStateJournal(journal.path).load()
+
+        assert states == {"b": "2", **_BALLAST}
+
+        fresh = CardStateJournal(journal.path)
+        fresh.load()
+        assert fresh.load_stats["journal_entries"] == 2
+        assert fresh.load_stats["cards"] == 101
+        assert fresh.load_stats["elapsed_ms"] >= 0
+
+    def test_torn_entry_compacts(self, journal):
+        journal._write_snapshot({"a": "1"})
+        journal._append_lines('{"k":"b","v":"2"}\n{"k":"c","v":')
+
+        loader = CardStateJournal(journal.path)
+        states = loader.load()
+
+        assert states == {"a": "1", "b": "2"}
+        assert loader.load_stats["torn"] is True
+        assert not journal.journal_path.exists()
+        assert json.loads(journal.path.read_text(encoding="utf-8")) == states
+
+    def test_replay_after_crash_before_journal_unlink(self, journal):
+        journal._write_snapshot({"a": "1"})
+        journal._append_lines('{"k":"a","v":"2"}\n{"all":{"a":"3"}}\n')
+        leftover = journal.journal_path.read_text(encoding="utf-8")
+        journal._write_snapshot({"a": "3"})
+        journal.journal_path.write_text(leftover, encoding="utf-8")
+
+        assert CardStateJournal(journal.path).load() == {"a": "3"}
+
+    def test_legacy_indented_snapshot(self, journal):
+        journal.path.write_text(json.dumps({"a": "1", "b": "2"}, indent=2), encoding="utf-8")
+
+        assert CardStateJournal(journal.path).load() == {"a": "1", "b": "2"}
+
+
+class TestReviewServiceIntegration:
+    async def test_review_journals_changed_card(self, isolate_card_states_file):
+        from app.services.review_service import ReviewService
+
+        isolate_card_states_file.write_text(json.dumps({"old": '{"s":1}'}), encoding="utf-8")
+        service = ReviewService(canvas_service=MagicMock(), task_manager=MagicMock())
+        assert service.get_card_state_stats()["load"]["cards"] == 1
+
+        service._card_states["concept-x"] = '{"s":2}'
+        await service._save_card_states()
+
+        journal_file = isolate_card_states_file.with_suffix(".journal.jsonl")
+        assert json.loads(journal_file.read_text(encoding="utf-8")) == {"k": "concept-x", "v": '{"s":2}'}
+        assert ReviewService._load_card_states() == {"old": '{"s":1}', "concept-x": '{"s":2}'}
@@ -0,0 +1,171 @@
+"""
+Tests for the CompressionEngine behind compress_context.
+
+The query is tokenized once per request, sentence tokenizations are cached
+per content hash across requests, relevance is BM25 with vault-level IDF
+(TermStatistics from LanceDB content_tokenized) and the token budget is
+filled in one pass.
+"""
+
+import pytest
+
+from agentic_rag import compression
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.compression import CompressionEngine, TermStatistics, compress_context
+from tests.unit.conftest import fake_vector
+
+
+def _doc(content, **extra):
+    return {"doc_id": "d", "content": content, "score": 0.5, "metadata": {}, **extra}
+
+
+@pytest.fixture
+def count_tokenize(monkeypatch):
+    calls = []
+    original = compression._tokenize_terms
+
+    def _counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(compression, "_tokenize_terms", _counting)
+    return calls
+
+
+class TestTokenizationCache:
+    def test_query_tokenized_once_and_sentences_cached(self, count_tokenize):
+        engine = CompressionEngine()
+        docs = [_doc("贝叶斯定理描述后验概率。先验概率来自经验。"), _doc("矩阵可逆当且仅当行列式非零。")]
+
+        engine.compress("贝叶斯定理", docs, max_tokens=1000)
+        first = len(count_tokenize)
+        engine.compress("后验概率", docs, max_tokens=1000)
+
+        # 3 sentences + 1 query, then only the new query
+        assert first == 4
+        assert count_tokenize[first:] == ["后验概率"]
+        assert engine.stats()["hits"] == 2
+
+    def test_changed_content_is_retokenized(self):
+        engine = CompressionEngine()
+        engine.compress("q", [_doc("第一版内容。")])
+        engine.compress("q", [_doc("第二版内容。")])
+
+        assert engine.stats()["misses"] == 2
+
+    def test_cache_bounded(self):
+        engine = CompressionEngine(cache_size=2)
+        for i in range(5):
+            engine.compress("q", [_doc(f"内容 {i}。")])
+
+        assert engine.stats()["entries"] == 2
+
+
+class TestBM25:
+    def test_idf_weights_rare_terms(self):
+        stats = TermStatistics.from_tokenized(["概率 定理", "概率 矩阵", "概率 贝叶斯", None])
+
+        assert stats.num_docs == 3
+        assert stats.doc_freq["概率"] == 3
+        assert stats.idf("贝叶斯") > stats.idf("概率")
+        assert stats.idf("unseen") > stats.idf("贝叶斯")
+
+    def test_vault_idf_changes_ranking(self):
+        docs = [_doc("概率 概率 概率。"), _doc("贝叶斯 公式。")]
+        # "概率" is everywhere in the vault, "贝叶斯" is rare
+        vault = TermStatistics(1000, {"概率": 900, "贝叶斯": 3})
+        budget = compression._count_tokens_approx("贝叶斯 公式。")
+
+        kept = CompressionEngine().compress("贝叶斯 概率", docs, budget, term_stats=vault)
+
+        assert kept == "贝叶斯 公式。"
+
+    def test_no_query_terms_scores_zero(self):
+        engine = CompressionEngine()
+        units = list(engine.units_for("内容。"))
+        assert engine._score(set(), units, None) == [0.0]
+
+
+class TestSelection:
+    def test_budget_and_original_order(self):
+        docs = [
+            _doc("无关的句子一。贝叶斯定理用于更新概率。无关的句子二。"),
+            _doc("另一个贝叶斯例子。"),
+        ]
+
+        relevant = ["贝叶斯定理用于更新概率。", "另一个贝叶斯例子。"]
+        budget = sum(compression._count_tokens_approx(s) for s in relevant)
+
+        result = compress_context("贝叶斯定理", docs, max_tokens=budget)
+
+        assert result.split("\n") == relevant
+
+    def test_atomic_blocks_protected(self):
+        code = "```python\nprint('x')\n```"
+        docs = [_doc(f"完全无关。\n{code}\n另一句无关。")]
+
+        result = compress_context("贝叶斯", docs, max_tokens=1000)
+
+        assert code in result
+
+    def test_stale_documents_rank_lower(self):
+        fresh = _doc("贝叶斯定理。")
+        stale = _doc("贝叶斯定理 旧版。", metadata={"stale": True})
+        budget = compression._count_tokens_approx("贝叶斯定理。")
+
+        assert compress_context("贝叶斯定理", [stale, fresh], budget) == "贝叶斯定理。"
+
+    def test_empty(self):
+        assert compress_context("q", [_doc("")]) == ""
+        assert compress_context("q", []) == ""
+
+
+class TestVaultTermStatistics:
+    async def test_built_in_background_and_rebuilt_on_change(self, make_lancedb_client):
+        client = make_lancedb_client(enable_embedding_cache=False, enable_result_cache=False)
+        await client.initialize()
+        await client.add_documents(
+            "vault_notes",
+            [
+                {"doc_id": f"n{i}", "content": f"贝叶斯 定理 {i}", "vector": fake_vector(str(i))}
+                for i in range(3)
+            ],
+        )
+
+        assert await client.get_term_statistics() is None  # build scheduled
+        await client._term_stats_pending["vault_notes"]
+        stats = await client.get_term_statistics()
+        assert stats.num_docs == 3
+        assert stats.doc_freq["贝叶斯"] == 3
+
+        await client.add_documents(
+            "vault_notes", [{"doc_id": "n9", "content": "矩阵", "vector": fake_vector("9")}]
+        )
+        # Previous statistics are served while the rebuild runs
+        assert await client.get_term_statistics() is stats
+        await client._term_stats_pending["vault_notes"]
+        assert (await client.get_term_statistics()).num_docs == 4
+        await client.close()
+
+    async def test_named_vault_table(self, make_lancedb_client):
+        client = make_lancedb_client(
+            vault_id="canvas_vault", enable_embedding_cache=False, enable_result_cache=False
+        )
+        await client.initialize()
+        await client.add_documents(
+            "vault_notes", [{"doc_id": "n1", "content": "贝叶斯 定理", "vector": fake_vector("1")}]
+        )
+
+        assert await client.get_term_statistics("vault_notes") is None
+        await client._term_stats_pending["canvas_vault_vault_notes"]
+        assert (await client.get_term_statistics("vault_notes")).num_docs == 1
+        await client.close()
+
+    async def test_missing_table(self, tmp_path):
+        client = LanceDBClient(db_path=str(tmp_path / "db"), vault_id="default")
+        await client.initialize()
+
+        assert await client.get_term_statistics("nope") is None
+        await client._term_stats_pending["nope"]
+        assert await client.get_term_statistics("nope") is None
+        await client.close()
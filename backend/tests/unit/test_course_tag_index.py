@@ -0,0 +1,182 @@
+"""
+Tests for the materialized course → tag set index behind find_related_courses.
+
+The index is built with one scan on first use, then kept current by
+add_documents and the file-chunk deletes used by index_vault_notes /
+index_single_file; stage 2 of progressive_scope_search becomes a lookup of
+precomputed Jaccard neighbours.
+"""
+
+import pytest
+
+from agentic_rag.clients.course_tag_index import CourseTagIndex, tag_jaccard
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from tests.unit.conftest import EMBED_DIM, fake_vector
+
+
+class TestCourseTagIndex:
+    def test_neighbours_precomputed(self):
+        index = CourseTagIndex()
+        index.add_rows(
+            [
+                ("a.md", "离散数学", ["逻辑", "集合"]),
+                ("b.md", "数理逻辑", ["逻辑", "集合", "证明"]),
+                ("c.md", "线性代数", ["矩阵"]),
+            ]
+        )
+
+        assert index.related("离散数学", 0.3) == ["数理逻辑"]
+        assert index.related("数理逻辑", 0.3) == ["离散数学"]
+        assert index.related("线性代数", 0.0) == []
+        assert index.stats()["neighbour_pairs"] == 1
+
+    def test_ordered_by_similarity(self):
+        index = CourseTagIndex()
+        index.add_rows(
+            [
+                ("a.md", "A", ["x", "y", "z"]),
+                ("b.md", "B", ["x"]),
+                ("c.md", "C", ["x", "y"]),
+            ]
+        )
+
+        assert index.related("A", 0.0) == ["C", "B"]
+
+    def test_remove_file_decrements_counts(self):
+        index = CourseTagIndex()
+        index.add_rows(
+            [
+                ("a1.md", "A", ["x"]),
+                ("a2.md", "A", ["x", "y"]),
+                ("b.md", "B", ["y"]),
+            ]
+        )
+        assert index.related("A", 0.4) == ["B"]
+
+        # "x" is still carried by a1.md; "y" leaves course A
+        index.remove_files(["a2.md"])
+
+        assert index.course_tags("A") == {"x"}
+        assert index.related("A", 0.0) == []
+        assert index.related("B", 0.0) == []
+
+    def test_matches_full_recomputation(self):
+        rows = [
+            (f"f{i}.md", f"C{i % 5}", [f"t{(i * j) % 7}" for j in range(3)])
+            for i in range(30)
+        ]
+        index = CourseTagIndex()
+        index.add_rows(rows)
+        index.remove_files([f"f{i}.md" for i in range(0, 30, 4)])
+
+        remaining = [r for i, r in enumerate(rows) if i % 4]
+        tags = {}
+        for _, course, course_tags in remaining:
+            tags.setdefault(course, set()).update(course_tags)
+        for course in tags:
+            expected = sorted(
+                (o for o in tags if o != course and tag_jaccard(tags[course], tags[o]) > 0.2),
+                key=lambda o: (-tag_jaccard(tags[course], tags[o]), o),
+            )
+            assert index.related(course, 0.2) == expected
+
+    def test_rows_without_course_or_tags_ignored(self):
+        index = CourseTagIndex()
+        index.add_rows([("a.md", "", ["x"]), ("b.md", "B", []), ("c.md", None, ["x"])])
+
+        assert index.stats()["courses"] == 0
+
+
+def _note(file_path, course, tags_str, i=0):
+    return {
+        "doc_id": f"{file_path}_{i}",
+        "content": f"{course} 笔记 {i}",
+        "vector": fake_vector(f"{file_path}{i}"),
+        "canvas_file": file_path,
+        "course": course,
+        "tags_str": tags_str,
+        "category": "",
+    }
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = make_lancedb_client(enable_embedding_cache=False, enable_result_cache=False)
+    await c.initialize()
+    await c.add_documents(
+        "vault_notes",
+        [
+            _note("dm.md", "离散数学", "逻辑,集合"),
+            _note("ml.md", "数理逻辑", "逻辑,集合,证明"),
+            _note("la.md", "线性代数", "矩阵"),
+        ],
+    )
+    yield c
+    await c.close()
+
+
+class TestFindRelatedCourses:
+    async def test_first_call_scans_then_lookups(self, client, monkeypatch):
+        assert await client.find_related_courses("离散数学") == ["数理逻辑"]
+
+        def _no_scan(table_name):
+            raise AssertionError("table scanned again")
+
+        monkeypatch.setattr(client._db, "open_table", _no_scan)
+        assert await client.find_related_courses("数理逻辑") == ["离散数学"]
+
+    async def test_incremental_add_and_delete(self, client):
+        await client.find_related_courses("离散数学")
+
+        await client.add_documents("vault_notes", [_note("la2.md", "线性代数", "逻辑,集合")])
+        assert await client.find_related_courses("离散数学", threshold=0.3) == [
+            "数理逻辑",
+            "线性代数",
+        ]
+
+        client._delete_files_chunks("vault_notes", ["la2.md"])
+        assert await client.find_related_courses("离散数学") == ["数理逻辑"]
+
+        client._delete_file_chunks("vault_notes", "ml.md")
+        assert await client.find_related_courses("离散数学") == []
+
+    async def test_drop_invalidates(self, tmp_path, monkeypatch):
+        c = LanceDBClient(db_path=str(tmp_path / "v1db"), vault_id="v1", enable_result_cache=False)
+        monkeypatch.setattr(c, "_ollama_embed", lambda text: fake_vector(text))
+        await c.initialize()
+        await c.add_documents(
+            "vault_notes",
+            [_note("dm.md", "离散数学", "逻辑"), _note("ml.md", "数理逻辑", "逻辑")],
+        )
+        assert await c.find_related_courses("离散数学", table_name="v1_vault_notes") == ["数理逻辑"]
+
+        c.drop_vault_tables("v1")
+
+        assert c._course_indexes == {}
+        assert await c.find_related_courses("离散数学", table_name="v1_vault_notes") == []
+        await c.close()
+
+    async def test_named_vault_resolves_table(self, make_lancedb_client):
+        c = make_lancedb_client(vault_id="canvas_vault", enable_result_cache=False)
+        await c.initialize()
+        await c.add_documents(
+            "vault_notes",
+            [_note("dm.md", "离散数学", "逻辑"), _note("ml.md", "数理逻辑", "逻辑")],
+        )
+
+        assert await c.find_related_courses("离散数学") == ["数理逻辑"]
+        assert "canvas_vault_vault_notes" in c._course_indexes
+        await c.close()
+
+    async def test_writes_from_another_client_rebuild(self, client, make_lancedb_client):
+        assert await client.find_related_courses("离散数学") == ["数理逻辑"]
+
+        writer = make_lancedb_client(db_path=client.db_path, embedding_dim=EMBED_DIM, enable_result_cache=False)
+        await writer.initialize()
+        await writer.add_documents("vault_notes", [_note("la2.md", "线性代数", "逻辑,集合")])
+
+        assert await client.find_related_courses("离散数学") == ["数理逻辑", "线性代数"]
+        await writer.close()
+
+    async def test_missing_table(self, client):
+        assert await client.find_related_courses("离散数学", table_name="nope") == []
@@ -0,0 +1,125 @@
+"""
+Tests for the single-scan multi-canvas search in CrossCanvasService.
+
+search_related_nodes issues one LanceDB search with a canvas_file IN (...)
+prefilter instead of one search per related canvas, then applies the
+per-canvas quota (num_results // len(related) + 1) after fusion.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.retrievers.cross_canvas_retriever import (
+    CrossCanvasRetrieverConfig,
+    CrossCanvasService,
+)
+from tests.unit.conftest import fake_vector
+
+
+def _hit(canvas: str, score: float) -> dict:
+    return {
+        "doc_id": f"{canvas}_{score}",
+        "content": "节点",
+        "score": score,
+        "metadata": {"canvas_file": canvas},
+    }
+
+
+class TestQuotas:
+    async def test_one_search_with_all_canvases(self):
+        lancedb = AsyncMock()
+        lancedb.search.return_value = []
+        service = CrossCanvasService(lancedb, CrossCanvasRetrieverConfig())
+
+        await service.search_related_nodes("q", ["a.canvas", "b.canvas", "a.canvas"], 10)
+
+        assert lancedb.search.await_count == 1
+        kwargs = lancedb.search.await_args.kwargs
+        assert kwargs["canvas_file"] == ["a.canvas", "b.canvas"]
+        # quota 6 per canvas x 2 canvases x overfetch 3
+        assert kwargs["num_results"] == 36
+
+    async def test_single_canvas_passes_plain_filter(self):
+        lancedb = AsyncMock()
+        lancedb.search.return_value = []
+        service = CrossCanvasService(lancedb, CrossCanvasRetrieverConfig())
+
+        await service.search_related_nodes("q", ["a.canvas"], 10)
+
+        assert lancedb.search.await_args.kwargs["canvas_file"] == "a.canvas"
+
+    async def test_quota_caps_dominant_canvas(self):
+        lancedb = AsyncMock()
+        lancedb.search.return_value = [_hit("a", 0.9 - i * 0.01) for i in range(10)] + [
+            _hit("b", 0.5),
+            _hit("c", 0.4),
+        ]
+        service = CrossCanvasService(lancedb, CrossCanvasRetrieverConfig())
+
+        results = await service.search_related_nodes("q", ["a", "b", "c"], 6)
+
+        canvases = [r["metadata"]["canvas_file"] for r in results]
+        # quota = 6 // 3 + 1 = 3
+        assert canvases == ["a", "a", "a", "b", "c"]
+        assert [r["score"] for r in results] == sorted(
+            (r["score"] for r in results), reverse=True
+        )
+
+    async def test_search_failure_returns_empty(self):
+        lancedb = AsyncMock()
+        lancedb.search.side_effect = RuntimeError("boom")
+        service = CrossCanvasService(lancedb, CrossCanvasRetrieverConfig())
+
+        assert await service.search_related_nodes("q", ["a", "b"], 5) == []
+
+
+class TestWhereFilter:
+    def test_list_builds_in_clause(self):
+        client = LanceDBClient(vault_id="default")
+        assert client._build_where_filters(canvas_file=["a.canvas", "it's.canvas"]) == [
+            "canvas_file IN ('a.canvas', 'it''s.canvas')"
+        ]
+        assert client._build_where_filters(canvas_file=[]) == []
+        assert client._build_where_filters(canvas_file="a.canvas") == [
+            "canvas_file = 'a.canvas'"
+        ]
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = make_lancedb_client(enable_embedding_cache=False, enable_result_cache=False)
+    await c.initialize()
+    await c.add_documents(
+        "canvas_nodes",
+        [
+            {
+                "doc_id": f"{canvas}_{i}",
+                "content": f"逆否命题 {canvas} 节点 {i}",
+                "vector": fake_vector(f"{canvas}{i}"),
+                "canvas_file": f"{canvas}.canvas",
+            }
+            for canvas in ("a", "b", "c", "other")
+            for i in range(4)
+        ],
+    )
+    c._rebuild_fts_index("canvas_nodes")
+    c.embedded.clear()
+    yield c
+    await c.close()
+
+
+class TestSingleScanAgainstLanceDB:
+    async def test_only_related_canvases_and_one_embedding(self, client):
+        service = CrossCanvasService(client, CrossCanvasRetrieverConfig())
+
+        results = await service.search_related_nodes(
+            "逆否命题", ["a.canvas", "b.canvas", "c.canvas"], num_results=6
+        )
+
+        canvases = [r["metadata"]["canvas_file"] for r in results]
+        assert len(results) == 6
+        assert set(canvases) <= {"a.canvas", "b.canvas", "c.canvas"}
+        assert max(canvases.count(c) for c in set(canvases)) <= 3
+        assert client.embedded == ["逆否命题"]
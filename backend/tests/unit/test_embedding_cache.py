@@ -0,0 +1,186 @@
+"""
+Tests for the content-addressed embedding cache (EmbeddingCache + LanceDBClient).
+
+Covers memory/disk hits, persistence across instances, LRU eviction,
+model-scoped keys and re-indexing an edited note with only changed sections
+being re-embedded.
+"""
+
+import pytest
+
+from agentic_rag.clients.embedding_cache import EmbeddingCache, normalize_text
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from tests.unit.conftest import EMBED_DIM, fake_vector
+
+
+class TestEmbeddingCache:
+    def test_memory_hit_and_miss_counting(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "c.sqlite3"), "bge-m3")
+
+        assert cache.get("hello") is None
+        cache.put("hello", [0.5] * EMBED_DIM)
+
+        assert cache.get("hello") == pytest.approx([0.5] * EMBED_DIM)
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        first = EmbeddingCache(path, "bge-m3")
+        first.put_many(["a", "b"], [[0.25] * EMBED_DIM, [0.75] * EMBED_DIM])
+        first.close()
+
+        second = EmbeddingCache(path, "bge-m3")
+        vectors = second.get_many(["a", "b", "c"])
+
+        assert vectors[0] == pytest.approx([0.25] * EMBED_DIM)
+        assert vectors[1] == pytest.approx([0.75] * EMBED_DIM)
+        assert vectors[2] is None
+        assert second.stats()["disk_hits"] == 2
+
+    def test_model_is_part_of_key(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        EmbeddingCache(path, "bge-m3").put("text", [1.0] * EMBED_DIM)
+
+        assert EmbeddingCache(path, "other-model").get("text") is None
+
+    def test_normalized_text_shares_entry(self, tmp_path):
+        cache = EmbeddingCache(None, "bge-m3")
+        cache.put("line one\r\nline two  ", [1.0] * EMBED_DIM)
+
+        assert normalize_text("line one\r\nline two  ") == "line one\nline two"
+        assert cache.get("line one\nline two") is not None
+
+    def test_disk_eviction_keeps_capacity(self, tmp_path):
+        cache = EmbeddingCache(
+            str(tmp_path / "c.sqlite3"), "bge-m3", max_memory_entries=2, max_disk_entries=10
+        )
+        for i in range(30):
+            cache.put(f"text {i}", [float(i)] * EMBED_DIM)
+
+        assert cache.disk_entries() <= 11
+        assert cache.stats()["evictions"] > 0
+        # Most recent entries survive
+        assert cache.get("text 29") is not None
+
+    def test_disk_hit_defers_last_access_write(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        EmbeddingCache(path, "bge-m3").put("a", [0.5] * EMBED_DIM)
+        cache = EmbeddingCache(path, "bge-m3")
+        changes = cache._conn.total_changes
+
+        assert cache.get("a") is not None
+        assert cache._conn.total_changes == changes
+        assert cache.stats()["pending_access_updates"] == 1
+
+        cache.put("b", [0.25] * EMBED_DIM)
+        assert cache.stats()["pending_access_updates"] == 0
+
+    def test_disk_count_is_tracked_without_counting(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        first = EmbeddingCache(path, "bge-m3")
+        first.put_many(["a", "b"], [[0.5] * EMBED_DIM] * 2)
+        first.put("a", [0.25] * EMBED_DIM)
+        assert first.disk_entries() == 2
+        first.close()
+
+        cache = EmbeddingCache(path, "bge-m3")
+        assert cache.disk_entries() == 2
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        cache.put("c", [0.5] * EMBED_DIM)
+        cache.stats()
+
+        assert cache.disk_entries() == 3
+        assert not [sql for sql in statements if "COUNT" in sql]
+        cache.clear()
+        assert cache.disk_entries() == 0
+
+    def test_memory_hit_refreshes_disk_last_access(self, tmp_path):
+        cache = EmbeddingCache(
+            str(tmp_path / "c.sqlite3"), "bge-m3", max_memory_entries=20, max_disk_entries=10
+        )
+        cache.put("hot", [1.0] * EMBED_DIM)
+        for i in range(30):
+            assert cache.get("hot") is not None
+            cache.put(f"text {i}", [float(i)] * EMBED_DIM)
+
+        assert cache.stats()["evictions"] > 0
+        row = cache._conn.execute(
+            "SELECT 1 FROM embeddings WHERE key = ?", (cache.key_for("hot"),)
+        ).fetchone()
+        assert row is not None
+
+    async def test_async_lookup_and_put(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        first = EmbeddingCache(path, "bge-m3")
+        await first.aput_many(["a", "b"], [[0.25] * EMBED_DIM, None])
+        first.close()
+
+        second = EmbeddingCache(path, "bge-m3")
+        vectors = await second.aget_many(["a", "b", "a"])
+
+        assert vectors[0] == pytest.approx([0.25] * EMBED_DIM)
+        assert vectors[1] is None
+        assert vectors[2] == pytest.approx([0.25] * EMBED_DIM)
+        assert second.stats()["disk_hits"] == 2
+        assert second.stats()["misses"] == 1
+        assert await second.aget("a") is not None
+        assert second.stats()["memory_hits"] == 1
+
+
+@pytest.fixture
+def client(make_lancedb_client):
+    return make_lancedb_client()
+
+
+def _embedded(client) -> list:
+    """Texts sent to Ollama, single and batch calls combined."""
+    return client.embedded + [text for batch in client.batches for text in batch]
+
+
+class TestLanceDBClientEmbeddingCache:
+    async def test_embed_hits_cache_on_repeat(self, client):
+        first = await client.embed("逆否命题是什么")
+        second = await client.embed("逆否命题是什么")
+
+        assert first == pytest.approx(second)
+        assert _embedded(client) == ["逆否命题是什么"]
+        assert client.get_stats()["embedding_cache"]["memory_hits"] == 1
+
+    async def test_reindex_edited_note_embeds_only_changed_sections(
+        self, client, tmp_path
+    ):
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        note = vault / "note.md"
+        note.write_text(
+            "# 第一节\n\n不变的内容。\n\n## 第二节\n\nOriginal body.\n", encoding="utf-8"
+        )
+        await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+        assert len(_embedded(client)) == 2
+
+        client.embedded.clear()
+        client.batches.clear()
+        note.write_text(
+            "# 第一节\n\n不变的内容。\n\n## 第二节\n\nEdited body.\n", encoding="utf-8"
+        )
+        total = await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        assert total == 2
+        assert len(_embedded(client)) == 1
+        assert "Edited body." in _embedded(client)[0]
+
+    async def test_cache_disabled(self, tmp_path, monkeypatch):
+        c = LanceDBClient(db_path=str(tmp_path / "db"), enable_embedding_cache=False)
+
+        async def _fake_single(text):
+            return fake_vector(text)
+
+        monkeypatch.setattr(c, "_ollama_embed", _fake_single)
+        await c.embed("x")
+
+        assert c.get_stats()["embedding_cache"] is None
+        assert not (tmp_path / "db" / "embedding_cache.sqlite3").exists()
@@ -0,0 +1,152 @@
+"""
+Tests for EpisodeCache, the indexed in-memory episode store behind
+MemoryService._episodes.
+
+Dedup and eviction are O(1) through the episode_id index and the ordered
+store; get_learning_history narrows by the group_id / concept indexes and
+search_memories tier 3 uses the incremental bigram index — both must match
+the linear scans they replace.
+"""
+
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.episode_cache import EpisodeCache, searchable_text
+
+
+def _episode(i, group="math", concept=None, **extra):
+    return {
+        "episode_id": f"ep-{i}",
+        "user_id": "u1",
+        "concept": concept if concept is not None else f"逆否命题{i % 7}",
+        "episode_type": "learning",
+        "node_id": f"node-{i}",
+        "group_id": group,
+        "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}",
+        **extra,
+    }
+
+
+class TestEpisodeCache:
+    def test_list_compatible(self):
+        cache = EpisodeCache(episodes=[_episode(0), _episode(1), _episode(2)])
+
+        assert len(cache) == 3
+        assert cache[0]["episode_id"] == "ep-0"
+        assert cache[-1]["episode_id"] == "ep-2"
+        assert cache[1]["episode_id"] == "ep-1"
+        assert [e["episode_id"] for e in cache[-2:]] == ["ep-1", "ep-2"]
+        assert [e["episode_id"] for e in reversed(cache)] == ["ep-2", "ep-1", "ep-0"]
+        assert cache == [_episode(0), _episode(1), _episode(2)]
+        with pytest.raises(IndexError):
+            cache[3]
+
+        cache.clear()
+        assert cache == []
+        assert cache.stats()["bigrams"] == 0
+
+    def test_dedup_and_eviction(self):
+        cache = EpisodeCache(maxlen=3)
+        for i in range(5):
+            cache.append(_episode(i))
+
+        assert [e["episode_id"] for e in cache] == ["ep-2", "ep-3", "ep-4"]
+        assert not cache.has("ep-1")
+        assert cache.has("ep-4")
+        assert cache.get("ep-3")["node_id"] == "node-3"
+        assert cache.stats()["ids"] == 3
+
+    def test_select_by_group_and_concept(self):
+        cache = EpisodeCache()
+        cache.append(_episode(0, group="math", concept="逆否命题"))
+        cache.append(_episode(1, group="physics", concept="牛顿定律"))
+        cache.append(_episode(2, group="math", concept="Matrix Rank"))
+        cache.append(_episode(3, group="math", concept=""))
+
+        assert [e["episode_id"] for e in cache.select(group_id="math")] == ["ep-0", "ep-2", "ep-3"]
+        assert [e["episode_id"] for e in cache.select(concept_contains="rank")] == ["ep-2"]
+        assert cache.select(group_id="physics", concept_contains="命题") == []
+        assert len(cache.select()) == 4
+
+    def test_search_matches_linear_scan(self):
+        rng = random.Random(7)
+        words = ["逆否命题", "矩阵", "rank", "Bayes", "定理", "node", "x"]
+        cache = EpisodeCache(maxlen=150)
+        episodes = []
+        for i in range(200):
+            episode = _episode(
+                i,
+                group=rng.choice(["math", "cs", None]),
+                concept=" ".join(rng.sample(words, 2)),
+                content=rng.choice(words) if i % 3 else None,
+            )
+            cache.append(episode)
+            episodes.append(episode)
+        kept = episodes[-150:]
+
+        for query in ["逆否", "RANK", "bayes 定", "x", "", "node-19", "none", "learning 逆", "不存在"]:
+            for group in [None, "math"]:
+                expected = [
+                    e for e in reversed(kept)
+                    if (not group or e.get("group_id", "") == group)
+                    and query.lower() in searchable_text(e)
+                ]
+                assert list(cache.search(query, group_id=group)) == expected, (query, group)
+
+
+def _events(n):
+    return [
+        {
+            "event_type": "color_changed",
+            "timestamp": f"2026-02-10T12:00:{i % 60:02d}Z",
+            "canvas_path": "数学/离散数学.canvas",
+            "node_id": f"node_{i:03d}",
+            "metadata": {"concept": f"concept_{i}"},
+        }
+        for i in range(n)
+    ]
+
+
+class TestMemoryServiceCache:
+    @pytest.fixture
+    def service(self):
+        from app.services.memory_service import MemoryService
+
+        svc = MemoryService(neo4j_client=MagicMock())
+        svc._initialized = True
+        svc.neo4j.stats = {"initialized": False}
+        svc._enqueue_episode = MagicMock()
+        return svc
+
+    def test_assigned_list_is_indexed(self, service):
+        service._episodes = [_episode(0), _episode(1)]
+
+        assert isinstance(service._episodes, EpisodeCache)
+        assert service._episodes.has("ep-1")
+        assert service._episodes.maxlen == service.MAX_EPISODE_CACHE
+
+    async def test_batch_dedup_and_cap(self, service, monkeypatch):
+        monkeypatch.setattr(service, "MAX_EPISODE_CACHE", 10)
+        service._episodes = []
+
+        await service.record_batch_learning_events(_events(15))
+        await service.record_batch_learning_events(_events(15)[-3:])
+
+        assert len(service._episodes) == 10
+        assert [e["node_id"] for e in service._episodes][-1] == "node_014"
+
+    async def test_tier3_search_uses_index(self, service):
+        service._episodes = [
+            _episode(0, concept="逆否命题"),
+            _episode(1, concept="充分条件"),
+            _episode(2, group="cs", concept="逆否命题"),
+        ]
+        service._search_graphiti = AsyncMock(return_value=[])
+        service._search_neo4j_fulltext = AsyncMock(return_value=[])
+
+        results = await service.search_memories("逆否", group_id="math")
+
+        assert [r["episode_id"] for r in results] == ["ep-0"]
+        assert results[0]["source"] == "in_memory"
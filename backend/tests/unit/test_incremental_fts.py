@@ -0,0 +1,114 @@
+"""
+Tests for incremental FTS index maintenance in LanceDBClient.
+
+The FTS index on content_tokenized is built once; later updates are
+merged by a debounced optimize() pass or immediately past a staleness
+threshold, while searches keep finding rows that are not merged yet.
+"""
+
+import asyncio
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from tests.unit.conftest import fake_vector
+
+
+def _docs(prefix: str, n: int) -> list:
+    return [
+        {
+            "doc_id": f"{prefix}{i}",
+            "content": f"{prefix} 笔记内容 {i}",
+            "vector": fake_vector(f"{prefix}{i}"),
+            "canvas_file": f"{prefix}_{i}.md",
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def make_client(make_lancedb_client):
+    async def _make(**kwargs) -> LanceDBClient:
+        c = make_lancedb_client(enable_embedding_cache=False, **kwargs)
+        await c.initialize()
+        await c.add_documents("vault_notes", _docs("base", 4))
+        c._rebuild_fts_index("vault_notes")
+        return c
+
+    return _make
+
+
+def _unindexed(client: LanceDBClient) -> int:
+    tbl = client._db.open_table("vault_notes")
+    index = client._get_fts_index(tbl)
+    return client._fts_unindexed_rows(tbl, index)
+
+
+class TestIncrementalFts:
+    async def test_index_built_once_then_updates_deferred(self, make_client):
+        client = await make_client(fts_debounce_seconds=60)
+        assert client.get_stats()["fts"]["full_rebuilds"] == 1
+
+        await client.add_documents("vault_notes", _docs("zebra", 2))
+        client._rebuild_fts_index("vault_notes")
+
+        stats = client.get_stats()["fts"]
+        assert stats["full_rebuilds"] == 1
+        assert stats["pending_tables"] == ["vault_notes"]
+        assert _unindexed(client) == 2
+
+        # Rows not merged yet are still searchable via FTS
+        results = await client.search("zebra", table_name="vault_notes")
+        assert any("zebra" in r["content"] for r in results)
+
+        assert await client.flush_fts_updates() == 1
+        assert _unindexed(client) == 0
+        assert client.get_stats()["fts"]["incremental_merges"] == 1
+        await client.close()
+
+    async def test_debounce_coalesces_updates(self, make_client):
+        client = await make_client(fts_debounce_seconds=0.05)
+
+        for prefix in ("one", "two", "three"):
+            await client.add_documents("vault_notes", _docs(prefix, 1))
+            client._rebuild_fts_index("vault_notes")
+        await asyncio.sleep(0.3)
+
+        stats = client.get_stats()["fts"]
+        assert stats["deferred_updates"] == 3
+        assert stats["incremental_merges"] == 1
+        assert stats["pending_tables"] == []
+        assert _unindexed(client) == 0
+        await client.close()
+
+    async def test_staleness_threshold_merges_immediately(self, make_client):
+        client = await make_client(
+            fts_debounce_seconds=60, fts_stale_rows=3
+        )
+
+        await client.add_documents("vault_notes", _docs("bulk", 3))
+        client._rebuild_fts_index("vault_notes")
+
+        # The merge starts right away, in a worker thread
+        assert client.get_stats()["fts"]["pending_tables"] == ["vault_notes"]
+        assert await client.flush_fts_updates() == 0
+
+        stats = client.get_stats()["fts"]
+        assert stats["stale_merges"] == 1
+        assert stats["incremental_merges"] == 1
+        assert stats["pending_tables"] == []
+        assert _unindexed(client) == 0
+        await client.close()
+
+    @pytest.mark.parametrize("kwargs", [{"fts_incremental": False}, {}])
+    async def test_full_rebuild_when_disabled_or_forced(
+        self, make_client, kwargs
+    ):
+        client = await make_client(**kwargs)
+
+        await client.add_documents("vault_notes", _docs("more", 1))
+        client._rebuild_fts_index("vault_notes", force=not kwargs)
+
+        assert client.get_stats()["fts"]["full_rebuilds"] == 2
+        assert _unindexed(client) == 0
+        await client.close()
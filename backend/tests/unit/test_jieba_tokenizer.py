@@ -0,0 +1,103 @@
+"""
+Tests for the jieba tokenization service (warm-up, query LRU, index-time
+batch tokenization that bypasses the query LRU).
+"""
+
+from agentic_rag.clients import tokenization
+from agentic_rag.clients.lancedb_client import _jieba_tokenize, _split_md_file_worker
+from agentic_rag.clients.tokenization import JiebaTokenizer, get_jieba_tokenizer
+
+
+class TestJiebaTokenizer:
+    def test_warm_up_records_startup_time(self):
+        tokenizer = JiebaTokenizer()
+        assert tokenizer.warm_up() is True
+        stats = tokenizer.stats()
+        assert stats["warmed_up"] is True
+        assert stats["startup_ms"] is not None
+
+    async def test_async_warm_up(self):
+        tokenizer = JiebaTokenizer()
+        assert await tokenizer.warm_up_async() is True
+        assert tokenizer.warmed_up
+
+    def test_query_tokenization_is_cached(self):
+        tokenizer = JiebaTokenizer(query_cache_size=8)
+        first = tokenizer.tokenize("机器学习是人工智能的子集")
+        second = tokenizer.tokenize("机器学习是人工智能的子集")
+
+        assert first == second
+        assert "人工智能" in first
+        stats = tokenizer.stats()
+        assert stats["query_cache_hits"] == 1
+        assert stats["query_cache_misses"] == 1
+        assert stats["texts"] == 1
+
+    def test_long_texts_bypass_query_cache(self):
+        tokenizer = JiebaTokenizer()
+        text = "深度学习" * (tokenization.QUERY_CACHE_MAX_CHARS // 4 + 1)
+        tokenizer.tokenize(text)
+        tokenizer.tokenize(text)
+
+        stats = tokenizer.stats()
+        assert stats["query_cache_entries"] == 0
+        assert stats["texts"] == 2
+        assert stats["tokens"] > 0
+        assert stats["tokens_per_sec"] > 0
+
+    def test_index_scope_bypasses_query_cache(self):
+        tokenizer = JiebaTokenizer(query_cache_size=8)
+        with tokenization.index_tokenization():
+            indexed = tokenizer.tokenize("图论中的欧拉回路")
+
+        assert indexed == tokenizer.tokenize("图论中的欧拉回路")
+        stats = tokenizer.stats()
+        assert stats["query_cache_hits"] == 0
+        assert stats["query_cache_misses"] == 1
+        assert stats["query_cache_entries"] == 1
+
+    def test_blank_text_passthrough(self):
+        tokenizer = JiebaTokenizer()
+        assert tokenizer.tokenize("") == ""
+        assert tokenizer.tokenize("   ") == "   "
+
+    def test_batch_matches_single(self):
+        tokenizer = JiebaTokenizer()
+        texts = ["逆否命题与原命题等价", "deep learning 深度学习", ""]
+        assert tokenizer.tokenize_batch(texts) == [tokenizer.tokenize(t) for t in texts]
+
+    def test_batch_bypasses_query_cache(self):
+        tokenizer = JiebaTokenizer(query_cache_size=8)
+        tokenizer.tokenize("欧拉回路")
+
+        tokenizer.tokenize_batch([f"第{i}条笔记: 图论中欧拉回路" for i in range(20)] + ["欧拉回路"])
+
+        stats = tokenizer.stats()
+        assert stats["query_cache_entries"] == 1
+        assert stats["query_cache_hits"] == 0
+        assert stats["query_cache_misses"] == 1
+        assert stats["texts"] == 22
+
+        tokenizer.tokenize("欧拉回路")
+        assert tokenizer.stats()["query_cache_hits"] == 1
+
+
+class TestIndexTimeTokenization:
+    def test_chunk_worker_pretokenizes_chunks(self):
+        chunks = _split_md_file_worker("n.md", "# 标题\n\n机器学习是人工智能的子集", 512, 50)
+        assert chunks
+        for chunk in chunks:
+            assert chunk["content_tokenized"] == _jieba_tokenize(chunk["content"])
+
+    def test_chunk_worker_leaves_query_cache_alone(self):
+        tokenizer = get_jieba_tokenizer()
+        chunks = _split_md_file_worker("only-indexed.md", "# 索引\n\n只在索引时出现的笔记内容", 512, 50)
+
+        assert chunks
+        assert all(chunk["content"] not in tokenizer._query_cache for chunk in chunks)
+
+    def test_module_helper_uses_shared_service(self):
+        before = get_jieba_tokenizer().stats()["query_cache_hits"]
+        _jieba_tokenize("共享分词服务")
+        _jieba_tokenize("共享分词服务")
+        assert get_jieba_tokenizer().stats()["query_cache_hits"] >= before + 1
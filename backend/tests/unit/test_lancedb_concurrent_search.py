@@ -0,0 +1,122 @@
+"""
+Tests for off-loop, concurrent LanceDB search branches.
+
+Covers the FTS branch overlapping query embedding, per-branch latency
+reporting and concurrent fan-out in search_multiple_tables.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tests.unit.conftest import fake_vector
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = make_lancedb_client(enable_embedding_cache=False)
+    await c.initialize()
+
+    docs = [
+        {
+            "doc_id": f"d{i}",
+            "content": f"逆否命题 第{i}条 contrapositive note {i}",
+            "vector": fake_vector(f"note {i}"),
+            "canvas_file": f"note_{i}.md",
+        }
+        for i in range(6)
+    ]
+    for table in ("vault_notes", "canvas_nodes"):
+        await c.add_documents(table, docs)
+        c._rebuild_fts_index(c.resolve_table_name(table))
+    yield c
+    await c.close()
+
+
+class TestConcurrentSearchBranches:
+    async def test_hybrid_reports_branch_latency(self, client):
+        results = await client.search("逆否命题", table_name="vault_notes", num_results=3)
+
+        assert results
+        latency = results[0]["metadata"]["search_latency_ms"]
+        assert {"embed", "dense", "fts", "total"} <= set(latency)
+        stats = client.get_stats()["search_latency"]
+        assert stats["total"]["count"] == 1
+        assert "p95_ms" in stats["dense"]
+
+    async def test_fts_overlaps_query_embedding(self, client, monkeypatch):
+        fts_started = threading.Event()
+        original_fts = client._run_search_blocking
+
+        async def _slow_embed(text):
+            # Embedding waits for the FTS branch to be running in the executor
+            for _ in range(200):
+                if fts_started.is_set():
+                    break
+                await asyncio.sleep(0.005)
+            return fake_vector(text)
+
+        async def _tracking(fn, *args):
+            if getattr(fn, "__name__", "") == "_fts":
+                fts_started.set()
+            return await original_fts(fn, *args)
+
+        monkeypatch.setattr(client, "_ollama_embed", _slow_embed)
+        monkeypatch.setattr(client, "_run_search_blocking", _tracking)
+
+        results = await client.search("逆否命题", table_name="vault_notes")
+
+        assert fts_started.is_set()
+        assert results
+
+    async def test_search_does_not_block_event_loop(self, client, monkeypatch):
+        original = client._run_search_blocking
+
+        async def _slow(fn, *args):
+            def _blocking(*a):
+                time.sleep(0.1)
+                return fn(*a)
+
+            return await original(_blocking, *args)
+
+        monkeypatch.setattr(client, "_run_search_blocking", _slow)
+        ticks = 0
+
+        async def _ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(_ticker())
+        await client.search("逆否命题", table_name="vault_notes")
+        ticker.cancel()
+
+        assert ticks >= 5
+
+    async def test_search_multiple_tables_fans_out(self, client, monkeypatch):
+        in_flight = 0
+        peak = 0
+        original = client.search
+
+        async def _tracked(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            try:
+                return await original(**kwargs)
+            finally:
+                in_flight -= 1
+
+        monkeypatch.setattr(client, "search", _tracked)
+        results = await client.search_multiple_tables(
+            "逆否命题", table_names=["vault_notes", "canvas_nodes"]
+        )
+
+        assert peak == 2
+        assert len(results) == 10
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
@@ -288,6 +288,52 @@ class TestMigrateJsonData:
         assert result["num"] == 42
 
 
+def _fake_fix(text):
+    return text.replace("乱码", "修复") if isinstance(text, str) else text
+
+
+class TestMigrateJournaledStore:
+    """The fallback store's JSONL journal is replayed and folded in."""
+
+    @pytest.fixture
+    def journaled(self, tmp_path):
+        from app.clients.neo4j_fallback_store import FallbackStore
+
+        store = FallbackStore(tmp_path / "neo4j_memory.json")
+        store.load()
+        store.put("concepts", {"id": "c1", "name": "概念1", "note": "快照"})
+        store.compact()
+        store.put("concepts", {"id": "c2", "name": "概念2", "note": "journal 乱码"})
+        store.commit()
+        assert store.journal_path.exists()
+        return store
+
+    def test_journal_entries_are_migrated(self, journaled):
+        from app.clients.neo4j_fallback_store import FallbackStore
+
+        with patch("migrate_neo4j_data.fix_unicode_garbage", side_effect=_fake_fix):
+            result = migrate_json_data(source=journaled.path, dry_run=False, force=True)
+
+        assert [c["note"] for c in result["concepts"]] == ["快照", "journal 修复"]
+        assert not journaled.journal_path.exists()
+        assert list(journaled.path.parent.glob("*.journal.jsonl.bak.*"))
+
+        reloaded = FallbackStore(journaled.path)
+        reloaded.load()
+        assert reloaded.get("concepts", "概念2")["note"] == "journal 修复"
+
+    def test_dry_run_leaves_journal(self, journaled):
+        snapshot = journaled.path.read_text(encoding="utf-8")
+        journal = journaled.journal_path.read_text(encoding="utf-8")
+
+        with patch("migrate_neo4j_data.fix_unicode_garbage", side_effect=_fake_fix):
+            result = migrate_json_data(source=journaled.path, dry_run=True, force=True)
+
+        assert result["concepts"][1]["note"] == "journal 修复"
+        assert journaled.path.read_text(encoding="utf-8") == snapshot
+        assert journaled.journal_path.read_text(encoding="utf-8") == journal
+
+
 class TestFixUnicodeGarbageFallback:
     """Test fix_unicode_garbage fallback when ftfy is unavailable."""
 
@@ -0,0 +1,238 @@
+"""
+Tests for the UNWIND bulk write API on Neo4jClient.
+
+record_episodes_bulk / record_score_history_bulk / create_edge_relationships_bulk
+send chunked row lists through one ``UNWIND $rows AS row`` transaction per
+chunk and report failures per input row; record_batch_learning_events uses
+them so a large batch is a handful of round-trips.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+from app.clients.neo4j_client import Neo4jClient
+
+
+class _FakeResult:
+    def __init__(self, records):
+        self._records = records
+
+    async def data(self):
+        return self._records
+
+
+class _FakeSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, params):
+        rows = params["rows"]
+        self._driver.calls.append([row["idx"] for row in rows])
+        if any(row.get("concept") == "bad" for row in rows):
+            raise ClientError("bad row")
+        return _FakeResult(
+            [{"idx": row["idx"]} for row in rows if row.get("concept") != "skipped"]
+        )
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.calls = []
+
+    def session(self, database=None):
+        return _FakeSession(self)
+
+
+def _neo4j_client() -> Neo4jClient:
+    client = Neo4jClient(retry_attempts=1)
+    client._driver = _FakeDriver()
+    client._initialized = True
+    return client
+
+
+def _episode(i, concept=None):
+    return {
+        "episode_id": f"ep-{i}",
+        "user_id": "batch_user",
+        "canvas_path": "数学/离散数学.canvas",
+        "node_id": f"n{i}",
+        "concept": concept or f"概念{i}",
+        "agent_type": "color_changed",
+    }
+
+
+class TestNeo4jMode:
+    async def test_500_episodes_in_three_round_trips(self):
+        client = _neo4j_client()
+
+        errors = await client.record_episodes_bulk([_episode(i) for i in range(500)])
+
+        assert errors == []
+        assert [len(call) for call in client._driver.calls] == [200, 200, 100]
+        assert client._driver.calls[2][-1] == 499
+
+    async def test_failed_chunk_isolates_rows(self):
+        client = _neo4j_client()
+        episodes = [_episode(i) for i in range(5)]
+        episodes[3]["concept"] = "bad"
+
+        errors = await client.record_episodes_bulk(episodes, chunk_size=2)
+
+        assert errors == [{"index": 3, "error": "bad row"}]
+        # chunk [2, 3] failed and was retried one row per transaction
+        assert client._driver.calls == [[0, 1], [2, 3], [2], [3], [4]]
+
+    async def test_unreturned_rows_reported(self):
+        client = _neo4j_client()
+        episodes = [_episode(0), _episode(1, concept="skipped")]
+
+        errors = await client.record_episodes_bulk(episodes)
+
+        assert errors == [{"index": 1, "error": "row not written"}]
+
+    async def test_group_id_inferred_like_record_episode(self):
+        client = _neo4j_client()
+        seen = []
+
+        async def _capture(query, **params):
+            seen.extend(params["rows"])
+            return [{"idx": row["idx"]} for row in params["rows"]]
+
+        client.run_query = _capture
+        await client.record_episodes_bulk([_episode(0)])
+
+        assert seen[0]["groupId"] == Neo4jClient._episode_params(_episode(0))["groupId"]
+        assert seen[0]["groupId"]
+
+    async def test_edges_and_score_history(self):
+        client = _neo4j_client()
+
+        edge_errors = await client.create_edge_relationships_bulk(
+            [
+                {"canvas_path": "a.canvas", "edge_id": f"e{i}", "from_node_id": "x", "to_node_id": "y"}
+                for i in range(3)
+            ]
+        )
+        score_errors = await client.record_score_history_bulk(
+            [{"concept_id": "n1", "canvas_name": "a.canvas", "score": 80}]
+        )
+
+        assert edge_errors == [] and score_errors == []
+        assert client._driver.calls == [[0, 1, 2], [0]]
+
+    async def test_connection_error_fails_whole_chunk(self):
+        client = _neo4j_client()
+        client.run_query = AsyncMock(side_effect=ConnectionError("down"))
+
+        errors = await client.record_episodes_bulk([_episode(i) for i in range(3)])
+
+        assert [e["index"] for e in errors] == [0, 1, 2]
+        assert client.run_query.await_count == 1
+
+    @pytest.mark.parametrize("exc", [ServiceUnavailable("gone"), OSError("reset")])
+    async def test_driver_and_os_errors_fail_chunk(self, exc):
+        client = _neo4j_client()
+        client.run_query = AsyncMock(side_effect=exc)
+
+        errors = await client.record_episodes_bulk([_episode(i) for i in range(2)])
+
+        assert [e["index"] for e in errors] == [0, 1]
+
+
+class TestJsonFallback:
+    async def test_episodes_written_and_saved_once(self, tmp_path):
+        client = Neo4jClient(use_json_fallback=True, storage_path=tmp_path / "neo4j.json")
+        await client.initialize()
+        client._save_json_data = AsyncMock(wraps=client._save_json_data)
+
+        errors = await client.record_episodes_bulk([_episode(i) for i in range(4)])
+
+        assert errors == []
+        assert len(client._data["relationships"]) == 4
+        assert client._save_json_data.await_count == 1
+
+    async def test_score_history_persisted(self, tmp_path):
+        path = tmp_path / "neo4j.json"
+        client = Neo4jClient(use_json_fallback=True, storage_path=path)
+        await client.initialize()
+
+        await client.record_score_history_bulk(
+            [
+                {"concept_id": "n1", "canvas_name": "a.canvas", "score": 60, "timestamp": "2026-01-01T00:00:00"},
+                {"concept_id": "n1", "canvas_name": "a.canvas", "score": 90, "timestamp": "2026-01-02T00:00:00"},
+            ]
+        )
+
+        history = await client.get_concept_score_history("n1", "a.canvas")
+        assert [h["score"] for h in history] == [60, 90]
+
+        reloaded = Neo4jClient(use_json_fallback=True, storage_path=path)
+        await reloaded.initialize()
+        assert len(reloaded._data["score_history"]) == 2
+
+
+def _events(n):
+    return [
+        {
+            "event_type": "color_changed",
+            "timestamp": f"2026-02-10T12:00:{i:02d}Z",
+            "canvas_path": "数学/离散数学.canvas",
+            "node_id": f"node_{i:03d}",
+            "metadata": {"concept": f"concept_{i}"},
+        }
+        for i in range(n)
+    ]
+
+
+class TestBatchLearningEvents:
+    @pytest.fixture
+    def service(self):
+        from app.services.memory_service import MemoryService
+
+        svc = MemoryService()
+        svc._initialized = True
+        svc._episodes = []
+        svc.neo4j = MagicMock()
+        svc.neo4j.stats = {"initialized": True}
+        svc.neo4j.record_episode = AsyncMock()
+        svc._enqueue_episode = MagicMock()
+        return svc
+
+    async def test_uses_bulk_write(self, service):
+        service.neo4j.record_episodes_bulk = AsyncMock(return_value=[])
+
+        result = await service.record_batch_learning_events(_events(5))
+
+        assert result["success"] is True
+        service.neo4j.record_episode.assert_not_called()
+        payloads = service.neo4j.record_episodes_bulk.call_args[0][0]
+        assert [p["node_id"] for p in payloads] == [f"node_{i:03d}" for i in range(5)]
+
+    async def test_row_errors_map_to_event_index(self, service):
+        service.neo4j.record_episodes_bulk = AsyncMock(return_value=[{"index": 1, "error": "bad row"}])
+        events = _events(3)
+        del events[0]["node_id"]
+
+        result = await service.record_batch_learning_events(events)
+
+        # valid records are events 1 and 2; bulk row 1 is event 2
+        assert result["failed"] == 2
+        assert {"index": 2, "error": "bad row"} in result["errors"]
+        assert service._pending_failed_writes[-1]["episode_id"] == result["episode_ids"][1]
+
+    async def test_bulk_exception_fails_every_row(self, service):
+        service.neo4j.record_episodes_bulk = AsyncMock(side_effect=OSError("socket closed"))
+
+        result = await service.record_batch_learning_events(_events(3))
+
+        assert result["failed"] == 3
+        assert [e["index"] for e in result["errors"]] == [0, 1, 2]
+        assert len(service._pending_failed_writes) == 3
@@ -0,0 +1,292 @@
+"""
+Tests for FallbackStore, the indexed and journaled storage behind the
+Neo4jClient JSON fallback mode.
+
+Writes append changed documents to a JSONL journal instead of rewriting the
+whole file, the journal is folded into the snapshot past the compaction
+threshold, older JSON files are migrated on load, and lookups (user /
+concept / relationship pair, due reviews, score history) go through indexes.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.clients.neo4j_client import Neo4jClient
+from app.clients.neo4j_fallback_store import STORE_VERSION, FallbackStore
+
+
+def _rel(i, user="u1", concept=None, due_in_days=-1, **extra):
+    return {
+        "id": f"learned-{i}",
+        "user_id": user,
+        "concept_id": f"concept-{i}",
+        "concept_name": concept or f"概念{i}",
+        "next_review": (datetime.now() + timedelta(days=due_in_days)).isoformat(),
+        "review_count": 1,
+        **extra,
+    }
+
+
+def _seed(store):
+    """Snapshot larger than the journals the tests write, so commits stay appends."""
+    for i in range(50):
+        store.put("users", {"id": f"seed-{i}", "created_at": "2026-01-01T00:00:00"})
+    store.compact()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FallbackStore(tmp_path / "neo4j_memory.json")
+    assert store.load() is True
+    _seed(store)
+    return store
+
+
+class TestJournal:
+    def test_commit_appends_without_rewriting_snapshot(self, store):
+        snapshot = store.path.read_text(encoding="utf-8")
+
+        store.put("users", {"id": "u1"})
+        store.put("relationships", _rel(1))
+        assert store.commit() == 2
+
+        assert store.path.read_text(encoding="utf-8") == snapshot
+        lines = store.journal_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["put", "put"]
+
+    def test_reload_replays_journal(self, store):
+        store.put("relationships", _rel(1))
+        store.append("score_history", {"concept_id": "n1", "score": 80})
+        store.commit()
+        rel = store.relationship("u1", "概念1")
+        rel["review_count"] = 2
+        store.put("relationships", rel)
+        store.delete("relationships", "learned-missing")
+        store.commit()
+
+        reloaded = FallbackStore(store.path)
+        assert reloaded.load() is False
+
+        assert reloaded.relationship("u1", "概念1")["review_count"] == 2
+        assert len(reloaded.data["relationships"]) == 1
+        assert [r["score"] for r in reloaded.score_history("n1")] == [80]
+
+    def test_compaction_threshold(self, tmp_path):
+        store = FallbackStore(tmp_path / "neo4j_memory.json", compact_threshold=3)
+        store.load()
+        _seed(store)
+
+        for i in range(2):
+            store.put("relationships", _rel(i))
+            store.commit()
+        assert store.journal_path.exists()
+
+        store.put("relationships", _rel(2))
+        store.commit()
+
+        assert not store.journal_path.exists()
+        snapshot = json.loads(store.path.read_text(encoding="utf-8"))
+        assert len(snapshot["relationships"]) == 3
+        assert snapshot["metadata"]["journal_seq"] == 53  # 50 seed users + 3 relationships
+
+    def test_journal_larger_than_snapshot_compacts(self, tmp_path):
+        store = FallbackStore(tmp_path / "neo4j_memory.json")
+        store.load()
+
+        store.put("relationships", _rel(1))
+        store.commit()
+
+        assert not store.journal_path.exists()
+        assert len(json.loads(store.path.read_text(encoding="utf-8"))["relationships"]) == 1
+
+    def test_torn_journal_line_is_ignored(self, store):
+        store.put("relationships", _rel(1))
+        store.commit()
+        with open(store.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op":"put","c":"relationships","doc":{"id":')
+
+        reloaded = FallbackStore(store.path)
+        reloaded.load()
+
+        assert [r["id"] for r in reloaded.data["relationships"]] == ["learned-1"]
+        assert not reloaded.journal_path.exists()
+
+        reloaded.put("relationships", _rel(2))
+        reloaded.commit()
+        again = FallbackStore(store.path)
+        again.load()
+        assert [r["id"] for r in again.data["relationships"]] == ["learned-1", "learned-2"]
+
+    def test_entries_already_in_snapshot_are_skipped(self, store):
+        store.append("score_history", {"concept_id": "n1", "score": 70})
+        store.commit()
+        journal = store.journal_path.read_text(encoding="utf-8")
+        store.compact()
+        # Crash between the snapshot replace and the journal unlink
+        store.journal_path.write_text(journal, encoding="utf-8")
+
+        reloaded = FallbackStore(store.path)
+        reloaded.load()
+
+        assert len(reloaded.data["score_history"]) == 1
+
+    def test_duplicate_relationship_ids_are_rekeyed(self, tmp_path):
+        path = tmp_path / "neo4j_memory.json"
+        data = {
+            "users": [],
+            "concepts": [],
+            "relationships": [_rel(1), _rel(3), {**_rel(2), "id": "learned-1"}],
+            "metadata": {"version": STORE_VERSION},
+        }
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        store = FallbackStore(path)
+        store.load()
+
+        ids = [r["id"] for r in store.data["relationships"]]
+        assert ids == ["learned-1", "learned-3", "learned-4"]
+        assert store.relationship("u1", "概念2")["id"] == "learned-4"
+        assert [r["id"] for r in json.loads(path.read_text(encoding="utf-8"))["relationships"]] == ids
+
+    def test_migrates_legacy_json(self, tmp_path):
+        path = tmp_path / "neo4j_memory.json"
+        legacy = {
+            "users": [{"id": "u1"}],
+            "concepts": [{"id": "concept-1", "name": "逆否命题"}],
+            "relationships": [_rel(1, concept="逆否命题")],
+            "metadata": {"version": "2.0"},
+        }
+        path.write_text(json.dumps(legacy, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        store = FallbackStore(path)
+        assert store.load() is False
+
+        migrated = json.loads(path.read_text(encoding="utf-8"))
+        assert migrated["metadata"]["version"] == STORE_VERSION
+        assert migrated["metadata"]["migrated_from"] == "2.0"
+        assert "\n" not in path.read_text(encoding="utf-8")
+        assert store.get("concepts", "逆否命题")["id"] == "concept-1"
+
+
+class TestIndexes:
+    def test_due_relationships_in_next_review_order(self, store):
+        store.put("relationships", _rel(1, due_in_days=-1))
+        store.put("relationships", _rel(2, due_in_days=-3))
+        store.put("relationships", _rel(3, due_in_days=2))
+        store.put("relationships", _rel(4, user="u2", due_in_days=-5))
+        store.put("relationships", _rel(5, next_review="not-a-date"))
+
+        due = store.due_relationships("u1", datetime.now())
+        assert [r["id"] for r in due] == ["learned-2", "learned-1"]
+
+        rel = store.get("relationships", "learned-3")
+        rel["next_review"] = (datetime.now() - timedelta(days=10)).isoformat()
+        store.put("relationships", rel)
+
+        due = store.due_relationships("u1", datetime.now())
+        assert [r["id"] for r in due] == ["learned-3", "learned-2", "learned-1"]
+
+    def test_pair_lookup_keeps_first_match(self, store):
+        store.put("relationships", _rel(1, concept="逆否命题"))
+        store.put("relationships", _rel(2, concept="逆否命题"))
+
+        assert store.relationship("u1", "逆否命题")["id"] == "learned-1"
+
+        store.delete("relationships", "learned-1")
+
+        assert store.relationship("u1", "逆否命题")["id"] == "learned-2"
+        assert [r["id"] for r in store.user_relationships("u1")] == ["learned-2"]
+
+    def test_score_history_by_concept_or_node_id(self, store):
+        store.append("score_history", {"concept_id": "n1", "score": 60})
+        store.append("score_history", {"node_id": "n1", "score": 70})
+        store.append("score_history", {"concept_id": "n2", "score": 80})
+
+        assert [r["score"] for r in store.score_history("n1")] == [60, 70]
+
+    def test_directly_assigned_lists_are_reindexed(self, store):
+        store.data["relationships"] = [_rel(1, concept="逆否命题")]
+        assert store.relationship("u1", "逆否命题")["id"] == "learned-1"
+
+        store.data["relationships"].append(_rel(2, concept="充分条件"))
+        assert store.relationship("u1", "充分条件")["id"] == "learned-2"
+
+
+class TestNeo4jClientFallback:
+    @pytest.fixture
+    async def client(self, tmp_path):
+        client = Neo4jClient(use_json_fallback=True, storage_path=tmp_path / "neo4j_memory.json")
+        await client.initialize()
+        _seed(client._store)
+        return client
+
+    async def test_learning_relationship_round_trip(self, client):
+        await client.create_learning_relationship("u1", "逆否命题", score=70)
+        await client.create_learning_relationship("u1", "逆否命题", score=90)
+
+        assert client._store.journal_path.exists()
+        reloaded = Neo4jClient(use_json_fallback=True, storage_path=client._storage_path)
+        await reloaded.initialize()
+
+        rels = reloaded._data["relationships"]
+        assert len(rels) == 1
+        assert rels[0]["last_score"] == 90
+        assert rels[0]["review_count"] == 2
+
+    async def test_review_suggestions_use_due_index(self, client):
+        client._data = {
+            "users": [{"id": "u1"}],
+            "concepts": [{"id": "concept-2", "name": "概念2"}],
+            "relationships": [_rel(1, due_in_days=-1), _rel(2, due_in_days=-2), _rel(3, due_in_days=1)],
+        }
+
+        suggestions = await client.get_review_suggestions("u1", limit=5)
+
+        assert [s["concept"] for s in suggestions] == ["概念2", "概念1"]
+        assert suggestions[0]["concept_id"] == "concept-2"
+
+    async def test_assigned_data_is_persisted_on_next_save(self, client):
+        client._data = {"users": [], "concepts": [], "relationships": [_rel(1)]}
+        await client.create_learning_relationship("u1", "逆否命题", score=80)
+
+        reloaded = Neo4jClient(use_json_fallback=True, storage_path=client._storage_path)
+        await reloaded.initialize()
+
+        assert {r["concept_name"] for r in reloaded._data["relationships"]} == {"概念1", "逆否命题"}
+
+    async def test_new_ids_skip_gaps(self, client):
+        client._data = {
+            "users": [{"id": "alice"}],
+            "concepts": [{"id": "concept-1", "name": "A"}, {"id": "concept-3", "name": "B"}],
+            "relationships": [
+                _rel(1, user="alice", concept="A"),
+                {**_rel(3, user="alice", concept="B"), "id": "learned-3"},
+            ],
+        }
+
+        await client.create_learning_relationship("bob", "X", score=80)
+        await client.create_learning_relationship("bob", "Y", score=80)
+
+        pairs = [(r["id"], r["user_id"], r["concept_name"]) for r in client._data["relationships"]]
+        assert pairs == [
+            ("learned-1", "alice", "A"),
+            ("learned-3", "alice", "B"),
+            ("learned-4", "bob", "X"),
+            ("learned-5", "bob", "Y"),
+        ]
+        assert {c["id"] for c in client._data["concepts"]} == {"concept-1", "concept-3", "concept-4", "concept-5"}
+
+        reloaded = Neo4jClient(use_json_fallback=True, storage_path=client._storage_path)
+        await reloaded.initialize()
+        assert len(reloaded._data["relationships"]) == 4
+
+    async def test_cleanup_compacts_journal(self, client):
+        await client.create_learning_relationship("u1", "逆否命题", score=80)
+
+        await client.cleanup()
+
+        assert not client._store.journal_path.exists()
+        snapshot = json.loads(client._storage_path.read_text(encoding="utf-8"))
+        assert len(snapshot["relationships"]) == 1
@@ -0,0 +1,168 @@
+"""
+Tests for the pooled, coalescing Ollama embedding client.
+
+A local aiohttp test server stands in for Ollama's /api/embed endpoint.
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.clients.ollama_embed_client import (
+    OllamaEmbedClient,
+    close_ollama_embed_clients,
+    get_ollama_embed_client,
+)
+
+DIM = 4
+
+
+@pytest.fixture
+async def ollama_server():
+    requests = []
+
+    async def _embed(request):
+        body = await request.json()
+        inputs = body["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        requests.append(list(inputs))
+        return web.json_response(
+            {"embeddings": [[float(len(t))] * DIM for t in inputs]}
+        )
+
+    app = web.Application()
+    app.router.add_post("/api/embed", _embed)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", requests
+    await runner.cleanup()
+
+
+class TestOllamaEmbedClient:
+    async def test_concurrent_embeds_coalesce_into_one_request(self, ollama_server):
+        url, requests = ollama_server
+        client = OllamaEmbedClient(base_url=url, coalesce_window_ms=20)
+
+        texts = ["a", "bb", "ccc", "bb"]
+        vectors = await asyncio.gather(*(client.embed(t) for t in texts))
+        await client.close()
+
+        assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 2.0]
+        assert len(requests) == 1
+        assert sorted(requests[0]) == ["a", "bb", "ccc"]
+        assert client.stats()["coalesced_requests"] == 4
+
+    async def test_max_batch_flushes_immediately(self, ollama_server):
+        url, requests = ollama_server
+        client = OllamaEmbedClient(base_url=url, coalesce_window_ms=1000, max_batch=2)
+
+        vectors = await asyncio.wait_for(
+            asyncio.gather(client.embed("x"), client.embed("yy")), timeout=0.5
+        )
+        await client.close()
+
+        assert [v[0] for v in vectors] == [1.0, 2.0]
+        assert requests == [["x", "yy"]]
+
+    async def test_coalesced_request_uses_caller_timeout(self, ollama_server):
+        url, _ = ollama_server
+        client = OllamaEmbedClient(base_url=url, coalesce_window_ms=5)
+        timeouts = []
+        post = client._post
+
+        async def _recording_post(texts, timeout_s):
+            timeouts.append(timeout_s)
+            return await post(texts, timeout_s)
+
+        client._post = _recording_post
+        await asyncio.gather(client.embed("a", timeout_s=5), client.embed("b", timeout_s=90))
+        await client.close()
+
+        assert timeouts == [90]
+
+    async def test_session_is_reused(self, ollama_server):
+        url, _ = ollama_server
+        client = OllamaEmbedClient(base_url=url, coalesce_window_ms=0)
+
+        await client.embed_batch(["a"])
+        session = client._session
+        await client.embed_batch(["b"])
+
+        assert client._session is session
+        await client.close()
+        assert client.stats()["session_open"] is False
+
+    async def test_unavailable_server_returns_none(self):
+        client = OllamaEmbedClient(base_url="http://127.0.0.1:1", coalesce_window_ms=5)
+
+        results = await asyncio.gather(client.embed("a"), client.embed("b"))
+        assert results == [None, None]
+        assert await client.embed_batch(["a"]) is None
+        await client.close()
+        assert client.stats()["errors"] >= 2
+
+    async def test_inflight_flush_task_is_referenced(self, ollama_server):
+        url, _ = ollama_server
+        client = OllamaEmbedClient(base_url=url, coalesce_window_ms=0.1)
+
+        pending = asyncio.ensure_future(client.embed("a"))
+        while not client._tasks:
+            await asyncio.sleep(0.001)
+        assert (await pending)[0] == 1.0
+        await asyncio.sleep(0)
+        assert client._tasks == set()
+        await client.close()
+
+    def test_new_loop_closes_old_session_and_fails_orphans(self):
+        client = OllamaEmbedClient(base_url="http://127.0.0.1:1", coalesce_window_ms=60_000)
+        first, second = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+
+            async def _start():
+                await client.embed_batch(["a"])
+                task = asyncio.ensure_future(client.embed("b"))
+                await asyncio.sleep(0)
+                return task
+
+            orphan = first.run_until_complete(_start())
+            old_session = client._session
+
+            second.run_until_complete(client.embed_batch(["c"]))
+            second.run_until_complete(client.close())
+
+            assert old_session.closed
+            first.run_until_complete(asyncio.wait([orphan]))
+            assert isinstance(orphan.exception(), RuntimeError)
+        finally:
+            first.close()
+            second.close()
+
+
+class TestLanceDBClientSharedPool:
+    async def test_clients_share_pool(self, ollama_server, tmp_path, monkeypatch):
+        url, requests = ollama_server
+        monkeypatch.setenv("OLLAMA_BASE_URL", url)
+        await close_ollama_embed_clients()
+
+        a = LanceDBClient(db_path=str(tmp_path / "a"), enable_embedding_cache=False)
+        b = LanceDBClient(db_path=str(tmp_path / "b"), enable_embedding_cache=False)
+        assert a._get_ollama_client() is b._get_ollama_client()
+
+        vectors = await asyncio.gather(a.embed("q1"), b.embed("q22"))
+        assert [v[0] for v in vectors] == [2.0, 3.0]
+        assert len(requests) == 1
+
+        # Closing one client leaves the shared pool to the others
+        pooled = get_ollama_embed_client()
+        await a.close()
+        assert pooled.stats()["session_open"] is True
+        assert (await b.embed("q333"))[0] == 4.0
+
+        await close_ollama_embed_clients()
+        assert pooled.stats()["session_open"] is False
@@ -0,0 +1,179 @@
+"""
+Tests for the progressive_scope_search execution modes.
+
+cascade runs the stages one after another; concurrent runs every stage at
+once and must return exactly what cascade returns; wide runs a single search
+and assigns scope_level from each row's course / category. In every mode the
+query is embedded once.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.config import DEFAULT_CONFIG
+from agentic_rag.clients.query_embeddings import query_embedding_scope
+from tests.unit.conftest import fake_vector
+
+
+def _note(doc_id, course, tags_str, category=""):
+    return {
+        "doc_id": doc_id,
+        "content": f"{course} 笔记 {doc_id}",
+        "vector": fake_vector(doc_id),
+        "canvas_file": f"{doc_id}.md",
+        "course": course,
+        "tags_str": tags_str,
+        "category": category,
+    }
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = make_lancedb_client(enable_embedding_cache=False, enable_result_cache=False)
+    await c.initialize()
+    await c.add_documents(
+        "vault_notes",
+        [
+            _note("dm1", "离散数学", "逻辑,集合", "数学"),
+            _note("dm2", "离散数学", "逻辑,集合", "数学"),
+            _note("ml1", "数理逻辑", "逻辑,集合,证明", "数学"),
+            _note("ml2", "数理逻辑", "逻辑,集合,证明", "数学"),
+            _note("la1", "线性代数", "矩阵", "数学"),
+            _note("os1", "操作系统", "进程", "计算机"),
+            _note("os2", "操作系统", "进程", "计算机"),
+        ],
+    )
+    c.embedded.clear()
+    yield c
+    await c.close()
+
+
+async def _scope_search(client, mode, **kwargs):
+    params = dict(
+        query="逻辑 集合",
+        course_id="离散数学",
+        num_results=10,
+        min_results_threshold=5,
+        query_type="vector",
+        tag_jaccard_bridge_enabled=True,
+        category="数学",
+    )
+    params.update(kwargs)
+    results = await client.progressive_scope_search(scope_mode=mode, **params)
+    return [(r["doc_id"], r["metadata"]["scope_level"]) for r in results]
+
+
+class TestScopeModes:
+    @pytest.mark.parametrize("threshold", [1, 3, 5, 100])
+    async def test_concurrent_matches_cascade(self, client, threshold):
+        cascade = await _scope_search(client, "cascade", min_results_threshold=threshold)
+        concurrent = await _scope_search(client, "concurrent", min_results_threshold=threshold)
+
+        assert concurrent == cascade
+
+    async def test_levels(self, client):
+        levels = dict(await _scope_search(client, "concurrent", min_results_threshold=100))
+
+        assert levels["lancedb_dm1"] == levels["lancedb_dm2"] == 1
+        assert levels["lancedb_ml1"] == levels["lancedb_ml2"] == 2
+        assert levels["lancedb_la1"] == 3
+        assert levels["lancedb_os1"] == levels["lancedb_os2"] == 4
+
+    async def test_wide_assigns_levels_from_metadata(self, client, monkeypatch):
+        calls = []
+        original = client.search
+
+        async def _spy(**kwargs):
+            calls.append(kwargs)
+            return await original(**kwargs)
+
+        monkeypatch.setattr(client, "search", _spy)
+
+        wide = await _scope_search(client, "wide", min_results_threshold=100)
+
+        assert len(calls) == 1
+        assert calls[0]["num_results"] == 10 * LanceDBClient.SCOPE_WIDE_OVERSAMPLE
+        assert "course_id" not in calls[0]
+        assert [level for _, level in wide] == [1, 1, 2, 2, 3, 4, 4]
+
+    async def test_wide_threshold_stops_at_stage(self, client):
+        wide = await _scope_search(client, "wide", min_results_threshold=2)
+
+        assert sorted(wide) == [("lancedb_dm1", 1), ("lancedb_dm2", 1)]
+
+    @pytest.mark.parametrize("mode", LanceDBClient.SCOPE_SEARCH_MODES)
+    async def test_query_embedded_once(self, client, mode):
+        await _scope_search(client, mode, min_results_threshold=100)
+
+        assert client.embedded == ["逻辑 集合"]
+
+    async def test_request_scope_reused(self, client):
+        with query_embedding_scope({"逻辑 集合": fake_vector("逻辑 集合")}) as scope:
+            await _scope_search(client, "concurrent", min_results_threshold=100)
+
+        assert client.embedded == []
+        assert scope.calls == {}
+
+    async def test_unknown_mode(self, client):
+        with pytest.raises(ValueError):
+            await _scope_search(client, "parallel")
+
+    def test_default_mode_is_cascade(self):
+        assert DEFAULT_CONFIG["progressive_scope_mode"] == "cascade"
+
+    @pytest.mark.parametrize("query_type", ["hybrid", "vector"])
+    async def test_category_search_runs_in_executor(self, client, monkeypatch, query_type):
+        threads = []
+        original = client._apply_where_clauses
+
+        def _spy(query, clauses):
+            threads.append(threading.get_ident())
+            return original(query, clauses)
+
+        monkeypatch.setattr(client, "_apply_where_clauses", _spy)
+
+        results = await client._search_by_category(
+            query="逻辑 集合", category="数学", query_type=query_type
+        )
+
+        assert {r["doc_id"] for r in results} <= {
+            "lancedb_dm1", "lancedb_dm2", "lancedb_ml1", "lancedb_ml2", "lancedb_la1"
+        }
+        assert results
+        assert threads and threading.get_ident() not in threads
+
+
+class TestConcurrentStages:
+    async def test_stages_overlap(self, client, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def _slow_search(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+
+        async def _slow_category(**kwargs):
+            return await _slow_search(**kwargs)
+
+        monkeypatch.setattr(client, "search", _slow_search)
+        monkeypatch.setattr(client, "_search_by_category", _slow_category)
+
+        assert await _scope_search(client, "concurrent") == []
+        # stage 1, one related course, category, full library
+        assert peak == 4
+
+    async def test_stage_error_propagates(self, client, monkeypatch):
+        async def _failing(**kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(client, "search", _failing)
+
+        with pytest.raises(RuntimeError):
+            await _scope_search(client, "concurrent")
@@ -0,0 +1,199 @@
+"""
+Tests for the per-request shared query embedding context.
+
+prepare_query_embeddings embeds every distinct query (original query and
+multi_query variants) in one batch before fan-out; retrieval nodes read the
+vectors through query_embedding_scope instead of embedding again, and any
+embedding they still do is reported in state["embedding_calls"].
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+# nodes.py is loaded under the _nodes_impl alias (see nodes/__init__.py);
+# patch _get_lancedb_client where prepare_query_embeddings_node looks it up.
+from agentic_rag import _nodes_impl as nodes
+from agentic_rag.clients.query_embeddings import (
+    current_query_embedding_scope,
+    query_embedding_scope,
+)
+from agentic_rag.retrievers import vault_notes_retriever
+from agentic_rag.retrievers.vault_notes_retriever import (
+    VaultNotesService,
+    vault_notes_retrieval_node,
+)
+from agentic_rag.state import add_counts, create_initial_state
+from tests.unit.conftest import EMBED_DIM, fake_vector
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = make_lancedb_client(enable_embedding_cache=False, enable_result_cache=False)
+    await c.initialize()
+    await c.add_documents(
+        "vault_notes",
+        [
+            {
+                "doc_id": f"n{i}",
+                "content": f"逆否命题 笔记 {i}",
+                "vector": fake_vector(f"n{i}"),
+                "canvas_file": f"n{i}.md",
+            }
+            for i in range(3)
+        ],
+    )
+    c.embedded.clear()
+    yield c
+    await c.close()
+
+
+class TestQueryEmbeddingScope:
+    async def test_prepared_vector_skips_embedding(self, client):
+        with query_embedding_scope({"逆否命题": fake_vector("逆否命题")}) as scope:
+            results = await client.search(
+                "逆否命题", table_name="vault_notes", query_type="vector"
+            )
+
+        assert results
+        assert client.embedded == []
+        assert scope.hits == 1
+        assert scope.calls == {}
+
+    async def test_miss_is_embedded_once_and_recorded(self, client):
+        with query_embedding_scope() as scope:
+            for _ in range(3):
+                await client.search(
+                    "逆否命题", table_name="vault_notes", query_type="vector"
+                )
+
+        assert client.embedded == ["逆否命题"]
+        assert scope.calls == {"逆否命题": 1}
+
+    async def test_scope_is_reset_after_block(self, client):
+        with query_embedding_scope({"q": [0.0] * EMBED_DIM}):
+            assert current_query_embedding_scope() is not None
+        assert current_query_embedding_scope() is None
+
+        await client.search("逆否命题", table_name="vault_notes", query_type="vector")
+        assert client.embedded == ["逆否命题"]
+
+
+class TestEmbedQueries:
+    async def test_single_deduplicated_batch(self, client):
+        vectors = await client.embed_queries(["a", "b", "a", "", "c"])
+
+        assert client.batches == [["a", "b", "c"]]
+        assert client.embedded == []
+        assert vectors == {t: fake_vector(t) for t in "abc"}
+
+    async def test_falls_back_to_single_embedding(self, client, monkeypatch):
+        async def _no_batch(texts):
+            return None
+
+        monkeypatch.setattr(client, "_ollama_embed_batch", _no_batch)
+        vectors = await client.embed_queries(["a", "b", "a"])
+
+        assert client.embedded == ["a", "b"]
+        assert set(vectors) == {"a", "b"}
+
+
+class _FakeEmbedClient:
+    def __init__(self):
+        self.batches = []
+
+    async def embed_queries(self, texts):
+        self.batches.append(list(texts))
+        return {t: fake_vector(t) for t in texts}
+
+
+class TestPrepareQueryEmbeddingsNode:
+    @pytest.fixture
+    def fake_client(self, monkeypatch):
+        fake = _FakeEmbedClient()
+
+        async def _get():
+            return fake
+
+        monkeypatch.setattr(nodes, "_get_lancedb_client", _get)
+        return fake
+
+    async def test_embeds_query_and_variants_once(self, fake_client):
+        state = create_initial_state(
+            messages=[{"role": "user", "content": "逆否命题"}],
+            multi_queries=["逆否命题", "逆否命题的定义", "逆否命题 例子"],
+        )
+
+        update = await nodes.prepare_query_embeddings_node(state, None)
+
+        assert fake_client.batches == [["逆否命题", "逆否命题的定义", "逆否命题 例子"]]
+        assert set(update["query_embeddings"]) == set(state["multi_queries"])
+        assert update["embedding_calls"] == {q: 1 for q in state["multi_queries"]}
+
+    async def test_rewrite_loop_only_embeds_new_query(self, fake_client):
+        state = create_initial_state(
+            messages=[{"role": "user", "content": "改写后的查询"}],
+            query_embeddings={"逆否命题": fake_vector("逆否命题")},
+            multi_queries=["逆否命题"],
+        )
+
+        update = await nodes.prepare_query_embeddings_node(state, None)
+
+        assert fake_client.batches == [["改写后的查询"]]
+        assert set(update["query_embeddings"]) == {"逆否命题", "改写后的查询"}
+        assert update["embedding_calls"] == {"改写后的查询": 1}
+
+    async def test_embedding_failure_is_non_fatal(self, monkeypatch):
+        async def _broken():
+            raise RuntimeError("lancedb unavailable")
+
+        monkeypatch.setattr(nodes, "_get_lancedb_client", _broken)
+        state = create_initial_state(messages=[{"role": "user", "content": "q"}])
+
+        update = await nodes.prepare_query_embeddings_node(state, None)
+
+        assert update == {"query_embeddings": {}}
+
+
+class TestRetrievalNodes:
+    async def test_vault_notes_node_reuses_prepared_vector(self, client, monkeypatch):
+        monkeypatch.setattr(
+            vault_notes_retriever, "_vault_notes_service", VaultNotesService(client)
+        )
+        state = create_initial_state(
+            messages=[{"role": "user", "content": "逆否命题"}],
+            query_embeddings={"逆否命题": fake_vector("逆否命题")},
+        )
+
+        update = await vault_notes_retrieval_node(state, SimpleNamespace(context=None))
+
+        assert update["vault_notes_results"]
+        assert client.embedded == []
+        assert "embedding_calls" not in update
+
+    async def test_vault_notes_node_reports_misses(self, client, monkeypatch):
+        monkeypatch.setattr(
+            vault_notes_retriever, "_vault_notes_service", VaultNotesService(client)
+        )
+        state = create_initial_state(messages=[{"role": "user", "content": "逆否命题"}])
+
+        update = await vault_notes_retrieval_node(state, SimpleNamespace(context=None))
+
+        assert update["embedding_calls"] == {"逆否命题": 1}
+
+
+class TestStateAndGraph:
+    def test_add_counts_sums_parallel_updates(self):
+        merged = add_counts({"a": 1}, {"a": 2, "b": 1})
+        assert merged == {"a": 3, "b": 1}
+        assert add_counts(None, None) == {}
+
+    def test_prepare_node_runs_before_fan_out(self):
+        from agentic_rag.state_graph import build_canvas_agentic_rag_graph
+
+        builder = build_canvas_agentic_rag_graph()
+
+        assert "prepare_query_embeddings" in builder.nodes
+        assert ("multi_query_rewrite", "prepare_query_embeddings") in builder.edges
+        assert ("rewrite_query", "prepare_query_embeddings") in builder.edges
+        assert "fan_out_retrieval" in builder.branches["prepare_query_embeddings"]
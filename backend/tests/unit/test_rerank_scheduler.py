@@ -0,0 +1,227 @@
+"""
+Tests for RerankScheduler, the cross-request micro-batching front of the
+LocalReranker singleton.
+
+Concurrent score() calls inside the collection window share one predict
+call; batches never exceed max_batch_pairs (a single request is never
+split), at most max_concurrent_batches run at once, and each caller gets
+back exactly its own scores.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agentic_rag import reranking
+from agentic_rag.rerank_scheduler import RerankScheduler
+
+
+class _FakePredict:
+    """Scores a pair as len(doc); records every batch it receives."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, pairs):
+        with self._lock:
+            self.batches.append(list(pairs))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            return [float(len(doc)) for _, doc in pairs]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestBatching:
+    async def test_concurrent_callers_share_one_predict(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict, max_batch_pairs=64, max_wait_ms=20)
+
+        results = await asyncio.gather(
+            scheduler.score("q1", ["a", "bb"]),
+            scheduler.score("q2", ["ccc"]),
+            scheduler.score("q3", ["dddd", "e", "ff"]),
+        )
+
+        assert results == [[1.0, 2.0], [3.0], [4.0, 1.0, 2.0]]
+        assert len(predict.batches) == 1
+        assert predict.batches[0][0] == ("q1", "a")
+        assert len(predict.batches[0]) == 6
+
+    async def test_batch_size_cap_does_not_split_requests(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict, max_batch_pairs=4, max_wait_ms=20)
+
+        results = await asyncio.gather(
+            scheduler.score("q1", ["a"] * 3),
+            scheduler.score("q2", ["b"] * 3),
+            scheduler.score("q3", ["c"] * 6),
+        )
+
+        assert [len(r) for r in results] == [3, 3, 6]
+        # FIFO: [q1] [q2] [q3 alone, larger than the cap but never split]
+        assert [len(b) for b in predict.batches] == [3, 3, 6]
+
+    async def test_full_batch_skips_the_window(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict, max_batch_pairs=2, max_wait_ms=5000)
+
+        t0 = time.perf_counter()
+        await scheduler.score("q", ["a", "b"])
+
+        assert time.perf_counter() - t0 < 1.0
+
+    async def test_concurrency_cap(self):
+        predict = _FakePredict(delay=0.05)
+        scheduler = RerankScheduler(
+            predict, max_batch_pairs=1, max_wait_ms=0, max_concurrent_batches=2
+        )
+
+        await asyncio.gather(*(scheduler.score(f"q{i}", ["x"]) for i in range(6)))
+
+        assert len(predict.batches) == 6
+        assert predict.max_active == 2
+
+    async def test_requests_queued_behind_running_batch_are_merged(self):
+        predict = _FakePredict(delay=0.05)
+        scheduler = RerankScheduler(predict, max_batch_pairs=64, max_wait_ms=0)
+
+        first = asyncio.create_task(scheduler.score("q0", ["x"]))
+        await asyncio.sleep(0.01)  # q0 is now running alone
+        rest = await asyncio.gather(*(scheduler.score(f"q{i}", ["yy"]) for i in range(1, 5)))
+
+        assert await first == [1.0]
+        assert rest == [[2.0]] * 4
+        assert [len(b) for b in predict.batches] == [1, 4]
+
+    async def test_running_batches_are_referenced(self):
+        scheduler = RerankScheduler(_FakePredict(delay=0.05), max_wait_ms=0)
+
+        pending = asyncio.ensure_future(scheduler.score("q", ["a"]))
+        while not scheduler._tasks:
+            await asyncio.sleep(0.001)
+        assert await pending == [1.0]
+        await asyncio.sleep(0)
+        assert scheduler._tasks == set()
+
+    async def test_empty_documents(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict)
+
+        assert await scheduler.score("q", []) == []
+        assert predict.batches == []
+
+
+class TestErrors:
+    async def test_predict_error_reaches_every_caller_in_batch(self):
+        def _boom(pairs):
+            raise RuntimeError("model crashed")
+
+        scheduler = RerankScheduler(_boom, max_wait_ms=10)
+
+        results = await asyncio.gather(
+            scheduler.score("q1", ["a"]),
+            scheduler.score("q2", ["b"]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert scheduler.stats()["errors"] == 1
+
+    async def test_cancelled_caller_is_dropped(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict, max_wait_ms=30)
+
+        cancelled = asyncio.create_task(scheduler.score("gone", ["a"]))
+        kept = asyncio.create_task(scheduler.score("kept", ["bb"]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await kept == [2.0]
+        assert predict.batches == [[("kept", "bb")]]
+
+    def test_works_across_event_loops(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict, max_wait_ms=1)
+
+        assert asyncio.run(scheduler.score("q", ["a"])) == [1.0]
+        assert asyncio.run(scheduler.score("q", ["bb"])) == [2.0]
+
+
+class TestStats:
+    async def test_metrics(self):
+        predict = _FakePredict()
+        scheduler = RerankScheduler(predict, max_batch_pairs=64, max_wait_ms=10)
+
+        await asyncio.gather(
+            scheduler.score("q1", ["a", "b"]),
+            scheduler.score("q2", ["c", "d"]),
+        )
+        stats = scheduler.stats()
+
+        assert stats["queue_depth"] == 0
+        assert stats["running_batches"] == 0
+        assert stats["batches"] == 1
+        assert stats["requests"] == 2
+        assert stats["avg_batch_pairs"] == 4
+        assert stats["avg_batch_requests"] == 2
+        assert stats["max_batch_pairs_seen"] == 4
+        assert stats["wait_ms"]["avg"] >= 0
+        assert set(stats["predict_ms"]) == {"avg", "p95"}
+
+    def test_stats_before_first_batch(self):
+        stats = RerankScheduler(_FakePredict()).stats()
+
+        assert stats["batches"] == 0
+        assert "wait_ms" not in stats
+
+
+class _StubModel:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, batch_size, show_progress_bar):
+        self.calls.append(list(pairs))
+        return [float(len(doc)) for _, doc in pairs]
+
+
+@pytest.fixture
+def local_reranker():
+    """LocalReranker without loading weights: only what rerank() touches."""
+    reranker = reranking.LocalReranker.__new__(reranking.LocalReranker)
+    reranker.model = _StubModel()
+    reranker.batch_size = 32
+    reranker.scheduler = RerankScheduler(reranker._predict_pairs, max_wait_ms=10)
+    reranker.score_cache = None
+    return reranker
+
+
+class TestLocalRerankerWiring:
+    async def test_concurrent_reranks_use_one_predict(self, local_reranker):
+        first, second = await asyncio.gather(
+            local_reranker.rerank("q1", ["a", "ccc", "bb"], top_k=2),
+            local_reranker.rerank("q2", ["dddd"], top_k=5),
+        )
+
+        assert [d["index"] for d in first] == [1, 2]
+        assert second == [{"index": 0, "score": 4.0, "document": "dddd"}]
+        assert len(local_reranker.model.calls) == 1
+
+    async def test_singleton_stats(self, monkeypatch, local_reranker):
+        monkeypatch.setattr(reranking, "_reranker_instance", None)
+        assert reranking.get_rerank_scheduler_stats() is None
+
+        monkeypatch.setattr(reranking, "_reranker_instance", local_reranker)
+        await local_reranker.rerank("q", ["a"])
+
+        assert reranking.get_rerank_scheduler_stats()["requests"] == 1
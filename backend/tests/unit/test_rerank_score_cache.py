@@ -0,0 +1,134 @@
+"""
+Tests for RerankScoreCache and its use by LocalReranker / _rerank_local.
+
+Scores are keyed on (model, normalized query, content hash): a CRAG loop
+iteration that re-retrieves the same chunks only sends new candidates to
+the cross-encoder, and a chunk whose content changed is rescored.
+"""
+
+import pytest
+
+from agentic_rag import reranking
+from agentic_rag import _nodes_impl as nodes
+from agentic_rag.rerank_cache import RerankScoreCache, normalize_query
+from agentic_rag.rerank_scheduler import RerankScheduler
+
+
+class TestScoreCache:
+    def test_normalize_query(self):
+        assert normalize_query("  What  is\tＡ*  ") == "what is a*"
+
+    def test_miss_then_hit(self):
+        cache = RerankScoreCache()
+        scores, keys = cache.lookup("m", "q", ["a", "b"])
+        assert scores == [None, None]
+
+        cache.put_many(keys, [0.5, 0.7])
+        scores, _ = cache.lookup("m", " Q ", ["b", "a"])
+
+        assert scores == [0.7, 0.5]
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 2
+
+    def test_model_is_part_of_key(self):
+        cache = RerankScoreCache()
+        _, keys = cache.lookup("m1", "q", ["a"])
+        cache.put_many(keys, [0.5])
+
+        assert cache.lookup("m2", "q", ["a"])[0] == [None]
+
+    def test_changed_content_drops_old_entries(self):
+        cache = RerankScoreCache()
+        _, keys = cache.lookup("m", "q", ["old text"], doc_ids=["d1"])
+        cache.put_many(keys, [0.9])
+
+        scores, _ = cache.lookup("m", "q", ["new text"], doc_ids=["d1"])
+
+        assert scores == [None]
+        assert cache.stats()["invalidations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_doc(self):
+        cache = RerankScoreCache()
+        for query in ("q1", "q2"):
+            _, keys = cache.lookup("m", query, ["text"], doc_ids=["d1"])
+            cache.put_many(keys, [0.1])
+
+        assert cache.invalidate_doc("d1") == 2
+        assert cache.invalidate_doc("unknown") == 0
+
+    def test_bounded(self):
+        cache = RerankScoreCache(maxsize=3)
+        _, keys = cache.lookup("m", "q", [str(i) for i in range(10)])
+        cache.put_many(keys, [float(i) for i in range(10)])
+
+        assert cache.stats()["entries"] == 3
+
+
+class _StubModel:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, batch_size, show_progress_bar):
+        self.calls.append([doc for _, doc in pairs])
+        return [float(len(doc)) for _, doc in pairs]
+
+
+@pytest.fixture
+def local_reranker():
+    """LocalReranker without loading weights: only what rerank() touches."""
+    reranker = reranking.LocalReranker.__new__(reranking.LocalReranker)
+    reranker.model = _StubModel()
+    reranker.batch_size = 32
+    reranker.scheduler = RerankScheduler(reranker._predict_pairs, max_wait_ms=0)
+    reranker.score_cache = RerankScoreCache()
+    reranker.cache_model_key = "stub:torch/float32"
+    return reranker
+
+
+def _results(*pairs):
+    return [{"doc_id": d, "content": c, "score": 0.1, "metadata": {}} for d, c in pairs]
+
+
+class TestLocalRerankerCache:
+    async def test_only_new_candidates_reach_model(self, local_reranker):
+        await local_reranker.rerank_search_results("q", _results(("d1", "aa"), ("d2", "bbb")))
+        reranked = await local_reranker.rerank_search_results(
+            "q", _results(("d2", "bbb"), ("d1", "aa"), ("d3", "c"))
+        )
+
+        assert local_reranker.model.calls == [["aa", "bbb"], ["c"]]
+        assert [r["doc_id"] for r in reranked] == ["d2", "d1", "d3"]
+        assert reranked[0]["rerank_score"] == 3.0
+
+    async def test_edited_chunk_is_rescored(self, local_reranker):
+        await local_reranker.rerank_search_results("q", _results(("d1", "aa")))
+        reranked = await local_reranker.rerank_search_results("q", _results(("d1", "aaaa")))
+
+        assert local_reranker.model.calls == [["aa"], ["aaaa"]]
+        assert reranked[0]["score"] == 4.0
+
+
+class TestRerankLocalQuery:
+    async def test_scores_against_original_query(self, monkeypatch, local_reranker):
+        monkeypatch.setattr(nodes, "CROSS_ENCODER_AVAILABLE", True)
+        monkeypatch.setattr(nodes, "get_reranker", lambda **kwargs: local_reranker)
+        seen = []
+        original = local_reranker.rerank_search_results
+
+        async def _spy(query, search_results, top_k=10):
+            seen.append(query)
+            return await original(query, search_results, top_k)
+
+        monkeypatch.setattr(local_reranker, "rerank_search_results", _spy)
+
+        first = {"messages": [{"role": "user", "content": "什么是逆否命题"}]}
+        await nodes._rerank_local(_results(("d1", "aa")), first)
+        rewritten = {
+            "messages": [{"role": "user", "content": "逆否命题 定义 等价"}],
+            "original_query": "什么是逆否命题",
+        }
+        await nodes._rerank_local(_results(("d1", "aa"), ("d2", "b")), rewritten)
+
+        assert seen == ["什么是逆否命题", "什么是逆否命题"]
+        assert local_reranker.model.calls == [["aa"], ["b"]]
@@ -0,0 +1,119 @@
+"""
+Tests for the pluggable LocalReranker inference backend.
+
+resolve_reranker_backend keeps "auto" on torch (onnx / int8 are opt-in) and
+never runs fp16 on CPU; torch thread counts only apply during predict;
+get_reranker reinitializes the singleton when backend or thread settings
+change.
+"""
+
+import pytest
+
+from agentic_rag import reranking
+from agentic_rag.config import DEFAULT_CONFIG, validate_config
+from agentic_rag.reranking import resolve_reranker_backend
+
+
+class TestResolveBackend:
+    @pytest.mark.parametrize("onnx_available", [True, False])
+    def test_auto_on_cpu_stays_on_torch(self, monkeypatch, onnx_available):
+        monkeypatch.setattr(reranking, "ONNX_RUNTIME_AVAILABLE", onnx_available)
+        assert resolve_reranker_backend("auto", "cpu", "float16") == ("torch", "float32")
+        assert resolve_reranker_backend("auto", "cpu", "float32") == ("torch", "float32")
+
+    def test_auto_on_gpu_keeps_requested_dtype(self):
+        assert resolve_reranker_backend("auto", "cuda:0", "float16") == ("torch", "float16")
+
+    def test_torch_on_cpu_never_fp16(self):
+        assert resolve_reranker_backend("torch", "cpu", "float16") == ("torch", "float32")
+        assert resolve_reranker_backend("torch", "cpu", "bfloat16") == ("torch", "bfloat16")
+
+    def test_int8_falls_back_to_torch_on_gpu(self):
+        assert resolve_reranker_backend("int8", "cuda", "float16") == ("torch", "float16")
+
+    def test_explicit_backends_case_insensitive(self):
+        assert resolve_reranker_backend("ONNX", "cpu", "float16") == ("onnx", "float32")
+        assert resolve_reranker_backend("int8", "cpu", "float32") == ("int8", "int8")
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            resolve_reranker_backend("tensorrt", "cpu", "float32")
+
+
+class TestTorchThreads:
+    def test_threads_apply_only_during_predict(self):
+        torch = pytest.importorskip("torch")
+        before = torch.get_num_threads()
+        wanted = 1 if before != 1 else 2
+        seen = []
+
+        class _Model:
+            def predict(self, pairs, batch_size, show_progress_bar):
+                seen.append(torch.get_num_threads())
+                return [0.0] * len(pairs)
+
+        reranker = object.__new__(reranking.LocalReranker)
+        reranker._torch_threads, reranker.batch_size = wanted, 8
+        reranker.model = _Model()
+
+        assert reranker._predict_pairs([("q", "d")]) == [0.0]
+        assert seen == [wanted]
+        assert torch.get_num_threads() == before
+
+
+class _FakeReranker:
+    created = []
+
+    def __init__(self, model_name, torch_dtype, batch_size, backend, num_threads):
+        self.model_name = model_name
+        self.requested_dtype = torch_dtype
+        self.requested_backend = backend
+        self.num_threads = num_threads or None
+        _FakeReranker.created.append(self)
+
+
+class TestGetRerankerSingleton:
+    @pytest.fixture(autouse=True)
+    def fake_reranker(self, monkeypatch):
+        _FakeReranker.created = []
+        monkeypatch.setattr(reranking, "LocalReranker", _FakeReranker)
+        monkeypatch.setattr(reranking, "CROSS_ENCODER_AVAILABLE", True)
+        monkeypatch.setattr(reranking, "_reranker_instance", None)
+        monkeypatch.setattr(reranking, "_reranker_init_flag", False)
+
+    def test_same_config_reuses_instance(self):
+        first = reranking.get_reranker(backend="int8", num_threads=4)
+        second = reranking.get_reranker(backend="int8", num_threads=4)
+
+        assert first is second
+        assert len(_FakeReranker.created) == 1
+
+    @pytest.mark.parametrize(
+        "change", [{"backend": "onnx"}, {"num_threads": 2}, {"torch_dtype": "float32"}]
+    )
+    def test_changed_config_reinitializes(self, change):
+        reranking.get_reranker(backend="int8", num_threads=4)
+        kwargs = {"backend": "int8", "num_threads": 4, **change}
+        reranker = reranking.get_reranker(**kwargs)
+
+        assert len(_FakeReranker.created) == 2
+        assert reranker.requested_backend == kwargs["backend"]
+
+    def test_zero_threads_means_default(self):
+        reranking.get_reranker(num_threads=0)
+        reranking.get_reranker(num_threads=None)
+
+        assert len(_FakeReranker.created) == 1
+
+
+class TestConfig:
+    def test_defaults(self):
+        assert DEFAULT_CONFIG["reranker_backend"] == "auto"
+        assert DEFAULT_CONFIG["reranker_num_threads"] == 0
+
+    def test_invalid_values_replaced(self):
+        validated = validate_config(
+            {"reranker_backend": "tensorrt", "reranker_num_threads": -1}
+        )
+        assert validated["reranker_backend"] == "auto"
+        assert validated["reranker_num_threads"] == 0
@@ -0,0 +1,191 @@
+"""
+Tests for the tags list column and scalar filter indexes in LanceDBClient.
+
+Tag filters match exact tags through array_has_any on a LABEL_LIST-indexed
+list column (no more substring hits from LIKE on tags_str); subject,
+course, category and canvas_file carry BITMAP/BTREE indexes. Tables written
+before the tags column existed are migrated on initialize().
+"""
+
+import random
+
+import lancedb
+import pyarrow as pa
+
+from agentic_rag.clients.lancedb_client import LanceDBClient, _split_tags
+
+DIM = 8
+
+
+def _vec(seed: str) -> list:
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(DIM)]
+
+
+def _note(doc_id: str, tags_str: str, course: str = "cs101") -> dict:
+    return {
+        "doc_id": doc_id,
+        "content": f"{doc_id} 笔记内容",
+        "vector": _vec(doc_id),
+        "canvas_file": f"{doc_id}.md",
+        "subject": "cs",
+        "course": course,
+        "tags_str": tags_str,
+        "category": "lecture",
+    }
+
+
+async def _make_client(db_path, monkeypatch) -> LanceDBClient:
+    c = LanceDBClient(
+        db_path=str(db_path),
+        embedding_dim=DIM,
+        vault_id="default",
+        enable_embedding_cache=False,
+        enable_result_cache=False,
+    )
+
+    async def _fake_single(text):
+        return _vec(text)
+
+    monkeypatch.setattr(c, "_ollama_embed", _fake_single)
+    await c.initialize()
+    return c
+
+
+def _index_types(client: LanceDBClient, table: str = "vault_notes") -> dict:
+    tbl = client._db.open_table(table)
+    return {index.columns[0]: index.index_type for index in tbl.list_indices()}
+
+
+class TestTagsColumn:
+    def test_split_tags(self):
+        assert _split_tags("ml, ai,,deep learning ") == ["ml", "ai", "deep learning"]
+        assert _split_tags("") == []
+        assert _split_tags(None) == []
+
+    def test_filter_clause_uses_list_column(self):
+        client = LanceDBClient(vault_id="default")
+        clauses = client._build_where_filters(tags=["ml", "it's"])
+        assert clauses == ["array_has_any(tags, make_array('ml', 'it''s'))"]
+
+    async def test_tags_populated_and_typed(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path / "db", monkeypatch)
+        # First batch has only empty tags: column must still be list<string>
+        await client.add_documents("vault_notes", [_note("a", "")])
+        await client.add_documents("vault_notes", [_note("b", "ml,ai")])
+
+        tbl = client._db.open_table("vault_notes")
+        assert tbl.schema.field("tags").type == pa.list_(pa.string())
+        assert sorted(tbl.to_arrow().column("tags").to_pylist(), key=len) == [
+            [],
+            ["ml", "ai"],
+        ]
+        await client.close()
+
+    def test_typed_tags_normalized_per_row(self):
+        arrow = LanceDBClient._with_typed_tags(
+            [{"doc_id": "a"}, {"doc_id": "b", "tags": None}, {"doc_id": "c", "tags": ["ml"]}]
+        )
+
+        assert arrow.schema.field("tags").type == pa.list_(pa.string())
+        assert arrow.column("tags").to_pylist() == [[], [], ["ml"]]
+
+    async def test_tag_filter_is_exact(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path / "db", monkeypatch)
+        await client.add_documents(
+            "vault_notes",
+            [_note("ml_note", "ml,ai"), _note("web_note", "html,css")],
+        )
+
+        results = await client.search(
+            "笔记", table_name="vault_notes", tags=["ml"], query_type="vector"
+        )
+
+        assert [r["doc_id"] for r in results] == ["lancedb_ml_note"]
+        await client.close()
+
+
+class TestScalarIndexes:
+    async def test_indexes_created_for_filter_columns(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path / "db", monkeypatch)
+        await client.add_documents("vault_notes", [_note("a", "ml"), _note("b", "ai")])
+        client._ensure_scalar_indexes("vault_notes")
+
+        assert _index_types(client) == {
+            "subject": "Bitmap",
+            "course": "Bitmap",
+            "category": "Bitmap",
+            "canvas_file": "BTree",
+            "tags": "LabelList",
+        }
+
+        # Idempotent
+        client._ensure_scalar_indexes("vault_notes")
+        assert len(_index_types(client)) == 5
+
+        results = await client.search(
+            "笔记",
+            table_name="vault_notes",
+            course_id="cs101",
+            tags=["ai"],
+            query_type="vector",
+        )
+        assert [r["doc_id"] for r in results] == ["lancedb_b"]
+        await client.close()
+
+    async def test_only_existing_columns_indexed(self, tmp_path, monkeypatch):
+        client = await _make_client(tmp_path / "db", monkeypatch)
+        await client.add_documents(
+            "canvas_nodes",
+            [{"doc_id": "n1", "content": "节点", "vector": _vec("n1"), "canvas_file": "c.canvas"}],
+        )
+        client._ensure_scalar_indexes("canvas_nodes")
+
+        assert _index_types(client, "canvas_nodes") == {"canvas_file": "BTree"}
+        await client.close()
+
+
+class TestMigration:
+    async def test_legacy_table_gets_tags_column(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "db"
+        legacy = lancedb.connect(str(db_path))
+        legacy.create_table(
+            "vault_notes",
+            data=[
+                {**_note("old_ml", " ml , ai"), "content_tokenized": "old"},
+                {**_note("old_web", "html"), "content_tokenized": "old"},
+            ],
+        )
+
+        client = await _make_client(db_path, monkeypatch)
+
+        tbl = client._db.open_table("vault_notes")
+        rows = {
+            r["doc_id"]: r["tags"]
+            for r in tbl.to_arrow().select(["doc_id", "tags"]).to_pylist()
+        }
+        assert rows == {"old_ml": ["ml", "ai"], "old_web": ["html"]}
+        assert _index_types(client)["tags"] == "LabelList"
+
+        results = await client.search(
+            "笔记", table_name="vault_notes", tags=["ml"], query_type="vector"
+        )
+        assert [r["doc_id"] for r in results] == ["lancedb_old_ml"]
+        await client.close()
+
+    async def test_cached_legacy_table_migrated_on_insert(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "db"
+        client = await _make_client(db_path, monkeypatch)
+        # Written by an older process after this client initialized
+        lancedb.connect(str(db_path)).create_table(
+            "vault_notes", data=[{**_note("old", "ml"), "content_tokenized": "old", "timestamp": "2026-01-01"}]
+        )
+        await client.search("笔记", table_name="vault_notes", query_type="vector")
+        assert "vault_notes" in client._tables_cache
+
+        assert await client.add_documents("vault_notes", [_note("new", "ai, ml")]) == 1
+
+        tbl = client._db.open_table("vault_notes")
+        rows = {r["doc_id"]: r["tags"] for r in tbl.to_arrow().select(["doc_id", "tags"]).to_pylist()}
+        assert rows == {"old": ["ml"], "new": ["ai", "ml"]}
+        await client.close()
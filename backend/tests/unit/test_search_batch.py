@@ -0,0 +1,166 @@
+"""
+Tests for LanceDBClient.search_batch (multi_query variants in one retrieval).
+
+All queries are embedded in one batch, the dense branch is one multi-vector
+query, FTS runs per query in the search executor and every query is fused
+with RRF on its own — the same results as calling search() per query, and
+they land in the result cache so those search() calls become hits.
+"""
+
+import pytest
+
+from agentic_rag import _nodes_impl as nodes
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.clients.query_cache import get_search_result_cache
+from agentic_rag.clients.query_embeddings import query_embedding_scope
+from agentic_rag.state import create_initial_state
+from tests.unit.conftest import EMBED_DIM, fake_vector
+
+QUERIES = ["逆否命题", "逆否命题的定义", "充分必要条件"]
+
+
+async def _make_client(make_lancedb_client, enable_result_cache=False) -> LanceDBClient:
+    c = make_lancedb_client(
+        embedding_dim=EMBED_DIM,
+        enable_embedding_cache=False,
+        enable_result_cache=enable_result_cache,
+    )
+    await c.initialize()
+    contents = [
+        "逆否命题与原命题等价",
+        "命题的逆否命题的定义",
+        "充分条件与必要条件",
+        "充分必要条件的判断",
+        "矩阵的秩",
+        "贝叶斯定理",
+    ]
+    await c.add_documents(
+        "vault_notes",
+        [
+            {
+                "doc_id": f"n{i}",
+                "content": text,
+                "vector": fake_vector(text),
+                "canvas_file": f"n{i}.md",
+            }
+            for i, text in enumerate(contents)
+        ],
+    )
+    c._rebuild_fts_index("vault_notes", force=True)
+    c.embedded.clear()
+    c.batches.clear()
+    return c
+
+
+def _ids(results):
+    return [(r["doc_id"], round(r["score"], 6)) for r in results]
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = await _make_client(make_lancedb_client)
+    yield c
+    await c.close()
+
+
+class TestSearchBatch:
+    @pytest.mark.parametrize("query_type", ["hybrid", "vector"])
+    async def test_matches_per_query_search(self, client, query_type):
+        batched = await client.search_batch(
+            QUERIES, table_name="vault_notes", num_results=3, query_type=query_type
+        )
+
+        for query, results in zip(QUERIES, batched):
+            single = await client.search(
+                query, table_name="vault_notes", num_results=3, query_type=query_type
+            )
+            assert results
+            assert _ids(results) == _ids(single)
+
+    async def test_one_embedding_batch_and_one_dense_query(self, client):
+        dense_before = len(client._search_latency["dense"])
+
+        await client.search_batch(QUERIES, table_name="vault_notes", num_results=3)
+
+        assert client.batches == [QUERIES]
+        assert client.embedded == []
+        assert len(client._search_latency["dense"]) == dense_before + 1
+
+    async def test_scope_vectors_reused(self, client):
+        vectors = {q: fake_vector(q) for q in QUERIES[:2]}
+        with query_embedding_scope(vectors) as scope:
+            await client.search_batch(QUERIES, table_name="vault_notes")
+
+        assert client.batches == [QUERIES[2:]]
+        assert scope.calls == {QUERIES[2]: 1}
+
+    async def test_aligned_with_duplicates_and_blanks(self, client):
+        batched = await client.search_batch(
+            [QUERIES[0], "", QUERIES[0]], table_name="vault_notes", num_results=2
+        )
+
+        assert len(batched) == 3
+        assert batched[1] == []
+        assert _ids(batched[0]) == _ids(batched[2])
+        assert client.batches == [[QUERIES[0]]]
+
+    async def test_missing_table(self, client):
+        assert await client.search_batch(QUERIES, table_name="nope") == [[], [], []]
+
+
+class TestResultCache:
+    async def test_later_search_hits_cache(self, make_lancedb_client):
+        get_search_result_cache().clear()
+        client = await _make_client(make_lancedb_client, enable_result_cache=True)
+
+        batched = await client.search_batch(QUERIES, table_name="vault_notes", num_results=3)
+        client.batches.clear()
+
+        for query, results in zip(QUERIES, batched):
+            assert _ids(await client.search(query, table_name="vault_notes", num_results=3)) == _ids(results)
+        assert client.batches == [] and client.embedded == []
+        await client.close()
+        get_search_result_cache().clear()
+
+
+class _FakeBatchClient:
+    def __init__(self):
+        self.calls = []
+
+    async def embed_queries(self, texts):
+        return {t: fake_vector(t) for t in texts}
+
+    async def search_batch(self, queries, table_name, num_results):
+        self.calls.append((list(queries), table_name, num_results))
+        return [[] for _ in queries]
+
+
+class TestPrepareNodePrefetch:
+    async def test_variants_searched_in_one_batch(self, monkeypatch):
+        fake = _FakeBatchClient()
+
+        async def _get():
+            return fake
+
+        monkeypatch.setattr(nodes, "_get_lancedb_client", _get)
+        state = create_initial_state(
+            messages=[{"role": "user", "content": QUERIES[0]}],
+            multi_queries=QUERIES,
+        )
+
+        await nodes.prepare_query_embeddings_node(state, None)
+
+        assert fake.calls == [(QUERIES, "vault_notes", 10)]
+
+    async def test_single_query_not_prefetched(self, monkeypatch):
+        fake = _FakeBatchClient()
+
+        async def _get():
+            return fake
+
+        monkeypatch.setattr(nodes, "_get_lancedb_client", _get)
+        state = create_initial_state(messages=[{"role": "user", "content": QUERIES[0]}])
+
+        await nodes.prepare_query_embeddings_node(state, None)
+
+        assert fake.calls == []
@@ -0,0 +1,137 @@
+"""
+Tests for concurrent, deadline-bounded tiers in MemoryService.search_memories.
+
+Tier 1 (Graphiti) and tier 2 (Neo4j fulltext) run at the same time, each
+under its own budget and both under an overall deadline; results that arrive
+in time are merged even when another tier is still running, and
+search_memories_with_report() returns per-tier timing and timeout flags,
+which the service keeps for get_stats() and the memory health response.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.memory_schemas import MemoryHealthResponse
+from app.services.memory_service import MemoryService
+
+
+def _hit(episode_id, score=0.5):
+    return {"episode_id": episode_id, "content": episode_id, "relevance_score": score}
+
+
+def _tier(hits, delay=0.0, error=None):
+    async def _search(*args, **kwargs):
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return [dict(h) for h in hits]
+
+    return _search
+
+
+@pytest.fixture
+def service():
+    svc = MemoryService(neo4j_client=MagicMock())
+    svc._initialized = True
+    svc._search_tier_budgets_ms = {"graphiti": 1000, "neo4j_fulltext": 1000}
+    svc._search_deadline_ms = 1000
+    svc._episodes = [
+        {"episode_id": "mem-1", "concept": "逆否命题", "episode_type": "learning", "group_id": "g"}
+    ]
+    return svc
+
+
+class TestConcurrentTiers:
+    async def test_tiers_overlap(self, service):
+        service._search_graphiti = _tier([_hit("g1")], delay=0.1)
+        service._search_neo4j_fulltext = _tier([_hit("n1")], delay=0.1)
+
+        start = time.monotonic()
+        report = await service.search_memories_with_report("逆否")
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.18
+        assert {r["episode_id"] for r in report["results"]} == {"g1", "n1", "mem-1"}
+        assert report["timed_out"] is False
+        assert report["tiers"]["graphiti"]["results"] == 1
+        assert report["tiers"]["neo4j_fulltext"]["elapsed_ms"] >= 90
+        assert report["tiers"]["in_memory"]["results"] == 1
+
+    async def test_tier_budget(self, service):
+        service._search_tier_budgets_ms["graphiti"] = 20
+        service._search_graphiti = _tier([_hit("g1")], delay=1.0)
+        service._search_neo4j_fulltext = _tier([_hit("n1")])
+
+        report = await service.search_memories_with_report("逆否")
+
+        graphiti = report["tiers"]["graphiti"]
+        assert graphiti["timed_out"] is True and graphiti["results"] == 0
+        assert graphiti["elapsed_ms"] < 500
+        assert report["tiers"]["neo4j_fulltext"]["timed_out"] is False
+        assert {r["episode_id"] for r in report["results"]} == {"n1", "mem-1"}
+        assert report["timed_out"] is True
+
+    async def test_deadline_merges_finished_tiers(self, service):
+        service._search_graphiti = _tier([_hit("g1")], delay=1.0)
+        service._search_neo4j_fulltext = _tier([_hit("n1")], delay=0.01)
+
+        start = time.monotonic()
+        report = await service.search_memories_with_report("逆否", deadline_ms=50)
+
+        assert time.monotonic() - start < 0.5
+        assert report["deadline_ms"] == 50
+        assert report["tiers"]["graphiti"]["timed_out"] is True
+        assert report["tiers"]["neo4j_fulltext"]["results"] == 1
+        assert {r["episode_id"] for r in report["results"]} == {"n1", "mem-1"}
+
+    async def test_failing_tier_degrades(self, service):
+        service._search_graphiti = _tier([], error=RuntimeError("graphiti down"))
+        service._search_neo4j_fulltext = _tier([_hit("n1")])
+
+        report = await service.search_memories_with_report("逆否")
+
+        assert report["tiers"]["graphiti"]["error"] == "graphiti down"
+        assert report["tiers"]["graphiti"]["timed_out"] is False
+        assert {r["episode_id"] for r in report["results"]} == {"n1", "mem-1"}
+
+    async def test_search_memories_returns_list(self, service):
+        service._search_graphiti = _tier([_hit("g1", 0.9)])
+        service._search_neo4j_fulltext = _tier([])
+
+        results = await service.search_memories("逆否", max_results=1)
+
+        assert [r["episode_id"] for r in results] == ["g1"]
+
+
+class TestSearchStats:
+    async def test_timeouts_are_counted_per_tier(self, service):
+        service._search_tier_budgets_ms["graphiti"] = 20
+        service._search_graphiti = _tier([_hit("g1")], delay=1.0)
+        service._search_neo4j_fulltext = _tier([_hit("n1")])
+
+        await service.search_memories("逆否")
+        await service.search_memories("逆否")
+
+        stats = service.get_stats()["search"]
+        assert stats["searches"] == 2
+        assert stats["timed_out_searches"] == 2
+        assert stats["tier_timeouts"] == {"graphiti": 2}
+        assert stats["last_search"]["timed_out"] is True
+        assert stats["last_search"]["tiers"]["neo4j_fulltext"]["results"] == 1
+
+    async def test_health_reports_last_search(self, service):
+        service.neo4j.stats = {"initialized": True, "mode": "JSON_FALLBACK"}
+        service._search_graphiti = _tier([], error=RuntimeError("graphiti down"))
+        service._search_neo4j_fulltext = _tier([_hit("n1")])
+        assert (await service.get_health_status())["search"]["last_search"] is None
+
+        await service.search_memories("逆否")
+        health = MemoryHealthResponse(**await service.get_health_status())
+
+        assert health.search.searches == 1
+        assert health.search.timed_out_searches == 0
+        assert health.search.last_search.tiers["graphiti"].error == "graphiti down"
+        assert health.search.last_search.tiers["in_memory"].results == 1
@@ -0,0 +1,148 @@
+"""
+Tests for the search result cache keyed on per-table index version.
+"""
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import LanceDBClient
+from agentic_rag.clients.query_cache import SearchResultCache, get_search_result_cache
+from tests.unit.conftest import fake_vector
+
+
+def _docs(prefix: str, n: int) -> list:
+    return [
+        {
+            "doc_id": f"{prefix}{i}",
+            "content": f"逆否命题 {prefix} 内容 {i}",
+            "vector": fake_vector(f"{prefix}{i}"),
+            "canvas_file": f"{prefix}_{i}.md",
+        }
+        for i in range(n)
+    ]
+
+
+class TestSearchResultCache:
+    def test_version_bump_invalidates_only_that_table(self):
+        cache = SearchResultCache()
+        cache.put("db", "a", "fp", [{"doc_id": "1"}], cache.version("db", "a"))
+        cache.put("db", "b", "fp", [{"doc_id": "2"}], cache.version("db", "b"))
+
+        cache.bump("db", "a")
+
+        assert cache.get("db", "a", "fp") is None
+        assert cache.get("db", "b", "fp") == [{"doc_id": "2"}]
+        assert cache.stats()["invalidations"] == 1
+
+    def test_put_against_stale_version_is_dropped(self):
+        cache = SearchResultCache()
+        version = cache.version("db", "a")
+        cache.bump("db", "a")  # table changed while the search was running
+        cache.put("db", "a", "fp", [{"doc_id": "1"}], version)
+
+        assert cache.get("db", "a", "fp") is None
+
+    def test_returns_copies(self):
+        cache = SearchResultCache()
+        cache.put("db", "a", "fp", [{"metadata": {"x": 1}}], 0)
+        first = cache.get("db", "a", "fp")
+        first[0]["metadata"]["x"] = 99
+
+        assert cache.get("db", "a", "fp")[0]["metadata"]["x"] == 1
+
+    def test_ttl_and_lru_bounds(self):
+        cache = SearchResultCache(maxsize=2, ttl_seconds=60)
+        for i in range(3):
+            cache.put("db", "a", f"fp{i}", [{"i": i}], 0)
+
+        assert cache.stats()["entries"] == 2
+        assert cache.get("db", "a", "fp0") is None
+
+    def test_fingerprint_is_order_stable(self):
+        assert SearchResultCache.fingerprint(a=1, b=[1, 2]) == SearchResultCache.fingerprint(
+            b=[1, 2], a=1
+        )
+
+
+@pytest.fixture
+async def client(make_lancedb_client):
+    c = make_lancedb_client(enable_embedding_cache=False)
+    await c.initialize()
+    await c.add_documents("vault_notes", _docs("base", 4))
+    c._rebuild_fts_index("vault_notes")
+    yield c
+    await c.close()
+
+
+class TestLanceDBClientResultCache:
+    async def test_identical_search_served_from_cache(self, client):
+        first = await client.search("逆否命题", table_name="vault_notes", num_results=3)
+        second = await client.search("逆否命题", table_name="vault_notes", num_results=3)
+
+        assert [r["doc_id"] for r in first] == [r["doc_id"] for r in second]
+        assert client.embedded == ["逆否命题"]
+        # Cache hits report their own lookup latency, not the original search's
+        latency = second[0]["metadata"]["search_latency_ms"]
+        assert set(latency) == {"cache", "total"}
+        assert "cache" not in first[0]["metadata"]["search_latency_ms"]
+
+    async def test_different_params_miss(self, client):
+        await client.search("逆否命题", table_name="vault_notes", num_results=3)
+        await client.search("逆否命题", table_name="vault_notes", num_results=2)
+        await client.search("逆否命题", table_name="vault_notes", num_results=3, rrf_k=10)
+
+        assert len(client.embedded) == 3
+
+    async def test_add_documents_invalidates(self, client):
+        await client.search("逆否命题", table_name="vault_notes")
+        await client.add_documents("vault_notes", _docs("new", 1))
+        results = await client.search("逆否命题", table_name="vault_notes")
+
+        assert len(client.embedded) == 2
+        assert any(r["doc_id"] == "lancedb_new0" for r in results)
+
+    async def test_delete_file_chunks_invalidates(self, client):
+        await client.search("逆否命题", table_name="vault_notes")
+        client._delete_file_chunks("vault_notes", "base_0.md")
+        results = await client.search("逆否命题", table_name="vault_notes")
+
+        assert len(client.embedded) == 2
+        assert all(r["doc_id"] != "lancedb_base0" for r in results)
+
+    async def test_writes_from_another_instance_invalidate(self, client, tmp_path):
+        await client.search("逆否命题", table_name="vault_notes")
+        # Versions are process-wide: a second client on the same db_path
+        # marking the table as changed invalidates this client's entries
+        other = LanceDBClient(db_path=str(tmp_path / "db"), vault_id="default")
+        other._bump_index_version("vault_notes")
+
+        await client.search("逆否命题", table_name="vault_notes")
+        assert len(client.embedded) == 2
+
+    async def test_degraded_results_not_cached(self, client, monkeypatch):
+        from agentic_rag.clients import lancedb_client
+
+        def _broken(text):
+            raise RuntimeError("tokenizer unavailable")
+
+        monkeypatch.setattr(lancedb_client, "_jieba_tokenize", _broken)
+        first = await client.search("逆否命题", table_name="vault_notes")
+        await client.search("逆否命题", table_name="vault_notes")
+
+        assert first  # dense-only results still returned
+        assert len(client.embedded) == 2
+
+    async def test_cache_can_be_disabled(self, client):
+        client.enable_result_cache = False
+        await client.search("逆否命题", table_name="vault_notes")
+        await client.search("逆否命题", table_name="vault_notes")
+
+        assert len(client.embedded) == 2
+        assert client.get_stats()["result_cache"] is None
+
+    async def test_stats_visible(self, client):
+        await client.search("逆否命题", table_name="vault_notes")
+        await client.search("逆否命题", table_name="vault_notes")
+
+        stats = client.get_stats()["result_cache"]
+        assert stats["hits"] >= 1
+        assert stats["hits"] == get_search_result_cache().stats()["hits"]
@@ -0,0 +1,89 @@
+"""
+Tests for SnapshotJournal, the snapshot + JSONL journal files shared by
+FallbackStore and CardStateJournal.
+
+Appends are counted against the compaction threshold and the snapshot
+size, replay stops at a torn final line and does not count skipped
+entries, and a snapshot write replaces the file and drops the journal.
+"""
+
+import json
+import threading
+
+from app.utils.snapshot_journal import SnapshotJournal
+
+
+def test_append_and_replay(tmp_path):
+    files = SnapshotJournal(tmp_path / "store.json", compact_threshold=3)
+    assert files.read_snapshot() is None
+    files.write_snapshot({f"k{i}": i for i in range(20)})
+
+    assert files.append([{"k": "a"}, {"k": "b"}]) == 2
+    assert not files.should_compact
+    files.append([{"k": "c"}])
+    assert files.should_compact
+
+    seen = []
+    replayed, torn = SnapshotJournal(files.path).replay(lambda entry: seen.append(entry["k"]) or entry["k"] != "b")
+
+    assert (replayed, torn) == (2, False)
+    assert seen == ["a", "b", "c"]
+
+
+def test_journal_larger_than_snapshot_should_compact(tmp_path):
+    files = SnapshotJournal(tmp_path / "store.json")
+    files.write_snapshot({"a": 1})
+    assert not files.should_compact
+
+    files.append([{"k": "a", "v": 2}])
+    assert files.should_compact
+
+    reopened = SnapshotJournal(files.path)
+    reopened.read_snapshot()
+    reopened.replay(lambda entry: True)
+    assert reopened.should_compact
+
+
+def test_replay_stops_at_torn_tail(tmp_path):
+    files = SnapshotJournal(tmp_path / "store.json")
+    files.append([{"k": "a"}])
+    files.append_lines('{"k":"b","v":')
+
+    seen = []
+    assert files.replay(lambda entry: seen.append(entry["k"])) == (1, True)
+    assert seen == ["a"]
+
+
+def test_write_snapshot_drops_journal(tmp_path):
+    files = SnapshotJournal(tmp_path / "store.json")
+    files.append([{"k": "a"}])
+
+    files.write_snapshot({"a": "中文"})
+
+    assert files.entries == 0
+    assert not files.journal_path.exists()
+    assert not list(tmp_path.glob("*.tmp"))
+    assert files.read_snapshot() == {"a": "中文"}
+    assert json.loads(files.path.read_text(encoding="utf-8")) == {"a": "中文"}
+
+
+def test_concurrent_snapshot_writes_use_separate_temp_files(tmp_path):
+    path = tmp_path / "store.json"
+    errors = []
+
+    def compact(n):
+        try:
+            for _ in range(20):
+                SnapshotJournal(path).write_snapshot({"writer": n, "rows": list(range(200))})
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=compact, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert SnapshotJournal(path).read_snapshot()["rows"] == list(range(200))
+    assert not list(tmp_path.glob("*.tmp"))
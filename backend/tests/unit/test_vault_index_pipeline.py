@@ -0,0 +1,168 @@
+"""
+Tests for the pipelined vault indexer (VaultIndexPipeline + index_vault_notes).
+
+Covers cross-file embedding batches, bounded concurrency, bulk writes,
+fingerprint-driven skipping and throughput reporting via progress_callback.
+"""
+
+import asyncio
+
+import pytest
+
+from agentic_rag.clients.lancedb_client import _split_md_file_worker
+from agentic_rag.clients.vault_index_pipeline import (
+    VaultIndexPipeline,
+    _callback_accepts_stats,
+)
+from tests.unit.conftest import EMBED_DIM
+
+
+def _write_vault(root, n_files: int = 5) -> None:
+    for i in range(n_files):
+        (root / f"note_{i}.md").write_text(
+            f"# 标题 {i}\n\n第 {i} 篇笔记的内容。\n\n## 小节\n\nSection body {i}.\n",
+            encoding="utf-8",
+        )
+
+
+@pytest.fixture
+def client(make_lancedb_client):
+    return make_lancedb_client(batch_size=3)
+
+
+class TestIndexVaultNotesPipeline:
+    async def test_indexes_all_files_with_cross_file_batches(self, client, tmp_path):
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        _write_vault(vault, n_files=5)
+
+        total = await client.index_vault_notes(
+            vault_path=str(vault), embed_batch_size=4, chunk_workers=0
+        )
+
+        assert total == 10  # 2 sections per file
+        tbl = client._db.open_table("vault_notes")
+        assert tbl.count_rows() == 10
+        # Batches span files: no batch is larger than the configured size,
+        # and fewer round-trips than one per file were needed.
+        assert max(len(b) for b in client.batches) <= 4
+        assert len(client.batches) < 5 * 2
+        fps = client._get_all_fingerprints()
+        assert set(fps) == {f"note_{i}.md" for i in range(5)}
+
+    async def test_second_run_skips_unchanged_files(self, client, tmp_path):
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        _write_vault(vault, n_files=3)
+        await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        client.batches.clear()
+        (vault / "note_1.md").write_text("# 新标题\n\n改过的内容。\n", encoding="utf-8")
+        total = await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        assert total == 1
+        assert sum(len(b) for b in client.batches) == 1
+        tbl = client._db.open_table("vault_notes")
+        # old two chunks of note_1 replaced by one
+        assert tbl.count_rows() == 5
+
+    async def test_progress_callback_receives_throughput(self, client, tmp_path):
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        _write_vault(vault, n_files=4)
+        events = []
+
+        def _cb(current, total, stats):
+            events.append((current, total, stats))
+
+        await client.index_vault_notes(
+            vault_path=str(vault), chunk_workers=0, progress_callback=_cb
+        )
+
+        assert [e[0] for e in events] == [1, 2, 3, 4]
+        assert all(e[1] == 4 for e in events)
+        last = events[-1][2]
+        assert last["files_indexed"] == 4
+        assert last["chunks_written"] == 8
+        assert "files_per_sec" in last and "chunks_per_sec" in last
+        assert client.get_stats()["last_index"]["chunks_written"] == 8
+
+    async def test_legacy_two_arg_callback_still_supported(self, client, tmp_path):
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        _write_vault(vault, n_files=2)
+        calls = []
+
+        await client.index_vault_notes(
+            vault_path=str(vault),
+            chunk_workers=0,
+            progress_callback=lambda cur, tot: calls.append((cur, tot)),
+        )
+
+        assert calls == [(1, 2), (2, 2)]
+
+    async def test_embedding_unavailable_skips_without_fingerprint(
+        self, client, tmp_path, monkeypatch
+    ):
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        _write_vault(vault, n_files=2)
+
+        async def _down(texts):
+            return None
+
+        monkeypatch.setattr(client, "_ollama_embed_batch", _down)
+        total = await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        assert total == 0
+        assert client._get_all_fingerprints() == {}
+
+
+class TestVaultIndexPipeline:
+    async def test_embed_concurrency_is_bounded(self, tmp_path):
+        in_flight = 0
+        peak = 0
+
+        async def _embed(texts):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [[0.0] * EMBED_DIM for _ in texts]
+
+        written = []
+
+        async def _write(jobs):
+            written.extend(job.rel_path for job in jobs)
+            return sum(len(job.chunks) for job in jobs)
+
+        pipeline = VaultIndexPipeline(
+            chunk_fn=lambda rel, content, mt, ot: [
+                {"content": line, "file_path": rel} for line in content.split("\n")
+            ],
+            embed_fn=_embed,
+            write_fn=_write,
+            embed_batch_size=2,
+            embed_concurrency=2,
+        )
+
+        files = []
+        for i in range(6):
+            path = tmp_path / f"{i}.md"
+            path.write_text("a\nb\nc", encoding="utf-8")
+            files.append((str(path), f"{i}.md"))
+        stats = await pipeline.run(files)
+
+        assert peak <= 2
+        assert sorted(written) == sorted(rel for _, rel in files)
+        assert stats["chunks_written"] == 18
+
+    def test_chunk_worker_is_module_level(self):
+        chunks = _split_md_file_worker("a/b.md", "# H\n\ntext", 512, 50)
+        assert chunks and chunks[0]["file_path"] == "a/b.md"
+
+    def test_callback_signature_detection(self):
+        assert _callback_accepts_stats(lambda a, b, c: None)
+        assert _callback_accepts_stats(lambda *args: None)
+        assert not _callback_accepts_stats(lambda a, b: None)
@@ -0,0 +1,195 @@
+"""
+Tests for the note-level wiki-link adjacency index behind expand_neighbors.
+
+index_vault_notes records each note's [[links]] and top chunk ids; link
+targets resolve to exact files (no substring matches), neighbour expansion
+is one doc_id IN (...) lookup, and the graph is persisted so a new client
+does not rescan the notes table.
+"""
+
+import pytest
+
+from agentic_rag.clients.wikilink_index import WikiLinkIndex, link_key
+from tests.unit.conftest import EMBED_DIM, fake_vector
+
+
+class TestWikiLinkIndex:
+    def test_link_key(self):
+        assert link_key(" 逆否命题#定义 ") == "逆否命题"
+        assert link_key("Math/Note.md") == "math/note"
+        assert link_key("note^block1") == "note"
+
+    def test_exact_resolution(self):
+        index = WikiLinkIndex()
+        index.set_file("线性代数.md", [], ["la"])
+        index.set_file("线性代数习题.md", [], ["ex"])
+
+        assert index.resolve("线性代数") == "线性代数.md"
+        assert index.resolve("线性代数习题") == "线性代数习题.md"
+        assert index.resolve("代数") is None
+
+    def test_path_links_and_duplicate_names(self):
+        index = WikiLinkIndex()
+        index.set_file("a/note.md", [], [])
+        index.set_file("b/sub/note.md", [], [])
+
+        assert index.resolve("note") == "a/note.md"
+        assert index.resolve("sub/note") == "b/sub/note.md"
+        assert index.resolve("B/Sub/Note.md") == "b/sub/note.md"
+        assert index.resolve("c/note") is None
+
+    def test_outgoing_backlinks_and_removal(self):
+        index = WikiLinkIndex()
+        index.set_file("A.md", ["B", "C", "missing"], ["a0"])
+        index.set_file("B.md", ["C"], ["b0"])
+        index.set_file("C.md", ["A"], ["c0"])
+
+        assert index.outgoing("A.md") == ["B.md", "C.md"]
+        assert index.backlinks("C.md") == ["A.md", "B.md"]
+        assert index.neighbour_chunk_ids(["B", "b", "C"]) == [("B.md", "b0"), ("C.md", "c0")]
+
+        index.remove_files(["B.md"])
+        assert index.outgoing("A.md") == ["C.md"]
+        assert index.backlinks("C.md") == ["A.md"]
+        assert index.stats() == {"files": 2, "links": 4}
+
+    def test_top_chunks_kept(self):
+        index = WikiLinkIndex(top_chunks=2)
+        index.set_file("A.md", [], ["a0", "a1", "a2"])
+
+        assert index.chunk_ids("A.md") == ["a0", "a1"]
+
+
+@pytest.fixture
+def make_client(make_lancedb_client):
+    def _make(db_path):
+        return make_lancedb_client(db_path, embedding_dim=EMBED_DIM, enable_result_cache=False)
+
+    return _make
+
+
+def _write_vault(root) -> None:
+    (root / "线性代数.md").write_text("# 线性代数\n\n矩阵与向量空间。\n", encoding="utf-8")
+    (root / "线性代数习题.md").write_text("# 习题\n\n练习题。\n", encoding="utf-8")
+    (root / "特征值.md").write_text(
+        "# 特征值\n\n见 [[线性代数|线代]] 与 [[不存在的笔记]]。\n", encoding="utf-8"
+    )
+
+
+def _result(content: str) -> dict:
+    return {"doc_id": "lancedb_x", "content": content, "score": 0.9, "metadata": {}}
+
+
+@pytest.fixture
+def vault(tmp_path):
+    root = tmp_path / "vault"
+    root.mkdir()
+    _write_vault(root)
+    return root
+
+
+class TestExpandNeighbors:
+    async def test_exact_file_single_lookup(self, tmp_path, vault, make_client):
+        client = make_client(tmp_path / "db")
+        await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        index = client.get_wikilink_index()
+        assert index.outgoing("特征值.md") == ["线性代数.md"]
+
+        expanded = await client.expand_neighbors([_result("参考 [[线性代数]]")])
+
+        neighbours = expanded[1:]
+        assert [n["metadata"]["canvas_file"] for n in neighbours] == ["线性代数.md"]
+        assert neighbours[0]["metadata"]["source_type"] == "neighbor_expansion"
+        await client.close()
+
+    async def test_incremental_update_and_delete(self, tmp_path, vault, make_client):
+        client = make_client(tmp_path / "db")
+        await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        (vault / "特征值.md").write_text("# 特征值\n\n见 [[线性代数习题]]。\n", encoding="utf-8")
+        (vault / "线性代数.md").unlink()
+        await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+
+        index = client.get_wikilink_index()
+        assert index.outgoing("特征值.md") == ["线性代数习题.md"]
+        assert "线性代数.md" not in index
+        assert await client.expand_neighbors([_result("[[线性代数]]")]) == [_result("[[线性代数]]")]
+        await client.close()
+
+    async def test_persisted_across_clients(self, tmp_path, vault, make_client, monkeypatch):
+        first = make_client(tmp_path / "db")
+        await first.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+        await first.close()
+
+        second = make_client(tmp_path / "db")
+        await second.initialize()
+        monkeypatch.setattr(
+            second, "_scan_wikilink_index", lambda table_name: pytest.fail("notes table rescanned")
+        )
+
+        index = second.get_wikilink_index()
+        assert index.outgoing("特征值.md") == ["线性代数.md"]
+        await second.close()
+
+    async def test_writes_from_another_client_reload(self, tmp_path, vault, make_client):
+        reader = make_client(tmp_path / "db")
+        await reader.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+        assert len(await reader.expand_neighbors([_result("[[线性代数]]")])) == 2
+
+        (vault / "特征值.md").write_text("# 特征值\n\n见 [[线性代数习题]]。\n", encoding="utf-8")
+        writer = make_client(tmp_path / "db")
+        await writer.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+        await writer.close()
+
+        await reader.expand_neighbors([_result("[[线性代数]]")])
+        assert reader.get_wikilink_index().outgoing("特征值.md") == ["线性代数习题.md"]
+        await reader.close()
+
+    async def test_built_from_existing_table(self, tmp_path, make_client):
+        client = make_client(tmp_path / "db")
+        await client.initialize()
+        await client.add_documents(
+            "vault_notes",
+            [
+                {"doc_id": "a0", "content": "链接 [[B]]", "vector": fake_vector("a"), "canvas_file": "A.md"},
+                {"doc_id": "b0", "content": "B 的内容", "vector": fake_vector("b"), "canvas_file": "B.md"},
+            ],
+        )
+
+        expanded = await client.expand_neighbors([_result("[[B]]")])
+
+        assert [n["doc_id"] for n in expanded[1:]] == ["lancedb_b0"]
+        assert client.get_wikilink_index().backlinks("B.md") == ["A.md"]
+        await client.close()
+
+    async def test_rebuild_forgets_graph(self, tmp_path, vault, make_client):
+        client = make_client(tmp_path / "db")
+        await client.index_vault_notes(vault_path=str(vault), chunk_workers=0)
+        (vault / "特征值.md").unlink()
+
+        await client.rebuild_index(vault_path=str(vault))
+
+        assert "特征值.md" not in client.get_wikilink_index()
+        await client.close()
+
+
+class TestGraphServiceFromIndex:
+    async def test_build_from_index(self):
+        from app.services.wikilink_graph_service import WikilinkGraphService
+
+        index = WikiLinkIndex()
+        index.set_file("notes/A.md", ["B"], [])
+        index.set_file("notes/B.md", ["C"], [])
+        index.set_file("C.md", [], [])
+        service = WikilinkGraphService()
+
+        result = await service.build_from_index(index)
+
+        assert result["total_nodes"] == 3
+        assert result["total_edges"] == 2
+        neighbours = service.get_neighbors("A.md", hop=2)
+        assert [(n.title, n.path, n.hop_distance) for n in neighbours] == [
+            ("B", "notes/B.md", 1),
+            ("C", "C.md", 2),
+        ]